@@ -0,0 +1,248 @@
+# action_log.py
+"""
+Columnar log of observed player actions.
+
+Every observed action used to be copied into each opponent tracker in its own
+shape: OpponentTracker kept nested dicts, EnhancedOpponentTracker built ActionData
+objects, and the bot fed each of them separately. The ActionLog is now the single
+place actions are recorded. It stores them as a struct of typed arrays with
+integer codes for player, action, street, position and hand (under 60 bytes per
+action instead of a dict or dataclass per action). The trackers subscribe to it
+as views: they update their counters from each appended row and keep row ids
+into the log for their per-hand and recent-action views instead of copies.
+"""
+
+import logging
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ('fold', 'check', 'call', 'bet', 'raise', 'all_in')
+STREETS = ('preflop', 'flop', 'turn', 'river')
+POSITIONS = ('UTG', 'MP', 'CO', 'BTN', 'SB', 'BB', 'unknown')
+
+ACTION_ALIASES = {'all-in': 'all_in', 'allin': 'all_in', 'all in': 'all_in'}
+
+DEFAULT_MAX_ROWS = 200000
+
+
+class LoggedAction(NamedTuple):
+    """One decoded row of the action log."""
+    row_id: int
+    player_name: str
+    action_type: str
+    street: str
+    position: str
+    amount: float
+    pot_size_before: float
+    stack_size: float
+    hand_id: str
+    timestamp: float
+    decision_time: float
+
+
+class _Interner:
+    """Bidirectional string <-> small integer code table."""
+
+    def __init__(self, seed=()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in seed:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def normalize_action_type(action_type: str) -> str:
+    action = (action_type or 'unknown').strip().lower()
+    return ACTION_ALIASES.get(action, action)
+
+
+class ActionLog:
+    """Struct-of-arrays action log with per-player row indexes and subscribed views."""
+
+    def __init__(self, max_rows: int = DEFAULT_MAX_ROWS):
+        self.max_rows = max_rows
+        self._players = _Interner()
+        self._actions = _Interner(ACTIONS)
+        self._streets = _Interner(STREETS)
+        self._positions = _Interner(POSITIONS)
+        self._hands = _Interner()
+
+        # Columns, one entry per row
+        self._player = array('I')
+        self._action = array('H')
+        self._street = array('H')
+        self._position = array('H')
+        self._hand = array('I')
+        self._amount = array('d')
+        self._pot = array('d')
+        self._stack = array('d')
+        self._timestamp = array('d')
+        self._decision_time = array('d')
+
+        # Row ids are global; _base is the id of the first row still held
+        self._base = 0
+        self._player_rows: Dict[int, array] = defaultdict(lambda: array('I'))
+        self._views: List[Callable[[LoggedAction], None]] = []
+
+    # --- Recording ---------------------------------------------------------
+
+    def subscribe(self, view: Callable[[LoggedAction], None]):
+        """Register a callable that receives every appended action."""
+        self._views.append(view)
+
+    def append(self, player_name: str, action_type: str, street: str, position: Optional[str] = None,
+               amount: float = 0.0, pot_size_before: float = 0.0, stack_size: float = 0.0,
+               hand_id: Optional[str] = None, decision_time: float = 0.0,
+               timestamp: Optional[float] = None) -> LoggedAction:
+        """Record an action and forward it to the subscribed views."""
+        player_code = self._players.code(player_name)
+        self._player.append(player_code)
+        self._action.append(self._actions.code(normalize_action_type(action_type)))
+        self._street.append(self._streets.code((street or 'unknown').lower()))
+        self._position.append(self._positions.code(position or 'unknown'))
+        self._hand.append(self._hands.code(hand_id or ''))
+        self._amount.append(float(amount or 0.0))
+        self._pot.append(float(pot_size_before or 0.0))
+        self._stack.append(float(stack_size or 0.0))
+        self._timestamp.append(time.time() if timestamp is None else timestamp)
+        self._decision_time.append(float(decision_time or 0.0))
+
+        row_id = self._base + len(self._player) - 1
+        self._player_rows[player_code].append(row_id)
+        if len(self._player) > self.max_rows:
+            self._compact()
+
+        action = self.get_row(row_id)
+        for view in self._views:
+            try:
+                view(action)
+            except Exception as e:
+                logger.error(f"Action log view failed for {player_name} {action_type}: {e}")
+        return action
+
+    def _compact(self):
+        """Drop the oldest quarter of the rows (amortised O(1) per append)."""
+        drop = max(1, self.max_rows // 4)
+        for column in self._columns():
+            del column[:drop]
+        self._base += drop
+        for player_code, rows in list(self._player_rows.items()):
+            kept = array('I', (row for row in rows if row >= self._base))
+            if kept:
+                self._player_rows[player_code] = kept
+            else:
+                del self._player_rows[player_code]
+        self._reintern()
+
+    def _reintern(self):
+        """Rebuild the player and hand tables from the rows still held.
+
+        Both are unbounded over a session (every opponent and every hand id ever
+        seen), so without this the tables would outgrow the trimmed columns.
+        """
+        players = _Interner()
+        player_map = {old: players.code(self._players.values[old]) for old in self._player_rows}
+        self._player = array('I', (player_map[code] for code in self._player))
+        self._player_rows = defaultdict(lambda: array('I'),
+                                        ((player_map[old], rows) for old, rows in self._player_rows.items()))
+        self._players = players
+
+        hands = _Interner()
+        hand_values = self._hands.values
+        self._hand = array('I', (hands.code(hand_values[code]) for code in self._hand))
+        self._hands = hands
+
+    def _columns(self):
+        return (self._player, self._action, self._street, self._position, self._hand,
+                self._amount, self._pot, self._stack, self._timestamp, self._decision_time)
+
+    # --- Reading -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._player)
+
+    def get_row(self, row_id: int) -> LoggedAction:
+        index = row_id - self._base
+        if index < 0 or index >= len(self._player):
+            raise IndexError(f"Row {row_id} is not in the log")
+        return LoggedAction(
+            row_id=row_id,
+            player_name=self._players.values[self._player[index]],
+            action_type=self._actions.values[self._action[index]],
+            street=self._streets.values[self._street[index]],
+            position=self._positions.values[self._position[index]],
+            amount=self._amount[index],
+            pot_size_before=self._pot[index],
+            stack_size=self._stack[index],
+            hand_id=self._hands.values[self._hand[index]],
+            timestamp=self._timestamp[index],
+            decision_time=self._decision_time[index],
+        )
+
+    def rows(self, row_ids: Optional[Iterable[int]] = None) -> Iterator[LoggedAction]:
+        """Decoded rows for the given ids (all held rows by default); compacted rows are skipped."""
+        if row_ids is None:
+            row_ids = range(self._base, self._base + len(self._player))
+        base = self._base
+        return (self.get_row(row_id) for row_id in row_ids if row_id >= base)
+
+    def player_actions(self, player_name: str, last: Optional[int] = None) -> Iterator[LoggedAction]:
+        """Decoded actions of one player, oldest first (optionally only the last N)."""
+        player_code = self._players.codes.get(player_name)
+        if player_code is None:
+            return iter(())
+        rows = self._player_rows.get(player_code, ())
+        if last is not None:
+            rows = rows[-last:] if last > 0 else ()
+        return (self.get_row(row_id) for row_id in rows)
+
+    def action_counts(self, player_name: str, street: Optional[str] = None) -> Dict[str, int]:
+        """Action type -> count for a player, read straight from the code columns."""
+        player_code = self._players.codes.get(player_name)
+        if player_code is None:
+            return {}
+        street_code = self._streets.codes.get(street) if street else None
+        if street and street_code is None:
+            return {}
+        counts = Counter()
+        base = self._base
+        for row_id in self._player_rows.get(player_code, ()):
+            index = row_id - base
+            if street_code is None or self._street[index] == street_code:
+                counts[self._action[index]] += 1
+        return {self._actions.values[code]: count for code, count in counts.items()}
+
+    def players(self) -> List[str]:
+        return [self._players.values[code] for code in self._player_rows]
+
+    def interned_counts(self) -> Dict[str, int]:
+        """Entries in the player and hand code tables."""
+        return {'players': len(self._players), 'hands': len(self._hands)}
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the columns, per-player indexes and code tables."""
+        columns = sum(column.itemsize * len(column) for column in self._columns())
+        indexes = sum(rows.itemsize * len(rows) for rows in self._player_rows.values())
+        tables = sum(sys.getsizeof(value) for table in (self._players, self._hands) for value in table.values)
+        return columns + indexes + tables
+
+
+def create_action_log(config: Optional[Dict] = None) -> ActionLog:
+    """Factory function reading the optional 'action_log' config section."""
+    settings = (config or {}).get('action_log', {}) if isinstance(config, dict) else {}
+    return ActionLog(max_rows=settings.get('max_rows', DEFAULT_MAX_ROWS))
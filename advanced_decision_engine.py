@@ -10,6 +10,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from board_features import get_board_features
+
 logger = logging.getLogger(__name__)
 
 class PlayingStyle(Enum):
@@ -25,6 +27,13 @@ class BoardTexture(Enum):
     COORDINATED = "coordinated"
     RAINBOW = "rainbow"
 
+    @classmethod
+    def from_cards(cls, community_cards: List[str]) -> 'BoardTexture':
+        """Texture of the flop from the shared board-feature cache."""
+        if len(community_cards) < 3:
+            return cls.DRY
+        return cls(get_board_features(community_cards[:3]).simple_texture)
+
 @dataclass
 class OpponentProfile:
     """Profile of an opponent's playing style."""
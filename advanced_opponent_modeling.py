@@ -9,12 +9,18 @@ from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 import statistics
 
+from opponent_profile_store import SOURCE_BASIC
+from decayed_stats import DecayedStats, create_decayed_stats
+from population_priors import get_population_priors
+
 logger = logging.getLogger(__name__)
 
 class OpponentProfile:
     """Enhanced opponent profile with detailed statistics."""
     
-    def __init__(self, player_name: str):
+    STREET_AGGRESSION_STATS = {'flop': 'cbet', 'turn': 'turn_aggression', 'river': 'river_aggression'}
+
+    def __init__(self, player_name: str, decayed_stats: Optional[DecayedStats] = None):
         self.name = player_name
         self.hands_observed = 0
         
@@ -24,11 +30,8 @@ class OpponentProfile:
         self.aggression_factor = 0.0
         self.fold_to_3bet = 0.0
         
-        # Advanced stats
-        self.cbet_frequency = 0.0  # Continuation bet frequency
-        self.fold_to_cbet = 0.0    # Fold to continuation bet
-        self.turn_aggression = 0.0  # Turn betting frequency
-        self.river_aggression = 0.0 # River betting frequency
+        # Advanced stats: decayed frequencies shrunk towards the population (see properties below)
+        self.decayed_stats = decayed_stats if decayed_stats is not None else DecayedStats()
         
         # Position-based stats
         self.position_stats = defaultdict(lambda: {
@@ -62,27 +65,44 @@ class OpponentProfile:
     
     def update_postflop_action(self, street: str, action: str, amount: float, pot_size: float):
         """Update postflop statistics."""
-        if action in ['bet', 'raise']:
+        aggressive = action in ['bet', 'raise']
+        if aggressive:
             bet_ratio = amount / pot_size if pot_size > 0 else 0
             self.bet_sizes[street].append(bet_ratio)
-            
-            # Update street-specific aggression
-            if street == 'flop':
-                self.cbet_frequency = self._update_frequency(self.cbet_frequency, True)
-            elif street == 'turn':
-                self.turn_aggression = self._update_frequency(self.turn_aggression, True)
-            elif street == 'river':
-                self.river_aggression = self._update_frequency(self.river_aggression, True)
+
+        # Street-specific aggression: passive actions count as opportunities too
+        stat = self.STREET_AGGRESSION_STATS.get(street)
+        if stat:
+            self.decayed_stats.update(stat, aggressive)
     
-    def update_fold_to_bet(self, street: str, bet_type: str = 'standard'):
-        """Update folding statistics."""
+    def update_fold_to_bet(self, street: str, bet_type: str = 'standard', folded: bool = True):
+        """Update folding statistics with the response to a bet."""
         if street == 'flop' and bet_type == 'cbet':
-            self.fold_to_cbet = self._update_frequency(self.fold_to_cbet, True)
-    
-    def _update_frequency(self, current_freq: float, occurred: bool) -> float:
-        """Update frequency statistics with exponential decay."""
-        alpha = 0.1  # Learning rate
-        return current_freq * (1 - alpha) + (1.0 if occurred else 0.0) * alpha
+            self.decayed_stats.update('fold_to_cbet', folded)
+
+    @property
+    def cbet_frequency(self) -> float:
+        """Continuation bet frequency."""
+        return self.decayed_stats.estimate('cbet')
+
+    @property
+    def fold_to_cbet(self) -> float:
+        """Fold to continuation bet."""
+        return self.decayed_stats.estimate('fold_to_cbet')
+
+    @property
+    def turn_aggression(self) -> float:
+        """Turn betting frequency."""
+        return self.decayed_stats.estimate('turn_aggression')
+
+    @property
+    def river_aggression(self) -> float:
+        """River betting frequency."""
+        return self.decayed_stats.estimate('river_aggression')
+
+    def get_stat_confidence(self, stat: str) -> float:
+        """Share of a decayed stat's estimate that comes from this player's own actions."""
+        return self.decayed_stats.confidence(stat)
     
     def get_betting_tendency(self, street: str) -> str:
         """Get opponent's betting tendency for a street."""
@@ -135,19 +155,41 @@ class OpponentProfile:
 class AdvancedOpponentAnalyzer:
     """Advanced analysis of opponent behavior patterns."""
     
-    def __init__(self):
+    def __init__(self, profile_store=None):
         self.profiles: Dict[str, OpponentProfile] = {}
+        # Optional OpponentProfileStore used to seed profiles of players seen in earlier sessions
+        self.profile_store = profile_store
+        self.population_priors = get_population_priors()
         self.global_pool_stats = {
-            'avg_vpip': 0.22,  # Typical online poker stats
-            'avg_pfr': 0.18,
+            'avg_vpip': self.population_priors.mean('vpip', 0.22),  # Typical online poker stats
+            'avg_pfr': self.population_priors.mean('pfr', 0.18),
             'avg_aggression': 1.8
         }
     
     def get_or_create_profile(self, player_name: str) -> OpponentProfile:
         """Get existing profile or create new one."""
         if player_name not in self.profiles:
-            self.profiles[player_name] = OpponentProfile(player_name)
+            profile = OpponentProfile(player_name, create_decayed_stats(population_priors=self.population_priors))
+            if self.profile_store:
+                self._seed_from_store(profile)
+            self.profiles[player_name] = profile
         return self.profiles[player_name]
+
+    def _seed_from_store(self, profile: OpponentProfile):
+        """Seed VPIP/PFR and sample size from the basic tracker's stored counters."""
+        try:
+            stored = self.profile_store.load_profile(SOURCE_BASIC, profile.name)
+        except Exception as e:
+            logger.warning(f"Could not load stored profile for {profile.name}: {e}")
+            return
+        if not stored:
+            return
+        counters = stored.get('counters', {})
+        opportunities = counters.get('preflop_opportunities', 0)
+        if opportunities > 0:
+            profile.vpip = counters.get('vpip_hands', 0) / opportunities
+            profile.pfr = counters.get('pfr_hands', 0) / opportunities
+        profile.hands_observed = int(counters.get('hands_seen', 0))
     
     def update_opponent_profile(self, player_name: str, stats_data: Dict) -> None:
         """Update or create opponent profile with statistics from existing tracker."""
@@ -305,7 +347,7 @@ def integrate_with_existing_tracker(opponent_tracker, active_opponents_count: in
     """Integration function with existing opponent tracker."""
     try:
         # Initialize advanced analyzer
-        analyzer = AdvancedOpponentAnalyzer()
+        analyzer = AdvancedOpponentAnalyzer(getattr(opponent_tracker, 'profile_store', None))
         
         # Get opponent data from existing tracker
         if hasattr(opponent_tracker, 'tracked_opponents'):
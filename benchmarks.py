@@ -0,0 +1,419 @@
+# benchmarks.py
+"""
+Performance benchmark suite for the decision hot paths.
+
+Benchmarks (rates are operations per second):
+
+- hand_evaluator.calculate_best_hand     7-card hands evaluated
+- equity.monte_carlo.<street>            calculate_equity_monte_carlo trials, preflop/flop/turn/river
+- parser.parse_html                      PokerPageParser snapshots parsed, over examples/
+- decision.make_decision.scenarios       DecisionEngine decisions over the game states the
+                                         test_scenarios fixtures build
+- decision.make_decision.simulated       DecisionEngine decisions over seeded table_simulator states
+- decision.decide_batch.corpus           DecisionEngine.decide_batch sweeps over test_scenarios/corpus.jsonl
+- startup.import.<module>                fresh-interpreter imports of poker_bot / enhanced_poker_bot
+                                         (interpreter start included)
+
+Each benchmark gets a warm-up call, then `repeat` timed rounds of at least
+`min_time` seconds each. It records the best and median rate; the median is
+what comparisons use. Card deals and the `random` module are seeded, so rounds
+do the same work from run to run. A benchmark that cannot run here (for
+example, fixtures whose imports need a display) is recorded as skipped with
+the reason, and its baseline entry is left alone.
+
+Results are written as JSON. With --baseline, each benchmark's median is
+compared with the stored one, and a drop beyond --threshold is flagged as a
+regression (exit status 1).
+
+    python benchmarks.py -o benchmark_results.json
+    python benchmarks.py --baseline benchmark_results.json --threshold 0.15
+"""
+
+import argparse
+import contextlib
+import glob
+import importlib
+import inspect
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FORMAT = 'pokerbot-benchmarks'
+RESULTS_VERSION = 1
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_SEED = 1234
+EQUITY_TRIALS_PER_CALL = 200
+SIMULATED_STATES = 40
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+RANKS = '23456789TJQKA'
+SUITS = 'shdc'
+UNICODE_SUITS = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+BOARD_SIZES = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark factory when its inputs are unavailable in this environment."""
+
+
+def _deals(seed: int, count: int, cards: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    deck = [rank + suit for rank in RANKS for suit in SUITS]
+    return [rng.sample(deck, cards) for _ in range(count)]
+
+
+def _quiet_logger(name: str) -> logging.Logger:
+    quiet = logging.getLogger(name)
+    quiet.setLevel(logging.WARNING)
+    return quiet
+
+
+def _load_config():
+    from config import Config
+    return Config(os.path.join(ROOT, 'config.json'))
+
+
+# --- Benchmark factories: each returns run() -> operations done --------------------
+
+def bench_hand_evaluator(seed: int) -> Callable[[], int]:
+    from hand_evaluator import HandEvaluator
+    evaluator = HandEvaluator()
+    deals = _deals(seed, 200, 7)
+
+    def run():
+        for cards in deals:
+            evaluator.calculate_best_hand(cards[:2], cards[2:])
+        return len(deals)
+    return run
+
+
+def _bench_equity(street: str) -> Callable[[int], Callable[[], int]]:
+    def factory(seed: int) -> Callable[[], int]:
+        from equity_calculator import EquityCalculator
+        calculator = EquityCalculator()
+        deals = [[card[0].replace('T', '10') + UNICODE_SUITS[card[1]] for card in cards]
+                 for cards in _deals(seed, 10, 2 + BOARD_SIZES[street])]
+        position = [0]
+
+        def run():
+            cards = deals[position[0] % len(deals)]
+            position[0] += 1
+            random.seed(seed + position[0])
+            calculator.calculate_equity_monte_carlo([cards[:2]], cards[2:], None, EQUITY_TRIALS_PER_CALL)
+            return EQUITY_TRIALS_PER_CALL
+        return run
+    return factory
+
+
+def bench_parser(seed: int) -> Callable[[], int]:
+    from html_parser import PokerPageParser
+    paths = sorted(glob.glob(os.path.join(ROOT, 'examples', '**', '*.html'), recursive=True))
+    if not paths:
+        raise BenchmarkSkipped("no HTML snapshots under examples/")
+    snapshots = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            snapshots.append(f.read())
+    parser = PokerPageParser(_quiet_logger('benchmarks.parser'), _load_config())
+
+    def run():
+        for html in snapshots:
+            parser.parse_html(html)
+        return len(snapshots)
+    return run
+
+
+class _ScenarioRecorder:
+    """Stands in for the fixtures' bot.decision_engine: records each game state, then decides on the real engine."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.states: List[Tuple[Dict, int]] = []
+
+    def make_decision(self, game_state, player_index, budget=None):
+        self.states.append((_copy_state(game_state), player_index))
+        return self.engine.make_decision(game_state, player_index)
+
+    def __getattr__(self, name):
+        return getattr(self.engine, name)
+
+
+def _copy_state(game_state: Dict) -> Dict:
+    """Copy of a game state deep enough that make_decision's writes to player dicts don't leak."""
+    copied = dict(game_state)
+    copied['players'] = [dict(player) if isinstance(player, dict) else player for player in game_state['players']]
+    return copied
+
+
+def _decision_engine():
+    from decision_engine import DecisionEngine
+    from hand_evaluator import HandEvaluator
+    return DecisionEngine(HandEvaluator(), _load_config())
+
+
+def collect_scenario_states(directory: str = os.path.join(ROOT, 'test_scenarios')) -> List[Tuple[Dict, int]]:
+    """
+    Run every test_scenarios test method against a recording engine and return
+    the (game_state, player_index) pairs they decide on. Assertion outcomes are
+    ignored; only the states matter here.
+    """
+    from hand_evaluator import HandEvaluator
+    recorder = _ScenarioRecorder(_decision_engine())
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    package = os.path.basename(directory)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for path in sorted(glob.glob(os.path.join(directory, 'test_*.py'))):
+            module = importlib.import_module(f"{package}.{os.path.splitext(os.path.basename(path))[0]}")
+            for _, case_class in inspect.getmembers(module, inspect.isclass):
+                if not issubclass(case_class, unittest.TestCase) or case_class.__module__ != module.__name__:
+                    continue
+                for name in unittest.TestLoader().getTestCaseNames(case_class):
+                    case = case_class(name)
+                    case.config = {'big_blind': 0.02, 'small_blind': 0.01}
+                    case.hand_evaluator = HandEvaluator()
+                    case.bot = SimpleNamespace(decision_engine=recorder, config=case.config,
+                                               hand_evaluator=case.hand_evaluator, close_logger=lambda: None)
+                    try:
+                        getattr(case, name)()
+                    except Exception:
+                        pass
+    return recorder.states
+
+
+def _bench_decisions(states: List[Tuple[Dict, int]], seed: int) -> Callable[[], int]:
+    engine = _decision_engine()
+
+    def run():
+        random.seed(seed)
+        for state, index in states:
+            engine.make_decision(_copy_state(state), index)
+        return len(states)
+    return run
+
+
+def bench_scenario_decisions(seed: int) -> Callable[[], int]:
+    try:
+        states = collect_scenario_states()
+    except Exception as e:
+        raise BenchmarkSkipped(f"test_scenarios fixtures could not be loaded ({type(e).__name__}: {e})")
+    if not states:
+        raise BenchmarkSkipped("test_scenarios fixtures produced no game states")
+    return _bench_decisions(states, seed)
+
+
+def simulated_states(seed: int, count: int = SIMULATED_STATES) -> List[Tuple[Dict, int]]:
+    """Game states met by a seat of a seeded six-handed simulator table."""
+    from table_simulator import NLHETable, TightAggressiveAgent, CallingStationAgent, LooseAggressiveAgent
+
+    class _Recorder(TightAggressiveAgent):
+        def __init__(self):
+            self.states = []
+
+        def decide(self, game_state, player_index):
+            self.states.append((_copy_state(game_state), player_index))
+            return super().decide(game_state, player_index)
+
+    recorder = _Recorder()
+    field = [TightAggressiveAgent(), LooseAggressiveAgent(rng=random.Random(seed)), CallingStationAgent(),
+             TightAggressiveAgent(), LooseAggressiveAgent(rng=random.Random(seed + 1))]
+    table = NLHETable([recorder] + field, rng=random.Random(seed))
+    while len(recorder.states) < count:
+        table.play_hand()
+    return recorder.states[:count]
+
+
+def bench_simulated_decisions(seed: int) -> Callable[[], int]:
+    return _bench_decisions(simulated_states(seed), seed)
+
+
+def bench_corpus_sweep(seed: int) -> Callable[[], int]:
+    from scenario_corpus import DEFAULT_CORPUS_PATH, load_corpus
+    if not os.path.exists(DEFAULT_CORPUS_PATH):
+        raise BenchmarkSkipped(f"no scenario corpus at {DEFAULT_CORPUS_PATH}")
+    scenarios = load_corpus(DEFAULT_CORPUS_PATH)
+    engine = _decision_engine()
+
+    def run():
+        random.seed(seed)
+        engine.decide_batch(scenarios)
+        return len(scenarios)
+    return run
+
+
+def _bench_import(module: str) -> Callable[[int], Callable[[], int]]:
+    def factory(seed: int) -> Callable[[], int]:
+        command = [sys.executable, '-c', f"import {module}"]
+
+        def run():
+            completed = subprocess.run(command, cwd=ROOT, capture_output=True)
+            if completed.returncode != 0:
+                raise BenchmarkSkipped(f"import {module} failed: "
+                                       f"{completed.stderr.decode(errors='replace').strip().splitlines()[-1]}")
+            return 1
+        return run
+    return factory
+
+
+BENCHMARKS: Dict[str, Tuple[str, Callable[[int], Callable[[], int]]]] = {
+    'hand_evaluator.calculate_best_hand': ('hands/s', bench_hand_evaluator),
+    **{f'equity.monte_carlo.{street}': ('trials/s', _bench_equity(street)) for street in BOARD_SIZES},
+    'parser.parse_html': ('snapshots/s', bench_parser),
+    'decision.make_decision.scenarios': ('decisions/s', bench_scenario_decisions),
+    'decision.make_decision.simulated': ('decisions/s', bench_simulated_decisions),
+    'decision.decide_batch.corpus': ('spots/s', bench_corpus_sweep),
+    'startup.import.poker_bot': ('imports/s', _bench_import('poker_bot')),
+    'startup.import.enhanced_poker_bot': ('imports/s', _bench_import('enhanced_poker_bot')),
+}
+
+
+# --- Running and comparing ---------------------------------------------------------
+
+def measure(run: Callable[[], int], min_time: float = DEFAULT_MIN_TIME, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """Warm up once, then time `repeat` rounds of at least min_time seconds."""
+    run()
+    rates = []
+    operations = 0
+    for _ in range(max(1, repeat)):
+        done = 0
+        start = time.perf_counter()
+        while True:
+            done += run()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rates.append(done / elapsed)
+        operations += done
+    return {'rate': max(rates), 'median_rate': statistics.median(rates), 'rounds': len(rates),
+            'operations': operations}
+
+
+def run_benchmarks(names: Optional[List[str]] = None, min_time: float = DEFAULT_MIN_TIME,
+                   repeat: int = DEFAULT_REPEAT, seed: int = DEFAULT_SEED) -> Dict[str, Any]:
+    """Run the selected benchmarks (all by default) and return the results document."""
+    results = {}
+    for name, (unit, factory) in BENCHMARKS.items():
+        if names and not any(selected in name for selected in names):
+            continue
+        try:
+            run = factory(seed)
+            results[name] = {'unit': unit, **measure(run, min_time, repeat)}
+            logger.info(f"{name}: {results[name]['median_rate']:,.1f} {unit}")
+        except BenchmarkSkipped as e:
+            results[name] = {'unit': unit, 'skipped': str(e)}
+            logger.warning(f"{name} skipped: {e}")
+    return {
+        'format': RESULTS_FORMAT,
+        'version': RESULTS_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'min_time': min_time, 'repeat': repeat, 'seed': seed},
+        'benchmarks': results,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Per-benchmark comparison of median rates; status is regression, improvement, ok, new, skipped or missing."""
+    rows = []
+    current_benchmarks = current.get('benchmarks', {})
+    baseline_benchmarks = baseline.get('benchmarks', {})
+    for name in sorted(set(current_benchmarks) | set(baseline_benchmarks)):
+        now, before = current_benchmarks.get(name), baseline_benchmarks.get(name)
+        row = {'name': name, 'baseline': None, 'current': None, 'change': None}
+        if now is None:
+            row['status'] = 'missing'
+        elif 'skipped' in now:
+            row['status'] = 'skipped'
+        elif before is None or 'skipped' in before:
+            row['status'] = 'new'
+            row['current'] = now['median_rate']
+        else:
+            row['baseline'], row['current'] = before['median_rate'], now['median_rate']
+            row['change'] = (row['current'] - row['baseline']) / row['baseline'] if row['baseline'] else 0.0
+            if row['change'] < -threshold:
+                row['status'] = 'regression'
+            elif row['change'] > threshold:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def format_results(document: Dict) -> str:
+    lines = [f"{'benchmark':<36} {'median':>14} {'best':>14}  unit"]
+    for name, result in document['benchmarks'].items():
+        if 'skipped' in result:
+            lines.append(f"{name:<36} {'skipped':>14} {'':>14}  {result['skipped']}")
+        else:
+            lines.append(f"{name:<36} {result['median_rate']:>14,.1f} {result['rate']:>14,.1f}  {result['unit']}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<36} {'baseline':>14} {'current':>14} {'change':>8}  status"]
+    for row in rows:
+        baseline = f"{row['baseline']:,.1f}" if row['baseline'] is not None else '-'
+        current = f"{row['current']:,.1f}" if row['current'] is not None else '-'
+        change = f"{row['change']:+.1%}" if row['change'] is not None else '-'
+        lines.append(f"{row['name']:<36} {baseline:>14} {current:>14} {change:>8}  {row['status'].upper()}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the performance benchmark suite.")
+    parser.add_argument('-o', '--output', help="Write results JSON here")
+    parser.add_argument('--baseline', help="Compare against this stored results JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative drop in median rate counted as a regression (default 0.10)")
+    parser.add_argument('--only', action='append', help="Run benchmarks whose name contains this (repeatable)")
+    parser.add_argument('--min-time', type=float, default=DEFAULT_MIN_TIME)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--list', action='store_true', help="List benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (unit, _) in BENCHMARKS.items():
+            print(f"{name}  ({unit})")
+        return 0
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    document = run_benchmarks(args.only, args.min_time, args.repeat, args.seed)
+    print(format_results(document))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('platform') != document['platform'] or baseline.get('python') != document['python']:
+            print(f"Note: baseline was recorded on {baseline.get('platform')} / Python {baseline.get('python')}")
+        rows = compare_results(document, baseline, args.threshold)
+        print(format_comparison(rows))
+        regressions = [row['name'] for row in rows if row['status'] == 'regression']
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# board_features.py
+"""
+Shared board-feature service.
+
+Board texture used to be recomputed from raw card strings by every module that
+needed it (enhanced_board_analysis, EnhancedPokerBot._classify_board_texture and
+the postflop helpers). Texture only depends on ranks and the *pattern* of suits,
+so boards are mapped to a canonical suit-isomorphic id (22,100 flops collapse to
+1,755 ids) and the features are computed once per id and shared by everyone.
+"""
+
+import itertools
+import logging
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+RANK_VALUES = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+    'T': 10, '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14,
+}
+RANK_CHARS = {value: rank for rank, value in RANK_VALUES.items() if rank != '10'}
+
+# Parser output uses suit symbols; hand strings elsewhere use letters
+SUIT_ALIASES = {'♠': 's', '♥': 'h', '♦': 'd', '♣': 'c'}
+CANONICAL_SUITS = 'cdhs'
+
+# Labels matching advanced_decision_engine.BoardTexture values
+SIMPLE_TEXTURE_DRY = 'dry'
+SIMPLE_TEXTURE_WET = 'wet'
+SIMPLE_TEXTURE_COORDINATED = 'coordinated'
+SIMPLE_TEXTURE_RAINBOW = 'rainbow'
+
+
+def parse_card(card: str) -> Tuple[int, str]:
+    """Split a card string like 'Ah', '10♠' or 'Td' into (rank value, suit letter)."""
+    if not isinstance(card, str) or len(card.strip()) < 2:
+        raise ValueError(f"Invalid card: {card!r}")
+    card = card.strip()
+    rank, suit = card[:-1].upper(), card[-1]
+    suit = SUIT_ALIASES.get(suit, suit.lower())
+    if rank not in RANK_VALUES or suit not in CANONICAL_SUITS:
+        raise ValueError(f"Invalid card: {card!r}")
+    return RANK_VALUES[rank], suit
+
+
+def canonical_board(community_cards: Sequence[str]) -> str:
+    """
+    Canonical id of a board up to card order and suit relabelling.
+
+    Every relabelling of the board's suits onto 'cdhs' is tried (at most 24) and
+    the smallest rank-sorted encoding wins, so isomorphic boards share one id.
+    """
+    parsed = [parse_card(card) for card in community_cards]
+    suits = sorted({suit for _, suit in parsed})
+    best = None
+    for labels in itertools.permutations(CANONICAL_SUITS, len(suits)):
+        mapping = dict(zip(suits, labels))
+        encoded = tuple(sorted(((rank, mapping[suit]) for rank, suit in parsed), reverse=True))
+        if best is None or encoded < best:
+            best = encoded
+    return ''.join(RANK_CHARS[rank] + suit for rank, suit in (best or ()))
+
+
+def _classify_simple_texture(rank_values: List[int], suits: List[str]) -> str:
+    """Dry/wet/coordinated/rainbow label used by the advanced decision engine."""
+    if len(rank_values) < 3:
+        return SIMPLE_TEXTURE_DRY
+    max_suit_count = max(Counter(suits).values())
+    ordered = sorted(rank_values)
+    is_connected = len(ordered) >= 2 and (ordered[-1] - ordered[0]) <= 4
+    if max_suit_count >= 2 and is_connected:
+        return SIMPLE_TEXTURE_WET
+    if max_suit_count >= 3:
+        return SIMPLE_TEXTURE_WET
+    if is_connected:
+        return SIMPLE_TEXTURE_COORDINATED
+    if max_suit_count == 1:
+        return SIMPLE_TEXTURE_RAINBOW
+    return SIMPLE_TEXTURE_DRY
+
+
+@dataclass(frozen=True)
+class BoardFeatures:
+    """Texture features of one canonical board."""
+    board_id: str
+    num_cards: int
+    texture_type: str
+    wetness_score: int
+    simple_texture: str
+    has_flush_draw: bool
+    has_backdoor_flush_draw: bool
+    max_suit_count: int
+    distinct_suits: int
+    open_ended: bool
+    gutshot: bool
+    backdoor_straight: bool
+    has_pair: bool
+    is_connected: bool
+    high_card_count: int
+    betting_implications: Tuple[Tuple[str, str], ...]
+
+    @property
+    def straight_draws(self) -> Dict[str, bool]:
+        return {'open_ended': self.open_ended, 'gutshot': self.gutshot,
+                'backdoor_straight': self.backdoor_straight}
+
+    def to_analysis(self) -> Dict[str, Any]:
+        """Fresh dict in the EnhancedBoardAnalyzer.analyze_board format."""
+        return {
+            'texture_type': self.texture_type,
+            'wetness_score': self.wetness_score,
+            'flush_draws': self.has_flush_draw,
+            'has_flush_draw': self.has_flush_draw,
+            'straight_draws': self.straight_draws,
+            'pairs_on_board': self.has_pair,
+            'has_pair': self.has_pair,
+            'betting_implications': dict(self.betting_implications),
+            'num_cards': self.num_cards,
+        }
+
+
+def compute_board_features(board_id: str) -> BoardFeatures:
+    """Compute the features of a canonical board id (uncached)."""
+    from enhanced_board_analysis import BoardTexture
+
+    cards = [board_id[i:i + 2] for i in range(0, len(board_id), 2)]
+    texture = BoardTexture(cards)
+    suits = texture.suits
+    straight_draws = texture._analyze_straight_draws() if cards else {}
+    return BoardFeatures(
+        board_id=board_id,
+        num_cards=len(cards),
+        texture_type=texture.get_texture_type(),
+        wetness_score=texture._calculate_wetness_score() if cards else 0,
+        simple_texture=_classify_simple_texture(texture.rank_values, suits),
+        has_flush_draw=texture._has_flush_draw(),
+        has_backdoor_flush_draw=texture._has_backdoor_flush_draw(),
+        max_suit_count=max(Counter(suits).values()) if suits else 0,
+        distinct_suits=len(set(suits)),
+        open_ended=straight_draws.get('open_ended', False),
+        gutshot=straight_draws.get('gutshot', False),
+        backdoor_straight=straight_draws.get('backdoor_straight', False),
+        has_pair=texture._has_pair() if cards else False,
+        is_connected=texture._has_connected_ranks(),
+        high_card_count=sum(1 for rank in texture.rank_values if rank >= 10),
+        betting_implications=tuple(sorted(texture.get_betting_implications().items())) if cards else (),
+    )
+
+
+class BoardFeatureService:
+    """Two-level cache: raw board -> canonical id -> BoardFeatures."""
+
+    def __init__(self, max_raw_entries: int = 50000):
+        self.max_raw_entries = max_raw_entries
+        self._raw_to_id: "OrderedDict[Tuple[str, ...], str]" = OrderedDict()
+        self._features: Dict[str, BoardFeatures] = {}
+        self.stats = {'raw_hits': 0, 'canonical_hits': 0, 'computed': 0}
+
+    def get_features(self, community_cards: Sequence[str]) -> BoardFeatures:
+        """Features for a board; raises ValueError on unparseable cards."""
+        raw_key = tuple(sorted(community_cards))
+        board_id = self._raw_to_id.get(raw_key)
+        if board_id is not None:
+            self._raw_to_id.move_to_end(raw_key)
+            self.stats['raw_hits'] += 1
+            return self._features[board_id]
+
+        board_id = canonical_board(raw_key)
+        features = self._features.get(board_id)
+        if features is None:
+            features = compute_board_features(board_id)
+            self._features[board_id] = features
+            self.stats['computed'] += 1
+        else:
+            self.stats['canonical_hits'] += 1
+
+        self._raw_to_id[raw_key] = board_id
+        if len(self._raw_to_id) > self.max_raw_entries:
+            self._raw_to_id.popitem(last=False)
+        return features
+
+    def warm_flops(self) -> int:
+        """Precompute all 1,755 canonical flops; returns the number of ids cached."""
+        deck = [RANK_CHARS[rank] + suit for rank in range(2, 15) for suit in CANONICAL_SUITS]
+        for flop in itertools.combinations(deck, 3):
+            board_id = canonical_board(flop)
+            if board_id not in self._features:
+                self._features[board_id] = compute_board_features(board_id)
+                self.stats['computed'] += 1
+        return len(self._features)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'canonical_boards': len(self._features),
+                'raw_boards': len(self._raw_to_id)}
+
+    def clear(self):
+        self._raw_to_id.clear()
+        self._features.clear()
+
+
+# Create global instance
+board_feature_service = BoardFeatureService()
+
+
+def get_board_features(community_cards: Sequence[str]) -> BoardFeatures:
+    """Board features from the shared service."""
+    return board_feature_service.get_features(community_cards)
+
+
+def get_board_features_safe(community_cards: Optional[Sequence[str]]) -> Optional[BoardFeatures]:
+    """Like get_board_features, but None for missing or unparseable boards."""
+    if not community_cards:
+        return None
+    try:
+        return board_feature_service.get_features(community_cards)
+    except ValueError as e:
+        logger.debug(f"Board features unavailable: {e}")
+        return None
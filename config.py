@@ -64,6 +64,10 @@ class Config:
         """
         return self.settings.get(key, default)
 
+    def __getitem__(self, key):
+        """Allows dict-style access to settings (e.g., config['big_blind'])."""
+        return self.settings[key]
+
     def __getattr__(self, name):
         """
         Allows accessing settings as attributes (e.g., config.LOG_LEVEL).
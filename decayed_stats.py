@@ -0,0 +1,175 @@
+# decayed_stats.py
+"""
+Time-decayed, sample-size-aware opponent statistics.
+
+Opponent frequencies were either raw ratios behind a hard sample cutoff
+(OpponentProfile.classify_player_type waits for 20 hands) or fixed-rate
+exponential averages (AdvancedOpponentAnalyzer._update_frequency). A DecayedRate
+keeps four floats per stat instead:
+
+- exponentially decayed hit and opportunity weights, so old behaviour fades
+  with a configurable half-life (measured in opportunities of that stat);
+- the decayed sum of squared weights, giving the Kish effective sample size;
+- a population prior, which the estimate is shrunk towards in proportion to
+  how little data there is.
+
+Every update is O(1), and downstream code reads a confidence-weighted estimate
+plus its confidence instead of keeping raw history.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Typical online population frequencies (fractions), used until real priors are loaded
+POPULATION_PRIORS: Dict[str, float] = {
+    'vpip': 0.24,
+    'pfr': 0.17,
+    'aggression_frequency': 0.3,
+    'cbet': 0.6,
+    'fold_to_cbet': 0.45,
+    'turn_aggression': 0.4,
+    'river_aggression': 0.35,
+}
+DEFAULT_PRIOR = 0.5
+DEFAULT_PRIOR_STRENGTH = 10.0  # Pseudo-observations the prior is worth
+DEFAULT_HALF_LIFE = 200.0      # Opportunities after which an observation counts half
+
+
+class DecayedRate:
+    """Exponentially decayed hit rate with effective sample size and prior shrinkage."""
+
+    __slots__ = ('prior', 'prior_strength', 'decay', 'hits', 'weight', 'weight_sq')
+
+    def __init__(self, prior: float = DEFAULT_PRIOR, prior_strength: float = DEFAULT_PRIOR_STRENGTH,
+                 half_life: Optional[float] = DEFAULT_HALF_LIFE):
+        self.prior = prior
+        self.prior_strength = prior_strength
+        self.decay = 0.5 ** (1.0 / half_life) if half_life else 1.0
+        self.hits = 0.0
+        self.weight = 0.0
+        self.weight_sq = 0.0
+
+    def add_opportunity(self):
+        """Start a new observation: decay the history and count one opportunity."""
+        decay = self.decay
+        self.hits *= decay
+        self.weight = self.weight * decay + 1.0
+        self.weight_sq = self.weight_sq * decay * decay + 1.0
+
+    def add_hit(self):
+        """Mark the current opportunity as a hit (call at most once per opportunity)."""
+        self.hits += 1.0
+
+    def update(self, occurred: bool):
+        self.add_opportunity()
+        if occurred:
+            self.add_hit()
+
+    def seed(self, hits: float, opportunities: float):
+        """Add a block of stored observations at full weight (e.g. lifetime counters)."""
+        if opportunities <= 0:
+            return
+        self.hits += min(hits, opportunities)
+        self.weight += opportunities
+        self.weight_sq += opportunities
+
+    @property
+    def observed(self) -> Optional[float]:
+        """Decayed observed rate without shrinkage (None before any observation)."""
+        return self.hits / self.weight if self.weight > 0 else None
+
+    @property
+    def effective_sample_size(self) -> float:
+        return self.weight * self.weight / self.weight_sq if self.weight_sq > 0 else 0.0
+
+    @property
+    def estimate(self) -> float:
+        """Observed rate shrunk towards the prior by the prior's pseudo-observations."""
+        return (self.hits + self.prior * self.prior_strength) / (self.weight + self.prior_strength)
+
+    @property
+    def confidence(self) -> float:
+        """Share of the estimate that comes from observations (0..1)."""
+        ess = self.effective_sample_size
+        return ess / (ess + self.prior_strength) if self.prior_strength > 0 else 1.0
+
+    def to_tuple(self) -> Tuple[float, float, float]:
+        return (self.hits, self.weight, self.weight_sq)
+
+    def restore(self, values: Tuple[float, float, float]):
+        self.hits, self.weight, self.weight_sq = (float(value) for value in values)
+
+
+class DecayedStats:
+    """Named DecayedRates created on first use with the matching population prior."""
+
+    def __init__(self, priors: Optional[Dict[str, float]] = None,
+                 prior_strength: float = DEFAULT_PRIOR_STRENGTH,
+                 half_life: Optional[float] = DEFAULT_HALF_LIFE,
+                 prior_strengths: Optional[Dict[str, float]] = None):
+        self.priors = dict(POPULATION_PRIORS)
+        if priors:
+            self.priors.update(priors)
+        self.prior_strength = prior_strength
+        # Per-stat overrides, e.g. strengths estimated from the population's spread
+        self.prior_strengths = dict(prior_strengths or {})
+        self.half_life = half_life
+        self.rates: Dict[str, DecayedRate] = {}
+
+    def rate(self, name: str) -> DecayedRate:
+        rate = self.rates.get(name)
+        if rate is None:
+            rate = DecayedRate(self.priors.get(name, DEFAULT_PRIOR),
+                               self.prior_strengths.get(name, self.prior_strength), self.half_life)
+            self.rates[name] = rate
+        return rate
+
+    def set_priors(self, priors: Dict[str, float]):
+        """Replace population priors, including those of rates already in use."""
+        self.priors.update(priors)
+        for name, rate in self.rates.items():
+            if name in priors:
+                rate.prior = priors[name]
+
+    def update(self, name: str, occurred: bool):
+        self.rate(name).update(occurred)
+
+    def estimate(self, name: str) -> float:
+        return self.rate(name).estimate
+
+    def confidence(self, name: str) -> float:
+        return self.rate(name).confidence
+
+    def effective_sample_size(self, name: str) -> float:
+        rate = self.rates.get(name)
+        return rate.effective_sample_size if rate else 0.0
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """name -> estimate, confidence and effective sample size."""
+        return {
+            name: {
+                'estimate': rate.estimate,
+                'confidence': rate.confidence,
+                'effective_sample_size': rate.effective_sample_size,
+            }
+            for name, rate in self.rates.items()
+        }
+
+
+def create_decayed_stats(config: Optional[Dict] = None, population_priors=None) -> DecayedStats:
+    """
+    Factory function reading the optional 'decayed_stats' config section. Priors
+    from a population_priors.PopulationPriors lookup take precedence over the
+    built-in ones; priors set in the config take precedence over both.
+    """
+    settings = (config or {}).get('decayed_stats', {}) if isinstance(config, dict) else {}
+    priors, strengths = population_priors.decayed_stat_priors() if population_priors else ({}, {})
+    priors.update(settings.get('priors') or {})
+    return DecayedStats(
+        priors=priors,
+        prior_strength=settings.get('prior_strength', DEFAULT_PRIOR_STRENGTH),
+        half_life=settings.get('half_life', DEFAULT_HALF_LIFE),
+        prior_strengths=strengths,
+    )
@@ -0,0 +1,176 @@
+# decision_budget.py
+"""
+Per-decision latency budget with graceful degradation.
+
+A DecisionBudget is started when a decision cycle begins and handed down to the
+equity, analysis and decision stages. Each stage records what it cost, and
+expensive stages ask the budget how much work they can still afford: equity
+drops to fewer Monte Carlo trials, then to a cached result, and optional
+stages (opponent range narrowing, opponent profiles) are skipped when their
+usual cost, tracked across decisions by StageCostEstimates, no longer fits. A stage can be capped at a share of the
+budget (equity gets 60% by default) so it cannot crowd out the stages after
+it. The worst degradation applied is recorded so decisions made under time
+pressure can be identified afterwards.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEGRADATION_NONE = 0
+DEGRADATION_REDUCED_TRIALS = 1
+DEGRADATION_CACHED_EQUITY = 2
+DEGRADATION_SKIPPED_STAGES = 3
+
+DEGRADATION_LABELS = {
+    DEGRADATION_NONE: 'none',
+    DEGRADATION_REDUCED_TRIALS: 'reduced_trials',
+    DEGRADATION_CACHED_EQUITY: 'cached_equity',
+    DEGRADATION_SKIPPED_STAGES: 'skipped_stages',
+}
+
+DEFAULT_BUDGET_MS = 1500.0
+DEFAULT_RESERVE_MS = 150.0
+DEFAULT_MIN_EQUITY_TRIALS = 200
+DEFAULT_STAGE_SHARES = {'equity': 0.6}  # Largest fraction of budget_ms a stage may spend
+
+
+class DecisionBudget:
+    """Deadline, per-stage cost record and degradation level for one decision."""
+
+    def __init__(self, budget_ms: float = DEFAULT_BUDGET_MS, reserve_ms: float = DEFAULT_RESERVE_MS,
+                 min_equity_trials: int = DEFAULT_MIN_EQUITY_TRIALS,
+                 stage_shares: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.budget_ms = budget_ms
+        # Time kept back for the decision logic itself and acting on the result
+        self.reserve_ms = reserve_ms
+        self.min_equity_trials = min_equity_trials
+        self.stage_shares = dict(DEFAULT_STAGE_SHARES if stage_shares is None else stage_shares)
+        self._clock = clock
+        self.started_at = clock()
+        self.deadline = self.started_at + budget_ms / 1000.0
+
+        self.stage_costs: Dict[str, float] = {}
+        self.degradation_level = DEGRADATION_NONE
+        self.degradation_reasons: List[str] = []
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self.started_at) * 1000.0
+
+    def remaining_ms(self) -> float:
+        return max(0.0, (self.deadline - self._clock()) * 1000.0)
+
+    def available_ms(self) -> float:
+        """Time left for optional work once the reserve is set aside."""
+        return max(0.0, self.remaining_ms() - self.reserve_ms)
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self.available_ms() <= 0.0
+
+    def can_afford(self, estimated_ms: float) -> bool:
+        return self.available_ms() >= estimated_ms
+
+    def stage_allowance_ms(self, stage: str) -> float:
+        """Time `stage` may still spend: its unspent share, and never more than is available."""
+        available = self.available_ms()
+        share = self.stage_shares.get(stage)
+        if share is None:
+            return available
+        return max(0.0, min(available, self.budget_ms * share - self.stage_costs.get(stage, 0.0)))
+
+    def stage_deadline(self, stage: str) -> float:
+        """Clock time at which `stage`, starting now, has used up its allowance."""
+        return self._clock() + self.stage_allowance_ms(stage) / 1000.0
+
+    def past(self, deadline: float) -> bool:
+        return self._clock() >= deadline
+
+    def try_stage(self, stage: str, estimated_ms: float, reason: Optional[str] = None) -> bool:
+        """True if an optional stage fits in the available time; otherwise records it as skipped."""
+        if self.can_afford(estimated_ms):
+            return True
+        self.degrade(DEGRADATION_SKIPPED_STAGES, reason or f"{stage} skipped")
+        return False
+
+    def degrade(self, level: int, reason: str):
+        """Record a degradation; the budget keeps the most severe level."""
+        self.degradation_level = max(self.degradation_level, level)
+        self.degradation_reasons.append(reason)
+        logger.info(f"Decision budget degradation ({DEGRADATION_LABELS.get(level, level)}): {reason} "
+                    f"[{self.remaining_ms():.0f}ms left of {self.budget_ms:.0f}ms]")
+
+    def record_cost(self, stage: str, cost_ms: float):
+        self.stage_costs[stage] = self.stage_costs.get(stage, 0.0) + cost_ms
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a block and add it to the stage costs."""
+        start = self._clock()
+        try:
+            yield self
+        finally:
+            self.record_cost(name, (self._clock() - start) * 1000.0)
+
+    def plan_trials(self, requested: int, cost_per_trial_ms: float, stage: str = 'equity') -> int:
+        """
+        Number of Monte Carlo trials that fit in the stage's allowance.
+
+        Returns `requested` when it fits, fewer (recording the degradation) when
+        it does not, and 0 when not even min_equity_trials can be afforded.
+        """
+        if cost_per_trial_ms <= 0:
+            return requested
+        affordable = int(self.stage_allowance_ms(stage) / cost_per_trial_ms)
+        if affordable >= requested:
+            return requested
+        if affordable < min(self.min_equity_trials, requested):
+            return 0
+        self.degrade(DEGRADATION_REDUCED_TRIALS, f"equity trials cut from {requested} to {affordable}")
+        return affordable
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'budget_ms': self.budget_ms,
+            'elapsed_ms': self.elapsed_ms(),
+            'within_budget': self.elapsed_ms() <= self.budget_ms,
+            'degradation_level': self.degradation_level,
+            'degradation': DEGRADATION_LABELS.get(self.degradation_level, str(self.degradation_level)),
+            'degradation_reasons': list(self.degradation_reasons),
+            'stage_costs_ms': dict(self.stage_costs),
+        }
+
+
+class StageCostEstimates:
+    """Running cost of optional stages across decisions, weighted towards recent runs."""
+
+    def __init__(self, initial_ms: Optional[Dict[str, float]] = None, weight: float = 0.3):
+        self.weight = weight
+        self.estimates: Dict[str, float] = dict(initial_ms or {})
+
+    def get(self, stage: str) -> float:
+        return self.estimates.get(stage, 0.0)
+
+    def update(self, stage: str, cost_ms: float):
+        previous = self.estimates.get(stage)
+        self.estimates[stage] = cost_ms if previous is None else (1 - self.weight) * previous + self.weight * cost_ms
+
+
+def create_decision_budget(config: Optional[Dict] = None) -> Optional[DecisionBudget]:
+    """
+    Factory function to start a budget from the 'decision_budget' config section.
+    Returns None when the section disables budgeting ("enabled": false).
+    """
+    settings = (config or {}).get('decision_budget', {}) if isinstance(config, dict) else {}
+    if not settings.get('enabled', True):
+        return None
+    return DecisionBudget(
+        budget_ms=settings.get('budget_ms', DEFAULT_BUDGET_MS),
+        reserve_ms=settings.get('reserve_ms', DEFAULT_RESERVE_MS),
+        min_equity_trials=settings.get('min_equity_trials', DEFAULT_MIN_EQUITY_TRIALS),
+        stage_shares=settings.get('stage_shares'),
+    )
@@ -0,0 +1,121 @@
+# decision_core.py
+"""
+Headless decision core for tests, benchmarks and offline tools.
+
+PokerBot builds logging handlers, the HTML parser, trackers and (on first use)
+the UI controller around its DecisionEngine. Scenario tests only need the
+engine, so DecisionCore provides the same decision surface (config,
+hand_evaluator, decision_engine, close_logger) without the rest. It is built
+once per process and shared.
+
+Decisions are deterministic. Each make_decision call reseeds the `random`
+module, which the preflop/postflop strategy code draws from. A missing win
+probability is simulated once per spot (hole cards, board, opponent count) by
+the regular EquityCalculator, from a seed derived from the spot, and then
+memoised. Results therefore do not depend on test order, process, or how many
+workers run the suite.
+"""
+
+import logging
+import os
+import random
+import zlib
+from typing import Dict, Optional, Tuple
+
+from config import Config
+from decision_engine import DecisionEngine
+from equity_calculator import EquityCalculator
+from hand_evaluator import HandEvaluator
+from opponent_tracking import OpponentTracker
+from table_control_strategies import TableControlManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 20240601
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+
+def _spot_seed(seed: int, key: Tuple) -> int:
+    return zlib.crc32(repr((seed, key)).encode('utf-8'))
+
+
+class SeededEquityCalculator(EquityCalculator):
+    """EquityCalculator with reproducible, memoised win probabilities."""
+
+    def __init__(self, seed: int = DEFAULT_SEED):
+        super().__init__()
+        self.seed = seed
+        self._win_probabilities: Dict[Tuple, float] = {}
+
+    def calculate_win_probability(self, hole_cards, community_cards, num_opponents=1, budget=None):
+        """Simulate each spot once from its own seed; the caller's random state is left untouched."""
+        key = (tuple(str(card) for card in hole_cards or ()),
+               tuple(str(card) for card in community_cards or ()), num_opponents)
+        if key not in self._win_probabilities:
+            state = random.getstate()
+            random.seed(_spot_seed(self.seed, key))
+            try:
+                self._win_probabilities[key] = super().calculate_win_probability(
+                    hole_cards, community_cards, num_opponents)
+            finally:
+                random.setstate(state)
+        return self._win_probabilities[key]
+
+    def clear(self):
+        """Forget the memoised win probabilities (long replays clear them per file to bound memory)."""
+        self._win_probabilities.clear()
+
+
+class SeededDecisionEngine(DecisionEngine):
+    """DecisionEngine that reseeds `random` before every decision."""
+
+    def __init__(self, hand_evaluator, config=None, seed: int = DEFAULT_SEED):
+        super().__init__(hand_evaluator, config)
+        self.seed = seed
+        self.equity_calculator = SeededEquityCalculator(seed)
+
+    def make_decision(self, game_state, player_index, budget=None):
+        random.seed(self.seed)
+        return super().make_decision(game_state, player_index, budget)
+
+    def reset(self):
+        """Forget per-session state (opponent reads, table image) so each scenario starts fresh."""
+        self.opponent_tracker = OpponentTracker()
+        self.table_control_manager = TableControlManager(self.config)
+        self.last_postflop_context = None
+        self.last_decision_budget = None
+
+
+class DecisionCore:
+    """The decision surface of PokerBot, without logging handlers, parser, trackers or UI."""
+
+    def __init__(self, settings: Optional[Dict] = None, config_path: str = DEFAULT_CONFIG_PATH,
+                 seed: int = DEFAULT_SEED):
+        self.config = Config(config_path)
+        # Top-level overrides on top of the config file (e.g. blind sizes)
+        self.config.settings.update(settings or {})
+        self.hand_evaluator = HandEvaluator()
+        self.decision_engine = SeededDecisionEngine(self.hand_evaluator, self.config, seed)
+
+    def reset(self):
+        self.decision_engine.reset()
+
+    def close_logger(self):
+        """Nothing to close; kept so PokerBot-style teardown code works unchanged."""
+
+
+_cores: Dict[Tuple, DecisionCore] = {}
+
+
+def get_decision_core(settings: Optional[Dict] = None, seed: int = DEFAULT_SEED,
+                      config_path: str = DEFAULT_CONFIG_PATH) -> DecisionCore:
+    """
+    Shared DecisionCore for these settings, built on the first call in this
+    process. Every call returns it reset, so callers start from a fresh session.
+    """
+    key = (repr(sorted((settings or {}).items())), seed, config_path)
+    core = _cores.get(key)
+    if core is None:
+        core = _cores[key] = DecisionCore(settings, config_path, seed)
+    core.reset()
+    return core
@@ -7,9 +7,9 @@ from opponent_tracking import OpponentTracker
 from tournament_adjustments import get_tournament_adjustment_factor, adjust_preflop_range_for_tournament, adjust_bet_size_for_tournament
 from hand_utils import get_hand_strength_value, calculate_stack_to_pot_ratio, get_preflop_hand_category, normalize_card_list
 from preflop_decision_logic import make_preflop_decision
-from postflop_decision_logic import make_postflop_decision
 from table_control_strategies import TableControlManager, get_enhanced_aggression_factor
 import logging
+import time
 
 ACTION_FOLD = "fold"
 ACTION_CHECK = "check"
@@ -18,6 +18,13 @@ ACTION_RAISE = "raise"
 
 logger = logging.getLogger(__name__)
 
+# Loggers on the decision path that DecisionEngine.decide_batch(quiet=True) raises to WARNING
+DECISION_LOGGERS = (
+    'decision_engine', 'preflop_decision_logic', 'postflop_decision_logic', 'postflop',
+    'enhanced_hand_classification', 'enhanced_spr_strategy', 'enhanced_board_analysis', 'hand_utils',
+    'opponent_tracking', 'table_control_strategies',
+)
+
 
 def parse_monetary_value(value_str_or_float):
     if isinstance(value_str_or_float, (int, float)):
@@ -31,6 +38,12 @@ def parse_monetary_value(value_str_or_float):
         logger.error(f"Could not convert monetary value '{value_str_or_float}' to float. Defaulting to 0.0.")
         return 0.0
 
+def count_active_opponents(all_players):
+    """Active opponents for equity, at least 1."""
+    num_opponents = len([p for p in all_players if p and p.get('is_active', False) and not p.get('is_my_player', False)])
+    return num_opponents or 1  # Default to 1 opponent if none found
+
+
 class DecisionEngine:    
     def __init__(self, hand_evaluator, config=None): 
         self.hand_evaluator = hand_evaluator
@@ -55,6 +68,11 @@ class DecisionEngine:
         # Initialize opponent tracking system
         self.opponent_tracker = OpponentTracker()
         
+        # Feature memo of the most recent postflop decision (see postflop/decision_context.py)
+        self.last_postflop_context = None
+        # Latency budget of the most recent decision (see decision_budget.py)
+        self.last_decision_budget = None
+        
         # Tournament settings (default to cash game)
         self.tournament_level = self.config.get_setting('tournament_level', 0)  # 0 = cash game, 1-3 = tournament levels
 
@@ -102,7 +120,13 @@ class DecisionEngine:
         bet_to_call = max(0.0, bet_to_call)        # logger.debug(f"_calculate_bet_to_call: my_player_bet={my_player.get('current_bet', 0.0)}, max_bet_on_table={max_bet_on_table}, initial_parsed_b2c={parsed_bet_to_call_str}, final_b2c={bet_to_call}")
         return bet_to_call, max_bet_on_table
 
-    def make_decision(self, game_state, player_index):
+    def make_decision(self, game_state, player_index, budget=None):
+        """
+        Decide (action, amount) for players[player_index].
+        budget is an optional DecisionBudget; when given, equity is sized to the
+        time left and each stage's cost and any degradation are recorded on it.
+        """
+        self.last_decision_budget = budget
         # Extract player and game state information
         my_player = game_state['players'][player_index]
 
@@ -168,15 +192,14 @@ class DecisionEngine:
             logger.info(f"win_probability not found for player {player_index}, calculating using equity calculator.")
             try:
                 # Calculate number of active opponents
-                num_opponents = len([p for p in all_players if p and p.get('is_active', False) and not p.get('is_my_player', False)])
-                if num_opponents == 0:
-                    num_opponents = 1  # Default to 1 opponent if none found
+                num_opponents = count_active_opponents(all_players)
                 
                 # Use equity calculator to compute win probability
                 win_probability = self.equity_calculator.calculate_win_probability(
                     my_player['hand'], 
                     community_cards, 
-                    num_opponents
+                    num_opponents,
+                    budget=budget
                 )
                 logger.info(f"Calculated win probability using equity calculator: {win_probability:.3f} ({win_probability*100:.1f}%) vs {num_opponents} opponents")
             except Exception as e:
@@ -251,6 +274,7 @@ class DecisionEngine:
         logger.info(f"  abs(final_bet_to_call) < 1e-10 = {abs(final_bet_to_call) < 1e-10}")
         logger.info(f"  can_check = {can_check}")
         active_opponents_count = sum(1 for i, p in enumerate(all_players) if p and p.get('is_active', False) and i != player_index)
+        strategy_start = time.perf_counter()
         if current_round == 'preflop':
             logger.debug(f"  DEBUG ENGINE: PRE-CALL to make_preflop_decision: final_bet_to_call={final_bet_to_call}, max_bet_on_table={max_bet_on_table}")
             
@@ -320,6 +344,9 @@ class DecisionEngine:
             
             logger.debug(f"  DEBUG ENGINE: PRE-CALL to make_postflop_decision: final_bet_to_call={final_bet_to_call}, max_bet_on_table={max_bet_on_table}")
             
+            self.last_postflop_context = None
+            # The postflop strategy modules load on the first postflop decision
+            from postflop_decision_logic import make_postflop_decision
             action, amount = make_postflop_decision(
                 decision_engine_instance=self,
                 numerical_hand_rank=numerical_hand_rank,
@@ -346,7 +373,14 @@ class DecisionEngine:
                 opponent_tracker=self.opponent_tracker,  # Pass opponent tracking data
                 action_history=action_history # Pass action_history
             )
+            if self.last_postflop_context is not None:
+                logger.debug(f"Postflop features used: {self.last_postflop_context.get_usage_report()}")
         
+        if budget is not None:
+            budget.record_cost(f'{current_round}_strategy', (time.perf_counter() - strategy_start) * 1000.0)
+            if budget.degradation_level:
+                logger.info(f"Decision made under budget pressure: {budget.summary()}")
+
         # Ensure amount is a float before returning
         if isinstance(amount, (str)):
             try:
@@ -374,6 +408,53 @@ class DecisionEngine:
 
         return action, round(amount, 2)
 
+    def decide_batch(self, scenarios, quiet=True):
+        """
+        Decide a batch of spots and return their (action, amount) pairs in order.
+        Each item is a (game_state, player_index) pair or has to_game_state()
+        (see scenario_corpus.Scenario); the given game states are not modified.
+        Setup is shared across the batch: win probabilities missing from the
+        states are computed once per distinct spot (hand, board, opponents)
+        up front, and with quiet, the DECISION_LOGGERS drop records below
+        WARNING for the whole batch instead of formatting them per decision.
+        Other loggers (and other threads' logging) are left alone.
+        """
+        spots = []
+        for item in scenarios:
+            game_state, player_index = item.to_game_state() if hasattr(item, 'to_game_state') else item
+            game_state = dict(game_state, players=[dict(p) if p else p for p in game_state['players']])
+            spots.append((game_state, player_index))
+
+        previous_levels = {}
+        if quiet:
+            import postflop_decision_logic  # noqa: F401 - sets its logger level on import; load it before saving levels
+            for name in DECISION_LOGGERS:
+                decision_logger = logging.getLogger(name)
+                if decision_logger.getEffectiveLevel() < logging.WARNING:
+                    previous_levels[name] = decision_logger.level
+                    decision_logger.setLevel(logging.WARNING)
+        try:
+            win_probabilities = {}
+            for game_state, player_index in spots:
+                my_player = game_state['players'][player_index]
+                if not my_player.get('has_turn') or my_player.get('win_probability') is not None:
+                    continue
+                key = (tuple(my_player.get('hand') or ()), tuple(game_state.get('community_cards') or ()),
+                       count_active_opponents(game_state['players']))
+                if key not in win_probabilities:
+                    try:
+                        win_probabilities[key] = self.equity_calculator.calculate_win_probability(
+                            list(key[0]), list(key[1]), key[2])
+                    except Exception as e:
+                        logger.error(f"Error calculating win probability for batch spot {key}: {e}")
+                        win_probabilities[key] = None  # make_decision falls back as usual
+                if win_probabilities[key] is not None:
+                    my_player['win_probability'] = win_probabilities[key]
+            return [self.make_decision(game_state, player_index) for game_state, player_index in spots]
+        finally:
+            for name, level in previous_levels.items():
+                logging.getLogger(name).setLevel(level)
+
     def update_opponents_from_game_state(self, game_state, player_index):
         """Update opponent tracking based on current game state and recent actions."""
         try:
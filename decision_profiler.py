@@ -0,0 +1,205 @@
+# decision_profiler.py
+"""
+Sampling profiler for decision cycles with flame-graph (folded stack) output.
+
+Running a whole session under cProfile distorts timings and produces far more
+data than is needed to explain the occasional slow decision. The
+DecisionProfiler keeps one daemon thread that, while a decision cycle is in
+progress, periodically reads the deciding thread's stack through
+sys._current_frames(). Only frames below the point where the cycle began are
+recorded, so the stacks cover DecisionEngine.make_decision, the postflop logic
+and EquityCalculator without the main-loop noise above them.
+
+A cycle's samples are kept when the cycle was picked for sampling (a
+configurable fraction) or when it ran longer than the slow threshold; other
+cycles' samples are discarded. Kept samples are merged per session and written
+in the folded format understood by flamegraph.pl and speedscope:
+
+    decision_cycle;poker_bot.PokerBot.analyze;equity_calculator.EquityCalculator.calculate_equity_monte_carlo 42
+"""
+
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_FRACTION = 0.05
+DEFAULT_SLOW_THRESHOLD_MS = 1000.0
+DEFAULT_INTERVAL_MS = 5.0
+DEFAULT_OUTPUT_DIR = 'logs'
+MAX_STACK_DEPTH = 128
+
+REASON_SAMPLED = 'sampled'
+REASON_SLOW = 'slow'
+
+
+class DecisionProfiler:
+    """Samples the stacks of selected decision cycles and aggregates them as folded stacks."""
+
+    def __init__(self, sample_fraction: float = DEFAULT_SAMPLE_FRACTION,
+                 slow_threshold_ms: Optional[float] = DEFAULT_SLOW_THRESHOLD_MS,
+                 interval_ms: float = DEFAULT_INTERVAL_MS, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 rng: Optional[random.Random] = None):
+        self.sample_fraction = sample_fraction
+        self.slow_threshold_ms = slow_threshold_ms
+        self.interval = interval_ms / 1000.0
+        self.output_dir = output_dir
+        self._rng = rng or random.Random()
+
+        self.folded: Counter = Counter()        # Folded stack -> samples, over kept cycles
+        self.kept_cycles: List[Dict] = []       # label, elapsed_ms, reason, samples
+        self.stats = {'cycles': 0, 'kept': 0, 'samples': 0, 'discarded_samples': 0}
+
+        # (thread id, anchor frame, root label, sample buffer) of the cycle being sampled
+        self._target: Optional[Tuple[int, object, str, Counter]] = None
+        self._cycle_start = 0.0
+        self._cycle_sampled = False
+        self._labels: Dict[object, str] = {}
+        self._armed = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Cycle control (called on the deciding thread) --------------------------
+
+    def begin_cycle(self, label: str = 'decision_cycle'):
+        """
+        Start a decision cycle. Frames from the caller downwards are sampled while
+        the cycle is open; a cycle left open is ended first.
+        """
+        if self._target is not None:
+            self.end_cycle()
+        self._cycle_sampled = self._rng.random() < self.sample_fraction
+        if not self._cycle_sampled and self.slow_threshold_ms is None:
+            return  # Nothing could make this cycle worth keeping
+        self._ensure_thread()
+        anchor = sys._getframe(1)
+        self._target = (threading.get_ident(), anchor, label, Counter())
+        self._cycle_start = time.perf_counter()
+        self._armed.set()
+
+    def end_cycle(self) -> Optional[str]:
+        """Close the current cycle; returns the reason it was kept, or None."""
+        target = self._target
+        if target is None:
+            return None
+        self._armed.clear()
+        self._target = None
+        elapsed_ms = (time.perf_counter() - self._cycle_start) * 1000.0
+        self.stats['cycles'] += 1
+        samples = target[3]
+        sample_count = sum(samples.values())
+
+        if self._cycle_sampled:
+            reason = REASON_SAMPLED
+        elif self.slow_threshold_ms is not None and elapsed_ms >= self.slow_threshold_ms:
+            reason = REASON_SLOW
+        else:
+            self.stats['discarded_samples'] += sample_count
+            return None
+        self.folded.update(samples)
+        self.stats['kept'] += 1
+        self.stats['samples'] += sample_count
+        self.kept_cycles.append({'label': target[2], 'elapsed_ms': elapsed_ms, 'reason': reason,
+                                 'samples': sample_count})
+        if reason == REASON_SLOW:
+            logger.info(f"Slow decision cycle profiled: {elapsed_ms:.0f}ms, {sample_count} samples")
+        return reason
+
+    # --- Sampler thread ---------------------------------------------------------------
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name='decision-profiler', daemon=True)
+            self._thread.start()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            label = self._labels[code] = f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+        return label
+
+    def _run(self):
+        while not self._stopped:
+            self._armed.wait()
+            if self._stopped:
+                break
+            time.sleep(self.interval)
+            target = self._target
+            if target is None:
+                continue
+            thread_id, anchor, root, samples = target
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None and frame is not anchor and len(stack) < MAX_STACK_DEPTH:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if frame is not anchor:
+                continue  # Cycle ended between reading the target and the stack
+            stack.append(root)
+            stack.reverse()
+            samples[';'.join(stack)] += 1
+
+    def close(self):
+        """Stop the sampler thread (the aggregated stacks are kept)."""
+        self._target = None
+        self._stopped = True
+        self._armed.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # --- Output ---------------------------------------------------------------
+
+    def folded_lines(self) -> List[str]:
+        return [f"{stack} {count}" for stack, count in sorted(self.folded.items())]
+
+    def top_frames(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Leaf frames with the most samples (where the time was actually spent)."""
+        leaves: Counter = Counter()
+        for stack, samples in self.folded.items():
+            leaves[stack.rsplit(';', 1)[-1]] += samples
+        return leaves.most_common(count)
+
+    def write(self, session_id: Optional[str] = None, path: Optional[str] = None) -> Optional[str]:
+        """Write decision_profile_<session>.folded; returns the path, or None without samples."""
+        if not self.folded:
+            return None
+        session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = path or os.path.join(self.output_dir, f"decision_profile_{session_id}.folded")
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(self.folded_lines()) + '\n')
+        except OSError as e:
+            logger.error(f"Failed to write decision profile to {path}: {e}")
+            return None
+        logger.info(f"Decision profile ({self.stats['kept']} cycles, {self.stats['samples']} samples) "
+                    f"written to {path}")
+        return path
+
+
+def create_decision_profiler(config: Optional[Dict] = None) -> Optional[DecisionProfiler]:
+    """
+    Factory function reading the optional 'decision_profiler' config section.
+    Profiling is off unless the section sets "enabled": true.
+    """
+    settings = (config or {}).get('decision_profiler', {}) if isinstance(config, dict) else {}
+    if not settings.get('enabled', False):
+        return None
+    return DecisionProfiler(
+        sample_fraction=settings.get('sample_fraction', DEFAULT_SAMPLE_FRACTION),
+        slow_threshold_ms=settings.get('slow_threshold_ms', DEFAULT_SLOW_THRESHOLD_MS),
+        interval_ms=settings.get('interval_ms', DEFAULT_INTERVAL_MS),
+        output_dir=settings.get('output_dir', DEFAULT_OUTPUT_DIR),
+    )
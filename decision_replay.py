@@ -0,0 +1,361 @@
+# decision_replay.py
+"""
+Replay archived GameLogger decision logs through the current decision stack.
+
+GameLogger writes one row per decision to decisions_<session>.csv: hole and
+community cards, street, pot, stack, bet to call, win probability, opponent
+count and the action taken. This tool rebuilds each row as a scenario_corpus
+Scenario and re-decides it with DecisionEngine.decide_batch on the seeded
+headless core (decision_core.py). Then it reports where the current stack
+would act differently.
+
+The log does not keep positions, opponents' stacks or the action history. So
+the rebuilt spot gives every opponent the hero's stack, has the first opponent
+hold the bet to call, and has no history. A changed decision is therefore a
+lead to look at, not proof. Rows that logged no win probability get seeded
+equity.
+
+The EV impact of a change is ev_utils.calculate_expected_value for the
+replayed action minus that for the logged action. Both use the same spot and
+win probability, so the two estimates are comparable. The logged ev_* columns
+are not used, because they come from whatever model was live when the row was
+written.
+
+Memory stays bounded however much is replayed. Files are read row by row, and
+decided in batches of --batch-size. Only counters and the --top largest EV
+changes are kept, and changed rows go straight to --changes-dir. Files are
+spread over a process pool.
+
+    python decision_replay.py logs/ -w 4
+    python decision_replay.py 'archive/2024-0*/decisions_*.csv.gz' --changes-dir replay_changes --top 50
+"""
+
+import argparse
+import ast
+import csv
+import glob
+import gzip
+import heapq
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from decision_engine import count_active_opponents
+from ev_utils import calculate_expected_value
+from scenario_corpus import STREET_NAMES, Scenario
+
+logger = logging.getLogger(__name__)
+
+DECISION_FILE_PREFIX = 'decisions_'
+DECISION_FILE_SUFFIXES = ('.csv', '.csv.gz')
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_TOP = 20
+BOARD_STREETS = {0: 'preflop', 3: 'flop', 4: 'turn', 5: 'river'}
+ACTION_ALIASES = {'bet': 'raise', 'all_in': 'raise', 'all-in': 'raise', 'allin': 'raise'}
+CHANGE_COLUMNS = (
+    'source', 'line', 'hand_id', 'street', 'hole_cards', 'community_cards', 'pot_size', 'bet_to_call',
+    'win_probability', 'logged_action', 'logged_amount', 'replayed_action', 'replayed_amount', 'ev_delta'
+)
+
+
+def iter_decision_files(sources: List[str]) -> Iterator[str]:
+    """GameLogger decision CSVs (optionally gzipped) in the given directories, files or globs, sorted."""
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for file_name in sorted(files):
+                    if file_name.startswith(DECISION_FILE_PREFIX) and file_name.endswith(DECISION_FILE_SUFFIXES):
+                        yield os.path.join(root, file_name)
+            continue
+        paths = sorted(glob.glob(source))
+        if not paths:
+            logger.warning(f"No decision logs match {source}")
+        yield from paths
+
+
+def _open_text(path: str):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', newline='', encoding='utf-8')
+    return open(path, 'r', newline='', encoding='utf-8')
+
+
+def _parse_cards(text: Optional[str]) -> List[str]:
+    """Cards as GameLogger writes them: str() of a list, e.g. "['A♠', 'K♦']"."""
+    text = (text or '').strip()
+    if not text:
+        return []
+    if text.startswith('['):
+        try:
+            return [str(card) for card in ast.literal_eval(text)]
+        except (ValueError, SyntaxError):
+            return []
+    return text.replace(',', ' ').split()
+
+
+def _float(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def normalize_action(action: Optional[str]) -> str:
+    action = (action or '').strip().lower()
+    return ACTION_ALIASES.get(action, action)
+
+
+def reconstruct_spot(row: Dict[str, str], scenario_id: str, big_blind: float) -> Optional[Scenario]:
+    """The decision context of one decisions CSV row, or None if the row has no usable hand."""
+    hole_cards = _parse_cards(row.get('hole_cards'))
+    if len(hole_cards) != 2:
+        return None
+    board = _parse_cards(row.get('community_cards'))
+    stage = (row.get('game_stage') or '').strip().lower()
+    street = STREET_NAMES.get(stage) or BOARD_STREETS.get(len(board))
+    if street is None:
+        return None
+    stack = _float(row.get('stack_size'))
+    bet_to_call = _float(row.get('bet_to_call'))
+    win_probability = _float(row.get('win_probability'))
+    opponents = max(1, int(_float(row.get('opponent_count'))))
+    players = [{'name': 'Hero', 'pos': '', 'stack': stack, 'bet': 0.0, 'cards': hole_cards, 'to_call': bet_to_call}]
+    players.extend({'name': f'Opponent{seat}', 'pos': '', 'stack': stack, 'bet': bet_to_call if seat == 1 else 0.0}
+                   for seat in range(1, opponents + 1))
+    logged_action = normalize_action(row.get('action_taken') or row.get('action'))
+    return Scenario(id=scenario_id, street=street, board=board, pot=_float(row.get('pot_size')), players=players,
+                    small_blind=big_blind / 2, big_blind=big_blind,
+                    win_probability=win_probability if win_probability > 0 else None,
+                    expected=[logged_action] if logged_action else [])
+
+
+def estimate_ev(action: str, amount: float, scenario: Scenario) -> float:
+    """EV of an action in this spot by the ev_utils model."""
+    return calculate_expected_value(action, amount, scenario.pot, scenario.win_probability or 0.0,
+                                    'fold', 'check', 'call', 'raise', scenario.players[scenario.hero]['to_call'])
+
+
+class ReplaySummary:
+    """Counters for a replay plus the largest EV changes; small enough to ship between processes."""
+
+    def __init__(self, top: int = DEFAULT_TOP):
+        self.top = top
+        self.files = 0
+        self.rows = 0
+        self.replayed = 0
+        self.skipped = 0
+        self.errors = 0
+        self.changed = 0
+        self.resized = 0
+        self.ev_delta = 0.0
+        self.transitions: Dict[str, int] = {}
+        self.streets: Dict[str, Dict[str, float]] = {}
+        self._largest: List[Tuple[float, str, Dict[str, Any]]] = []
+
+    def add_decision(self, street: str, change: Optional[Dict[str, Any]]):
+        self.replayed += 1
+        stats = self.streets.setdefault(street, {'replayed': 0, 'changed': 0, 'ev_delta': 0.0})
+        stats['replayed'] += 1
+        if change is None:
+            return
+        if change['logged_action'] == change['replayed_action']:
+            self.resized += 1
+        else:
+            self.changed += 1
+            stats['changed'] += 1
+            transition = f"{change['logged_action'] or '?'}->{change['replayed_action']}"
+            self.transitions[transition] = self.transitions.get(transition, 0) + 1
+        self.ev_delta += change['ev_delta']
+        stats['ev_delta'] += change['ev_delta']
+        self._keep((abs(change['ev_delta']), f"{change['source']}:{change['line']}", change))
+
+    def _keep(self, item: Tuple[float, str, Dict[str, Any]]):
+        if len(self._largest) < self.top:
+            heapq.heappush(self._largest, item)
+        elif item[:2] > self._largest[0][:2]:
+            heapq.heapreplace(self._largest, item)
+
+    def merge(self, other: 'ReplaySummary'):
+        for name in ('files', 'rows', 'replayed', 'skipped', 'errors', 'changed', 'resized', 'ev_delta'):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for transition, count in other.transitions.items():
+            self.transitions[transition] = self.transitions.get(transition, 0) + count
+        for street, stats in other.streets.items():
+            mine = self.streets.setdefault(street, {'replayed': 0, 'changed': 0, 'ev_delta': 0.0})
+            for key, value in stats.items():
+                mine[key] += value
+        for item in other._largest:
+            self._keep(item)
+
+    def largest_changes(self) -> List[Dict[str, Any]]:
+        return [change for _, _, change in sorted(self._largest, key=lambda item: item[:2], reverse=True)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'files': self.files, 'rows': self.rows, 'replayed': self.replayed, 'skipped': self.skipped,
+            'errors': self.errors, 'changed': self.changed, 'resized': self.resized,
+            'ev_delta': round(self.ev_delta, 6),
+            'transitions': dict(sorted(self.transitions.items(), key=lambda item: -item[1])),
+            'streets': {street: dict(stats, ev_delta=round(stats['ev_delta'], 6))
+                        for street, stats in sorted(self.streets.items())},
+            'largest_changes': self.largest_changes(),
+        }
+
+
+def _init_worker(log_level: int):
+    logging.disable(log_level)
+
+
+def _replay_batch(engine, batch: List[Tuple[int, Dict[str, str], Scenario]], source: str,
+                  summary: ReplaySummary, changes_writer):
+    for _, _, scenario in batch:
+        if scenario.win_probability is None:
+            game_state, index = scenario.to_game_state()
+            scenario.win_probability = engine.equity_calculator.calculate_win_probability(
+                game_state['players'][index]['hand'], scenario.board, count_active_opponents(game_state['players']))
+    try:
+        decisions = engine.decide_batch([scenario for _, _, scenario in batch])
+    except Exception as e:
+        logger.warning(f"Replay of {len(batch)} decisions from {source} failed: {e}")
+        summary.errors += len(batch)
+        return
+    for (line, row, scenario), (action, amount) in zip(batch, decisions):
+        logged_action = scenario.expected[0] if scenario.expected else ''
+        logged_amount = round(_float(row.get('amount')), 2)
+        action = normalize_action(action)
+        amount = round(amount or 0.0, 2)
+        change = None
+        if action != logged_action or (action == 'raise' and amount != logged_amount):
+            change = {
+                'source': source, 'line': line, 'hand_id': row.get('hand_id', ''), 'street': scenario.street,
+                'hole_cards': ' '.join(scenario.players[scenario.hero]['cards']),
+                'community_cards': ' '.join(scenario.board), 'pot_size': scenario.pot,
+                'bet_to_call': scenario.players[scenario.hero]['to_call'],
+                'win_probability': round(scenario.win_probability, 4),
+                'logged_action': logged_action, 'logged_amount': logged_amount,
+                'replayed_action': action, 'replayed_amount': amount,
+                'ev_delta': round(estimate_ev(action, amount, scenario)
+                                  - estimate_ev(logged_action, logged_amount, scenario), 6),
+            }
+            if changes_writer is not None:
+                changes_writer.writerow([change[column] for column in CHANGE_COLUMNS])
+        summary.add_decision(scenario.street, change)
+
+
+def replay_file(path: str, settings: Optional[Dict] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                top: int = DEFAULT_TOP, changes_dir: Optional[str] = None) -> ReplaySummary:
+    """Re-decide every row of one decisions CSV on a fresh seeded core."""
+    from decision_core import get_decision_core
+    core = get_decision_core(settings)
+    core.decision_engine.equity_calculator.clear()
+    big_blind = core.config.get_setting('big_blind', 0.02)
+    summary = ReplaySummary(top)
+    summary.files = 1
+
+    changes_file = changes_writer = None
+    if changes_dir:
+        os.makedirs(changes_dir, exist_ok=True)
+        name = os.path.basename(path)[:-len('.gz')] if path.endswith('.gz') else os.path.basename(path)
+        changes_file = open(os.path.join(changes_dir, f'changes_{name}'), 'w', newline='', encoding='utf-8')
+        changes_writer = csv.writer(changes_file)
+        changes_writer.writerow(CHANGE_COLUMNS)
+    try:
+        with _open_text(path) as f:
+            batch = []
+            for line, row in enumerate(csv.DictReader(f), start=2):
+                summary.rows += 1
+                scenario = reconstruct_spot(row, f'{path}:{line}', big_blind)
+                if scenario is None:
+                    summary.skipped += 1
+                    continue
+                batch.append((line, row, scenario))
+                if len(batch) >= batch_size:
+                    _replay_batch(core.decision_engine, batch, path, summary, changes_writer)
+                    batch = []
+            if batch:
+                _replay_batch(core.decision_engine, batch, path, summary, changes_writer)
+    finally:
+        if changes_file is not None:
+            changes_file.close()
+    return summary
+
+
+def run_replay(sources: List[str], workers: int = 1, settings: Optional[Dict] = None,
+               batch_size: int = DEFAULT_BATCH_SIZE, top: int = DEFAULT_TOP, changes_dir: Optional[str] = None,
+               log_level: int = logging.WARNING) -> Dict[str, Any]:
+    """Replay every decision log in sources, one file per task, and return the merged report."""
+    files = list(iter_decision_files(sources))
+    workers = max(1, min(workers, len(files) or 1))
+    replay = partial(replay_file, settings=settings, batch_size=batch_size, top=top, changes_dir=changes_dir)
+    summary = ReplaySummary(top)
+    start = time.perf_counter()
+    if workers == 1:
+        previous_disable = logging.root.manager.disable
+        _init_worker(log_level)
+        try:
+            for path in files:
+                summary.merge(replay(path))
+        finally:
+            logging.disable(previous_disable)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_level,)) as pool:
+            for part in pool.map(replay, files):
+                summary.merge(part)
+    elapsed = time.perf_counter() - start
+    report = summary.to_dict()
+    report.update({'workers': workers, 'elapsed_seconds': elapsed,
+                   'decisions_per_second': summary.replayed / elapsed if elapsed > 0 else 0.0})
+    return report
+
+
+def format_replay_report(report: Dict[str, Any]) -> str:
+    """Human-readable report of a replay run."""
+    lines = [
+        f"Replayed {report['replayed']} of {report['rows']} decisions from {report['files']} file(s) "
+        f"with {report['workers']} worker(s) in {report['elapsed_seconds']:.2f}s "
+        f"({report['decisions_per_second']:,.0f} decisions/s); {report['skipped']} skipped, {report['errors']} errors",
+        f"Changed action: {report['changed']}, changed raise size: {report['resized']}, "
+        f"estimated EV impact: {report['ev_delta']:+.2f}",
+    ]
+    for street, stats in report['streets'].items():
+        lines.append(f"  {street:<8} replayed={stats['replayed']:<8} changed={stats['changed']:<6} "
+                     f"ev_delta={stats['ev_delta']:+.2f}")
+    if report['transitions']:
+        lines.append("Transitions: " + ", ".join(f"{name} x{count}" for name, count in report['transitions'].items()))
+    if report['largest_changes']:
+        lines.append("Largest EV changes:")
+        for change in report['largest_changes']:
+            lines.append(f"  {change['ev_delta']:+.3f} {change['source']}:{change['line']} {change['street']} "
+                         f"[{change['hole_cards']}] [{change['community_cards']}] "
+                         f"{change['logged_action']} {change['logged_amount']} -> "
+                         f"{change['replayed_action']} {change['replayed_amount']}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay GameLogger decision logs through the current decision stack.")
+    parser.add_argument('sources', nargs='+', help="Log directories, decisions CSV files (.csv/.csv.gz) or globs")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--big-blind', type=float, default=None, help="Big blind of the logged games (default: config)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help="Decisions per decide_batch call")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="Largest EV changes to list")
+    parser.add_argument('--changes-dir', default=None, help="Write the changed decisions of each file here")
+    parser.add_argument('--json', default=None, help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    settings = {'big_blind': args.big_blind, 'small_blind': args.big_blind / 2} if args.big_blind else None
+    report = run_replay(args.sources, args.workers, settings, args.batch_size, args.top, args.changes_dir)
+    print(format_replay_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0 if report['errors'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,319 @@
+# duplicate_evaluation.py
+"""
+Duplicate-poker A/B evaluation of two strategy configs.
+
+Both configs play the same seeded deals against the same scripted field on the
+headless table (table_simulator.py). Each deal is replayed once per seat with
+the candidate rotated through every seat, so the candidate holds every hand
+from every position. Config A and config B each play every (deal, rotation)
+pair. Card luck is common to both sides and cancels in the paired difference,
+so the variance that decides how many hands a result needs is that of
+A minus B on matched deals, not of either config's raw winnings. The report
+includes the measured hands-reduction factor against an unpaired comparison.
+
+Per deal the harness reseeds the scripted opponents, the candidate's equity
+sampler and the global `random` module, which the strategy code draws from.
+Both configs therefore face identical opponent randomness until their own
+actions diverge. Deals are spread over a process pool in seeded chunks.
+
+Results are reported as bb/100 with a normal-approximation confidence
+interval, the deal being the independent unit. Each config's bb/100 is also
+split by the street on which the candidate left the hand (its fold, or the
+last street reached); the splits sum to the total.
+
+    python duplicate_evaluation.py --set-b strategy.bluff_frequency=0.3 --deals 2000 --workers 4
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from table_simulator import (NLHETable, HandResult, SeatSpec, STREETS, build_agent, seat_label, merge_settings,
+                             DEFAULT_SMALL_BLIND, DEFAULT_BIG_BLIND, DEFAULT_STACK_BB)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIELD = 'tag,lag,station,tag,lag'
+DEFAULT_CHUNK_DEALS = 50
+DEFAULT_CONFIDENCE = 0.95
+CONFIGS = ('a', 'b')
+
+
+class RunningSum:
+    """Count, sum and sum of squares of a stream of values."""
+
+    __slots__ = ('count', 'total', 'squares')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.squares = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.squares += value * value
+
+    def merge(self, other: 'RunningSum'):
+        self.count += other.count
+        self.total += other.total
+        self.squares += other.squares
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return max(0.0, (self.squares - self.count * self.mean ** 2) / (self.count - 1))
+
+    @property
+    def stderr(self) -> float:
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+
+@dataclass
+class DuplicateResult:
+    """Paired results of config A and B over the same deals; values in big blinds."""
+    labels: Dict[str, str]
+    seats: int
+    deals: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    deal_means: Dict[str, RunningSum] = field(default_factory=lambda: {c: RunningSum() for c in CONFIGS})
+    hand_nets: Dict[str, RunningSum] = field(default_factory=lambda: {c: RunningSum() for c in CONFIGS})
+    difference: RunningSum = field(default_factory=RunningSum)
+    street_totals: Dict[str, Dict[str, float]] = field(
+        default_factory=lambda: {c: {street: 0.0 for street in STREETS} for c in CONFIGS})
+
+    def add_deal(self, nets: Dict[str, List[Tuple[float, str]]]):
+        """Record one deal: per config, the candidate's (net bb, exit street) for every rotation."""
+        self.deals += 1
+        means = {}
+        for config in CONFIGS:
+            for net, street in nets[config]:
+                self.hand_nets[config].add(net)
+                self.street_totals[config][street] += net
+            means[config] = sum(net for net, _ in nets[config]) / len(nets[config])
+            self.deal_means[config].add(means[config])
+        self.difference.add(means['a'] - means['b'])
+
+    def merge(self, other: 'DuplicateResult'):
+        self.deals += other.deals
+        self.errors += other.errors
+        self.difference.merge(other.difference)
+        for config in CONFIGS:
+            self.deal_means[config].merge(other.deal_means[config])
+            self.hand_nets[config].merge(other.hand_nets[config])
+            for street, total in other.street_totals[config].items():
+                self.street_totals[config][street] += total
+
+    @property
+    def hands_per_config(self) -> int:
+        return self.deals * self.seats
+
+    @property
+    def hands_reduction_factor(self) -> float:
+        """Hands an unpaired A/B comparison needs per hand of this one for the same precision."""
+        paired_per_hand = self.difference.variance * self.seats
+        unpaired = self.hand_nets['a'].variance + self.hand_nets['b'].variance
+        return unpaired / paired_per_hand if paired_per_hand > 0 else 0.0
+
+    def interval(self, running: RunningSum, confidence: float) -> Tuple[float, float, float]:
+        """(bb/100, low, high) for a per-deal mean."""
+        z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+        mean, half_width = running.mean * 100.0, z * running.stderr * 100.0
+        return mean, mean - half_width, mean + half_width
+
+    def summary(self, confidence: float = DEFAULT_CONFIDENCE) -> Dict[str, Any]:
+        hands = self.hands_per_config
+        result = {'deals': self.deals, 'hands_per_config': hands, 'confidence': confidence,
+                  'elapsed_s': self.elapsed, 'errors': self.errors,
+                  'hands_reduction_factor': self.hands_reduction_factor}
+        for config in CONFIGS:
+            bb_per_100, low, high = self.interval(self.deal_means[config], confidence)
+            result[config] = {
+                'label': self.labels[config], 'bb_per_100': bb_per_100, 'ci': [low, high],
+                'by_street': {street: (total / hands * 100.0 if hands else 0.0)
+                              for street, total in self.street_totals[config].items()},
+            }
+        difference, low, high = self.interval(self.difference, confidence)
+        result['difference'] = {'bb_per_100': difference, 'ci': [low, high], 'significant': low > 0 or high < 0}
+        return result
+
+    def report(self, confidence: float = DEFAULT_CONFIDENCE) -> str:
+        s = self.summary(confidence)
+        level = f"{confidence:.0%}"
+        lines = [f"{s['deals']} deals x {self.seats} rotations = {s['hands_per_config']} hands per config "
+                 f"in {s['elapsed_s']:.1f}s ({s['errors']} agent errors)",
+                 f"{'config':<8} {'bb/100':>9} {level + ' CI':>22}  " + ' '.join(f"{st:>9}" for st in STREETS)]
+        for config in CONFIGS:
+            entry = s[config]
+            lines.append(f"{config.upper():<8} {entry['bb_per_100']:>9.2f} "
+                         f"{'[' + format(entry['ci'][0], '.2f') + ', ' + format(entry['ci'][1], '.2f') + ']':>22}  "
+                         + ' '.join(f"{entry['by_street'][st]:>9.2f}" for st in STREETS))
+        diff = s['difference']
+        lines.append(f"A - B: {diff['bb_per_100']:.2f} bb/100, {level} CI [{diff['ci'][0]:.2f}, {diff['ci'][1]:.2f}]"
+                     f"{' (significant)' if diff['significant'] else ''}; duplicate dealing needed "
+                     f"{s['hands_reduction_factor']:.1f}x fewer hands than an unpaired comparison")
+        return "\n".join(lines)
+
+
+def exit_street(hand: HandResult, seat: int) -> str:
+    """Street on which `seat` folded, or the last street of the hand."""
+    for action in hand.actions:
+        if action['seat'] == seat and action['action_type'] == 'FOLD':
+            return action['street']
+    return hand.street
+
+
+def _deal_seed(seed: Optional[int], deal: int) -> int:
+    if seed is None:
+        return random.SystemRandom().getrandbits(63)
+    return seed * 1_000_003 + deal
+
+
+def _reseed(agents: Sequence, hand_seed: int):
+    random.seed(hand_seed)
+    for index, agent in enumerate(agents):
+        rng = getattr(agent, 'rng', None)
+        if isinstance(rng, random.Random):
+            rng.seed(hand_seed * 31 + index)
+
+
+def _play_deals(job) -> DuplicateResult:
+    """Play a chunk of deals for both configs (runs inside pool workers)."""
+    candidates, field_specs, first_deal, deals, seed, table_kwargs = job
+    start = time.perf_counter()
+    seats = len(field_specs) + 1
+    result = DuplicateResult({c: seat_label(candidates[c]) for c in CONFIGS}, seats)
+    players = {}
+    for config in CONFIGS:
+        setup = random.Random(0)
+        players[config] = (build_agent(candidates[config], random.Random(setup.getrandbits(64))),
+                           [build_agent(spec, random.Random(setup.getrandbits(64))) for spec in field_specs])
+    field_names = [f"Field{i + 1}_{seat_label(spec)}" for i, spec in enumerate(field_specs)]
+    big_blind = table_kwargs.get('big_blind', DEFAULT_BIG_BLIND)
+    errors = 0
+
+    for deal in range(first_deal, first_deal + deals):
+        deal_seed = _deal_seed(seed, deal)
+        deck = list(range(52))
+        random.Random(deal_seed).shuffle(deck)
+        nets = {config: [] for config in CONFIGS}
+        for rotation in range(seats):
+            for config in CONFIGS:
+                candidate, field_agents = players[config]
+                agents = field_agents[:rotation] + [candidate] + field_agents[rotation:]
+                names = field_names[:rotation] + ['Candidate'] + field_names[rotation:]
+                _reseed(agents, deal_seed * seats + rotation)
+                table = NLHETable(agents, names=names, **table_kwargs)
+                hand = table.play_hand(deck)
+                errors += table.errors
+                nets[config].append((hand.net[rotation] / big_blind, exit_street(hand, rotation)))
+        result.add_deal(nets)
+    result.errors = errors
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _quiet_worker(level: int):
+    logging.getLogger().setLevel(level)
+
+
+def run_duplicate(candidate_a: SeatSpec, candidate_b: SeatSpec, field_specs: Sequence[SeatSpec], deals: int,
+                  workers: Optional[int] = 1, seed: Optional[int] = None, chunk_deals: int = DEFAULT_CHUNK_DEALS,
+                  table_kwargs: Optional[Dict] = None, worker_log_level: int = logging.WARNING) -> DuplicateResult:
+    """Play `deals` duplicate deals of A and B against the field, over `workers` processes."""
+    if not 1 <= len(field_specs) <= 8:
+        raise ValueError(f"The field needs 1-8 opponents, got {len(field_specs)}")
+    candidates = {'a': candidate_a, 'b': candidate_b}
+    table_kwargs = dict(table_kwargs or {})
+    jobs = [(candidates, list(field_specs), first, min(chunk_deals, deals - first), seed, table_kwargs)
+            for first in range(0, deals, chunk_deals)]
+    start = time.perf_counter()
+    result = DuplicateResult({c: seat_label(candidates[c]) for c in CONFIGS}, len(field_specs) + 1)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            result.merge(_play_deals(job))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_quiet_worker,
+                                 initargs=(worker_log_level,)) as pool:
+            for part in pool.map(_play_deals, jobs):
+                result.merge(part)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def parse_assignment(text: str) -> Dict:
+    """'strategy.bluff_frequency=0.3' -> {'strategy': {'bluff_frequency': 0.3}} (value parsed as JSON if possible)."""
+    key, _, raw = text.partition('=')
+    if not key or not _:
+        raise ValueError(f"Expected section.key=value, got '{text}'")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    for part in reversed(key.split('.')[1:]):
+        value = {part: value}
+    return {key.split('.')[0]: value}
+
+
+def load_candidate(kind: str, config_path: Optional[str], assignments: Sequence[str]) -> SeatSpec:
+    """Seat spec for a candidate engine: a config file (or none) plus key=value overrides."""
+    settings: Dict = {}
+    if config_path:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            settings = json.load(f)
+    for assignment in assignments:
+        settings = merge_settings(settings, parse_assignment(assignment))
+    return kind, {'settings': settings}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Duplicate-poker A/B evaluation of two strategy configs.")
+    parser.add_argument('--engine', default='decision_engine', choices=['decision_engine', 'advanced'])
+    parser.add_argument('--config-a', help="Config file for A (decision_engine: merged over config.json)")
+    parser.add_argument('--config-b', help="Config file for B")
+    parser.add_argument('--set-a', action='append', default=[], metavar='SECTION.KEY=VALUE')
+    parser.add_argument('--set-b', action='append', default=[], metavar='SECTION.KEY=VALUE')
+    parser.add_argument('--field', default=DEFAULT_FIELD, help="Comma-separated scripted opponents")
+    parser.add_argument('--deals', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--chunk-deals', type=int, default=DEFAULT_CHUNK_DEALS)
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE)
+    parser.add_argument('--stack-bb', type=float, default=DEFAULT_STACK_BB)
+    parser.add_argument('--small-blind', type=float, default=DEFAULT_SMALL_BLIND)
+    parser.add_argument('--big-blind', type=float, default=DEFAULT_BIG_BLIND)
+    parser.add_argument('--json', help="Also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    candidate_a = load_candidate(args.engine, args.config_a, args.set_a)
+    candidate_b = load_candidate(args.engine, args.config_b, args.set_b)
+    field_specs = [name.strip() for name in args.field.split(',') if name.strip()]
+    table_kwargs = {'small_blind': args.small_blind, 'big_blind': args.big_blind, 'starting_stack_bb': args.stack_bb}
+    result = run_duplicate(candidate_a, candidate_b, field_specs, args.deals, workers=args.workers, seed=args.seed,
+                           chunk_deals=args.chunk_deals, table_kwargs=table_kwargs)
+    print(result.report(args.confidence))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result.summary(args.confidence), f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
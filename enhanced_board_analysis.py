@@ -9,6 +9,8 @@ from typing import List, Dict, Tuple, Optional
 from collections import Counter
 import itertools
 
+from board_features import get_board_features
+
 logger = logging.getLogger(__name__)
 
 class BoardTexture:
@@ -237,36 +239,12 @@ class BoardTexture:
 class EnhancedBoardAnalyzer:
     """Main class for enhanced board analysis integration."""
     
-    def __init__(self):
-        self.texture_cache = {}
-    
     def analyze_board(self, community_cards: List[str]) -> Dict:
         """Comprehensive board analysis."""
         try:
-            # Create cache key
-            cache_key = tuple(sorted(community_cards))
-            
-            if cache_key in self.texture_cache:
-                return self.texture_cache[cache_key]
-              # Analyze board texture
-            texture = BoardTexture(community_cards)
-            
-            analysis = {
-                'texture_type': texture.get_texture_type(),
-                'wetness_score': texture._calculate_wetness_score(),
-                'flush_draws': texture._has_flush_draw(),  # Test expects this key
-                'has_flush_draw': texture._has_flush_draw(),  # Keep original for compatibility
-                'straight_draws': texture._analyze_straight_draws(),
-                'pairs_on_board': texture._has_pair(),  # Test expects this key
-                'has_pair': texture._has_pair(),  # Keep original for compatibility
-                'betting_implications': texture.get_betting_implications(),
-                'num_cards': len(community_cards)
-            }
-            
-            # Cache result
-            self.texture_cache[cache_key] = analysis
-            
-            return analysis
+            # Features come from the shared canonical-board cache (see board_features.py);
+            # each call gets its own dict so callers may modify it freely
+            return get_board_features(community_cards).to_analysis()
             
         except Exception as e:
             logger.warning(f"Board analysis failed: {e}")
@@ -263,9 +263,22 @@ def classify_hand_strength_enhanced(
     numerical_hand_rank: int,
     win_probability: float,
     street: str = 'flop',
-    board_texture: str = 'unknown'
+    board_texture: str = 'unknown',
+    decision_context=None
 ) -> Tuple[str, Dict[str, Any]]:
-    """Enhanced hand strength classification function."""
+    """Enhanced hand strength classification function.
+
+    When a postflop decision context is given, the result is memoised on it so
+    repeated classifications within one decision are computed once.
+    """
+    if decision_context is not None:
+        return decision_context.get_feature(
+            'hand_classification',
+            lambda: hand_classifier.classify_hand_strength(
+                numerical_hand_rank, win_probability, street, board_texture
+            ),
+            numerical_hand_rank, win_probability, street, board_texture
+        )
     return hand_classifier.classify_hand_strength(
         numerical_hand_rank, win_probability, street, board_texture
     )
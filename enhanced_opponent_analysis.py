@@ -8,6 +8,8 @@ import logging
 import time
 from typing import Dict, List, Optional, Any, Tuple
 
+from population_priors import get_population_priors
+
 logger = logging.getLogger(__name__)
 
 def _safe_extract_stat(stats_dict: Dict, key: str, default: float = 0.0) -> float:
@@ -40,103 +42,41 @@ def get_enhanced_opponent_analysis(
     This fixes the critical "no_opponents_data" issue that was breaking decision making.
     """
     
-    # Initialize with intelligent defaults based on typical online poker statistics
+    # Initialize with population priors computed from archived hands, falling back to
+    # typical online poker statistics
+    priors = get_population_priors()
+    avg_vpip = priors.mean('vpip', 0.25) * 100
+    avg_pfr = priors.mean('pfr', 0.18) * 100
+    fold_to_cbet = priors.mean('fold_to_cbet', 0.5, street='flop')
     analysis = {
         'tracked_count': 0,
         'table_type': 'standard',
         'analysis_quality': 'medium',
-        'avg_vpip': 25.0,
-        'avg_pfr': 18.0,
-        'avg_aggression': 0.75,
-        'fold_equity_estimate': 0.50,
-        'calling_frequency': 0.50,
-        'reasoning': 'enhanced_defaults',
+        'avg_vpip': avg_vpip,
+        'avg_pfr': avg_pfr,
+        'avg_aggression': avg_pfr / avg_vpip if priors and avg_vpip > 0 else 0.75,
+        'fold_equity_estimate': fold_to_cbet,
+        'calling_frequency': 1.0 - fold_to_cbet,
+        'reasoning': 'population_priors' if priors else 'enhanced_defaults',
         'opponent_summary': {},
         'strategic_recommendations': {},
         'opponent_types': {},
         'is_weak_passive': False,
-        'fold_to_cbet': 0.5
+        'fold_to_cbet': fold_to_cbet
     }
     
-    # Try to extract real opponent data
-    if opponent_tracker:
-        try:
-            tracked_opponents = []
-            total_hands_tracked = 0
-            
-            # Handle Mock objects in testing
-            if hasattr(opponent_tracker, '_mock_name'):
-                # For Mock objects, use get_aggregated_stats if available
-                if hasattr(opponent_tracker, 'get_aggregated_stats'):
-                    try:
-                        stats = opponent_tracker.get_aggregated_stats()
-                        if isinstance(stats, dict):
-                            for name, profile in stats.items():
-                                if name and profile:
-                                    opponent_data = {
-                                        'name': name,
-                                        'vpip': profile.get('vpip', 25.0),
-                                        'pfr': profile.get('pfr', 18.0),
-                                        'aggression': profile.get('aggression_factor', 0.75),
-                                        'hands': profile.get('hands_played', 25),
-                                        'type': 'regular'
-                                    }
-                                    tracked_opponents.append(opponent_data)
-                                    total_hands_tracked += opponent_data['hands']
-                    except Exception as e:
-                        logger.debug(f"Error with mock tracker: {e}")
-            elif hasattr(opponent_tracker, 'opponents'):
-                # Real opponent tracker
-                for name, profile in opponent_tracker.opponents.items():
-                    if name and profile:
-                        # Get hands seen safely - try multiple attribute names
-                        hands_seen = 0
-                        for attr in ['hands_seen_count', 'hands_seen', 'hands_played_count', 'hands_played']:
-                            if hasattr(profile, attr):
-                                try:
-                                    value = getattr(profile, attr, 0)
-                                    # Handle Mock objects during testing
-                                    if hasattr(value, '_mock_name'):
-                                        continue
-                                    if isinstance(value, (int, float)) and value > 0:
-                                        hands_seen = value
-                                        break
-                                except (TypeError, ValueError):
-                                    continue
-                        
-                        # Additional mock check for hands_seen
-                        if hasattr(hands_seen, '_mock_name'):
-                            hands_seen = 10  # Use default for testing
-                        
-                        if isinstance(hands_seen, (int, float)) and hands_seen > 0:
-                            vpip = _safe_get_vpip(profile)
-                            pfr = _safe_get_pfr(profile) 
-                            aggression = _safe_get_aggression(profile)
-                            
-                            opponent_data = {
-                                'name': name,
-                                'vpip': vpip,
-                                'pfr': pfr,
-                                'aggression': aggression,
-                                'hands': hands_seen,
-                                'type': _classify_player_type(vpip, pfr, aggression)
-                            }
-                            
-                            tracked_opponents.append(opponent_data)
-                            total_hands_tracked += hands_seen
-                            
-                            logger.debug(f"Tracked opponent {name}: VPIP={vpip:.1f}, PFR={pfr:.1f}, Hands={hands_seen}")
-            
-            # If we have tracked opponent data, use it
-            if tracked_opponents:
-                analysis = _analyze_tracked_opponents(tracked_opponents, analysis)
-                analysis['reasoning'] = 'tracked_opponent_data'
-                logger.info(f"Using tracked data for {len(tracked_opponents)} opponents with {total_hands_tracked} total hands")
-            else:
-                logger.info("No opponents with meaningful data found")
-        
-        except Exception as e:
-            logger.warning(f"Error analyzing opponent data: {e}. Using enhanced defaults.")
+    # Try to extract real opponent data; trackers with a table-dynamics cache reuse the
+    # profile-derived part until a profile changes
+    table_dynamics = getattr(opponent_tracker, 'table_dynamics', None) if opponent_tracker else None
+    if table_dynamics is not None and not hasattr(opponent_tracker, '_mock_name'):
+        cached = table_dynamics.memo(
+            'enhanced_opponent_analysis',
+            lambda: _analyze_tracker_profiles(opponent_tracker, dict(analysis))
+        )
+        analysis = dict(cached)
+        analysis['opponent_types'] = dict(cached['opponent_types'])
+    elif opponent_tracker:
+        analysis = _analyze_tracker_profiles(opponent_tracker, analysis)
     
     # Enhance analysis based on observable game context
     if recent_actions:
@@ -151,6 +91,88 @@ def get_enhanced_opponent_analysis(
     logger.debug(f"Final opponent analysis: tracked={analysis['tracked_count']}, type={analysis['table_type']}, vpip={analysis['avg_vpip']:.1f}")
     return analysis
 
+def _analyze_tracker_profiles(opponent_tracker, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold the tracker's opponent profiles into the default analysis."""
+    try:
+        tracked_opponents = []
+        total_hands_tracked = 0
+        
+        # Handle Mock objects in testing
+        if hasattr(opponent_tracker, '_mock_name'):
+            # For Mock objects, use get_aggregated_stats if available
+            if hasattr(opponent_tracker, 'get_aggregated_stats'):
+                try:
+                    stats = opponent_tracker.get_aggregated_stats()
+                    if isinstance(stats, dict):
+                        for name, profile in stats.items():
+                            if name and profile:
+                                opponent_data = {
+                                    'name': name,
+                                    'vpip': profile.get('vpip', 25.0),
+                                    'pfr': profile.get('pfr', 18.0),
+                                    'aggression': profile.get('aggression_factor', 0.75),
+                                    'hands': profile.get('hands_played', 25),
+                                    'type': 'regular'
+                                }
+                                tracked_opponents.append(opponent_data)
+                                total_hands_tracked += opponent_data['hands']
+                except Exception as e:
+                    logger.debug(f"Error with mock tracker: {e}")
+        elif hasattr(opponent_tracker, 'opponents'):
+            # Real opponent tracker
+            for name, profile in opponent_tracker.opponents.items():
+                if name and profile:
+                    # Get hands seen safely - try multiple attribute names
+                    hands_seen = 0
+                    for attr in ['hands_seen_count', 'hands_seen', 'hands_played_count', 'hands_played']:
+                        if hasattr(profile, attr):
+                            try:
+                                value = getattr(profile, attr, 0)
+                                # Handle Mock objects during testing
+                                if hasattr(value, '_mock_name'):
+                                    continue
+                                if isinstance(value, (int, float)) and value > 0:
+                                    hands_seen = value
+                                    break
+                            except (TypeError, ValueError):
+                                continue
+                    
+                    # Additional mock check for hands_seen
+                    if hasattr(hands_seen, '_mock_name'):
+                        hands_seen = 10  # Use default for testing
+                    
+                    if isinstance(hands_seen, (int, float)) and hands_seen > 0:
+                        vpip = _safe_get_vpip(profile)
+                        pfr = _safe_get_pfr(profile) 
+                        aggression = _safe_get_aggression(profile)
+                        
+                        opponent_data = {
+                            'name': name,
+                            'vpip': vpip,
+                            'pfr': pfr,
+                            'aggression': aggression,
+                            'hands': hands_seen,
+                            'type': _classify_player_type(vpip, pfr, aggression)
+                        }
+                        
+                        tracked_opponents.append(opponent_data)
+                        total_hands_tracked += hands_seen
+                        
+                        logger.debug(f"Tracked opponent {name}: VPIP={vpip:.1f}, PFR={pfr:.1f}, Hands={hands_seen}")
+        
+        # If we have tracked opponent data, use it
+        if tracked_opponents:
+            analysis = _analyze_tracked_opponents(tracked_opponents, analysis)
+            analysis['reasoning'] = 'tracked_opponent_data'
+            logger.info(f"Using tracked data for {len(tracked_opponents)} opponents with {total_hands_tracked} total hands")
+        else:
+            logger.info("No opponents with meaningful data found")
+    
+    except Exception as e:
+        logger.warning(f"Error analyzing opponent data: {e}. Using enhanced defaults.")
+
+    return analysis
+
 def _safe_get_vpip(profile) -> float:
     """Safely extract VPIP stat from opponent profile."""
     try:
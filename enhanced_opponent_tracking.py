@@ -10,7 +10,10 @@ from collections import defaultdict, deque
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-import statistics
+
+from action_log import ActionLog, LoggedAction
+from opponent_profile_store import SOURCE_ENHANCED
+from table_dynamics import TableDynamicsCache
 
 logger = logging.getLogger(__name__)
 
@@ -51,17 +54,66 @@ class HandData:
     shown_cards: List[str] = None
     hand_strength: str = ""
 
+class SlidingWindowCounts:
+    """
+    Named counters kept both for the whole history and for the last `window` entries.
+
+    Each entry is a small dict of counter increments. Adding an entry adds it to the
+    lifetime and window totals; once the window is full the oldest entry is
+    subtracted again, so both totals stay current in O(1) per update and per read.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._entries = deque()
+        self.window_totals: Dict[str, float] = defaultdict(float)
+        self.lifetime_totals: Dict[str, float] = defaultdict(float)
+
+    def add(self, counts: Dict[str, float]):
+        self._entries.append(counts)
+        for name, value in counts.items():
+            self.window_totals[name] += value
+            self.lifetime_totals[name] += value
+        if len(self._entries) > self.window:
+            evicted = self._entries.popleft()
+            for name, value in evicted.items():
+                self.window_totals[name] -= value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ratio(self, numerator: str, denominator: str, lifetime: bool = False) -> float:
+        totals = self.lifetime_totals if lifetime else self.window_totals
+        denom = totals.get(denominator, 0.0)
+        return totals.get(numerator, 0.0) / denom if denom > 0 else 0.0
+
 class EnhancedOpponentProfile:
     """Enhanced opponent profile with comprehensive statistics."""
-    
+
+    HAND_WINDOW = 200
+    DECISION_TIME_WINDOW = 30
+    STACK_WINDOW = 20
+    RECENT_ACTIONS = 50
+
     def __init__(self, player_name: str):
         self.player_name = player_name
         self.created_time = time.time()
         self.last_updated = time.time()
-        
+
         # Hand and action tracking
-        self.hands_data = deque(maxlen=200)  # Store detailed hand data
-        self.recent_actions = deque(maxlen=50)  # Recent actions for pattern analysis
+        self.hands_data = deque(maxlen=self.HAND_WINDOW)  # Store detailed hand data
+        # Recent actions are read from the tracker's action log (set by the tracker)
+        self.action_log: Optional[ActionLog] = None
+
+        # Sufficient statistics, updated once per hand/action so reads never rescan history.
+        # Window totals cover the same hands as hands_data; lifetime totals cover everything.
+        self.hand_counts = SlidingWindowCounts(self.HAND_WINDOW)
+        self.timing_counts = SlidingWindowCounts(self.DECISION_TIME_WINDOW)
+        self.stack_counts = SlidingWindowCounts(self.STACK_WINDOW)
+        self.bet_counts = defaultdict(int)  # Bets/raises seen per street
+        self.showdown_count = 0
+        self.showdowns_won = 0
+
         self.session_hands = 0
         self.total_hands_observed = 0
         
@@ -83,7 +135,7 @@ class EnhancedOpponentProfile:
         # Showdown statistics
         self.wtsd = 0.0  # Went To ShowDown
         self.w_sd = 0.0  # Won at ShowDown
-        self.showdown_hands = []
+        self.showdown_hands = deque(maxlen=self.HAND_WINDOW)
         
         # Aggression statistics
         self.aggression_factor = 0.0  # (Bets + Raises) / Calls
@@ -92,7 +144,6 @@ class EnhancedOpponentProfile:
         # Betting patterns
         self.avg_bet_size = defaultdict(float)  # By street
         self.bet_size_variance = defaultdict(float)
-        self.pot_size_betting = defaultdict(list)  # Bet sizes relative to pot
           # Position-based statistics
         self.position_stats = defaultdict(lambda: defaultdict(float))
           # Street-based statistics
@@ -119,7 +170,6 @@ class EnhancedOpponentProfile:
             }        }
         
         # Timing patterns
-        self.decision_times = deque(maxlen=30)
         self.avg_decision_time = 0.0
         self.quick_decisions = 0  # Decisions under 2 seconds
         self.slow_decisions = 0   # Decisions over 10 seconds
@@ -131,7 +181,6 @@ class EnhancedOpponentProfile:
         self.donk_bet_frequency = 0.0  # Leading into preflop aggressor
         
         # Stack management
-        self.stack_sizes = deque(maxlen=20)
         self.avg_stack_size = 0.0
         self.all_in_frequency = 0.0
         
@@ -153,21 +202,32 @@ class EnhancedOpponentProfile:
         self.session_profit = 0.0
         self.session_start_stack = 0.0
         self.hands_this_session = 0
-        
+
+        # Set by the tracker: called with the player name whenever the stats change
+        self.on_change = None
+
+    def _notify_changed(self):
+        if self.on_change:
+            self.on_change(self.player_name)
+        
+    @property
+    def recent_actions(self) -> List[LoggedAction]:
+        """The player's latest actions for pattern analysis, decoded from the action log."""
+        if self.action_log is None:
+            return []
+        return list(self.action_log.player_actions(self.player_name, last=self.RECENT_ACTIONS))
+
     def add_action(self, action_data: ActionData):
-        """Add a new action to the profile."""
-        self.recent_actions.append(action_data)
+        """Add a new action to the profile (an ActionData or an action log row)."""
         self.last_updated = time.time()
         
         # Update decision timing
         if action_data.decision_time > 0:
-            self.decision_times.append(action_data.decision_time)
-            self._update_timing_stats()
+            self._update_timing_stats(action_data.decision_time)
             
         # Update stack tracking
         if action_data.stack_size > 0:
-            self.stack_sizes.append(action_data.stack_size)
-            self._update_stack_stats()
+            self._update_stack_stats(action_data.stack_size)
             
         # Update betting patterns
         if action_data.action_type in ['bet', 'raise'] and action_data.amount > 0:
@@ -179,11 +239,13 @@ class EnhancedOpponentProfile:
         # Update street-specific statistics
         self._update_street_stats(action_data)
         
+        self._notify_changed()
         logger.debug(f"Added action for {self.player_name}: {action_data.action_type} on {action_data.street}")
         
     def add_hand_data(self, hand_data: HandData):
         """Add complete hand data."""
         self.hands_data.append(hand_data)
+        self.hand_counts.add(self._summarize_hand(hand_data))
         self.total_hands_observed += 1
         self.hands_this_session += 1
         
@@ -194,52 +256,41 @@ class EnhancedOpponentProfile:
         # Update showdown statistics
         if hand_data.went_to_showdown:
             self.showdown_hands.append(hand_data)
-            self._update_showdown_stats()
-            
-        # Recalculate all statistics
+            self._update_showdown_stats(hand_data)
+
+        # Refresh derived statistics from the running counters
         self._recalculate_statistics()
         
+        self._notify_changed()
         logger.debug(f"Added hand data for {self.player_name}: {hand_data.hand_id}")
         
-    def _update_timing_stats(self):
+    def _update_timing_stats(self, decision_time: float):
         """Update timing-related statistics."""
-        if self.decision_times:
-            self.avg_decision_time = statistics.mean(self.decision_times)
-            
-            # Count quick and slow decisions
-            quick_count = sum(1 for t in self.decision_times if t < 2.0)
-            slow_count = sum(1 for t in self.decision_times if t > 10.0)
-            
-            total_decisions = len(self.decision_times)
-            self.quick_decisions = quick_count / total_decisions if total_decisions > 0 else 0
-            self.slow_decisions = slow_count / total_decisions if total_decisions > 0 else 0
-            
-    def _update_stack_stats(self):
+        self.timing_counts.add({
+            'decisions': 1,
+            'time': decision_time,
+            'quick': 1 if decision_time < 2.0 else 0,
+            'slow': 1 if decision_time > 10.0 else 0
+        })
+        self.avg_decision_time = self.timing_counts.ratio('time', 'decisions')
+        self.quick_decisions = self.timing_counts.ratio('quick', 'decisions')
+        self.slow_decisions = self.timing_counts.ratio('slow', 'decisions')
+
+    def _update_stack_stats(self, stack_size: float):
         """Update stack-related statistics."""
-        if self.stack_sizes:
-            self.avg_stack_size = statistics.mean(self.stack_sizes)
-            
+        self.stack_counts.add({'samples': 1, 'stack': stack_size})
+        self.avg_stack_size = self.stack_counts.ratio('stack', 'samples')
+
     def _update_betting_patterns(self, action_data: ActionData):
         """Update betting pattern analysis."""
         street = action_data.street
         bet_amount = action_data.amount
-        pot_size = action_data.pot_size_before
-        
-        # Update average bet size
-        if street in self.avg_bet_size:
-            # Running average
-            count = len([a for a in self.recent_actions if a.street == street and a.action_type in ['bet', 'raise']])
-            self.avg_bet_size[street] = ((self.avg_bet_size[street] * (count - 1)) + bet_amount) / count
-        else:
-            self.avg_bet_size[street] = bet_amount
-            
-        # Track bet size relative to pot
-        if pot_size > 0:
-            bet_ratio = bet_amount / pot_size
-            self.pot_size_betting[street].append(bet_ratio)
-            if len(self.pot_size_betting[street]) > 20:
-                self.pot_size_betting[street].pop(0)
-                
+
+        # Running average of bet size per street
+        self.bet_counts[street] += 1
+        count = self.bet_counts[street]
+        self.avg_bet_size[street] += (bet_amount - self.avg_bet_size[street]) / count
+
     def _update_position_stats(self, action_data: ActionData):
         """Update position-based statistics."""
         position = action_data.position
@@ -271,55 +322,134 @@ class EnhancedOpponentProfile:
             
         self.street_stats[street]['total_actions'] += 1
         
-    def _update_showdown_stats(self):
+    def _update_showdown_stats(self, hand_data: HandData):
         """Update showdown-related statistics."""
-        if not self.showdown_hands:
-            return
-            
-        total_showdowns = len(self.showdown_hands)
-        won_showdowns = sum(1 for hand in self.showdown_hands if hand.won_hand)
-        
-        self.w_sd = won_showdowns / total_showdowns if total_showdowns > 0 else 0
-        
+        self.showdown_count += 1
+        if hand_data.won_hand:
+            self.showdowns_won += 1
+
+        self.w_sd = self.showdowns_won / self.showdown_count
+
         # WTSD calculation (hands that went to showdown / hands played)
         if self.total_hands_observed > 0:
-            self.wtsd = total_showdowns / self.total_hands_observed
-            
+            self.wtsd = self.showdown_count / self.total_hands_observed
+
+    @staticmethod
+    def _summarize_hand(hand_data: HandData) -> Dict[str, int]:
+        """Counter increments contributed by one hand; the only per-action scan of a hand."""
+        saw_preflop = vpip = pfr = aggressive = passive = 0
+        for action in hand_data.actions:
+            if action.action_type in ('bet', 'raise'):
+                aggressive += 1
+            elif action.action_type == 'call':
+                passive += 1
+            if action.street == 'preflop':
+                saw_preflop = 1
+                if action.action_type in ('call', 'raise'):
+                    vpip = 1
+                if action.action_type == 'raise':
+                    pfr = 1
+        return {
+            'hands': 1,
+            'preflop_hands': saw_preflop,
+            'vpip_hands': vpip,
+            'pfr_hands': pfr,
+            'aggressive_actions': aggressive,
+            'passive_actions': passive
+        }
+
     def _recalculate_statistics(self):
-        """Recalculate all derived statistics."""
-        if not self.hands_data:
+        """Derive the windowed statistics from the running counters."""
+        totals = self.hand_counts.window_totals
+        if not totals.get('hands'):
             return
-            
+
         # Calculate VPIP and PFR
-        preflop_hands = [h for h in self.hands_data if any(a.street == 'preflop' for a in h.actions)]
-        
-        if preflop_hands:
-            vpip_hands = sum(1 for hand in preflop_hands 
-                           if any(a.action_type in ['call', 'raise'] for a in hand.actions if a.street == 'preflop'))
-            pfr_hands = sum(1 for hand in preflop_hands 
-                          if any(a.action_type == 'raise' for a in hand.actions if a.street == 'preflop'))
-            
-            self.vpip = vpip_hands / len(preflop_hands)
-            self.pfr = pfr_hands / len(preflop_hands)
-            
+        if totals.get('preflop_hands'):
+            self.vpip = self.hand_counts.ratio('vpip_hands', 'preflop_hands')
+            self.pfr = self.hand_counts.ratio('pfr_hands', 'preflop_hands')
+
         # Calculate aggression factor
-        all_actions = [a for hand in self.hands_data for a in hand.actions]
-        aggressive_actions = sum(1 for a in all_actions if a.action_type in ['bet', 'raise'])
-        passive_actions = sum(1 for a in all_actions if a.action_type == 'call')
-        
+        aggressive_actions = totals.get('aggressive_actions', 0)
+        passive_actions = totals.get('passive_actions', 0)
+
         if passive_actions > 0:
             self.aggression_factor = aggressive_actions / passive_actions
         else:
             self.aggression_factor = aggressive_actions  # No calls = very aggressive
-            
+
         # Calculate aggression frequency
         total_non_fold = aggressive_actions + passive_actions
         if total_non_fold > 0:
             self.aggression_frequency = aggressive_actions / total_non_fold
-            
+
         # Update playing style
         self._classify_playing_style()
-        
+
+    def get_lifetime_stats(self) -> Dict[str, float]:
+        """VPIP/PFR/aggression over every hand observed, not just the stored window."""
+        totals = self.hand_counts.lifetime_totals
+        passive = totals.get('passive_actions', 0)
+        aggressive = totals.get('aggressive_actions', 0)
+        return {
+            'hands': int(totals.get('hands', 0)),
+            'vpip': self.hand_counts.ratio('vpip_hands', 'preflop_hands', lifetime=True),
+            'pfr': self.hand_counts.ratio('pfr_hands', 'preflop_hands', lifetime=True),
+            'aggression_factor': aggressive / passive if passive > 0 else aggressive,
+            'aggression_frequency': aggressive / (aggressive + passive) if aggressive + passive > 0 else 0.0
+        }
+
+    def to_aggregates(self) -> Dict:
+        """Lifetime counters persisted by the opponent profile store."""
+        totals = self.hand_counts.lifetime_totals
+        return {
+            'counters': {
+                'hands_seen': self.total_hands_observed,
+                'hands_played': totals.get('hands', 0),
+                'preflop_opportunities': totals.get('preflop_hands', 0),
+                'vpip_hands': totals.get('vpip_hands', 0),
+                'pfr_hands': totals.get('pfr_hands', 0),
+                'aggressive_actions': totals.get('aggressive_actions', 0),
+                'passive_actions': totals.get('passive_actions', 0),
+                'showdowns': self.showdown_count,
+                'showdowns_won': self.showdowns_won
+            },
+            'street_stats': {street: dict(stats) for street, stats in self.street_stats.items()},
+            'position_stats': {position: dict(stats) for position, stats in self.position_stats.items()}
+        }
+
+    def restore_aggregates(self, aggregates: Dict):
+        """
+        Seed the profile from a stored record (see to_aggregates).
+
+        The stored history enters the hand window as a single block, so it keeps
+        informing VPIP/PFR/aggression until HAND_WINDOW newer hands have been seen.
+        """
+        counters = aggregates.get('counters', {})
+        if counters.get('hands_played', 0) > 0:
+            self.hand_counts.add({
+                'hands': counters.get('hands_played', 0),
+                'preflop_hands': counters.get('preflop_opportunities', 0),
+                'vpip_hands': counters.get('vpip_hands', 0),
+                'pfr_hands': counters.get('pfr_hands', 0),
+                'aggressive_actions': counters.get('aggressive_actions', 0),
+                'passive_actions': counters.get('passive_actions', 0)
+            })
+        self.total_hands_observed = int(counters.get('hands_seen', 0))
+        self.showdown_count = int(counters.get('showdowns', 0))
+        self.showdowns_won = int(counters.get('showdowns_won', 0))
+        if self.showdown_count:
+            self.w_sd = self.showdowns_won / self.showdown_count
+            if self.total_hands_observed:
+                self.wtsd = self.showdown_count / self.total_hands_observed
+
+        for street, stats in aggregates.get('street_stats', {}).items():
+            self.street_stats.setdefault(street, {}).update({stat: int(value) for stat, value in stats.items()})
+        for position, stats in aggregates.get('position_stats', {}).items():
+            self.position_stats[position].update(stats)
+        self._recalculate_statistics()
+        self._notify_changed()
+
     def _classify_playing_style(self):
         """Classify the opponent's playing style."""
         if self.total_hands_observed < 10:
@@ -463,11 +593,16 @@ class EnhancedOpponentProfile:
 class EnhancedOpponentTracker:
     """Enhanced opponent tracker managing multiple opponent profiles."""
     
-    def __init__(self, config: Dict = None, logger_instance: logging.Logger = None):
+    def __init__(self, config: Dict = None, logger_instance: logging.Logger = None, profile_store=None,
+                 action_log: Optional[ActionLog] = None):
         self.config = config or {}
         self.logger = logger_instance or logging.getLogger(__name__)
         
         self.opponents = {}  # player_name -> EnhancedOpponentProfile
+        # Optional OpponentProfileStore: profiles load on first sight and are saved at hand end
+        self.profile_store = profile_store
+        self._dirty_profiles = set()
+        self._current_hand_id = None
         self.session_start_time = time.time()
         self.hands_this_session = 0
         
@@ -479,8 +614,29 @@ class EnhancedOpponentTracker:
         self.table_style = PlayingStyle.UNKNOWN
         self.table_aggression = 0.0
         self.average_vpip = 0.0
+        # Table averages maintained incrementally from the profiles that changed
+        self.table_dynamics = TableDynamicsCache(self.opponents, ('vpip', 'aggression_factor'),
+                                                 self._summarize_for_table)
+
+        # The tracker is a view of the action log (shared with the bot when given). Rows already
+        # in a shared log are replayed, so the tracker can be built after play has started.
+        self.action_log = action_log if action_log is not None else ActionLog()
+        for action in self.action_log.rows():
+            self.on_logged_action(action)
+        self.action_log.subscribe(self.on_logged_action)
         
         self.logger.info("Enhanced opponent tracker initialized")
+
+    @staticmethod
+    def _summarize_for_table(profile: EnhancedOpponentProfile) -> Optional[Tuple[float, float]]:
+        if profile.total_hands_observed < 5:
+            return None
+        return profile.vpip, profile.aggression_factor
+
+    @property
+    def dynamics_version(self) -> int:
+        """Changes whenever any profile changes; key decision caches on it."""
+        return self.table_dynamics.version
         
     def get_or_create_opponent(self, player_name: str) -> EnhancedOpponentProfile:
         """Get existing opponent profile or create new one."""
@@ -489,39 +645,73 @@ class EnhancedOpponentTracker:
                 # Remove oldest opponent
                 oldest_name = min(self.opponents.keys(), 
                                 key=lambda name: self.opponents[name].last_updated)
+                if self.profile_store and oldest_name in self._dirty_profiles:
+                    self.profile_store.queue_profile(SOURCE_ENHANCED, oldest_name,
+                                                     self.opponents[oldest_name].to_aggregates())
+                    self._dirty_profiles.discard(oldest_name)
                 del self.opponents[oldest_name]
+                self.table_dynamics.mark_dirty(oldest_name)
                 self.logger.info(f"Removed oldest opponent profile: {oldest_name}")
                 
-            self.opponents[player_name] = EnhancedOpponentProfile(player_name)
-            self.logger.info(f"Created new opponent profile: {player_name}")
+            profile = EnhancedOpponentProfile(player_name)
+            stored = self.profile_store.load_profile(SOURCE_ENHANCED, player_name) if self.profile_store else None
+            if stored:
+                profile.restore_aggregates(stored)
+                self.logger.info(f"Loaded stored opponent profile: {player_name} ({profile.total_hands_observed} hands)")
+            else:
+                self.logger.info(f"Created new opponent profile: {player_name}")
+            profile.on_change = self.table_dynamics.mark_dirty
+            profile.action_log = self.action_log
+            self.opponents[player_name] = profile
+            self.table_dynamics.mark_dirty(player_name)
             
         return self.opponents[player_name]
+
+    def end_hand(self) -> int:
+        """Queue the profiles touched this hand and write them in one batch; returns the number saved."""
+        if not self.profile_store or not self._dirty_profiles:
+            self._dirty_profiles.clear()
+            return 0
+        for player_name in self._dirty_profiles:
+            profile = self.opponents.get(player_name)
+            if profile:
+                self.profile_store.queue_profile(SOURCE_ENHANCED, player_name, profile.to_aggregates())
+        self._dirty_profiles.clear()
+        return self.profile_store.flush()
         
     def log_action(self, player_name: str, action_type: str, street: str, 
                   position: str = "unknown", amount: float = 0.0, 
                   pot_size_before_action: float = 0.0, stack_size: float = 0.0,
                   hand_id: str = "", decision_time: float = 0.0):
-        """Log an action for an opponent."""
-        
-        opponent = self.get_or_create_opponent(player_name)
-        
-        action_data = ActionData(
-            action_type=action_type,
-            amount=amount,
-            street=street,
+        """Log an action for an opponent (recorded in the action log, which updates the profiles)."""
+        self.action_log.append(
+            player_name,
+            action_type,
+            street,
             position=position,
+            amount=amount,
             pot_size_before=pot_size_before_action,
             stack_size=stack_size,
-            timestamp=time.time(),
             hand_id=hand_id,
             decision_time=decision_time
         )
         
-        opponent.add_action(action_data)
-        self._update_table_dynamics()
+    def on_logged_action(self, action: LoggedAction):
+        """ActionLog view: update the profiles from one logged action row."""
+        # A new hand ID means the previous hand is over: save what it changed
+        if action.hand_id and action.hand_id != self._current_hand_id:
+            if self._current_hand_id is not None:
+                self.end_hand()
+            self._current_hand_id = action.hand_id
+
+        opponent = self.get_or_create_opponent(action.player_name)
+        self._dirty_profiles.add(action.player_name)
         
-        self.logger.debug(f"Logged action for {player_name}: {action_type} on {street}")
+        opponent.add_action(action)
+        self._update_table_dynamics()
         
+        self.logger.debug(f"Logged action for {action.player_name}: {action.action_type} on {action.street}")
+
     def get_opponent_analysis(self, player_name: str) -> Dict:
         """Get comprehensive analysis for an opponent."""
         if player_name not in self.opponents:
@@ -561,11 +751,10 @@ class EnhancedOpponentTracker:
                 'recommendations': 'Insufficient data'
             }
             
-        # Calculate table averages
-        valid_opponents = [opp for opp in self.opponents.values() 
-                          if opp.total_hands_observed >= 5]
+        # Table averages over opponents with at least 5 hands, maintained incrementally
+        averages = self.table_dynamics.averages()
         
-        if not valid_opponents:
+        if not averages:
             return {
                 'table_style': 'unknown',
                 'aggression_level': 'medium',
@@ -573,8 +762,8 @@ class EnhancedOpponentTracker:
                 'recommendations': 'Gathering table data'
             }
             
-        avg_vpip = statistics.mean([opp.vpip for opp in valid_opponents])
-        avg_aggression = statistics.mean([opp.aggression_factor for opp in valid_opponents])
+        avg_vpip = averages['vpip']
+        avg_aggression = averages['aggression_factor']
         
         # Classify table
         if avg_vpip < 0.20:
@@ -599,18 +788,17 @@ class EnhancedOpponentTracker:
             'aggression_level': aggression_level,
             'average_vpip': avg_vpip,
             'average_aggression': avg_aggression,
-            'active_opponents': len(valid_opponents),
+            'active_opponents': self.table_dynamics.count,
             'recommendations': recommendations
         }
         
     def _update_table_dynamics(self):
         """Update overall table dynamics."""
-        valid_opponents = [opp for opp in self.opponents.values() 
-                          if opp.total_hands_observed >= 5]
+        averages = self.table_dynamics.averages()
         
-        if valid_opponents:
-            self.average_vpip = statistics.mean([opp.vpip for opp in valid_opponents])
-            self.table_aggression = statistics.mean([opp.aggression_factor for opp in valid_opponents])
+        if averages:
+            self.average_vpip = averages['vpip']
+            self.table_aggression = averages['aggression_factor']
             
     def _get_table_recommendations(self, table_style: str, aggression_level: str) -> str:
         """Get strategic recommendations based on table dynamics."""
@@ -651,6 +839,7 @@ class EnhancedOpponentTracker:
         except Exception as e:
             self.logger.error(f"Error saving session data: {e}")
 
-def create_enhanced_opponent_tracker(config: Dict = None, logger_instance: logging.Logger = None) -> EnhancedOpponentTracker:
+def create_enhanced_opponent_tracker(config: Dict = None, logger_instance: logging.Logger = None,
+                                     profile_store=None, action_log: Optional[ActionLog] = None) -> EnhancedOpponentTracker:
     """Factory function to create enhanced opponent tracker."""
-    return EnhancedOpponentTracker(config, logger_instance)
+    return EnhancedOpponentTracker(config, logger_instance, profile_store, action_log)
@@ -12,24 +12,25 @@ Enhanced poker bot with comprehensive improvements:
 import logging
 import time
 import sys
-from typing import Dict, List, Optional, Tuple, Any
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Any, TYPE_CHECKING
 
-# Import all enhanced modules
-from adaptive_timing_controller import AdaptiveTimingController, GameStateSnapshot, create_adaptive_timing_controller
-from enhanced_action_detection import EnhancedActionDetector, ActionElement, create_enhanced_action_detector
-from advanced_decision_engine import AdvancedDecisionEngine, DecisionContext, OpponentProfile as AdvancedOpponentProfile, PlayingStyle, BoardTexture, create_advanced_decision_engine
-from enhanced_opponent_tracking import EnhancedOpponentTracker, EnhancedOpponentProfile, ActionData, HandData, create_enhanced_opponent_tracker
-from performance_monitor import PerformanceMonitor, HandPerformance, SessionMetrics, create_performance_monitor
-
-# Import existing modules
-from enhanced_opponent_analysis import get_enhanced_opponent_analysis
-from improved_postflop_decisions import make_improved_postflop_decision, format_decision_explanation
-from session_performance_tracker import SessionPerformanceTracker, HandResult, get_session_tracker
+# The enhancement modules (timing, action detection, advanced engine, enhanced tracking,
+# performance monitoring, session tracking) load on first use; see the cached properties below.
+from stage_timing import get_stage_timer
+from html_snapshot_cache import create_html_snapshot_cache
+from decision_budget import StageCostEstimates, create_decision_budget
+from action_log import create_action_log
 
 # Import base modules
-from poker_bot import PokerBot
+from poker_bot import PokerBot, DEFAULT_STAGE_ESTIMATES_MS
 from decision_engine import ACTION_FOLD, ACTION_CHECK, ACTION_CALL, ACTION_RAISE
 
+if TYPE_CHECKING:
+    from adaptive_timing_controller import GameStateSnapshot
+    from advanced_decision_engine import DecisionContext, OpponentProfile as AdvancedOpponentProfile, BoardTexture
+    from enhanced_opponent_tracking import EnhancedOpponentProfile
+
 class EnhancedPokerBot(PokerBot):
     """Enhanced poker bot with comprehensive improvements integrated."""
     
@@ -48,15 +49,19 @@ class EnhancedPokerBot(PokerBot):
             self.player_data = []
             self.action_history = []
             self.current_hand_id_for_history = None
-        
-        # Initialize enhanced components
-        self.timing_controller = create_adaptive_timing_controller()
-        self.action_detector = create_enhanced_action_detector(self.parser)
-        self.decision_engine_advanced = create_advanced_decision_engine(self.config.settings)
-        self.opponent_tracker_enhanced = create_enhanced_opponent_tracker(self.config.settings, self.logger)
-        self.performance_monitor = create_performance_monitor(self.config.settings)
-        self.session_tracker = get_session_tracker()
-        
+            self.snapshot_cache = create_html_snapshot_cache()
+            self.last_decision_budget = None
+            self.stage_estimates = StageCostEstimates(DEFAULT_STAGE_ESTIMATES_MS)
+            self.opponent_store = None
+            self.action_log = create_action_log()
+            self.range_estimator = None
+            self.stage_timer = get_stage_timer()
+            self.decision_profiler = None
+        
+        # Enhanced components are built on first use; the enhanced tracker replays the action log when built
+        # Columnar archive for the performance trackers, opened by the live loop only
+        self.performance_archive = None
+
         # Enhanced tracking
         self.current_hand_start_time = None
         self.current_hand_starting_stack = 0.0
@@ -79,10 +84,71 @@ class EnhancedPokerBot(PokerBot):
         
         self.logger.info("Enhanced Poker Bot initialized with comprehensive improvements")
     
+    @cached_property
+    def timing_controller(self):
+        from adaptive_timing_controller import create_adaptive_timing_controller
+        return create_adaptive_timing_controller()
+
+    @cached_property
+    def action_detector(self):
+        from enhanced_action_detection import create_enhanced_action_detector
+        return create_enhanced_action_detector(self.parser)
+
+    @cached_property
+    def decision_engine_advanced(self):
+        from advanced_decision_engine import create_advanced_decision_engine
+        return create_advanced_decision_engine(self.config.settings)
+
+    @cached_property
+    def opponent_tracker_enhanced(self):
+        from enhanced_opponent_tracking import create_enhanced_opponent_tracker
+        return create_enhanced_opponent_tracker(self.config.settings, self.logger, profile_store=self.opponent_store,
+                                                action_log=self.action_log)
+
+    def open_opponent_store(self):
+        """Open the profile store for both trackers (the enhanced one may already be built)."""
+        store = super().open_opponent_store()
+        if store and 'opponent_tracker_enhanced' in self.__dict__:
+            self.opponent_tracker_enhanced.profile_store = store
+        return store
+
+    @cached_property
+    def performance_monitor(self):
+        from performance_monitor import create_performance_monitor
+        return create_performance_monitor(self.config.settings)
+
+    @cached_property
+    def session_tracker(self):
+        from session_performance_tracker import get_session_tracker
+        return get_session_tracker()
+
+    def open_performance_archive(self):
+        """Route the performance monitor's and session tracker's records into the hand archive."""
+        if self.performance_archive is None:
+            from hand_archive import create_archive_writer
+            self.performance_archive = create_archive_writer(self.config.settings, base_dir='logs')
+        if self.performance_archive:
+            self.performance_monitor.archive = self.performance_archive
+            self.session_tracker.archive = self.performance_archive
+            self.logger.info(f"Performance records archive to {self.performance_archive.root}")
+        return self.performance_archive
+
+    def close_performance_archive(self):
+        """Archive the monitor's session metrics and write the buffered row groups."""
+        if not self.performance_archive:
+            return
+        try:
+            self.performance_monitor.save_performance_data()
+            self.performance_archive.close()
+        except Exception as e:
+            self.logger.error(f"Error closing performance archive: {e}")
+
     def enhanced_main_loop(self):
         """Enhanced main loop with comprehensive improvements."""
         
         self.logger.info("Enhanced Poker Bot - Main Loop Started")
+        self.open_opponent_store()
+        self.open_performance_archive()
         self.performance_monitor.session_start_time = time.time()
         
         try:
@@ -104,10 +170,18 @@ class EnhancedPokerBot(PokerBot):
                 if not current_html:
                     self._handle_parse_failure()
                     continue
+                if self.decision_profiler:
+                    self.decision_profiler.begin_cycle('enhanced_decision_cycle')
+                
+                # Deadline for this decision cycle
+                budget = create_decision_budget(self.config.settings)
+                self.last_decision_budget = budget
                 
                 # Parse HTML with enhanced detection
-                parsed_result = self._enhanced_parse_html(current_html)
+                parsed_result = self._enhanced_parse_html(current_html, budget)
                 if not parsed_result:
+                    if self.decision_profiler:
+                        self.decision_profiler.end_cycle()
                     self._handle_parse_failure()
                     continue
                 
@@ -122,23 +196,28 @@ class EnhancedPokerBot(PokerBot):
                 # Enhanced game state analysis
                 game_analysis = self._enhanced_game_analysis(parsed_result)
                 if not game_analysis:
+                    if self.decision_profiler:
+                        self.decision_profiler.end_cycle()
                     continue
                 
                 # Decision making with enhanced logic
                 if game_analysis['my_turn']:
                     self.logger.info("My turn detected - making enhanced decision")
-                    decision_result = self._make_enhanced_decision(game_analysis)
+                    decision_result = self._make_enhanced_decision(game_analysis, budget)
                     if decision_result:
                         self._execute_enhanced_action(decision_result, game_analysis)
                         self.timing_controller.record_action_taken()
                 else:
                     self._handle_waiting_state(game_analysis)
                 
-                # Update performance monitoring
-                self._update_performance_tracking(game_analysis)
-                
-                # Apply adaptive strategy adjustments
-                self._apply_adaptive_adjustments()
+                with self.stage_timer.stage('performance_tracking'):
+                    # Update performance monitoring
+                    self._update_performance_tracking(game_analysis)
+                    
+                    # Apply adaptive strategy adjustments
+                    self._apply_adaptive_adjustments()
+                if self.decision_profiler:
+                    self.decision_profiler.end_cycle()
                   # Adaptive timing based on game activity
                 recommended_delay = self.timing_controller.get_recommended_delay()
                 time.sleep(recommended_delay)
@@ -172,8 +251,9 @@ class EnhancedPokerBot(PokerBot):
         self.failed_parses += 1
         return None
     
-    def _create_game_state_snapshot(self, parsed_result: Dict = None) -> GameStateSnapshot:
+    def _create_game_state_snapshot(self, parsed_result: Dict = None) -> 'GameStateSnapshot':
         """Create a game state snapshot for timing decisions."""
+        from adaptive_timing_controller import GameStateSnapshot
         if not parsed_result:
             return GameStateSnapshot(
                 hand_id=None,
@@ -213,16 +293,26 @@ class EnhancedPokerBot(PokerBot):
         if self.last_game_state:
             self.timing_controller.record_parse_result(self.last_game_state, False)
     
-    def _enhanced_parse_html(self, html_content: str) -> Optional[Dict]:
+    def _enhanced_parse_html(self, html_content: str, budget=None) -> Optional[Dict]:
         """Parse HTML with enhanced action detection."""
         try:
+            # Unchanged or timer-only snapshots reuse the previous enhanced result
+            snapshot = self.snapshot_cache.lookup(html_content)
+            if snapshot.is_reusable and snapshot.analysis:
+                cached_result = snapshot.analysis['enhanced_result']
+                self.table_data = cached_result['table_data']
+                self.player_data = cached_result['player_data']
+                return cached_result
+            
             # Use base parser for initial parsing
-            parsed_state = self.parser.parse_html(html_content)
+            with self.stage_timer.stage('parse'):
+                parsed_state = self.parser.parse_html(html_content)
             if not parsed_state or parsed_state.get('error'):
+                self.snapshot_cache.invalidate()
                 return None
             
             # Populate data structures
-            self.analyze()
+            self.analyze(budget)
             
             # Enhanced action detection
             actions, confidence = self.action_detector.detect_available_actions()
@@ -239,6 +329,7 @@ class EnhancedPokerBot(PokerBot):
                 'enhanced_actions': actions
             }
             
+            self.snapshot_cache.store(snapshot, parsed_state, {'enhanced_result': enhanced_result})
             return enhanced_result
             
         except Exception as e:
@@ -264,6 +355,7 @@ class EnhancedPokerBot(PokerBot):
             active_opponents_count = len([p for p in parsed_result['player_data'] 
                                         if not p.get('is_empty', False) and not p.get('is_my_player', False)])
             
+            from enhanced_opponent_analysis import get_enhanced_opponent_analysis
             opponent_analysis = get_enhanced_opponent_analysis(
                 opponent_tracker=self.opponent_tracker,
                 active_opponents_count=active_opponents_count,
@@ -304,6 +396,11 @@ class EnhancedPokerBot(PokerBot):
             self.current_hand_starting_stack > 0):
             
             self._complete_hand_tracking()
+
+        if self.current_hand_id_for_history:
+            self.opponent_tracker_enhanced.end_hand()
+        if self.range_estimator:
+            self.range_estimator.new_hand(hand_id)
         
         # Start new hand tracking
         self.current_hand_id_for_history = hand_id
@@ -354,6 +451,7 @@ class EnhancedPokerBot(PokerBot):
                 outcome = 'fold'  # Likely folded
             
             # Create hand result
+            from session_performance_tracker import HandResult
             hand_result = HandResult(
                 hand_id=self.current_hand_id_for_history,
                 start_time=self.current_hand_start_time,
@@ -375,8 +473,8 @@ class EnhancedPokerBot(PokerBot):
         except Exception as e:
             self.logger.error(f"Error completing hand tracking: {e}")
     
-    def _make_enhanced_decision(self, game_analysis: Dict) -> Optional[Dict]:
-        """Make decision using advanced decision engine."""
+    def _make_enhanced_decision(self, game_analysis: Dict, budget=None) -> Optional[Dict]:
+        """Make decision using advanced decision engine (within budget, if one is given)."""
         
         try:
             my_player = game_analysis['my_player']
@@ -399,14 +497,22 @@ class EnhancedPokerBot(PokerBot):
             self.logger.info(f"Available actions detected: {available_actions}")
             self.logger.info(f"Bet to call: {bet_to_call}, Pot size: {pot_size}, Win probability: {win_probability}")
             
-            # Get opponent profiles
+            # Get opponent profiles (optional: skipped when the budget cannot cover their usual cost)
             opponent_profiles = []
-            for player in game_analysis.get('player_data', []):
-                if not player.get('is_my_player', False) and not player.get('is_empty', False):
-                    profile = self.opponent_tracker_enhanced.get_or_create_opponent(player.get('name', 'Unknown'))
-                    opponent_profiles.append(self._convert_to_advanced_profile(profile))
+            stage_start = time.perf_counter()
+            if budget is None or budget.try_stage('opponent_profiles', self.stage_estimates.get('opponent_profiles'),
+                                                  "opponent profiles skipped"):
+                with self.stage_timer.stage('opponent_analysis'):
+                    for player in game_analysis.get('player_data', []):
+                        if not player.get('is_my_player', False) and not player.get('is_empty', False):
+                            profile = self.opponent_tracker_enhanced.get_or_create_opponent(player.get('name', 'Unknown'))
+                            opponent_profiles.append(self._convert_to_advanced_profile(profile))
+                self.stage_estimates.update('opponent_profiles', (time.perf_counter() - stage_start) * 1000.0)
+            if budget is not None:
+                budget.record_cost('opponent_profiles', (time.perf_counter() - stage_start) * 1000.0)
             
             # Create decision context
+            from advanced_decision_engine import DecisionContext
             context = DecisionContext(
                 hand_strength=my_player.get('hand_evaluation', ('', 'Unknown'))[1],
                 position=my_player.get('position', 'Unknown'),
@@ -426,7 +532,11 @@ class EnhancedPokerBot(PokerBot):
             # Apply adaptive adjustments
             self._apply_strategy_adjustments_to_context(context)
               # Make advanced decision
-            action, amount, reasoning = self.decision_engine_advanced.make_advanced_decision(context)
+            stage_start = time.perf_counter()
+            with self.stage_timer.stage('advanced_decision'):
+                action, amount, reasoning = self.decision_engine_advanced.make_advanced_decision(context)
+            if budget is not None:
+                budget.record_cost('advanced_decision', (time.perf_counter() - stage_start) * 1000.0)
               # CRITICAL SAFEGUARD: Never fold when check is available
             if action == 'fold' and 'check' in available_actions:
                 action = 'check'
@@ -455,7 +565,8 @@ class EnhancedPokerBot(PokerBot):
                     'position': context.position,
                     'win_probability': win_probability,
                     'pot_odds': pot_odds,
-                    'stack_size': stack_size
+                    'stack_size': stack_size,
+                    'degradation_level': budget.degradation_level if budget is not None else 0
                 }
             }
             
@@ -468,8 +579,9 @@ class EnhancedPokerBot(PokerBot):
             self.logger.error(f"Enhanced decision making error: {e}")
             return {'action': 'fold', 'amount': 0.0, 'reasoning': 'Error fallback'}
     
-    def _convert_to_advanced_profile(self, enhanced_profile: EnhancedOpponentProfile) -> AdvancedOpponentProfile:
+    def _convert_to_advanced_profile(self, enhanced_profile: 'EnhancedOpponentProfile') -> 'AdvancedOpponentProfile':
         """Convert enhanced profile to advanced decision engine format."""
+        from advanced_decision_engine import OpponentProfile as AdvancedOpponentProfile
         return AdvancedOpponentProfile(
             name=enhanced_profile.player_name,
             vpip=enhanced_profile.vpip,
@@ -480,51 +592,12 @@ class EnhancedPokerBot(PokerBot):
             stack_size=enhanced_profile.avg_stack_size
         )
     
-    def _classify_board_texture(self, community_cards: List[str]) -> BoardTexture:
+    def _classify_board_texture(self, community_cards: List[str]) -> 'BoardTexture':
         """Classify board texture for decision making."""
-        if len(community_cards) < 3:
-            return BoardTexture.DRY
-        
-        # Simple classification - could be enhanced
-        suits = [card[-1] for card in community_cards[:3]]
-        ranks = [card[:-1] for card in community_cards[:3]]
-        
-        # Check for flush draw
-        suit_counts = {}
-        for suit in suits:
-            suit_counts[suit] = suit_counts.get(suit, 0) + 1
-        max_suit_count = max(suit_counts.values()) if suit_counts else 0
-        
-        # Check for straight possibilities
-        rank_values = []
-        for rank in ranks:
-            if rank == 'A':
-                rank_values.append(14)
-            elif rank == 'K':
-                rank_values.append(13)
-            elif rank == 'Q':
-                rank_values.append(12)
-            elif rank == 'J':
-                rank_values.append(11)
-            elif rank == 'T':
-                rank_values.append(10)
-            else:
-                rank_values.append(int(rank))
-        
-        rank_values.sort()
-        is_connected = len(rank_values) >= 2 and (rank_values[-1] - rank_values[0]) <= 4
-        
-        # Classify texture
-        if max_suit_count >= 2 and is_connected:
-            return BoardTexture.WET
-        elif max_suit_count >= 3:
-            return BoardTexture.WET
-        elif is_connected:            return BoardTexture.COORDINATED
-        elif max_suit_count == 1:            return BoardTexture.RAINBOW
-        else:
-            return BoardTexture.DRY
+        from advanced_decision_engine import BoardTexture
+        return BoardTexture.from_cards(community_cards)
     
-    def _apply_strategy_adjustments_to_context(self, context: DecisionContext):
+    def _apply_strategy_adjustments_to_context(self, context: 'DecisionContext'):
         """Apply adaptive strategy adjustments to decision context."""
         adjustments = self.performance_monitor.get_adaptive_adjustments()
         
@@ -558,6 +631,7 @@ class EnhancedPokerBot(PokerBot):
                                   if action.get('was_bluff', False) and action.get('successful', False))
             
             # Create hand performance record
+            from performance_monitor import HandPerformance
             hand_performance = HandPerformance(
                 hand_id=self.current_hand_id_for_history,
                 timestamp=self.current_hand_start_time,
@@ -773,14 +847,14 @@ class EnhancedPokerBot(PokerBot):
             if isinstance(street, str):
                 street = street.lower()  # Normalize to lowercase
             
-            # Track our action in opponent modeling using log_action method
-            self.opponent_tracker_enhanced.log_action(
+            # Record our action in the action log, which feeds the opponent trackers
+            self.action_log.append(
                 player_name=my_name,
                 action_type=action_record['action_type'],
                 street=street,
                 position=self._get_last_known_position(),
                 amount=action_record['amount'],
-                pot_size_before_action=game_analysis.get('table_data', {}).get('pot_size', 0.0),
+                pot_size_before=game_analysis.get('table_data', {}).get('pot_size', 0.0),
                 stack_size=action_record['stack_size'],
                 hand_id=game_analysis.get('table_data', {}).get('hand_id', ''),
                 decision_time=0.0  # We could track this if needed
@@ -858,15 +932,25 @@ class EnhancedPokerBot(PokerBot):
                 self.opponent_tracker_enhanced.save_to_file('enhanced_opponent_data.json')
                 self.logger.info("Enhanced opponent data saved")
             
+            # Persist opponent profiles
+            self.opponent_tracker_enhanced.end_hand()
+            self.close_opponent_store()
+            
             # Save performance data
             if hasattr(self.performance_monitor, 'save_session_data'):
                 self.performance_monitor.save_session_data('session_performance.json')
                 self.logger.info("Performance data saved")
             
+            # Per-stage latency percentiles
+            self.export_stage_timings()
+            self.export_decision_profile()
+            
             # Save session tracker data
-            if hasattr(self.session_tracker, 'save_session'):
-                self.session_tracker.save_session()
+            if hasattr(self.session_tracker, 'save_session_data'):
+                self.session_tracker.save_session_data()
                 self.logger.info("Session tracker data saved")
+
+            self.close_performance_archive()
             
         except Exception as e:
             self.logger.error(f"Error during session cleanup: {e}", exc_info=True)
@@ -306,9 +306,18 @@ def get_spr_strategy_recommendation(
     street: str = 'flop',
     position: str = 'BB',
     opponent_count: int = 1,
-    board_texture: str = 'moderate'
+    board_texture: str = 'moderate',
+    decision_context=None
 ) -> Dict[str, str]:
-    """Get SPR-based strategy recommendation."""
+    """Get SPR-based strategy recommendation (memoised on decision_context if given)."""
+    if decision_context is not None:
+        return decision_context.get_feature(
+            'spr_strategy',
+            lambda: spr_strategy.get_spr_strategy(
+                spr, hand_strength, street, position, opponent_count, board_texture
+            ),
+            spr, hand_strength, street, position, opponent_count, board_texture
+        )
     return spr_strategy.get_spr_strategy(
         spr, hand_strength, street, position, opponent_count, board_texture
     )
@@ -317,9 +326,16 @@ def should_commit_stack_spr(
     spr: float,
     hand_strength: str,
     pot_commitment_ratio: float,
-    street: str = 'flop'
+    street: str = 'flop',
+    decision_context=None
 ) -> Tuple[bool, str]:
-    """Determine if stack commitment is appropriate based on SPR."""
+    """Determine if stack commitment is appropriate based on SPR (memoised on decision_context if given)."""
+    if decision_context is not None:
+        return decision_context.get_feature(
+            'stack_commitment',
+            lambda: spr_strategy.should_commit_stack(spr, hand_strength, pot_commitment_ratio, street),
+            spr, hand_strength, pot_commitment_ratio, street
+        )
     return spr_strategy.should_commit_stack(spr, hand_strength, pot_commitment_ratio, street)
 
 def get_protection_needs_spr(
@@ -1,6 +1,9 @@
 import random
+import time
+from collections import OrderedDict
 from itertools import combinations
 from hand_evaluator import HandEvaluator
+from decision_budget import DEGRADATION_CACHED_EQUITY, DEGRADATION_REDUCED_TRIALS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,9 +15,16 @@ class EquityCalculator:
         '♠': '♠', '♥': '♥', '♦': '♦', '♣': '♣'  # Idempotent for already symbol-suited cards
     }
 
+    EQUITY_CACHE_SIZE = 256
+    DEADLINE_CHECK_INTERVAL = 32  # Simulations between budget checks
+
     def __init__(self):
         self.hand_evaluator = HandEvaluator()
         self.all_cards = self._generate_deck()
+        # Running estimate of one simulation's cost, used to size runs to a decision budget
+        self.trial_cost_ms = 0.5
+        # (hole cards, board) -> (win, tie, equity) of the last full-size runs
+        self._equity_cache = OrderedDict()
     
     def _generate_deck(self):
         """Generate a standard 52-card deck"""
@@ -59,7 +69,14 @@ class EquityCalculator:
         """Get cards that are not in the known cards list"""
         return [card for card in self.all_cards if card not in known_cards]
     
-    def calculate_equity_monte_carlo(self, hole_cards_str_list, community_cards_str_list, opponent_range_str_list, num_simulations):
+    def calculate_equity_monte_carlo(self, hole_cards_str_list, community_cards_str_list, opponent_range_str_list, num_simulations, budget=None, opponent_weights=None):
+        """
+        Monte Carlo equity vs a random hand, or vs hands drawn from `opponent_weights`
+        (a 1326-combo weight vector from range_estimation) when given. With a
+        DecisionBudget, the number of simulations is sized to the time left, the run
+        stops at the deadline, and a cached result for the same cards is returned
+        when no run is affordable.
+        """
         logger.debug(
             f"Enter calculate_equity_monte_carlo. Hole Cards: {hole_cards_str_list}, "
             f"Community Cards: {community_cards_str_list}, Opponent Range: {opponent_range_str_list}, "
@@ -114,7 +131,38 @@ class EquityCalculator:
             logger.error(f"Error during initial card conversion to objects: {e}", exc_info=True)
             return 0.0, 0.0, 0.0
 
+        # Results against a narrowed range are not comparable across calls, so they are not cached
+        cache_key = None if opponent_weights is not None else (
+            tuple(player_hole_cards_str_list_for_conversion), tuple(community_cards_str_list))
+        requested_simulations = num_simulations
+        if budget is not None:
+            num_simulations = budget.plan_trials(requested_simulations, self.trial_cost_ms)
+            if num_simulations == 0:
+                cached_result = self._equity_cache.get(cache_key) if cache_key is not None else None
+                if cached_result is not None:
+                    budget.degrade(DEGRADATION_CACHED_EQUITY, "no time for equity trials; using cached equity")
+                    return cached_result
+                num_simulations = min(budget.min_equity_trials, requested_simulations)
+                budget.degrade(DEGRADATION_REDUCED_TRIALS, f"no time for equity trials; running minimum {num_simulations}")
+
+        range_hands = None
+        if opponent_weights is not None:
+            from range_estimation import sample_combos
+            range_hands = sample_combos(opponent_weights, num_simulations, known_cards_strings)
+            if not range_hands:
+                logger.warning("Opponent range has no live combos; falling back to a random hand")
+                range_hands = None
+
+        # Trials stop at the end of the equity stage's allowance, leaving the rest of the budget to later stages
+        stop_at = budget.stage_deadline('equity') if budget is not None else None
+        simulations_attempted = 0
+        run_start = time.perf_counter()
         for i in range(num_simulations):
+            if (budget is not None and total_simulations_count and i % self.DEADLINE_CHECK_INTERVAL == 0
+                    and budget.past(stop_at)):
+                budget.degrade(DEGRADATION_REDUCED_TRIALS, f"equity stopped at deadline after {total_simulations_count} trials")
+                break
+            simulations_attempted += 1
             current_deck_sim_strings = list(deck_strings) # Use the correctly pre-filtered string deck
             
             try:
@@ -129,7 +177,10 @@ class EquityCalculator:
                 if len(current_deck_sim_strings) < 2:
                     logger.debug(f"Sim {i}: Not enough cards for opponent hand. Deck: {len(current_deck_sim_strings)}. Skipping.")
                     continue
-                opponent_hole_cards_strings = random.sample(current_deck_sim_strings, 2)
+                if range_hands is not None:
+                    opponent_hole_cards_strings = list(range_hands[i])
+                else:
+                    opponent_hole_cards_strings = random.sample(current_deck_sim_strings, 2)
                 
                 # Remove opponent cards from available deck for board dealing
                 remaining_deck = [c for c in current_deck_sim_strings if c not in opponent_hole_cards_strings]
@@ -194,6 +245,12 @@ class EquityCalculator:
                 # Continue to next simulation attempt
                 continue
         
+        run_ms = (time.perf_counter() - run_start) * 1000.0
+        if simulations_attempted:
+            self.trial_cost_ms = 0.7 * self.trial_cost_ms + 0.3 * (run_ms / simulations_attempted)
+        if budget is not None:
+            budget.record_cost('equity', run_ms)
+
         if total_simulations_count == 0:
             logger.warning(
                 f"Total successful simulations was 0 for hole_cards: {player_hole_cards_str_list_for_conversion}, "
@@ -212,6 +269,11 @@ class EquityCalculator:
             f"Win: {win_probability*100:.2f}%, Tie: {tie_probability*100:.2f}%, Equity: {equity*100:.2f}% "
             f"({total_simulations_count} simulations)"
         )
+        if cache_key is not None and total_simulations_count >= requested_simulations:
+            self._equity_cache[cache_key] = (win_probability, tie_probability, equity)
+            self._equity_cache.move_to_end(cache_key)
+            if len(self._equity_cache) > self.EQUITY_CACHE_SIZE:
+                self._equity_cache.popitem(last=False)
         return win_probability, tie_probability, equity
     
     def _compare_hands(self, hand1_eval, hand2_eval):
@@ -302,7 +364,7 @@ class EquityCalculator:
         )
         return win_prob
     
-    def calculate_win_probability(self, hole_cards, community_cards, num_opponents=1):
+    def calculate_win_probability(self, hole_cards, community_cards, num_opponents=1, budget=None):
         """
         Calculate win probability against random opponents.
         This is a wrapper method around calculate_equity_monte_carlo for compatibility.
@@ -311,6 +373,7 @@ class EquityCalculator:
             hole_cards: Hero's hole cards (tuple or list format)
             community_cards: Community cards (list)
             num_opponents: Number of opponents (default 1)
+            budget: Optional DecisionBudget bounding the simulation time
             
         Returns:
             float: Win probability (0.0 to 1.0)
@@ -360,6 +423,7 @@ class EquityCalculator:
         
         # The monte carlo method expects [hole_cards_list], community_cards, opponent_range, num_simulations
         win_prob, _, _ = self.calculate_equity_monte_carlo(
-            [hole_cards], community_cards, None, 500  # 500 simulations for reasonable speed
+            [hole_cards], community_cards, None, 500,  # 500 simulations for reasonable speed
+            budget=budget
         )
         return win_prob
@@ -1,25 +1,207 @@
 """
 Game Logger for Poker Bot
 Provides comprehensive logging functionality for analyzing game decisions and performance.
+
+Decisions, hand results and performance metrics also go to the columnar
+hand_archive (typed row groups partitioned by date and session) next to the CSVs.
+
+Writing happens on a background thread: the public logging methods only put a
+record on a queue, and a BackgroundWriter drains it, keeps the CSV files and
+log files open, writes in batches and flushes on an interval, on flush() and
+at shutdown. The decision path pays for an enqueue instead of file I/O.
 """
 
+import atexit
+import copy
 import logging
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import csv
 
+from hand_archive import create_archive_writer
+
+module_logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 1.0   # Seconds between flushes of the open files
+DEFAULT_QUEUE_SIZE = 10000     # Records beyond this are dropped rather than blocking the bot
+MAX_BATCH = 256
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that leaves flushing to the background writer."""
+
+    def flush(self):
+        pass
+
+    def flush_buffer(self):
+        self.acquire()
+        try:
+            if self.stream and not self.stream.closed:
+                self.stream.flush()
+        finally:
+            self.release()
+
+
+class BackgroundWriter:
+    """Queue drained by a daemon thread that owns the open CSV files and batches writes."""
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_queue: int = DEFAULT_QUEUE_SIZE,
+                 name: str = 'game-logger-writer'):
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._csv_files: Dict[str, Tuple[Any, Any]] = {}
+        self._flushables: List[_BufferedFileHandler] = []
+        self._last_flush = time.monotonic()
+        self._closed = False
+        # Updated from the producer threads and the writer thread, so every increment takes the lock
+        self.stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'flushes': 0, 'dropped': 0, 'errors': 0}
+        self._stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    # --- Producer side (called on the bot's threads) ----------------------------
+
+    def _put(self, item) -> bool:
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self._count('dropped')
+            return False
+        self._count('enqueued')
+        return True
+
+    def write_row(self, path: str, row: List[Any]) -> bool:
+        """Queue a CSV row for `path` (the file is opened in append mode on first use)."""
+        return self._put(('row', path, row))
+
+    def submit(self, fn: Callable, *args) -> bool:
+        """Queue a call to run on the writer thread (used for formatted log output)."""
+        return self._put(('call', fn, args))
+
+    def add_flushable(self, handler: _BufferedFileHandler):
+        self._flushables.append(handler)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until everything queued so far is written and flushed to disk."""
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(('flush', done, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Write what is queued, flush and close the files, and stop the thread."""
+        if self._closed:
+            return
+        if self._thread.is_alive():
+            try:
+                self._queue.put(('stop', None, None), timeout=timeout)
+            except queue.Full:
+                module_logger.warning("Game logger queue still full at shutdown; stopping without draining")
+            self._thread.join(timeout)
+        self._closed = True
+
+    # --- Writer thread --------------------------------------------------------------
+
+    def _run(self):
+        running = True
+        while running:
+            wait = max(0.0, self.flush_interval - (time.monotonic() - self._last_flush))
+            try:
+                batch = [self._queue.get(timeout=wait)]
+            except queue.Empty:
+                self._flush_files()
+                continue
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            flush_events = []
+            for kind, first, second in batch:
+                if kind == 'row':
+                    self._write_row(first, second)
+                elif kind == 'call':
+                    try:
+                        first(*second)
+                    except Exception as e:
+                        self._count('errors')
+                        module_logger.error(f"Game logger write failed: {e}")
+                elif kind == 'flush':
+                    flush_events.append(first)
+                elif kind == 'stop':
+                    running = False
+            self._count('batches')
+
+            if flush_events or not running or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_files()
+            for event in flush_events:
+                event.set()
+        self._close_files()
+
+    def _write_row(self, path: str, row: List[Any]):
+        try:
+            entry = self._csv_files.get(path)
+            if entry is None:
+                handle = open(path, 'a', newline='', encoding='utf-8')
+                entry = self._csv_files[path] = (handle, csv.writer(handle))
+            entry[1].writerow(row)
+            self._count('written')
+        except Exception as e:
+            self._count('errors')
+            module_logger.error(f"Failed to write CSV row to {path}: {e}")
+
+    def _flush_files(self):
+        for handle, _ in self._csv_files.values():
+            try:
+                handle.flush()
+            except Exception as e:
+                module_logger.error(f"Failed to flush {handle.name}: {e}")
+        for handler in self._flushables:
+            handler.flush_buffer()
+        self._last_flush = time.monotonic()
+        self._count('flushes')
+
+    def _close_files(self):
+        self._flush_files()
+        for handle, _ in self._csv_files.values():
+            handle.close()
+        self._csv_files.clear()
+
+
 class GameLogger:
     """Centralized logging system for poker bot game analysis."""
     
-    def __init__(self, base_log_dir: str = "logs"):
+    def __init__(self, base_log_dir: str = "logs", flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 config: Optional[Dict] = None):
         """Initialize the game logger with separate log files for different data types."""
         self.base_log_dir = base_log_dir
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Create logs directory if it doesn't exist
         os.makedirs(base_log_dir, exist_ok=True)
+
+        # Background thread doing all file writes after setup
+        self.writer = BackgroundWriter(flush_interval)
+        atexit.register(self.close)
+
+        # Columnar archive, only touched from the writer thread
+        self.archive = create_archive_writer(config, self.session_id, base_log_dir)
         
         # Initialize different loggers for different purposes
         self._setup_loggers()
@@ -81,9 +263,10 @@ class GameLogger:
         for handler in logger.handlers[:]:
             logger.removeHandler(handler)
         
-        # Create file handler
-        handler = logging.FileHandler(filename, mode='a', encoding='utf-8')
+        # Create file handler; the background writer flushes it
+        handler = _BufferedFileHandler(filename, mode='a', encoding='utf-8')
         handler.setLevel(level)
+        self.writer.add_flushable(handler)
         
         # Create formatter
         formatter = logging.Formatter(
@@ -128,46 +311,80 @@ class GameLogger:
                 'timestamp', 'metric_type', 'value', 'description'
             ])
     
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until everything logged so far has been written to disk."""
+        if self.archive is not None:
+            self.writer.submit(self.archive.flush)
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Drain the queue, close the log and CSV files and stop the writer thread."""
+        atexit.unregister(self.close)
+        if self.archive is not None:
+            self.writer.submit(self.archive.close)
+        self.writer.close()
+        for logger in (self.main_logger, self.decision_logger, self.hand_logger,
+                       self.error_logger, self.performance_logger):
+            for handler in logger.handlers[:]:
+                handler.close()
+                logger.removeHandler(handler)
+
     def log_session_start(self):
         """Log the start of a new session."""
+        self.writer.submit(self._emit_session_start, self.session_id, self.session_start_time)
+
+    def _emit_session_start(self, session_id: str, session_start_time: datetime):
         self.main_logger.info("="*80)
-        self.main_logger.info(f"POKER BOT SESSION STARTED - ID: {self.session_id}")
-        self.main_logger.info(f"Session Start Time: {self.session_start_time}")
+        self.main_logger.info(f"POKER BOT SESSION STARTED - ID: {session_id}")
+        self.main_logger.info(f"Session Start Time: {session_start_time}")
         self.main_logger.info("="*80)
     
     def log_session_end(self):
-        """Log the end of a session with summary statistics."""
+        """Log the end of a session with summary statistics and flush everything to disk."""
         session_duration = datetime.now() - self.session_start_time
-        
-        self.main_logger.info("="*80)
-        self.main_logger.info("POKER BOT SESSION ENDED")
-        self.main_logger.info(f"Session Duration: {session_duration}")
-        self.main_logger.info(f"Total Hands Played: {self.hand_count}")
-        self.main_logger.info(f"Total Decisions Made: {self.decisions_made}")
-        if self.hand_count > 0:
-            self.main_logger.info(f"Average Decisions per Hand: {self.decisions_made / self.hand_count:.2f}")
-        self.main_logger.info("="*80)
+        self.writer.submit(self._emit_session_end, session_duration, self.hand_count, self.decisions_made)
         
         # Log performance metrics
         self._log_performance_metric("session_duration_seconds", session_duration.total_seconds())
         self._log_performance_metric("total_hands", self.hand_count)
         self._log_performance_metric("total_decisions", self.decisions_made)
+        self.flush()
+
+    def _emit_session_end(self, session_duration, hand_count: int, decisions_made: int):
+        self.main_logger.info("="*80)
+        self.main_logger.info("POKER BOT SESSION ENDED")
+        self.main_logger.info(f"Session Duration: {session_duration}")
+        self.main_logger.info(f"Total Hands Played: {hand_count}")
+        self.main_logger.info(f"Total Decisions Made: {decisions_made}")
+        if hand_count > 0:
+            self.main_logger.info(f"Average Decisions per Hand: {decisions_made / hand_count:.2f}")
+        self.main_logger.info("="*80)
     
     def log_new_hand(self, hand_id: str, starting_stack: float):
         """Log the start of a new hand."""
         self.hand_count += 1
-        self.main_logger.info(f"\n--- NEW HAND #{self.hand_count} ---")
+        self.writer.submit(self._emit_new_hand, self.hand_count, hand_id, starting_stack)
+
+    def _emit_new_hand(self, hand_number: int, hand_id: str, starting_stack: float):
+        self.main_logger.info(f"\n--- NEW HAND #{hand_number} ---")
         self.main_logger.info(f"Hand ID: {hand_id}")
         self.main_logger.info(f"Starting Stack: ${starting_stack:.2f}")
         
-        self.hand_logger.info(f"Hand #{self.hand_count} - ID: {hand_id} - Starting Stack: ${starting_stack:.2f}")
+        self.hand_logger.info(f"Hand #{hand_number} - ID: {hand_id} - Starting Stack: ${starting_stack:.2f}")
     
     def log_decision(self, decision_data: Dict[str, Any]):
-        """Log a decision with all relevant context."""
+        """Log a decision with all relevant context (queued; formatting happens on the writer thread)."""
         self.decisions_made += 1
+        timestamp = datetime.now()
         
+        # Write to CSV for structured analysis
+        self._write_decision_to_csv(timestamp, decision_data)
+        # Deep copy: the nested lists and dicts (ev_calculations, community_cards) are
+        # formatted later on the writer thread while the bot may still be mutating them
+        self.writer.submit(self._emit_decision, self.decisions_made, timestamp, copy.deepcopy(decision_data))
+
+    def _emit_decision(self, decision_number: int, timestamp: datetime, decision_data: Dict[str, Any]):
         # Extract key information
-        timestamp = datetime.now()
         hand_id = decision_data.get('hand_id', 'Unknown')
         game_stage = decision_data.get('game_stage', 'Unknown')
         action = decision_data.get('action', 'Unknown')
@@ -175,7 +392,7 @@ class GameLogger:
         reasoning = decision_data.get('reasoning', 'No reasoning provided')
         
         # Log to main logger
-        self.main_logger.info(f"DECISION #{self.decisions_made}: {action}" + 
+        self.main_logger.info(f"DECISION #{decision_number}: {action}" + 
                              (f" ${amount:.2f}" if amount > 0 else ""))
         self.main_logger.info(f"  Hand: {decision_data.get('hole_cards', 'Unknown')}")
         self.main_logger.info(f"  Rank: {decision_data.get('hand_description', 'Unknown')}")
@@ -184,7 +401,7 @@ class GameLogger:
         self.main_logger.info(f"  Reasoning: {reasoning}")
         
         # Log detailed decision analysis
-        self.decision_logger.debug(f"=== DECISION ANALYSIS #{self.decisions_made} ===")
+        self.decision_logger.debug(f"=== DECISION ANALYSIS #{decision_number} ===")
         self.decision_logger.debug(f"Timestamp: {timestamp}")
         self.decision_logger.debug(f"Hand ID: {hand_id}")
         self.decision_logger.debug(f"Game Stage: {game_stage}")
@@ -210,17 +427,19 @@ class GameLogger:
         self.decision_logger.debug(f"ACTION TAKEN: {action}" + (f" ${amount:.2f}" if amount > 0 else ""))
         self.decision_logger.debug(f"Reasoning: {reasoning}")
         self.decision_logger.debug("="*50)
-        
-        # Write to CSV for structured analysis
-        self._write_decision_to_csv(timestamp, decision_data)
     
     def log_game_state(self, table_data: Dict, player_data: List[Dict], my_player: Dict):
         """Log the current game state."""
+        active_players = len([p for p in player_data if not p.get('is_empty', True)])
+        self.writer.submit(self._emit_game_state, copy.deepcopy(table_data), active_players,
+                           copy.deepcopy(my_player) if my_player else None)
+
+    def _emit_game_state(self, table_data: Dict, active_players: int, my_player: Optional[Dict]):
         self.main_logger.info(f"\n--- GAME STATE ---")
         self.main_logger.info(f"Game Stage: {table_data.get('game_stage', 'Unknown')}")
         self.main_logger.info(f"Pot Size: ${table_data.get('pot_size', 'Unknown')}")
         self.main_logger.info(f"Community Cards: {table_data.get('community_cards', [])}")
-        self.main_logger.info(f"Active Players: {len([p for p in player_data if not p.get('is_empty', True)])}")
+        self.main_logger.info(f"Active Players: {active_players}")
         
         if my_player:
             self.main_logger.info(f"My Position: Seat {my_player.get('seat', 'Unknown')}")
@@ -232,21 +451,30 @@ class GameLogger:
     
     def log_error(self, error_msg: str, error_type: str = "ERROR", exception: Exception = None):
         """Log an error or warning."""
+        self.writer.submit(self._emit_error, error_msg, error_type, str(exception) if exception else None)
+
+    def _emit_error(self, error_msg: str, error_type: str, exception_text: Optional[str]):
         self.error_logger.error(f"[{error_type}] {error_msg}")
-        if exception:
-            self.error_logger.error(f"Exception Details: {str(exception)}")
+        if exception_text:
+            self.error_logger.error(f"Exception Details: {exception_text}")
         
         # Also log to main logger for visibility
         self.main_logger.warning(f"[{error_type}] {error_msg}")
     
     def log_performance(self, operation: str, duration: float, details: str = ""):
         """Log performance metrics."""
+        self.writer.submit(self._emit_performance, operation, duration, details)
+        self._log_performance_metric(operation, duration, details)
+
+    def _emit_performance(self, operation: str, duration: float, details: str):
         self.performance_logger.info(f"{operation}: {duration:.3f}s" + 
                                     (f" - {details}" if details else ""))
-        self._log_performance_metric(operation, duration, details)
     
     def log_html_retrieval(self, success: bool, html_length: int = 0, duration: float = 0):
         """Log HTML retrieval attempts."""
+        self.writer.submit(self._emit_html_retrieval, success, html_length, duration)
+
+    def _emit_html_retrieval(self, success: bool, html_length: int, duration: float):
         if success:
             self.main_logger.info(f"HTML Retrieved Successfully - Length: {html_length} chars in {duration:.3f}s")
         else:
@@ -255,6 +483,9 @@ class GameLogger:
     
     def log_ui_action(self, action: str, amount: float = None, success: bool = True):
         """Log UI actions taken."""
+        self.writer.submit(self._emit_ui_action, action, amount, success)
+
+    def _emit_ui_action(self, action: str, amount: Optional[float], success: bool):
         action_msg = f"UI Action: {action}"
         if amount is not None:
             action_msg += f" ${amount:.2f}"
@@ -266,52 +497,67 @@ class GameLogger:
         if not success:
             self.error_logger.warning(f"UI Action Failed: {action}")
     
+    def log_hand_result(self, hand_id: str, starting_stack: float, ending_stack: float,
+                        final_hand_rank: str = '', actions_taken: Any = '', total_invested: float = 0.0,
+                        hand_duration: float = 0.0):
+        """Record the outcome of a finished hand."""
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'hand_id': hand_id,
+            'starting_stack': starting_stack,
+            'ending_stack': ending_stack,
+            'profit_loss': ending_stack - starting_stack,
+            'final_hand_rank': final_hand_rank,
+            'actions_taken': str(actions_taken),
+            'total_invested': total_invested,
+            'hand_duration': hand_duration,
+        }
+        self.writer.write_row(self.hands_csv_path, list(record.values()))
+        self._archive('hand_results', record)
+
+    def _archive(self, table: str, record: Dict[str, Any]):
+        if self.archive is not None:
+            self.writer.submit(self.archive.append, table, record)
+
     def _write_decision_to_csv(self, timestamp: datetime, decision_data: Dict):
-        """Write decision data to CSV file."""
-        try:
-            with open(self.decisions_csv_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                ev = decision_data.get('ev_calculations', {})
-                
-                writer.writerow([
-                    timestamp.isoformat(),
-                    decision_data.get('hand_id', ''),
-                    decision_data.get('game_stage', ''),
-                    decision_data.get('hand_rank', ''),
-                    decision_data.get('hand_description', ''),
-                    str(decision_data.get('hole_cards', [])),
-                    str(decision_data.get('community_cards', [])),
-                    decision_data.get('pot_size', 0),
-                    decision_data.get('stack_size', 0),
-                    decision_data.get('bet_to_call', 0),
-                    decision_data.get('pot_odds', 0),
-                    decision_data.get('win_probability', 0),
-                    decision_data.get('action', ''),
-                    decision_data.get('amount', 0),
-                    decision_data.get('reasoning', ''),
-                    ev.get('ev_fold', 0),
-                    ev.get('ev_check', 0),
-                    ev.get('ev_call', 0),
-                    ev.get('ev_raise', 0),
-                    decision_data.get('opponent_count', 0)
-                ])
-        except Exception as e:
-            self.error_logger.error(f"Failed to write decision to CSV: {e}")
+        """Queue the decision's CSV row and archive record for the background writer."""
+        ev = decision_data.get('ev_calculations', {})
+        record = {
+            'timestamp': timestamp.isoformat(),
+            'hand_id': decision_data.get('hand_id', ''),
+            'game_stage': decision_data.get('game_stage', ''),
+            'hand_rank': decision_data.get('hand_rank', ''),
+            'hand_description': decision_data.get('hand_description', ''),
+            'hole_cards': str(decision_data.get('hole_cards', [])),
+            'community_cards': str(decision_data.get('community_cards', [])),
+            'pot_size': decision_data.get('pot_size', 0),
+            'stack_size': decision_data.get('stack_size', 0),
+            'bet_to_call': decision_data.get('bet_to_call', 0),
+            'pot_odds': decision_data.get('pot_odds', 0),
+            'win_probability': decision_data.get('win_probability', 0),
+            'action': decision_data.get('action', ''),
+            'amount': decision_data.get('amount', 0),
+            'reasoning': decision_data.get('reasoning', ''),
+            'ev_fold': ev.get('ev_fold', 0),
+            'ev_check': ev.get('ev_check', 0),
+            'ev_call': ev.get('ev_call', 0),
+            'ev_raise': ev.get('ev_raise', 0),
+            'opponent_count': decision_data.get('opponent_count', 0)
+        }
+        self.writer.write_row(self.decisions_csv_path, list(record.values()))
+        record['stake'] = decision_data.get('stake', '')
+        self._archive('decisions', record)
     
     def _log_performance_metric(self, metric_type: str, value: float, description: str = ""):
-        """Log a performance metric to CSV."""
-        try:
-            with open(self.performance_csv_path, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    datetime.now().isoformat(),
-                    metric_type,
-                    value,
-                    description
-                ])
-        except Exception as e:
-            self.error_logger.error(f"Failed to write performance metric to CSV: {e}")
+        """Queue a performance metric row for the CSV and the archive."""
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'metric_type': metric_type,
+            'value': value,
+            'description': description
+        }
+        self.writer.write_row(self.performance_csv_path, list(record.values()))
+        self._archive('performance', record)
     
     def create_summary_report(self) -> str:
         """Create a summary report of the session."""
@@ -335,6 +581,8 @@ class GameLogger:
             summary.append(f"  - Decisions: decisions_{self.session_id}.csv")
             summary.append(f"  - Hand Results: hand_results_{self.session_id}.csv")
             summary.append(f"  - Performance: performance_{self.session_id}.csv")
+            if self.archive is not None:
+                summary.append(f"Columnar Archive: {self.archive.root} (session={self.session_id})")
             summary.append("="*60)
             
             report = "\n".join(summary)
@@ -363,5 +611,7 @@ def get_logger() -> GameLogger:
 def initialize_logger(base_log_dir: str = "logs") -> GameLogger:
     """Initialize the global game logger with custom directory."""
     global _game_logger
+    if _game_logger is not None:
+        _game_logger.close()
     _game_logger = GameLogger(base_log_dir)
     return _game_logger
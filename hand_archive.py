@@ -0,0 +1,436 @@
+# hand_archive.py
+"""
+Append-only columnar archive for decisions, hand results and performance metrics.
+
+Analytics jobs used to parse every per-session CSV from GameLogger and the JSON
+files of the performance trackers. The archive stores the same records as typed
+columns in row groups, one file per table, date and session:
+
+    <root>/<table>/date=YYYY-MM-DD/session=<session_id>.pkrg
+
+Each row group is self-describing and appended to the end of its file:
+
+    b'PKRG' | uint32 metadata length | metadata JSON | column payloads
+
+The metadata lists each column's type and byte range plus min/max statistics
+(timestamp, hand_id) and the distinct stakes in the group. A reader walks the
+metadata only, skips partitions and row groups whose statistics cannot match
+the query, and reads just the columns it needs. Floats and integers are stored
+as little-endian numpy arrays; strings are dictionary-encoded int32 codes.
+pyarrow is not a dependency of the bot, so this is a small Parquet-style layout
+built on numpy. A torn row group at the end of a file (crash mid-append) is
+ignored by the reader.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import re
+import struct
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = 'hand_archive'
+DEFAULT_ROW_GROUP_SIZE = 1024
+FILE_SUFFIX = '.pkrg'
+MAGIC = b'PKRG'
+HEADER = struct.Struct('<4sI')
+
+FLOAT = 'f8'
+INT = 'i8'
+STRING = 'str'
+NUMPY_TYPES = {FLOAT: np.dtype('<f8'), INT: np.dtype('<i8')}
+CODE_TYPE = np.dtype('<i4')
+
+# Every table starts with timestamp (epoch seconds), hand_id and stake so scans can filter on them
+TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    'decisions': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('game_stage', STRING),
+        ('hand_rank', STRING), ('hand_description', STRING), ('hole_cards', STRING),
+        ('community_cards', STRING), ('pot_size', FLOAT), ('stack_size', FLOAT), ('bet_to_call', FLOAT),
+        ('pot_odds', FLOAT), ('win_probability', FLOAT), ('action', STRING), ('amount', FLOAT),
+        ('reasoning', STRING), ('ev_fold', FLOAT), ('ev_check', FLOAT), ('ev_call', FLOAT),
+        ('ev_raise', FLOAT), ('opponent_count', INT),
+    ),
+    'hand_results': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('starting_stack', FLOAT),
+        ('ending_stack', FLOAT), ('profit_loss', FLOAT), ('final_hand_rank', STRING),
+        ('actions_taken', STRING), ('total_invested', FLOAT), ('hand_duration', FLOAT),
+    ),
+    'performance': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('metric_type', STRING),
+        ('value', FLOAT), ('description', STRING),
+    ),
+    # SessionPerformanceTracker
+    'session_hands': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('position', STRING),
+        ('starting_stack', FLOAT), ('ending_stack', FLOAT), ('pot_won', FLOAT), ('profit_loss', FLOAT),
+        ('hand_strength', STRING), ('final_outcome', STRING), ('showdown', INT), ('actions_taken', STRING),
+        ('opponent_types', STRING), ('win_probability_avg', FLOAT), ('hand_duration', FLOAT),
+    ),
+    'session_decisions': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('decision_type', STRING),
+        ('outcome', STRING), ('context', STRING),
+    ),
+    # PerformanceMonitor
+    'monitor_hands': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('position', STRING),
+        ('starting_stack', FLOAT), ('ending_stack', FLOAT), ('profit_loss', FLOAT), ('actions_taken', STRING),
+        ('hand_strength', STRING), ('win_probability_avg', FLOAT), ('decision_quality_score', FLOAT),
+        ('bluffs_attempted', INT), ('bluffs_successful', INT), ('pot_size', FLOAT), ('opponents_count', INT),
+    ),
+    # PerformanceMetrics
+    'improvement_hands': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('session_id', STRING),
+        ('result', FLOAT), ('position', STRING), ('hand_strength', STRING), ('action_taken', STRING),
+        ('pot_size', FLOAT), ('opponents_count', INT), ('improvements_used', STRING),
+        ('decision_quality', FLOAT),
+    ),
+    # Session summaries saved by any of the three trackers; details holds the nested statistics as JSON
+    'session_summaries': (
+        ('timestamp', FLOAT), ('hand_id', STRING), ('stake', STRING), ('source', STRING),
+        ('session_id', STRING), ('hands_played', INT), ('profit', FLOAT), ('details', STRING),
+    ),
+}
+
+# GameLogger CSV file name prefix -> table
+CSV_PREFIXES = {'decisions_': 'decisions', 'hand_results_': 'hand_results', 'performance_': 'performance'}
+CSV_RENAMES = {'action_taken': 'action'}
+
+_PARTITION_RE = re.compile(r'^date=(\d{4}-\d{2}-\d{2})$')
+_SESSION_RE = re.compile(r'^session=(.+)' + re.escape(FILE_SUFFIX) + '$')
+
+
+def to_epoch(value: Any) -> float:
+    """Epoch seconds from a float, datetime or ISO-8601 string (NaN when unparseable)."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float('nan')
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    if kind == STRING:
+        return '' if value is None else str(value)
+    try:
+        return float(value) if kind == FLOAT else int(float(value))
+    except (TypeError, ValueError):
+        return float('nan') if kind == FLOAT else 0
+
+
+def _partition_date(timestamp: float) -> str:
+    if timestamp != timestamp:  # NaN
+        return '0000-00-00'
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+def encode_row_group(table: str, rows: Sequence[Dict[str, Any]]) -> bytes:
+    """Serialise rows (already coerced to the table schema) into one row group."""
+    columns = []
+    payload = []
+    offset = 0
+    for name, kind in TABLES[table]:
+        values = [row[name] for row in rows]
+        if kind == STRING:
+            dictionary: Dict[str, int] = {}
+            codes = np.fromiter((dictionary.setdefault(value, len(dictionary)) for value in values),
+                                dtype=CODE_TYPE, count=len(values))
+            code_bytes = codes.tobytes()
+            dict_bytes = json.dumps(list(dictionary), ensure_ascii=False).encode('utf-8')
+            columns.append({'name': name, 'type': kind, 'offset': offset, 'length': len(code_bytes),
+                            'dict_offset': offset + len(code_bytes), 'dict_length': len(dict_bytes)})
+            payload.extend((code_bytes, dict_bytes))
+            offset += len(code_bytes) + len(dict_bytes)
+        else:
+            data = np.asarray(values, dtype=NUMPY_TYPES[kind]).tobytes()
+            columns.append({'name': name, 'type': kind, 'offset': offset, 'length': len(data)})
+            payload.append(data)
+            offset += len(data)
+
+    timestamps = [row['timestamp'] for row in rows if row['timestamp'] == row['timestamp']]
+    hand_ids = [row['hand_id'] for row in rows if row['hand_id']]
+    metadata = {
+        'table': table,
+        'rows': len(rows),
+        'payload_length': offset,
+        'columns': columns,
+        'stats': {
+            'timestamp': [min(timestamps), max(timestamps)] if timestamps else None,
+            'hand_id': [min(hand_ids), max(hand_ids)] if hand_ids else None,
+            'stake': sorted({row['stake'] for row in rows}),
+        },
+    }
+    meta_bytes = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+    return HEADER.pack(MAGIC, len(meta_bytes)) + meta_bytes + b''.join(payload)
+
+
+class HandArchiveWriter:
+    """Buffers rows per table and date and appends them as row groups of one session's files."""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR, session_id: Optional[str] = None, stake: str = '',
+                 row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        self.root = root
+        self.session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.stake = stake
+        self.row_group_size = max(1, row_group_size)
+        self._buffers: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self.stats = {'rows': 0, 'row_groups': 0, 'bytes': 0}
+
+    def append(self, table: str, record: Dict[str, Any]):
+        """Queue one record; missing columns get empty values, unknown keys are ignored."""
+        schema = TABLES[table]
+        row = {name: _coerce(record.get(name), kind) for name, kind in schema}
+        row['timestamp'] = to_epoch(record.get('timestamp', datetime.now()))
+        if not row['stake']:
+            row['stake'] = self.stake
+        key = (table, _partition_date(row['timestamp']))
+        buffer = self._buffers.setdefault(key, [])
+        buffer.append(row)
+        self.stats['rows'] += 1
+        if len(buffer) >= self.row_group_size:
+            self._write(key)
+
+    def path_for(self, table: str, partition_date: str) -> str:
+        return os.path.join(self.root, table, f'date={partition_date}', f'session={self.session_id}{FILE_SUFFIX}')
+
+    def _write(self, key: Tuple[str, str]):
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        table, partition_date = key
+        path = self.path_for(table, partition_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = encode_row_group(table, rows)
+        with open(path, 'ab') as f:
+            f.write(data)
+        self.stats['row_groups'] += 1
+        self.stats['bytes'] += len(data)
+
+    def flush(self):
+        """Write all buffered rows as (possibly short) row groups."""
+        for key in list(self._buffers):
+            self._write(key)
+
+    def close(self):
+        self.flush()
+
+
+class HandArchive:
+    """Reader that range-scans the archive using partition names and row-group statistics."""
+
+    def __init__(self, root: str = DEFAULT_ARCHIVE_DIR):
+        self.root = root
+        self.stats = {'files': 0, 'row_groups_read': 0, 'row_groups_skipped': 0}
+
+    def partitions(self, table: str, start: Optional[float] = None, end: Optional[float] = None,
+                   sessions: Optional[Iterable[str]] = None) -> List[str]:
+        """Archive files of a table whose date partition and session can match."""
+        table_dir = os.path.join(self.root, table)
+        if not os.path.isdir(table_dir):
+            return []
+        first = _partition_date(start) if start is not None else None
+        last = _partition_date(end) if end is not None else None
+        wanted_sessions = set(sessions) if sessions is not None else None
+        paths = []
+        for partition in sorted(os.listdir(table_dir)):
+            match = _PARTITION_RE.match(partition)
+            if not match:
+                continue
+            day = match.group(1)
+            if (first and day < first) or (last and day > last):
+                continue
+            for name in sorted(os.listdir(os.path.join(table_dir, partition))):
+                session = _SESSION_RE.match(name)
+                if session and (wanted_sessions is None or session.group(1) in wanted_sessions):
+                    paths.append(os.path.join(table_dir, partition, name))
+        return paths
+
+    def row_groups(self, path: str) -> Iterator[Tuple[Dict[str, Any], int]]:
+        """(metadata, payload offset) for each complete row group, reading headers only."""
+        file_size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            position = 0
+            while position + HEADER.size <= file_size:
+                f.seek(position)
+                magic, meta_length = HEADER.unpack(f.read(HEADER.size))
+                payload_offset = position + HEADER.size + meta_length
+                if magic != MAGIC or payload_offset > file_size:
+                    logger.warning(f"Ignoring damaged tail of {path} at byte {position}")
+                    return
+                metadata = json.loads(f.read(meta_length).decode('utf-8'))
+                end = payload_offset + metadata['payload_length']
+                if end > file_size:
+                    logger.warning(f"Ignoring incomplete row group at the end of {path}")
+                    return
+                yield metadata, payload_offset
+                position = end
+
+    @staticmethod
+    def _may_match(stats: Dict[str, Any], start: Optional[float], end: Optional[float],
+                   stakes: Optional[set], hand_ids: Optional[set]) -> bool:
+        times = stats.get('timestamp')
+        if times and ((start is not None and times[1] < start) or (end is not None and times[0] > end)):
+            return False
+        if stakes is not None and not stakes.intersection(stats.get('stake', ())):
+            return False
+        if hand_ids is not None:
+            bounds = stats.get('hand_id')
+            if not bounds or not any(bounds[0] <= hand_id <= bounds[1] for hand_id in hand_ids):
+                return False
+        return True
+
+    @staticmethod
+    def _read_column(f, payload_offset: int, column: Dict[str, Any]) -> np.ndarray:
+        f.seek(payload_offset + column['offset'])
+        if column['type'] != STRING:
+            return np.frombuffer(f.read(column['length']), dtype=NUMPY_TYPES[column['type']])
+        codes = np.frombuffer(f.read(column['length']), dtype=CODE_TYPE)
+        f.seek(payload_offset + column['dict_offset'])
+        dictionary = np.array(json.loads(f.read(column['dict_length']).decode('utf-8')), dtype=object)
+        return dictionary[codes] if len(dictionary) else np.array([], dtype=object)
+
+    def scan(self, table: str, start: Any = None, end: Any = None, stake: Any = None,
+             hand_ids: Optional[Iterable[str]] = None, sessions: Optional[Iterable[str]] = None,
+             columns: Optional[Sequence[str]] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yield {column: array} per matching row group, filtered to matching rows.
+
+        start/end are inclusive bounds (epoch seconds, datetime or ISO string),
+        stake is one stake label or a collection of them, and columns limits the
+        columns returned (filter columns are read as needed either way).
+        """
+        schema = dict(TABLES[table])
+        wanted = list(columns) if columns else list(schema)
+        unknown = [name for name in wanted if name not in schema]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {unknown}")
+        start = to_epoch(start) if start is not None else None
+        end = to_epoch(end) if end is not None else None
+        stakes = None if stake is None else ({stake} if isinstance(stake, str) else set(stake))
+        hand_ids = set(hand_ids) if hand_ids is not None else None
+
+        needed = set(wanted)
+        if start is not None or end is not None:
+            needed.add('timestamp')
+        if stakes is not None:
+            needed.add('stake')
+        if hand_ids is not None:
+            needed.add('hand_id')
+
+        for path in self.partitions(table, start, end, sessions):
+            self.stats['files'] += 1
+            with open(path, 'rb') as f:
+                for metadata, payload_offset in self.row_groups(path):
+                    if not self._may_match(metadata['stats'], start, end, stakes, hand_ids):
+                        self.stats['row_groups_skipped'] += 1
+                        continue
+                    self.stats['row_groups_read'] += 1
+                    data = {column['name']: self._read_column(f, payload_offset, column)
+                            for column in metadata['columns'] if column['name'] in needed}
+                    mask = np.ones(metadata['rows'], dtype=bool)
+                    if start is not None:
+                        mask &= data['timestamp'] >= start
+                    if end is not None:
+                        mask &= data['timestamp'] <= end
+                    if stakes is not None:
+                        mask &= np.isin(data['stake'], list(stakes))
+                    if hand_ids is not None:
+                        mask &= np.isin(data['hand_id'], list(hand_ids))
+                    if not mask.any():
+                        continue
+                    if mask.all():
+                        yield {name: data[name] for name in wanted}
+                    else:
+                        yield {name: data[name][mask] for name in wanted}
+
+    def read(self, table: str, **query) -> Dict[str, np.ndarray]:
+        """Concatenate scan() results into one array per column."""
+        columns = query.get('columns') or [name for name, _ in TABLES[table]]
+        chunks = list(self.scan(table, **query))
+        if not chunks:
+            schema = dict(TABLES[table])
+            return {name: np.array([], dtype=NUMPY_TYPES.get(schema[name], object)) for name in columns}
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in columns}
+
+
+def archive_record(archive: Optional[HandArchiveWriter], table: str, record: Dict[str, Any]):
+    """Append a record if an archive is attached; a failing archive never breaks the caller."""
+    if archive is None:
+        return
+    try:
+        archive.append(table, record)
+    except Exception as e:
+        logger.error(f"Failed to archive {table} record: {e}")
+
+
+def import_csv(path: str, root: str = DEFAULT_ARCHIVE_DIR, stake: str = '',
+               row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Append one GameLogger CSV (decisions_/hand_results_/performance_<session>.csv) to the archive."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    for prefix, table in CSV_PREFIXES.items():
+        if name.startswith(prefix):
+            session_id = name[len(prefix):]
+            break
+    else:
+        raise ValueError(f"Not a GameLogger CSV: {path}")
+    writer = HandArchiveWriter(root, session_id, stake, row_group_size)
+    with open(path, newline='', encoding='utf-8') as f:
+        for record in csv.DictReader(f):
+            for old, new in CSV_RENAMES.items():
+                if old in record:
+                    record[new] = record.pop(old)
+            writer.append(table, record)
+    writer.close()
+    return writer.stats['rows']
+
+
+def create_archive_writer(config: Optional[Dict], session_id: Optional[str] = None,
+                          base_dir: str = '') -> Optional[HandArchiveWriter]:
+    """Factory function reading the optional 'hand_archive' config section (enabled by default)."""
+    settings = (config or {}).get('hand_archive', {}) if isinstance(config, dict) else {}
+    if not settings.get('enabled', True):
+        return None
+    return HandArchiveWriter(
+        settings.get('path') or os.path.join(base_dir, DEFAULT_ARCHIVE_DIR),
+        session_id,
+        stake=str(settings.get('stake', '')),
+        row_group_size=settings.get('row_group_size', DEFAULT_ROW_GROUP_SIZE),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import GameLogger CSVs into the columnar hand archive.")
+    parser.add_argument('csv', nargs='+', help="GameLogger CSV path or glob")
+    parser.add_argument('--archive', default=os.path.join('logs', DEFAULT_ARCHIVE_DIR))
+    parser.add_argument('--stake', default='', help="Stake label for rows that do not carry one")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    total = 0
+    for pattern in args.csv:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                total += import_csv(path, args.archive, args.stake, args.row_group_size)
+            except ValueError as e:
+                logger.warning(str(e))
+    print(f"Imported {total} rows into {args.archive}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+# html_snapshot_cache.py
+"""
+Snapshot diffing layer in front of PokerPageParser.
+
+Every decision cycle grabs a fresh HTML snapshot of the table. Most of the time
+the snapshot is byte-identical to the previous one, or differs only in the
+action timer, the timebank countdown or inline animation styles. This module
+fingerprints each snapshot twice (raw content and cosmetic-stripped structure)
+so callers can reuse the previous parse and analysis instead of re-running
+player extraction and equity.
+"""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CHANGED = 'changed'
+SNAPSHOT_IDENTICAL = 'identical'
+SNAPSHOT_COSMETIC = 'cosmetic'
+
+# Elements whose text only carries timer state (seconds left, timebank)
+DEFAULT_VOLATILE_TEXT_CLASSES = (
+    'countdown-text',
+    'text-countdown',
+    'remaining-timebank',
+)
+
+# Attributes that only affect rendering (animations, inline sizing)
+DEFAULT_VOLATILE_ATTRIBUTES = (
+    'style',
+)
+
+
+@dataclass
+class SnapshotLookup:
+    """Result of classifying one HTML snapshot against the previous one."""
+    change: str
+    content_hash: str
+    structure_hash: str
+    parsed_state: Optional[Dict[str, Any]] = None
+    analysis: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_reusable(self) -> bool:
+        """True when the cached parse/analysis can be used as-is."""
+        return self.change != SNAPSHOT_CHANGED and self.parsed_state is not None
+
+
+class HtmlSnapshotCache:
+    """Content-hash and structural-hash cache for the last parsed snapshot."""
+
+    def __init__(self, volatile_text_classes: Iterable[str] = DEFAULT_VOLATILE_TEXT_CLASSES,
+                 volatile_attributes: Iterable[str] = DEFAULT_VOLATILE_ATTRIBUTES):
+        self.volatile_text_classes = tuple(volatile_text_classes)
+        self.volatile_attributes = tuple(volatile_attributes)
+        self._text_pattern = self._build_text_pattern(self.volatile_text_classes)
+        self._attribute_pattern = self._build_attribute_pattern(self.volatile_attributes)
+
+        self.last_content_hash: Optional[str] = None
+        self.last_structure_hash: Optional[str] = None
+        self.parsed_state: Optional[Dict[str, Any]] = None
+        self.analysis: Optional[Dict[str, Any]] = None
+
+        self.stats = {
+            SNAPSHOT_IDENTICAL: 0,
+            SNAPSHOT_COSMETIC: 0,
+            SNAPSHOT_CHANGED: 0,
+        }
+
+    @staticmethod
+    def _build_text_pattern(class_names):
+        if not class_names:
+            return None
+        alternatives = '|'.join(re.escape(name) for name in class_names)
+        # Opening tag carrying one of the volatile classes, followed by its direct text
+        return re.compile(
+            r'(<[a-zA-Z][^>]*\bclass="[^"]*\b(?:' + alternatives + r')\b[^"]*"[^>]*>)[^<]*'
+        )
+
+    @staticmethod
+    def _build_attribute_pattern(attributes):
+        if not attributes:
+            return None
+        alternatives = '|'.join(re.escape(name) for name in attributes)
+        return re.compile(r'\s(?:' + alternatives + r')="[^"]*"')
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8', 'replace'), digest_size=16).hexdigest()
+
+    def normalize(self, html_content: str) -> str:
+        """Strip timer text and cosmetic attributes, leaving the game-relevant structure."""
+        normalized = html_content
+        if self._attribute_pattern is not None:
+            normalized = self._attribute_pattern.sub('', normalized)
+        if self._text_pattern is not None:
+            normalized = self._text_pattern.sub(r'\1', normalized)
+        # Collapse whitespace-only layout differences
+        normalized = re.sub(r'\s+', ' ', normalized)
+        return normalized
+
+    def lookup(self, html_content: str) -> SnapshotLookup:
+        """Classify a snapshot as identical, cosmetic-only or changed."""
+        content_hash = self._hash(html_content or '')
+
+        if content_hash == self.last_content_hash and self.parsed_state is not None:
+            self.stats[SNAPSHOT_IDENTICAL] += 1
+            return SnapshotLookup(SNAPSHOT_IDENTICAL, content_hash, self.last_structure_hash,
+                                  self.parsed_state, self.analysis)
+
+        structure_hash = self._hash(self.normalize(html_content or ''))
+        if structure_hash == self.last_structure_hash and self.parsed_state is not None:
+            self.stats[SNAPSHOT_COSMETIC] += 1
+            # Remember the new raw hash so an unchanged follow-up is an exact hit
+            self.last_content_hash = content_hash
+            return SnapshotLookup(SNAPSHOT_COSMETIC, content_hash, structure_hash,
+                                  self.parsed_state, self.analysis)
+
+        self.stats[SNAPSHOT_CHANGED] += 1
+        return SnapshotLookup(SNAPSHOT_CHANGED, content_hash, structure_hash)
+
+    def store(self, lookup: SnapshotLookup, parsed_state: Dict[str, Any],
+              analysis: Optional[Dict[str, Any]] = None):
+        """Remember the parse (and optional downstream analysis) for a changed snapshot."""
+        if not parsed_state or parsed_state.get('error'):
+            # Never cache failed parses; the next snapshot must be parsed again
+            self.invalidate()
+            return
+        self.last_content_hash = lookup.content_hash
+        self.last_structure_hash = lookup.structure_hash
+        self.parsed_state = parsed_state
+        self.analysis = analysis
+
+    def invalidate(self):
+        """Forget the cached snapshot."""
+        self.last_content_hash = None
+        self.last_structure_hash = None
+        self.parsed_state = None
+        self.analysis = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit counts per change type plus the overall reuse rate."""
+        total = sum(self.stats.values())
+        reused = self.stats[SNAPSHOT_IDENTICAL] + self.stats[SNAPSHOT_COSMETIC]
+        return {
+            **self.stats,
+            'total': total,
+            'reuse_rate': reused / total if total else 0.0,
+        }
+
+
+def create_html_snapshot_cache(config: Optional[Dict] = None) -> HtmlSnapshotCache:
+    """Factory function to create a snapshot cache from the 'snapshot_cache' config section."""
+    settings = (config or {}).get('snapshot_cache', {}) if isinstance(config, dict) else {}
+    return HtmlSnapshotCache(
+        volatile_text_classes=settings.get('volatile_text_classes', DEFAULT_VOLATILE_TEXT_CLASSES),
+        volatile_attributes=settings.get('volatile_attributes', DEFAULT_VOLATILE_ATTRIBUTES),
+    )
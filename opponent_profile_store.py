@@ -0,0 +1,206 @@
+# opponent_profile_store.py
+"""
+Persistent opponent profile store backed by SQLite.
+
+Opponent trackers used to keep their profiles in memory only, so every session
+started cold. The store keeps one row of counters per (tracker, player) plus
+per-street and per-position aggregate tables indexed by player. Trackers load a
+profile lazily the first time a player is seen (a primary-key lookup) and queue
+the profiles they touched; the queue is written in one transaction at hand end.
+The database runs in write-ahead-log mode so reads never wait for those writes.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'logs/opponent_profiles.db'
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Tracker namespaces: each tracker counts slightly differently, so their rows are kept apart
+SOURCE_BASIC = 'basic'        # opponent_tracking.OpponentTracker
+SOURCE_ENHANCED = 'enhanced'  # enhanced_opponent_tracking.EnhancedOpponentTracker
+
+PLAYER_COUNTERS = (
+    'hands_seen', 'hands_played', 'preflop_opportunities', 'vpip_hands', 'pfr_hands',
+    'aggressive_actions', 'passive_actions', 'showdowns', 'showdowns_won',
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS players (
+    source TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    {', '.join(f'{name} REAL NOT NULL DEFAULT 0' for name in PLAYER_COUNTERS)},
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (source, player_name)
+);
+CREATE INDEX IF NOT EXISTS idx_players_last_seen ON players (last_seen);
+CREATE TABLE IF NOT EXISTS street_stats (
+    source TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    street TEXT NOT NULL,
+    stat TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (source, player_name, street, stat)
+);
+CREATE INDEX IF NOT EXISTS idx_street_stats_street ON street_stats (source, street, stat);
+CREATE TABLE IF NOT EXISTS position_stats (
+    source TEXT NOT NULL,
+    player_name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    stat TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (source, player_name, position, stat)
+);
+CREATE INDEX IF NOT EXISTS idx_position_stats_position ON position_stats (source, position, stat);
+"""
+
+
+def empty_aggregates() -> Dict[str, Any]:
+    """Aggregate record of a player with no history."""
+    return {
+        'counters': {name: 0 for name in PLAYER_COUNTERS},
+        'street_stats': {},
+        'position_stats': {},
+    }
+
+
+class OpponentProfileStore:
+    """SQLite-backed opponent aggregates with lazy loads and batched writes."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, synchronous: str = 'NORMAL'):
+        if synchronous.upper() not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid synchronous mode: {synchronous!r}")
+        self.db_path = db_path
+        self.synchronous = synchronous.upper()
+        self._conn: Optional[sqlite3.Connection] = None
+        # (source, player_name) -> aggregate record waiting for the next flush
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.stats = {'loads': 0, 'load_hits': 0, 'flushes': 0, 'rows_written': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use, so an unused store never touches disk."""
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(f'PRAGMA synchronous={self.synchronous}')
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+            logger.info(f"Opponent profile store opened: {self.db_path}")
+        return self._conn
+
+    def load_profile(self, source: str, player_name: str) -> Optional[Dict[str, Any]]:
+        """Stored aggregates for a player, or None when the player has never been saved."""
+        self.stats['loads'] += 1
+        pending = self._pending.get((source, player_name))
+        if pending is not None:
+            self.stats['load_hits'] += 1
+            return pending
+
+        conn = self._connection()
+        row = conn.execute(
+            f"SELECT {', '.join(PLAYER_COUNTERS)} FROM players WHERE source = ? AND player_name = ?",
+            (source, player_name)
+        ).fetchone()
+        if row is None:
+            return None
+        self.stats['load_hits'] += 1
+
+        record = empty_aggregates()
+        record['counters'] = dict(zip(PLAYER_COUNTERS, row))
+        for street, stat, value in conn.execute(
+                "SELECT street, stat, value FROM street_stats WHERE source = ? AND player_name = ?",
+                (source, player_name)):
+            record['street_stats'].setdefault(street, {})[stat] = value
+        for position, stat, value in conn.execute(
+                "SELECT position, stat, value FROM position_stats WHERE source = ? AND player_name = ?",
+                (source, player_name)):
+            record['position_stats'].setdefault(position, {})[stat] = value
+        return record
+
+    def queue_profile(self, source: str, player_name: str, aggregates: Dict[str, Any]):
+        """Queue a profile's current aggregates; written on the next flush()."""
+        self._pending[(source, player_name)] = aggregates
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Write every queued profile in a single transaction; returns the number written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        now = time.time()
+
+        player_rows, street_rows, position_rows = [], [], []
+        for (source, player_name), aggregates in pending.items():
+            counters = aggregates.get('counters', {})
+            player_rows.append((source, player_name,
+                                *(counters.get(name, 0) for name in PLAYER_COUNTERS), now, now))
+            for street, stats in aggregates.get('street_stats', {}).items():
+                street_rows.extend((source, player_name, street, stat, value) for stat, value in stats.items())
+            for position, stats in aggregates.get('position_stats', {}).items():
+                position_rows.extend((source, player_name, position, stat, value) for stat, value in stats.items())
+
+        counter_columns = ', '.join(PLAYER_COUNTERS)
+        counter_updates = ', '.join(f'{name} = excluded.{name}' for name in PLAYER_COUNTERS)
+        conn = self._connection()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO players (source, player_name, {counter_columns}, first_seen, last_seen) "
+                    f"VALUES ({', '.join('?' * (len(PLAYER_COUNTERS) + 4))}) "
+                    f"ON CONFLICT (source, player_name) DO UPDATE SET {counter_updates}, last_seen = excluded.last_seen",
+                    player_rows
+                )
+                conn.executemany("INSERT OR REPLACE INTO street_stats VALUES (?, ?, ?, ?, ?)", street_rows)
+                conn.executemany("INSERT OR REPLACE INTO position_stats VALUES (?, ?, ?, ?, ?)", position_rows)
+        except sqlite3.Error as e:
+            # Keep the batch for the next attempt unless newer aggregates replaced it
+            for key, aggregates in pending.items():
+                self._pending.setdefault(key, aggregates)
+            logger.error(f"Failed to write opponent profiles: {e}")
+            return 0
+
+        self.stats['flushes'] += 1
+        self.stats['rows_written'] += len(player_rows)
+        logger.debug(f"Flushed {len(player_rows)} opponent profiles to {self.db_path}")
+        return len(player_rows)
+
+    def player_count(self, source: Optional[str] = None) -> int:
+        conn = self._connection()
+        if source is None:
+            return conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+        return conn.execute("SELECT COUNT(*) FROM players WHERE source = ?", (source,)).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, 'pending': len(self._pending), 'db_path': self.db_path}
+
+    def close(self):
+        """Flush queued profiles and close the database."""
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_opponent_profile_store(config: Optional[Dict] = None) -> Optional[OpponentProfileStore]:
+    """
+    Factory function reading the 'opponent_store' config section.
+    Returns None unless the section enables the store ("enabled": true).
+    """
+    settings = (config or {}).get('opponent_store', {}) if isinstance(config, dict) else {}
+    if not settings.get('enabled', False):
+        return None
+    return OpponentProfileStore(
+        db_path=settings.get('db_path', DEFAULT_DB_PATH),
+        synchronous=settings.get('synchronous', 'NORMAL'),
+    )
@@ -3,10 +3,17 @@
 
 import logging
 import time
+from array import array
 from collections import defaultdict, deque
-from typing import Dict, List, Optional, Tuple, Any # Added Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any # Added Any
 import time # For generating placeholder hand IDs
 
+from action_log import ActionLog, LoggedAction
+from opponent_profile_store import SOURCE_BASIC
+from table_dynamics import TableDynamicsCache
+from decayed_stats import DecayedStats, create_decayed_stats
+from population_priors import get_population_priors
+
 # logger = logging.getLogger(__name__) # Will be passed in
 
 # Define constants for streets to ensure consistency
@@ -21,7 +28,8 @@ class OpponentProfile:
     Track and analyze opponent tendencies for better decision making.
     """
     
-    def __init__(self, player_name: str, max_hands_tracked: int = 100, max_actions_per_hand: int = 20, logger_instance: Optional[logging.Logger] = None):
+    def __init__(self, player_name: str, max_hands_tracked: int = 100, max_actions_per_hand: int = 20, logger_instance: Optional[logging.Logger] = None,
+                 decayed_stats: Optional[DecayedStats] = None):
         self.player_name = player_name
         self.max_hands_tracked = max_hands_tracked
         self.max_actions_per_hand = max_actions_per_hand
@@ -51,36 +59,59 @@ class OpponentProfile:
         # Won at Showdown (W$SD)
         # Won When Saw Flop (WWSF)
 
-        # Recent hand history (tracking actions within specific hands)
-        # Stores a list of actions for the last N hands. Each hand is a list of action dicts.
-        self.hand_action_history: deque[Dict[str, List[Dict[str, Any]]]] = deque(maxlen=max_hands_tracked)
-        self.current_hand_actions: List[Dict[str, Any]] = [] # Actions for the hand currently being processed
+        # Recent hand history as row ids into the tracker's action log (set by the tracker).
+        # Stores (hand_id, row ids) for the last N hands; the actions themselves live in the log.
+        self.action_log: Optional[ActionLog] = None
+        self.hand_action_history: deque = deque(maxlen=max_hands_tracked)
+        self.current_hand_rows = array('I') # Log rows of the hand currently being processed
+        self.current_hand_action_count = 0
         self.current_hand_id: Optional[str] = None
         
-        # Bet sizing patterns (can be enhanced)
-        self.bet_sizes = {
-            PREFLOP: defaultdict(list),
-            FLOP: defaultdict(list),
-            TURN: defaultdict(list),
-            RIVER: defaultdict(list)
+        # Bet sizing patterns: running [sum of bet/pot ratios, count] per street and action
+        self.bet_size_totals = {
+            PREFLOP: defaultdict(lambda: [0.0, 0]),
+            FLOP: defaultdict(lambda: [0.0, 0]),
+            TURN: defaultdict(lambda: [0.0, 0]),
+            RIVER: defaultdict(lambda: [0.0, 0])
         }
+
+        # Time-decayed estimates shrunk towards population priors (vpip, pfr, aggression_frequency)
+        self.decayed_stats = decayed_stats if decayed_stats is not None else DecayedStats()
+
+        # Set by the tracker: called with the player name whenever the stats change
+        self.on_change = None
+
+    def _notify_changed(self):
+        if self.on_change:
+            self.on_change(self.player_name)
         
+    @property
+    def current_hand_actions(self) -> List[LoggedAction]:
+        """Actions of the hand currently being processed, decoded from the action log."""
+        if self.action_log is None:
+            return []
+        return list(self.action_log.rows(self.current_hand_rows))
+
+    def recent_hands(self) -> Iterator[Tuple[str, List[LoggedAction]]]:
+        """(hand_id, actions) for the last N finished hands, oldest first, decoded from the action log."""
+        for hand_id, rows in self.hand_action_history:
+            yield hand_id, list(self.action_log.rows(rows)) if self.action_log is not None else []
+
     def new_hand(self, hand_id: str):
         """Called at the start of a new hand to reset current hand data."""
-        if self.current_hand_id and self.current_hand_actions: 
+        if self.current_hand_id and self.current_hand_rows: 
             
-            if len(self.current_hand_actions) > self.max_actions_per_hand:
-                 self.logger.warning(f"Player {self.player_name}, Hand {self.current_hand_id}: Exceeded max_actions_per_hand ({len(self.current_hand_actions)} > {self.max_actions_per_hand}). Truncating.")
-                 self.current_hand_actions = self.current_hand_actions[:self.max_actions_per_hand]
-
-            self.hand_action_history.append({
-                "hand_id": self.current_hand_id,
-                "actions": list(self.current_hand_actions) # Store a copy
-            })
-        self.current_hand_actions = []
+            if len(self.current_hand_rows) > self.max_actions_per_hand:
+                 self.logger.warning(f"Player {self.player_name}, Hand {self.current_hand_id}: Exceeded max_actions_per_hand ({len(self.current_hand_rows)} > {self.max_actions_per_hand}). Truncating.")
+                 del self.current_hand_rows[self.max_actions_per_hand:]
+
+            self.hand_action_history.append((self.current_hand_id, self.current_hand_rows))
+        self.current_hand_rows = array('I')
+        self.current_hand_action_count = 0
         self.current_hand_id = hand_id
         self.hands_seen_count += 1 # Increment when a new hand starts and player is involved        # Reset per-hand flags (e.g., for C-bet opportunities)
         self._reset_per_hand_street_flags()
+        self._notify_changed()
 
     def _reset_per_hand_street_flags(self):
         """Resets flags that are specific to a hand and street, e.g., cbet opportunity."""
@@ -100,10 +131,12 @@ class OpponentProfile:
 
 
     def log_action(self, action_type: str, street: str, amount: float = 0, pot_size_before_action: float = 0, 
-                     position: Optional[str] = None, is_our_hero: bool = False, players_in_hand_at_action: int = 0):
+                     position: Optional[str] = None, is_our_hero: bool = False, players_in_hand_at_action: int = 0,
+                     row_id: Optional[int] = None):
         """
         Logs a single action taken by the opponent.
         This is the primary method for updating opponent statistics.
+        row_id is the action's row in the tracker's action log, kept for the per-hand view.
         """
         if not self.current_hand_id:
             self.logger.warning(f"Player {self.player_name}: Log_action called without current_hand_id. Action: {action_type} on {street}")
@@ -111,19 +144,12 @@ class OpponentProfile:
             self.current_hand_id = f"unknown_{int(time.time())}"
             self.logger.info(f"Created placeholder hand_id: {self.current_hand_id} for {self.player_name}")
 
-        action_record = {
-            "action_type": action_type.upper(), # Standardize to uppercase
-            "street": street.lower(),
-            "amount": amount,
-            "pot_size_before_action": pot_size_before_action,
-            "position": position,
-            "players_in_hand_at_action": players_in_hand_at_action,
-            # Add more context if needed, e.g., board cards at time of action
-        }
-        self.current_hand_actions.append(action_record)
+        if row_id is not None:
+            self.current_hand_rows.append(row_id)
+        self.current_hand_action_count += 1
         
         # Enhanced logging for debugging
-        self.logger.debug(f"Player {self.player_name}: Logged action {action_type} on {street} - Total actions this hand: {len(self.current_hand_actions)}")
+        self.logger.debug(f"Player {self.player_name}: Logged action {action_type} on {street} - Total actions this hand: {self.current_hand_action_count}")
 
         # --- PREFLOP Stats ---
         if street.lower() == PREFLOP:
@@ -132,6 +158,8 @@ class OpponentProfile:
             if not hasattr(self, '_preflop_opportunity_counted_this_hand') or not self._preflop_opportunity_counted_this_hand:
                 self.preflop_opportunities += 1
                 self._preflop_opportunity_counted_this_hand = True # Flag to count only once per hand
+                self.decayed_stats.rate('vpip').add_opportunity()
+                self.decayed_stats.rate('pfr').add_opportunity()
                 self.logger.debug(f"Player {self.player_name}: Preflop opportunity counted. Total: {self.preflop_opportunities}")
 
             action_upper = action_type.upper()
@@ -139,6 +167,7 @@ class OpponentProfile:
                 if not hasattr(self, '_vpip_counted_this_hand') or not self._vpip_counted_this_hand:
                     self.preflop_vpip_actions += 1
                     self._vpip_counted_this_hand = True # Count VPIP only once per hand
+                    self.decayed_stats.rate('vpip').add_hit()
                     self.logger.debug(f"Player {self.player_name}: VPIP action counted. Total: {self.preflop_vpip_actions}")
                 if position:
                     self.position_stats[position]["vpip_hands"] += 1
@@ -147,6 +176,7 @@ class OpponentProfile:
                 if not hasattr(self, '_pfr_counted_this_hand') or not self._pfr_counted_this_hand:
                     self.preflop_pfr_actions += 1
                     self._pfr_counted_this_hand = True # Count PFR only once per hand
+                    self.decayed_stats.rate('pfr').add_hit()
                     self.was_preflop_aggressor_this_hand = True
                     self.logger.debug(f"Player {self.player_name}: PFR action counted. Total: {self.preflop_pfr_actions}")
                 if position:
@@ -154,7 +184,7 @@ class OpponentProfile:
                 
                 # Store bet sizing (as ratio to pot or BBs)
                 if pot_size_before_action > 0 and amount > 0: # Basic bet sizing as % of pot
-                     self.bet_sizes[PREFLOP][action_upper].append(amount / pot_size_before_action)
+                     self._add_bet_size(PREFLOP, action_upper, amount / pot_size_before_action)
 
         # --- POSTFLOP Stats ---
         elif street.lower() in [FLOP, TURN, RIVER]:
@@ -165,16 +195,17 @@ class OpponentProfile:
             
             action_upper = action_type.upper()
             self.street_stats[street_lower][f"{action_upper}_count"] += 1
+            self.decayed_stats.update('aggression_frequency', action_upper in ("BET", "RAISE", "OPEN_BET"))
             
             # Bet sizing tracking for postflop
             if action_upper in ["BET", "RAISE"] and pot_size_before_action > 0 and amount > 0:
-                self.bet_sizes[street_lower][action_upper].append(amount / pot_size_before_action)
+                self._add_bet_size(street_lower, action_upper, amount / pot_size_before_action)
             
             self.logger.debug(f"Player {self.player_name}: Postflop action {action_type} on {street_lower} - Street total actions: {self.street_stats[street_lower]['total_actions_on_street']}")
 
         # --- General Action Tracking ---
         # Increment hands played if this is their first action of the hand
-        if len(self.current_hand_actions) == 1:
+        if self.current_hand_action_count == 1:
             self.hands_played_count += 1
             self.logger.debug(f"Player {self.player_name}: First action of hand. Hands played: {self.hands_played_count}")
 
@@ -184,6 +215,13 @@ class OpponentProfile:
             self._vpip_counted_this_hand = False
             self._pfr_counted_this_hand = False
 
+        self._notify_changed()
+
+    def _add_bet_size(self, street: str, action_type: str, ratio: float):
+        totals = self.bet_size_totals[street][action_type]
+        totals[0] += ratio
+        totals[1] += 1
+
 
     def get_vpip(self) -> float:
         if self.preflop_opportunities == 0: return 0.0
@@ -193,6 +231,11 @@ class OpponentProfile:
         if self.preflop_opportunities == 0: return 0.0
         return (self.preflop_pfr_actions / self.preflop_opportunities) * 100
     
+    def get_stat_estimate(self, stat: str) -> Tuple[float, float]:
+        """Decayed, prior-shrunk estimate of a stat (as a fraction) and its confidence (0..1)."""
+        rate = self.decayed_stats.rate(stat)
+        return rate.estimate, rate.confidence
+
     def get_cbet_stat(self, street: str) -> Tuple[float, int]:
         """Returns C-bet percentage and number of opportunities for the street."""
         if street not in [FLOP, TURN, RIVER]: return 0.0, 0
@@ -231,18 +274,56 @@ class OpponentProfile:
         
     def get_average_bet_size(self, street: str, action_type: str) -> Optional[float]:
         """Get average bet size ratio for specific street and action type (e.g. FLOP, BET)."""
-        sizes = self.bet_sizes.get(street, {}).get(action_type.upper(), [])
-        if not sizes:
+        totals = self.bet_size_totals.get(street, {}).get(action_type.upper())
+        if not totals or not totals[1]:
             return None
-        return sum(sizes) / len(sizes)
+        return totals[0] / totals[1]
 
-    def classify_player_type(self) -> str:
-        vpip = self.get_vpip()
-        pfr = self.get_pfr()
-        afq_flop = self.get_aggression_frequency(FLOP) # Example: use flop AFq
+    def to_aggregates(self) -> Dict[str, Any]:
+        """Counters persisted by the opponent profile store."""
+        return {
+            'counters': {
+                'hands_seen': self.hands_seen_count,
+                'hands_played': self.hands_played_count,
+                'preflop_opportunities': self.preflop_opportunities,
+                'vpip_hands': self.preflop_vpip_actions,
+                'pfr_hands': self.preflop_pfr_actions,
+            },
+            'street_stats': {street: dict(stats) for street, stats in self.street_stats.items()},
+            'position_stats': {position: dict(stats) for position, stats in self.position_stats.items()},
+        }
 
-        if self.hands_seen_count < 20: # Need a minimum sample size
-            return "unknown_low_sample"
+    def restore_aggregates(self, aggregates: Dict[str, Any]):
+        """Seed the counters from a stored profile (see to_aggregates)."""
+        counters = aggregates.get('counters', {})
+        self.hands_seen_count = int(counters.get('hands_seen', 0))
+        self.hands_played_count = int(counters.get('hands_played', 0))
+        self.preflop_opportunities = int(counters.get('preflop_opportunities', 0))
+        self.preflop_vpip_actions = int(counters.get('vpip_hands', 0))
+        self.preflop_pfr_actions = int(counters.get('pfr_hands', 0))
+        for street, stats in aggregates.get('street_stats', {}).items():
+            self.street_stats[street].update({stat: int(value) for stat, value in stats.items()})
+        for position, stats in aggregates.get('position_stats', {}).items():
+            self.position_stats[position].update({stat: int(value) for stat, value in stats.items()})
+        # Stored counters carry no timing, so they seed the decayed stats at full weight
+        self.decayed_stats.rate('vpip').seed(self.preflop_vpip_actions, self.preflop_opportunities)
+        self.decayed_stats.rate('pfr').seed(self.preflop_pfr_actions, self.preflop_opportunities)
+        aggressive = sum(self.street_stats[s].get("BET_count", 0) + self.street_stats[s].get("OPEN_BET_count", 0)
+                         + self.street_stats[s].get("RAISE_count", 0) for s in (FLOP, TURN, RIVER))
+        actions = sum(self.street_stats[s].get("total_actions_on_street", 0) for s in (FLOP, TURN, RIVER))
+        self.decayed_stats.rate('aggression_frequency').seed(aggressive, actions)
+        self._notify_changed()
+
+    def get_type_confidence(self) -> Tuple[float, float]:
+        """Confidence (0..1) and effective sample size of the VPIP data behind classify_player_type."""
+        return self.decayed_stats.confidence('vpip'), self.decayed_stats.effective_sample_size('vpip')
+
+    def classify_player_type(self) -> str:
+        # Classify on decayed estimates shrunk towards the population, so a short
+        # sample leans on the priors instead of switching type at a hard cutoff.
+        # Callers weigh the result with get_type_confidence().
+        vpip = self.decayed_stats.estimate('vpip') * 100
+        pfr = self.decayed_stats.estimate('pfr') * 100
 
         if vpip < 20: # Tight
             if pfr < (vpip * 0.5): # Significantly lower PFR than VPIP -> Passive
@@ -268,79 +349,156 @@ class OpponentProfile:
         return (f"OpponentProfile({self.player_name}): "
                 f"VPIP={self.get_vpip():.1f} ({self.preflop_vpip_actions}/{self.preflop_opportunities}), "
                 f"PFR={self.get_pfr():.1f} ({self.preflop_pfr_actions}/{self.preflop_opportunities}), "
-                f"HandsSeen={self.hands_seen_count}, Type={self.classify_player_type()}")
+                f"HandsSeen={self.hands_seen_count}, Type={self.classify_player_type()} "
+                f"(confidence {self.get_type_confidence()[0]:.2f})")
 
 
 class OpponentTracker:
     """
     Manages multiple OpponentProfile instances and provides aggregated table insights.
     """
-    def __init__(self, config=None, logger_instance: Optional[logging.Logger] = None, max_hands_to_track_per_opponent: int = 100):
+    def __init__(self, config=None, logger_instance: Optional[logging.Logger] = None, max_hands_to_track_per_opponent: int = 100,
+                 profile_store=None, action_log: Optional[ActionLog] = None):
         self.opponents: Dict[str, OpponentProfile] = {}
         self.config = config # Store config if provided
         self.logger = logger_instance if logger_instance else logging.getLogger(__name__)
         self.max_hands_to_track_per_opponent = max_hands_to_track_per_opponent
+        # Optional OpponentProfileStore: profiles load on first sight and are saved at hand end
+        self.profile_store = profile_store
+        self._dirty_profiles = set()
+        self._current_hand_id: Optional[str] = None
+        # Table averages maintained incrementally from the profiles that changed
+        self.min_hands_for_table_stats = self._tracker_setting('min_hands_for_table_stats', 10)
+        self.table_dynamics = TableDynamicsCache(self.opponents, ('vpip', 'pfr'), self._summarize_for_table)
+        # Unknown players start from population priors computed offline, when a priors file exists
+        self.population_priors = get_population_priors(self._settings_dict())
+        # Actions are recorded once in the action log (shared with the bot when given); the
+        # tracker is a view of it, and its profiles keep log row ids rather than action copies
+        self.action_log = action_log if action_log is not None else ActionLog()
+        self.action_log.subscribe(self.on_logged_action)
         self.logger.info("OpponentTracker initialized.")
 
+    def _tracker_setting(self, key: str, default):
+        if not self.config:
+            return default
+        settings = self.config.get_setting('opponent_tracker', {}) if hasattr(self.config, 'get_setting') \
+            else self.config.get('opponent_tracker', {})
+        return settings.get(key, default)
+
+    def _settings_dict(self) -> Dict:
+        if not self.config:
+            return {}
+        return self.config.settings if hasattr(self.config, 'settings') else self.config
+
+    def _summarize_for_table(self, profile: OpponentProfile) -> Optional[Tuple[float, float]]:
+        if profile.hands_seen_count < self.min_hands_for_table_stats:
+            return None
+        return profile.get_vpip(), profile.get_pfr()
+
+    @property
+    def dynamics_version(self) -> int:
+        """Changes whenever any profile changes; key decision caches on it."""
+        return self.table_dynamics.version
+
     def get_opponent_profile(self, player_name: str) -> OpponentProfile:
         """Retrieves or creates an opponent profile."""
         if player_name not in self.opponents:
             self.logger.info(f"Creating new profile for opponent: {player_name}")
-            self.opponents[player_name] = OpponentProfile(
+            profile = OpponentProfile(
                 player_name,
                 max_hands_tracked=self.max_hands_to_track_per_opponent,
-                logger_instance=self.logger # Pass logger to profile
+                logger_instance=self.logger, # Pass logger to profile
+                decayed_stats=create_decayed_stats(self._settings_dict(), self.population_priors)
             )
+            if self.profile_store:
+                stored = self.profile_store.load_profile(SOURCE_BASIC, player_name)
+                if stored:
+                    profile.restore_aggregates(stored)
+                    self.logger.info(f"Loaded stored profile for {player_name} ({profile.hands_seen_count} hands seen)")
+            profile.on_change = self.table_dynamics.mark_dirty
+            profile.action_log = self.action_log
+            self.opponents[player_name] = profile
+            self.table_dynamics.mark_dirty(player_name)
         return self.opponents[player_name]
 
+    def end_hand(self) -> int:
+        """Queue the profiles touched this hand and write them in one batch; returns the number saved."""
+        if not self.profile_store or not self._dirty_profiles:
+            self._dirty_profiles.clear()
+            return 0
+        for player_name in self._dirty_profiles:
+            profile = self.opponents.get(player_name)
+            if profile:
+                self.profile_store.queue_profile(SOURCE_BASIC, player_name, profile.to_aggregates())
+        self._dirty_profiles.clear()
+        return self.profile_store.flush()
+
     def log_action(self, player_name: str, action_type: str, street: str, amount: float = 0, 
                    pot_size_before_action: float = 0, position: Optional[str] = None, 
                    is_our_hero: bool = False, players_in_hand_at_action: int = 0, hand_id: Optional[str] = None):
         """
         Logs an action for a specific opponent.
-        Ensures the hand_id is passed to the profile's new_hand if it's a new hand for them.
+        The action is appended to the action log, which updates this tracker through on_logged_action.
         """
         if not player_name: # Basic validation
             self.logger.warning("Attempted to log action for player with no name.")
             return
 
+        self.action_log.append(
+            player_name,
+            action_type,
+            street,
+            position=position,
+            amount=amount,
+            pot_size_before=pot_size_before_action,
+            hand_id=hand_id
+        )
+            
+    def on_logged_action(self, action: LoggedAction):
+        """
+        ActionLog view: update the profiles from one logged action row.
+        Ensures the hand_id is passed to the profile's new_hand if it's a new hand for them.
+        """
+        player_name = action.player_name
+        hand_id = action.hand_id or None
+
+        # A new hand ID means the previous hand is over: save what it changed
+        if hand_id and hand_id != self._current_hand_id:
+            if self._current_hand_id is not None:
+                self.end_hand()
+            self._current_hand_id = hand_id
+
         profile = self.get_opponent_profile(player_name)
+        self._dirty_profiles.add(player_name)
         
         # Check if it's a new hand for this player profile
         if hand_id and profile.current_hand_id != hand_id:
             profile.new_hand(hand_id)
             self.logger.debug(f"New hand ({hand_id}) started for opponent {player_name} in OpponentTracker.")
-        elif not profile.current_hand_id and hand_id: # If profile just created and hand_id is available
-            profile.new_hand(hand_id)
-            self.logger.debug(f"Initial hand ({hand_id}) set for new opponent {player_name} in OpponentTracker.")
 
         profile.log_action(
-            action_type=action_type, 
-            street=street, 
-            amount=amount, 
-            pot_size_before_action=pot_size_before_action,
-            position=position,
-            is_our_hero=is_our_hero,
-            players_in_hand_at_action=players_in_hand_at_action
+            action_type=action.action_type.upper(),
+            street=action.street,
+            amount=action.amount,
+            pot_size_before_action=action.pot_size_before,
+            position=action.position if action.position != 'unknown' else None,
+            row_id=action.row_id
         )
-            
+
     def get_table_dynamics(self) -> Dict[str, Any]: # Changed return type value to Any
         if not self.opponents:
             return {'avg_vpip': 25.0, 'avg_pfr': 15.0, 'table_type': 'unknown_no_opponents', 'sample_size': 0}
             
-        # Filter for opponents with a minimum number of hands seen for more reliable stats
-        min_hands_for_stats = self.config.get_setting('opponent_tracker',{}).get('min_hands_for_table_stats', 10) if self.config else 10
+        # Averages over opponents with a minimum number of hands seen, maintained incrementally
+        min_hands_for_stats = self.min_hands_for_table_stats
+        averages = self.table_dynamics.averages()
         
-        relevant_profiles = [p for p in self.opponents.values() if p.hands_seen_count >= min_hands_for_stats]
-        
-        if not relevant_profiles:
+        if not averages:
             return {'avg_vpip': 25.0, 'avg_pfr': 15.0, 'table_type': f'unknown_low_sample_opps (need >{min_hands_for_stats} hands)', 'sample_size': 0}
             
-        vpips = [profile.get_vpip() for profile in relevant_profiles]
-        pfrs = [profile.get_pfr() for profile in relevant_profiles]
-        
-        avg_vpip = sum(vpips) / len(vpips)
-        avg_pfr = sum(pfrs) / len(pfrs)
+        avg_vpip = averages['vpip']
+        avg_pfr = averages['pfr']
+        sample_size = self.table_dynamics.count
         
         # Classify table type based on VPIP/PFR averages
         # These thresholds can be configured
@@ -356,8 +514,8 @@ class OpponentTracker:
             'avg_vpip': avg_vpip,
             'avg_pfr': avg_pfr,
             'table_type': table_type,
-            'sample_size': len(relevant_profiles),
-            'profiles_considered': len(relevant_profiles)
+            'sample_size': sample_size,
+            'profiles_considered': sample_size
         }
         
     def get_opponent_exploitative_adjustments(self, player_name: str, game_situation: Dict[str, Any]) -> Dict[str, Any]:
@@ -370,7 +528,7 @@ class OpponentTracker:
             return {"primary_adjust": "play_standard", "reason": "Not enough data or profile not found."}
 
         player_type = profile.classify_player_type()
-        adjustments = {"player_type_identified": player_type}
+        adjustments = {"player_type_identified": player_type, "type_confidence": profile.get_type_confidence()[0]}
 
         # Example adjustments based on player type
         if player_type == "tight_passive":
@@ -405,7 +563,7 @@ class OpponentTracker:
             adjustments["reason"] = "Maniacs overplay hands. Wait for strong hands, let them build the pot."
             adjustments["playing_range_mod"] = "tighten_significantly"
             adjustments["bluff_catch_range_mod"] = "widen_strong_medium"
-        else: # unknown_low_sample or moderate types
+        else: # moderate types
             adjustments["primary_adjust"] = "play_standard_gather_data"
             adjustments["reason"] = f"Player type is {player_type}. More data needed or play standard."
 
@@ -1,17 +1,27 @@
 # performance_monitor.py
 """
 Real-time performance monitoring and adaptive strategy adjustments.
+
+Windowed metrics are kept by RollingWindow aggregates: sums, counts, Welford
+mean/variance and monotonic min/max queues are updated as each hand enters a
+window and again as it leaves, so recording a hand and reading metrics cost
+the same whatever the window size.
+
+When a HandArchiveWriter is attached, every recorded hand and the saved session
+metrics go to the columnar hand archive instead of ad-hoc JSON dumps.
 """
 
 import logging
 import time
 import json
-import statistics
+import math
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from collections import deque
 from enum import Enum
 
+from hand_archive import HandArchiveWriter, archive_record
+
 logger = logging.getLogger(__name__)
 
 class PerformanceMetric(Enum):
@@ -62,12 +72,140 @@ class SessionMetrics:
     hands_per_hour: float
     current_streak: int  # Positive for winning streak, negative for losing
 
+class RunningMoments:
+    """Welford mean and variance supporting removal of earlier values."""
+
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.mean = (old_mean * (self.count + 1) - value) / self.count
+        self.m2 = max(0.0, self.m2 - (value - old_mean) * (value - self.mean))
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class RollingWindow:
+    """
+    Aggregates over the last `size` hands.
+
+    Each hand is reduced once to the numbers the metrics need; those are added to
+    the running totals on entry and subtracted on eviction. Biggest win/loss use
+    monotonic queues, so the extremes are also O(1) amortised per hand.
+    """
+
+    COUNTERS = ('wins', 'vpip', 'pfr', 'aggressive', 'passive', 'pot_size', 'bluffs_attempted', 'bluffs_successful')
+
+    def __init__(self, size: int):
+        self.size = size
+        self._entries = deque()
+        self._sequence = 0
+        self.totals: Dict[str, float] = dict.fromkeys(self.COUNTERS, 0)
+        self.profit = RunningMoments()
+        self.decision_quality = RunningMoments()
+        self._profit_sum = 0.0
+        self._max_queue = deque()  # (sequence, profit) with decreasing profits
+        self._min_queue = deque()  # (sequence, profit) with increasing profits
+
+    @staticmethod
+    def _reduce(hand: HandPerformance) -> Tuple[float, float, Dict[str, float]]:
+        actions = hand.actions_taken
+        counts = {
+            'wins': 1 if hand.profit_loss > 0 else 0,
+            'vpip': 1 if any(action in ('call', 'raise') for action in actions) else 0,
+            'pfr': 1 if 'raise' in actions else 0,
+            'aggressive': actions.count('raise') + actions.count('bet'),
+            'passive': actions.count('call'),
+            'pot_size': hand.pot_size,
+            'bluffs_attempted': hand.bluffs_attempted,
+            'bluffs_successful': hand.bluffs_successful,
+        }
+        return hand.profit_loss, hand.decision_quality_score, counts
+
+    def add(self, hand: HandPerformance):
+        profit, quality, counts = entry = self._reduce(hand)
+        self._sequence += 1
+        self._entries.append(entry)
+        for name, value in counts.items():
+            self.totals[name] += value
+        self.profit.add(profit)
+        self.decision_quality.add(quality)
+        self._profit_sum += profit
+
+        while self._max_queue and self._max_queue[-1][1] <= profit:
+            self._max_queue.pop()
+        self._max_queue.append((self._sequence, profit))
+        while self._min_queue and self._min_queue[-1][1] >= profit:
+            self._min_queue.pop()
+        self._min_queue.append((self._sequence, profit))
+
+        if len(self._entries) > self.size:
+            self._evict()
+
+    def _evict(self):
+        profit, quality, counts = self._entries.popleft()
+        for name, value in counts.items():
+            self.totals[name] -= value
+        self.profit.remove(profit)
+        self.decision_quality.remove(quality)
+        self._profit_sum -= profit
+        oldest = self._sequence - len(self._entries)
+        for queue in (self._max_queue, self._min_queue):
+            if queue and queue[0][0] <= oldest:
+                queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_profit(self) -> float:
+        return self._profit_sum
+
+    @property
+    def win_rate(self) -> float:
+        return self.totals['wins'] / len(self._entries) if self._entries else 0.0
+
+    def rate(self, name: str) -> float:
+        return self.totals[name] / len(self._entries) if self._entries else 0.0
+
+    @property
+    def biggest_win(self) -> float:
+        return self._max_queue[0][1] if self._max_queue else 0.0
+
+    @property
+    def biggest_loss(self) -> float:
+        return self._min_queue[0][1] if self._min_queue else 0.0
+
+
 class PerformanceMonitor:
     """Monitor and analyze bot performance in real-time."""
     
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, archive: Optional[HandArchiveWriter] = None):
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
+        self.archive = archive
         
         # Performance tracking
         self.hand_history = deque(maxlen=500)  # Store recent hands
@@ -79,10 +217,11 @@ class PerformanceMonitor:
         self.longest_winning_streak = 0
         self.longest_losing_streak = 0
         
-        # Rolling windows for trend analysis
-        self.short_term_window = deque(maxlen=20)   # Last 20 hands
-        self.medium_term_window = deque(maxlen=100) # Last 100 hands
-        self.long_term_window = deque(maxlen=500)   # Last 500 hands
+        # Rolling windows for trend analysis; the long window also backs the session metrics
+        self.recent_window = RollingWindow(10)        # Last 10 hands, for loss alerts
+        self.short_term_window = RollingWindow(20)    # Last 20 hands
+        self.medium_term_window = RollingWindow(100)  # Last 100 hands
+        self.long_term_window = RollingWindow(500)    # Last 500 hands
         
         # Performance targets and thresholds
         self.performance_targets = {
@@ -113,9 +252,10 @@ class PerformanceMonitor:
         self.current_session_hands += 1
         
         # Update all rolling windows
-        self.short_term_window.append(hand_performance)
-        self.medium_term_window.append(hand_performance)
-        self.long_term_window.append(hand_performance)
+        self.recent_window.add(hand_performance)
+        self.short_term_window.add(hand_performance)
+        self.medium_term_window.add(hand_performance)
+        self.long_term_window.add(hand_performance)
         
         # Update streak tracking
         self._update_streaks(hand_performance)
@@ -125,6 +265,8 @@ class PerformanceMonitor:
         
         # Update adaptive strategy
         self._update_adaptive_strategy()
+
+        archive_record(self.archive, 'monitor_hands', asdict(hand_performance))
         
         self.logger.debug(f"Recorded hand result: {hand_performance.hand_id}, P/L: {hand_performance.profit_loss:.2f}")
         
@@ -133,35 +275,30 @@ class PerformanceMonitor:
         if not self.hand_history:
             return self._create_empty_metrics()
             
-        hands = list(self.hand_history)
+        window = self.long_term_window
+        totals = window.totals
         session_time = time.time() - self.session_start_time
         
         # Calculate basic metrics
-        total_profit = sum(h.profit_loss for h in hands)
-        wins = sum(1 for h in hands if h.profit_loss > 0)
-        total_hands = len(hands)
-        win_rate = wins / total_hands if total_hands > 0 else 0
+        total_profit = window.total_profit
+        total_hands = len(window)
+        win_rate = window.win_rate
         
         # Calculate VPIP and PFR
-        preflop_actions = [h for h in hands if any(action in ['call', 'raise'] for action in h.actions_taken)]
-        vpip = len(preflop_actions) / total_hands if total_hands > 0 else 0
-        
-        pfr_actions = [h for h in hands if 'raise' in h.actions_taken]
-        pfr = len(pfr_actions) / total_hands if total_hands > 0 else 0
+        vpip = window.rate('vpip')
+        pfr = window.rate('pfr')
         
         # Calculate aggression factor
-        aggressive_actions = sum(h.actions_taken.count('raise') + h.actions_taken.count('bet') for h in hands)
-        passive_actions = sum(h.actions_taken.count('call') for h in hands)
-        aggression_factor = aggressive_actions / max(1, passive_actions)
+        aggression_factor = totals['aggressive'] / max(1, totals['passive'])
         
         # Calculate other metrics
-        avg_pot_size = statistics.mean([h.pot_size for h in hands]) if hands else 0
-        biggest_win = max([h.profit_loss for h in hands], default=0)
-        biggest_loss = min([h.profit_loss for h in hands], default=0)
+        avg_pot_size = window.rate('pot_size')
+        biggest_win = window.biggest_win
+        biggest_loss = window.biggest_loss
         
         # Bluff statistics
-        total_bluff_attempts = sum(h.bluffs_attempted for h in hands)
-        successful_bluffs = sum(h.bluffs_successful for h in hands)
+        total_bluff_attempts = int(totals['bluffs_attempted'])
+        successful_bluffs = int(totals['bluffs_successful'])
         
         # Hands per hour
         hours_played = session_time / 3600
@@ -198,15 +335,12 @@ class PerformanceMonitor:
             ('long_term', self.long_term_window)
         ]:
             if len(window_data) >= 5:
-                window_profit = sum(h.profit_loss for h in window_data)
-                window_win_rate = sum(1 for h in window_data if h.profit_loss > 0) / len(window_data)
-                avg_decision_quality = statistics.mean([h.decision_quality_score for h in window_data])
-                
                 trends[window_name] = {
-                    'profit': window_profit,
-                    'win_rate': window_win_rate,
+                    'profit': window_data.total_profit,
+                    'win_rate': window_data.win_rate,
                     'hands': len(window_data),
-                    'avg_decision_quality': avg_decision_quality
+                    'avg_decision_quality': window_data.decision_quality.mean,
+                    'profit_stdev': window_data.profit.stdev
                 }
                 
         # Calculate trend direction
@@ -334,8 +468,8 @@ class PerformanceMonitor:
             new_alerts.append(f"ALERT: Losing streak of {abs(self.current_streak)} hands - consider taking a break")
             
         # Check for dramatic profit loss
-        if len(self.short_term_window) >= 10:
-            recent_profit = sum(h.profit_loss for h in list(self.short_term_window)[-10:])
+        if len(self.recent_window) >= 10:
+            recent_profit = self.recent_window.total_profit
             if recent_profit < -20:  # Lost more than 20 big blinds in last 10 hands
                 new_alerts.append(f"ALERT: Large recent losses ({recent_profit:.1f} BB in last 10 hands)")
                 
@@ -448,7 +582,23 @@ class PerformanceMonitor:
         return "\n".join(report)
         
     def save_performance_data(self, filename: str = None):
-        """Save performance data to file."""
+        """Save performance data to the attached archive, or to a JSON file when none is attached or filename is given."""
+        if self.archive is not None and not filename:
+            metrics = self.get_current_metrics()
+            archive_record(self.archive, 'session_summaries', {
+                'source': 'performance_monitor',
+                'session_id': str(self.session_start_time),
+                'hands_played': metrics.hands_played,
+                'profit': metrics.total_profit,
+                'details': json.dumps({
+                    'session_metrics': asdict(metrics),
+                    'trends': self.get_performance_trends(),
+                    'adaptive_adjustments': self.get_adaptive_adjustments(),
+                    'alerts': self.performance_alerts,
+                }, default=str),
+            })
+            self.archive.flush()
+            return
         if not filename:
             timestamp = int(time.time())
             filename = f"performance_data_{timestamp}.json"
@@ -471,6 +621,6 @@ class PerformanceMonitor:
         except Exception as e:
             self.logger.error(f"Error saving performance data: {e}")
 
-def create_performance_monitor(config: Dict = None) -> PerformanceMonitor:
+def create_performance_monitor(config: Dict = None, archive: Optional[HandArchiveWriter] = None) -> PerformanceMonitor:
     """Factory function to create performance monitor."""
-    return PerformanceMonitor(config)
+    return PerformanceMonitor(config, archive)
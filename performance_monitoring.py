@@ -2,23 +2,59 @@
 """
 Performance monitoring system for tracking poker bot improvements.
 Collects metrics, analyzes performance trends, and provides actionable insights.
+
+History is persisted as an append-only record journal (see record_journal.py):
+a save appends the session header once and then only the hands recorded since
+the previous save, instead of rewriting every stored session. When a
+HandArchiveWriter is attached, hands and saved sessions also go to the columnar
+hand archive for analytics.
 """
 
-import logging
 import json
-import os
+import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict, deque
 import statistics
 
+from hand_archive import HandArchiveWriter, archive_record
+from record_journal import RecordJournal, DEFAULT_COMPACT_EVERY
+
 logger = logging.getLogger(__name__)
 
+MAX_HISTORICAL_SESSIONS = 100
+
+
+def _fold_performance_record(sessions: List[Dict], record: Dict) -> List[Dict]:
+    """Apply one journal record to the list of historical sessions."""
+    kind = record['type']
+    if kind == 'session':
+        sessions.append(record['session'])
+        # Keep only last 100 sessions
+        del sessions[:-MAX_HISTORICAL_SESSIONS]
+        return sessions
+    session = next((s for s in reversed(sessions) if s.get('session_id') == record['session_id']), None)
+    if session is None:
+        return sessions
+    if kind == 'hand':
+        hand = record['hand']
+        session['decisions'].append(hand)
+        session['hands_played'] += 1
+        session['total_winnings'] += hand['result']
+    elif kind == 'end':
+        session['end_time'] = record['end_time']
+    return sessions
+
 class PerformanceMetrics:
     """Tracks detailed performance metrics."""
     
-    def __init__(self, data_file: str = "performance_data.json"):
+    def __init__(self, data_file: str = "performance_data.json", compact_every: int = DEFAULT_COMPACT_EVERY,
+                 archive: Optional[HandArchiveWriter] = None):
         self.data_file = data_file
+        self.journal = RecordJournal(data_file, compact_every)
+        self.archive = archive
+        self._session_journaled = False
+        self._saved_hand_count = 0
         self.session_data = {
             'session_id': datetime.now().isoformat(),
             'start_time': datetime.now().isoformat(),
@@ -36,12 +72,10 @@ class PerformanceMetrics:
         self.decision_quality_scores = deque(maxlen=50)
         
     def _load_historical_data(self) -> List[Dict]:
-        """Load historical performance data."""
+        """Load historical performance data: the latest snapshot plus the journal tail."""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            return []
+            return self.journal.load([], _fold_performance_record,
+                                     migrate=lambda document: document if isinstance(document, list) else [])
         except Exception as e:
             logger.warning(f"Could not load historical data: {e}")
             return []
@@ -70,6 +104,9 @@ class PerformanceMetrics:
         # Calculate decision quality score
         quality_score = self._calculate_decision_quality(hand_data)
         self.decision_quality_scores.append(quality_score)
+
+        archive_record(self.archive, 'improvement_hands',
+                       dict(hand_data, session_id=self.session_data['session_id'], decision_quality=quality_score))
     
     def _calculate_decision_quality(self, hand_data: Dict) -> float:
         """Calculate a quality score for the decision (0-1 scale)."""
@@ -165,17 +202,37 @@ class PerformanceMetrics:
         }
     
     def save_session_data(self):
-        """Save current session to historical data."""
+        """Append the current session's new hands to the historical data journal."""
         try:
+            session_id = self.session_data['session_id']
             self.session_data['end_time'] = datetime.now().isoformat()
-            self.historical_data.append(self.session_data.copy())
-            
-            # Keep only last 100 sessions
-            if len(self.historical_data) > 100:
-                self.historical_data = self.historical_data[-100:]
-            
-            with open(self.data_file, 'w') as f:
-                json.dump(self.historical_data, f, indent=2)
+            records = []
+            if not self._session_journaled:
+                header = dict(self.session_data, hands_played=0, total_winnings=0.0, decisions=[],
+                              improvements_active=list(self.session_data['improvements_active']))
+                records.append({'type': 'session', 'session': header})
+            records.extend({'type': 'hand', 'session_id': session_id, 'hand': dict(hand)}
+                           for hand in self.session_data['decisions'][self._saved_hand_count:])
+            records.append({'type': 'end', 'session_id': session_id, 'end_time': self.session_data['end_time']})
+
+            self.journal.append(records)
+            self._session_journaled = True
+            self._saved_hand_count = len(self.session_data['decisions'])
+            for record in records:
+                self.historical_data = _fold_performance_record(self.historical_data, record)
+            if self.journal.should_compact:
+                self.journal.compact(self.historical_data)
+
+            if self.archive is not None:
+                summary = {key: value for key, value in self.session_data.items() if key != 'decisions'}
+                archive_record(self.archive, 'session_summaries', {
+                    'source': 'performance_metrics',
+                    'session_id': session_id,
+                    'hands_played': self.session_data['hands_played'],
+                    'profit': self.session_data['total_winnings'],
+                    'details': json.dumps(summary, default=str),
+                })
+                self.archive.flush()
                 
             logger.info(f"Session data saved: {self.session_data['hands_played']} hands, {self.session_data['total_winnings']:.2f} winnings")
             
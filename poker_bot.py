@@ -1,16 +1,27 @@
-from bs4 import BeautifulSoup
 import re
 import sys
+from functools import cached_property
 from hand_evaluator import HandEvaluator
-from equity_calculator import EquityCalculator
 from opponent_tracking import OpponentTracker # Ensure OpponentTracker is imported
 from decision_engine import DecisionEngine, ACTION_FOLD, ACTION_CHECK, ACTION_CALL, ACTION_RAISE # Import actions
-from ui_controller import UIController
 from config import Config # Import Config
-from html_parser import PokerPageParser # Add this import
+from html_snapshot_cache import create_html_snapshot_cache
+from decision_budget import StageCostEstimates, create_decision_budget
+from opponent_profile_store import create_opponent_profile_store
+from action_log import create_action_log
+from stage_timing import configure_stage_timer
+from decision_profiler import create_decision_profiler
 import time
 import logging
 
+# Monte Carlo trials requested for our equity each decision ('equity_trials' setting).
+# The decision budget runs fewer, and records the degradation, only when the equity
+# stage's share of the remaining time cannot cover them.
+DEFAULT_EQUITY_TRIALS = 5000
+
+# Initial cost estimates of the optional decision stages, refined from their measured runs
+DEFAULT_STAGE_ESTIMATES_MS = {'range': 5.0, 'opponent_profiles': 5.0}
+
 # Action definitions
 
 def parse_currency_string(value_str):
@@ -30,14 +41,29 @@ class PokerBot:
         self.fh = None # Initialize fh and ch to None
         self.ch = None # Initialize fh and ch to None
         self.logger = self._setup_logger()
-        self.parser = PokerPageParser(self.logger, self.config)
+        self.snapshot_cache = create_html_snapshot_cache(self.config.settings)
+        self.last_decision_budget = None
+        # Running cost of the optional stages, checked against each decision's budget
+        self.stage_estimates = StageCostEstimates(DEFAULT_STAGE_ESTIMATES_MS)
+        # Why the last run_test_file/run_test_html fell back to FOLD, or None when it ran through
+        self.last_run_error = None
+        # Per-stage latency histograms, exported at session end
+        self.stage_timer = configure_stage_timer(self.config.settings)
+        # Samples the stacks of a fraction of decision cycles, and of slow ones (None when disabled)
+        self.decision_profiler = create_decision_profiler(self.config.settings)
         self.hand_evaluator = HandEvaluator()
-        self.equity_calculator = EquityCalculator()
-        # Initialize OpponentTracker with config and logger
-        self.opponent_tracker = OpponentTracker(config=self.config, logger_instance=self.logger)
+        # Initialize OpponentTracker with config and logger. Profiles persist across sessions only once
+        # the live loop opens the store (see open_opponent_store); offline and test runs never touch it.
+        self.opponent_store = None
+        # Observed actions are recorded once in the action log; trackers are views fed from it
+        self.action_log = create_action_log(self.config.settings)
+        self.opponent_tracker = OpponentTracker(config=self.config, logger_instance=self.logger,
+                                                profile_store=self.opponent_store, action_log=self.action_log)
+        # Per-opponent combo ranges are built on the first logged action (see range_estimator)
+        self.action_log.subscribe(self._feed_range_estimator)
         # Pass config to DecisionEngine
         self.decision_engine = DecisionEngine(self.hand_evaluator, self.config) # Corrected arguments
-        self.ui_controller = UIController(self.logger, self.config) # Pass config
+        # parser, equity_calculator, range_estimator and ui_controller are built on first use (cached properties)
         self.table_data = {}
         self.player_data = [] # This will store list of player dicts
         self.current_html_content = ""
@@ -50,6 +76,38 @@ class PokerBot:
         # self.big_blind and self.small_blind are already set from config or defaults
         self.running = False
 
+    # Components below load on first use, so offline analysis and tests never import the
+    # UI stack (pyautogui, pyperclip) or bs4 and the range tables unless they need them.
+    # Assigning the attribute directly replaces the lazy value.
+
+    @cached_property
+    def parser(self):
+        from html_parser import PokerPageParser
+        return PokerPageParser(self.logger, self.config)
+
+    @cached_property
+    def equity_calculator(self):
+        from equity_calculator import EquityCalculator
+        return EquityCalculator()
+
+    @cached_property
+    def range_estimator(self):
+        """Per-opponent combo ranges for the current hand (None when the 'range_estimation' section disables it)."""
+        if not self.config.settings.get('range_estimation', {}).get('enabled', True):
+            return None
+        from range_estimation import create_range_estimator
+        return create_range_estimator(self.config.settings, type_lookup=self._opponent_type)
+
+    @cached_property
+    def ui_controller(self):
+        from ui_controller import UIController
+        return UIController(self.logger, self.config) # Pass config
+
+    def _feed_range_estimator(self, action):
+        """Action-log view forwarding each logged action to the range estimator."""
+        if self.range_estimator:
+            self.range_estimator.on_logged_action(action)
+
     def _setup_logger(self):
         logger = logging.getLogger(__name__) # Use __name__ for the logger
         logger.setLevel(self.config.get_setting('LOG_LEVEL', 'INFO').upper()) # Get level from config
@@ -121,10 +179,42 @@ class PokerBot:
         """Ensure logger is closed when bot instance is deleted."""
         self.close_logger()
 
+    def _opponent_type(self, player_name):
+        """(type, confidence) of a tracked player for the range estimator."""
+        profile = self.opponent_tracker.opponents.get(player_name)
+        if not profile:
+            return 'unknown'
+        return profile.classify_player_type(), profile.get_type_confidence()[0]
+
+    def _opponent_range_weights(self, community_cards, budget=None):
+        """
+        Narrowed combo weights when a single tracked opponent is still in the hand.
+        Skipped (equity then runs against a uniform range) when the budget cannot cover the range stage.
+        """
+        if not self.range_estimator:
+            return None
+        if budget is not None and not budget.try_stage('range', self.stage_estimates.get('range'),
+                                                       "opponent range skipped"):
+            return None
+        stage_start = time.perf_counter()
+        self.range_estimator.set_board(community_cards)
+        opponents = [p.get('name') for p in self.player_data
+                     if not p.get('is_my_player') and p.get('has_hidden_cards')]
+        weights = self.range_estimator.weights_for(opponents, hand_id=self.table_data.get('hand_id'))
+        stage_ms = (time.perf_counter() - stage_start) * 1000.0
+        self.stage_estimates.update('range', stage_ms)
+        if budget is not None:
+            budget.record_cost('range', stage_ms)
+        return weights
+
     def analyze_table(self):
         self.table_data = self.parser.analyze_table()
 
-    def analyze_players(self):
+    def analyze_players(self, budget=None):
+        with self.stage_timer.stage('analyze_players'):
+            self._analyze_players(budget)
+
+    def _analyze_players(self, budget=None):
         self.player_data = self.parser.analyze_players() 
         
         community_cards_for_equity = self.table_data.get('community_cards', [])
@@ -154,12 +244,15 @@ class PokerBot:
                     # might need adjustment if opponent_range_str_list is strictly required or
                     # if it doesn't handle a "random" opponent by default.
                     # For now, passing None for opponent_range and a fixed number of simulations.
-                    win_prob, tie_prob, equity = self.equity_calculator.calculate_equity_monte_carlo(
-                        formatted_hole_cards, 
-                        community_cards_for_equity, 
-                        None, # opponent_range_str_list - assuming None means random or default
-                        num_simulations=5000 # A reasonable number for faster testing
-                    )
+                    with self.stage_timer.stage('equity'):
+                        win_prob, tie_prob, equity = self.equity_calculator.calculate_equity_monte_carlo(
+                            formatted_hole_cards, 
+                            community_cards_for_equity, 
+                            None, # opponent_range_str_list - assuming None means random or default
+                            num_simulations=self.config.get_setting('equity_trials', DEFAULT_EQUITY_TRIALS),
+                            budget=budget, # Fewer simulations when the decision deadline is near
+                            opponent_weights=self._opponent_range_weights(community_cards_for_equity, budget)
+                        )
                     player_info['win_probability'] = win_prob
                     player_info['tie_probability'] = tie_prob # Store tie_prob as well
                     # self.logger.debug(f"Calculated equity for {player_info.get('name')}: Win={win_prob:.2f}, Tie={tie_prob:.2f}")
@@ -192,9 +285,9 @@ class PokerBot:
                 return player
         return None
 
-    def analyze(self):
+    def analyze(self, budget=None):
         self.analyze_table() 
-        self.analyze_players() 
+        self.analyze_players(budget) 
         return {
             'table': self.table_data,
             'players': self.player_data,
@@ -271,31 +364,61 @@ class PokerBot:
         self.ui_controller.calibrate_all()
         self.logger.info("Calibration finished. Positions saved in config.json")
 
-    def run_test_file(self, file_path):
-        self.logger.info(f"--- Running Test with File: {file_path} ---")
-        action = None
-        amount = None
+    def run_test_file(self, file_path, stage_timings=None):
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 current_html = f.read()
+        except Exception as e:
+            self.logger.error(f"Error reading test file {file_path}: {e}", exc_info=True)
+            self.last_run_error = f"{type(e).__name__}: {e}"
+            return ACTION_FOLD, 0
+        return self.run_test_html(current_html, source=file_path, stage_timings=stage_timings)
+
+    def run_test_html(self, current_html, source='<html>', stage_timings=None):
+        """
+        Parse one HTML snapshot and, if it is our turn, run the decision engine on it.
+        If stage_timings is a dict it receives 'parse', 'analyze' and 'decide'
+        wall-clock durations in seconds for the stages that actually ran.
+        The run is bounded by a fresh decision budget, kept in last_decision_budget.
+        A FOLD returned because the snapshot could not be parsed or decided on
+        leaves the reason in last_run_error (None after a normal run).
+        """
+        self.logger.info(f"--- Running Test with File: {source} ---")
+        action = None
+        amount = None
+        if stage_timings is None:
+            stage_timings = {}
+        budget = create_decision_budget(self.config.settings)
+        self.last_decision_budget = budget
+        self.last_run_error = None
+        if self.decision_profiler:
+            self.decision_profiler.begin_cycle()
+        try:
             self.logger.info(f"HTML length: {len(current_html)}")
             if not current_html:
                 self.logger.warning("Test HTML file is empty.")
+                self.last_run_error = "Empty HTML"
                 return ACTION_FOLD, 0
 
-            parsed_state = self.parser.parse_html(current_html)
+            stage_start = time.perf_counter()
+            with self.stage_timer.stage('parse'):
+                parsed_state = self.parser.parse_html(current_html)
+            stage_timings['parse'] = time.perf_counter() - stage_start
             if not parsed_state or parsed_state.get('error'):
                 self.logger.error(f"Failed to parse HTML from test file: {parsed_state.get('error', 'Unknown parsing error') if parsed_state else 'Parser returned None'}")
                 if parsed_state and parsed_state.get('warnings'):
                     for warning in parsed_state['warnings']:
                         self.logger.warning(f"Parser Warning: {warning}")
+                self.last_run_error = f"Parse failed: {parsed_state.get('error', 'Unknown parsing error') if parsed_state else 'Parser returned None'}"
                 return ACTION_FOLD, 0 
             
             if parsed_state.get('warnings'):
                 for warning in parsed_state['warnings']:
                     self.logger.warning(f"Parser Warning: {warning}")
 
-            self.analyze() 
+            stage_start = time.perf_counter()
+            self.analyze(budget) 
+            stage_timings['analyze'] = time.perf_counter() - stage_start
 
             my_player_data = self.get_my_player()
             table_data = self.table_data
@@ -303,11 +426,13 @@ class PokerBot:
 
             if not my_player_data or not table_data:
                 self.logger.error("Essential game data missing after self.analyze() from test file.")
+                self.last_run_error = "Essential game data missing after analyze()"
                 return ACTION_FOLD, 0
 
-            self.logger.info("\\n--- Game Summary from Test File ---")
-            self.logger.info(self.get_summary())
-            self.logger.info("--- End Game Summary ---")
+            with self.stage_timer.stage('logging'):
+                self.logger.info("\\n--- Game Summary from Test File ---")
+                self.logger.info(self.get_summary())
+                self.logger.info("--- End Game Summary ---")
 
             if my_player_data.get('has_turn'):
                 hand_rank_description = my_player_data.get('hand_evaluation', (0, "N/A"))[1]
@@ -329,6 +454,7 @@ class PokerBot:
                 
                 if my_player_index == -1:
                     self.logger.error("Could not find my_player_index in all_players_data for test file run.")
+                    self.last_run_error = "Could not find my player index"
                     return ACTION_FOLD, 0
 
                 # Construct game_state for DecisionEngine
@@ -357,7 +483,10 @@ class PokerBot:
                 }
 
                 # action_tuple = self.decision_engine.make_decision(my_player_data, table_data, all_players_data)
-                action_tuple = self.decision_engine.make_decision(game_state_for_decision, my_player_index)
+                stage_start = time.perf_counter()
+                with self.stage_timer.stage('decide'):
+                    action_tuple = self.decision_engine.make_decision(game_state_for_decision, my_player_index, budget=budget)
+                stage_timings['decide'] = time.perf_counter() - stage_start
                 
                 action = ""
                 amount = 0 
@@ -388,10 +517,13 @@ class PokerBot:
                     self.logger.info("Player data not found or not my turn. Waiting...")
                 return ACTION_FOLD, 0 # Or some other appropriate default
         except Exception as e:
-            self.logger.error(f"Error during test file run for {file_path}: {e}", exc_info=True)
+            self.logger.error(f"Error during test file run for {source}: {e}", exc_info=True)
+            self.last_run_error = f"{type(e).__name__}: {e}"
             return ACTION_FOLD, 0 # Default to FOLD on error
         finally:
-            self.logger.info(f"--- Test File Run Finished for: {file_path} ---")
+            if self.decision_profiler:
+                self.decision_profiler.end_cycle()
+            self.logger.info(f"--- Test File Run Finished for: {source} ---")
             # self.close_logger() # Closing logger here might be too soon if bot instance is reused.
                                # Let's call it from the main script or test runner.
 
@@ -431,8 +563,105 @@ class PokerBot:
         else:
             print("Logger not initialized or already cleaned up.")
 
+    def _process_new_snapshot(self, current_html, snapshot=None, budget=None):
+        """
+        Parse a snapshot that differs from the previous one, analyze it and fold
+        any newly inferred opponent actions into action_history.
+        Returns the raw player list from the parser, or None if parsing failed.
+        """
+        snapshot = snapshot if snapshot is not None else self.snapshot_cache.lookup(current_html)
+
+        # 2. Parse HTML to get game state
+        # Assuming self.parser.parse_html(current_html) returns a dict 
+        # like game_state = {'my_player_data': ..., 'table_data': ..., 'all_players_data': ...}
+        # or None/throws error on failure.
+        with self.stage_timer.stage('parse'):
+            parsed_state = self.parser.parse_html(current_html)
+        
+        if parsed_state and parsed_state.get('warnings'):
+            for warning in parsed_state['warnings']:
+                self.logger.warning(f"Parser Warning: {warning}")
+
+        if not parsed_state or parsed_state.get('error'): # Check for error from parser
+            self.logger.error(f"Failed to parse HTML or critical data missing: {parsed_state.get('error', 'Unknown parsing error') if parsed_state else 'Parser returned None'}. Retrying in 1 second...")
+            self.snapshot_cache.invalidate()
+            return None
+
+        # Process the parsed HTML data using PokerBot's analyze method.
+        # This populates self.table_data and self.player_data (which includes hand_evaluation).
+        self.analyze(budget)
+
+        # Check for hand change to reset action_history
+        new_hand_id = self.table_data.get('hand_id')
+        if new_hand_id and new_hand_id != self.current_hand_id_for_history:
+            self.logger.info(f"New hand detected (ID: {new_hand_id}). Resetting action history.")
+            if self.current_hand_id_for_history and self.opponent_tracker:
+                self.opponent_tracker.end_hand()
+            if self.range_estimator:
+                self.range_estimator.new_hand(new_hand_id)
+            self.action_history = []
+            self.current_hand_id_for_history = new_hand_id
+        elif not new_hand_id and self.current_hand_id_for_history: # Hand ended, no new ID yet
+            self.logger.info(f"Hand ID no longer present (was {self.current_hand_id_for_history}). Resetting action history.")
+            self.action_history = []
+            self.current_hand_id_for_history = None
+
+        # Get opponent actions from parser and update history
+        if hasattr(self.parser, 'get_parsed_actions') and callable(getattr(self.parser, 'get_parsed_actions')):
+            # Pass current HTML to get_parsed_actions for re-parsing if necessary
+            parsed_actions = self.parser.get_parsed_actions(html_content_for_reparse=current_html)
+            if parsed_actions:
+                for pa_action in parsed_actions:
+                    # Basic deduplication: check if a similar action from the same player on the same street is already in recent history
+                    is_duplicate = False
+                    # Check a bit more than just the number of newly parsed actions to catch recent duplicates
+                    # Check against the last N actions, where N is, for example, number of active players + a buffer
+                    # This helps avoid re-adding actions if parsing is slightly delayed or re-triggered.
+                    # The sequence number in action_history could also be used for more robust deduplication.
+                    # For now, a simple check against recent history by content.
+                    check_depth = len(self.player_data) + 3 # Check depth based on number of players + buffer
+                    for recent_action in self.action_history[-check_depth:]:
+                        if (recent_action.get('player_id') == pa_action.get('player_id') and
+                            recent_action.get('street') == pa_action.get('street') and
+                            recent_action.get('action_type') == pa_action.get('action_type') and
+                            recent_action.get('amount') == pa_action.get('amount') and
+                            not recent_action.get('is_bot')): # Only deduplicate opponent actions
+                            is_duplicate = True
+                            break
+                    if not is_duplicate:
+                        # Add hand_id to the parsed action before appending
+                        pa_action['hand_id'] = self.current_hand_id_for_history
+                        pa_action['sequence'] = len(self.action_history) # Add sequence number
+                        self.action_history.append(pa_action)
+                        self.logger.info(f"Added parsed opponent action to history: {pa_action}")
+                        if pa_action.get('player_id'):
+                            # Recorded once in the action log, which feeds the opponent trackers
+                            self.action_log.append(
+                                player_name=pa_action.get('player_id'),
+                                action_type=pa_action.get('action_type'),
+                                street=pa_action.get('street'),
+                                position=pa_action.get('position', 'unknown'), # Add position if available
+                                amount=pa_action.get('amount', 0),
+                                # pot_size needs to be the pot size *before* this action.
+                                # This might require more sophisticated state tracking or for parser to provide it.
+                                # For now, we might pass the current pot_size from table_data, though it's not ideal.
+                                pot_size_before=self.table_data.get('pot_size', 0),
+                                hand_id=self.current_hand_id_for_history
+                            )
+                    else:
+                        self.logger.debug(f"Skipped adding duplicate parsed opponent action: {pa_action}")
+
+        raw_all_players_data = self.parser.analyze_players() # Make sure this is called to get player data
+        self.snapshot_cache.store(snapshot, parsed_state, {
+            'table_data': self.table_data,
+            'player_data': self.player_data,
+            'raw_players': raw_all_players_data,
+        })
+        return raw_all_players_data
+
     def main_loop(self):
         self.logger.info("Poker Bot - Main Loop Started")
+        self.open_opponent_store()
         try:
             while True:
                 self.logger.info("\n--- New Decision Cycle ---")
@@ -448,88 +677,32 @@ class PokerBot:
                     time.sleep(1) # Changed from 5 seconds
                     continue
                 
-                # Removed the check: if current_html == self.last_html_content:
-                # HTML will be processed every cycle now.
+                # HTML is fetched every cycle; the snapshot cache decides how much of it is re-parsed.
                 self.last_html_content = current_html
-
-                # 2. Parse HTML to get game state
-                # Assuming self.parser.parse_html(current_html) returns a dict 
-                # like game_state = {'my_player_data': ..., 'table_data': ..., 'all_players_data': ...}
-                # or None/throws error on failure.
-                parsed_state = self.parser.parse_html(current_html)
-                
-                if parsed_state and parsed_state.get('warnings'):
-                    for warning in parsed_state['warnings']:
-                        self.logger.warning(f"Parser Warning: {warning}")
-
-                if not parsed_state or parsed_state.get('error'): # Check for error from parser
-                    self.logger.error(f"Failed to parse HTML or critical data missing: {parsed_state.get('error', 'Unknown parsing error') if parsed_state else 'Parser returned None'}. Retrying in 1 second...")
-                    time.sleep(1)
-                    continue
-
-                # Process the parsed HTML data using PokerBot's analyze method.
-                # This populates self.table_data and self.player_data (which includes hand_evaluation).
-                self.analyze()
-
-                # Check for hand change to reset action_history
-                new_hand_id = self.table_data.get('hand_id')
-                if new_hand_id and new_hand_id != self.current_hand_id_for_history:
-                    self.logger.info(f"New hand detected (ID: {new_hand_id}). Resetting action history.")
-                    self.action_history = []
-                    self.current_hand_id_for_history = new_hand_id
-                elif not new_hand_id and self.current_hand_id_for_history: # Hand ended, no new ID yet
-                    self.logger.info(f"Hand ID no longer present (was {self.current_hand_id_for_history}). Resetting action history.")
-                    self.action_history = []
-                    self.current_hand_id_for_history = None
-
-                # Get opponent actions from parser and update history
-                if hasattr(self.parser, 'get_parsed_actions') and callable(getattr(self.parser, 'get_parsed_actions')):
-                    # Pass current HTML to get_parsed_actions for re-parsing if necessary
-                    parsed_actions = self.parser.get_parsed_actions(html_content_for_reparse=current_html)
-                    if parsed_actions:
-                        for pa_action in parsed_actions:
-                            # Basic deduplication: check if a similar action from the same player on the same street is already in recent history
-                            is_duplicate = False
-                            # Check a bit more than just the number of newly parsed actions to catch recent duplicates
-                            # Check against the last N actions, where N is, for example, number of active players + a buffer
-                            # This helps avoid re-adding actions if parsing is slightly delayed or re-triggered.
-                            # The sequence number in action_history could also be used for more robust deduplication.
-                            # For now, a simple check against recent history by content.
-                            check_depth = len(self.player_data) + 3 # Check depth based on number of players + buffer
-                            for recent_action in self.action_history[-check_depth:]:
-                                if (recent_action.get('player_id') == pa_action.get('player_id') and
-                                    recent_action.get('street') == pa_action.get('street') and
-                                    recent_action.get('action_type') == pa_action.get('action_type') and
-                                    recent_action.get('amount') == pa_action.get('amount') and
-                                    not recent_action.get('is_bot')): # Only deduplicate opponent actions
-                                    is_duplicate = True
-                                    break
-                            if not is_duplicate:
-                                # Add hand_id to the parsed action before appending
-                                pa_action['hand_id'] = self.current_hand_id_for_history
-                                pa_action['sequence'] = len(self.action_history) # Add sequence number
-                                self.action_history.append(pa_action)
-                                self.logger.info(f"Added parsed opponent action to history: {pa_action}")
-                                if self.opponent_tracker:
-                                    # Ensure all necessary parameters are passed to log_action
-                                    self.opponent_tracker.log_action(
-                                        player_name=pa_action.get('player_id'), # Changed from player_id to player_name
-                                        action_type=pa_action.get('action_type'), # Corrected parameter name
-                                        street=pa_action.get('street'),
-                                        position=pa_action.get('position', 'unknown'), # Add position if available
-                                        amount=pa_action.get('amount', 0), # Renamed from bet_size to amount
-                                        # pot_size needs to be the pot size *before* this action.
-                                        # This might require more sophisticated state tracking or for parser to provide it.
-                                        # For now, we might pass the current pot_size from table_data, though it's not ideal.
-                                        pot_size_before_action=self.table_data.get('pot_size', 0), # Renamed from pot_size
-                                        hand_id=self.current_hand_id_for_history
-                                    )
-                            else:
-                                self.logger.debug(f"Skipped adding duplicate parsed opponent action: {pa_action}")
-
+                if self.decision_profiler:
+                    self.decision_profiler.begin_cycle()
+
+                # Deadline for this decision cycle; equity shrinks to fit what is left of it
+                budget = create_decision_budget(self.config.settings)
+                self.last_decision_budget = budget
+
+                # Identical snapshots, or ones where only timers/animations changed,
+                # reuse the previous parse and analysis (no player extraction, no equity).
+                snapshot = self.snapshot_cache.lookup(current_html)
+                if snapshot.is_reusable:
+                    self.logger.debug(f"Snapshot {snapshot.change}; reusing previous parse and analysis.")
+                    self.table_data = snapshot.analysis['table_data']
+                    self.player_data = snapshot.analysis['player_data']
+                    raw_all_players_data = snapshot.analysis['raw_players']
+                else:
+                    raw_all_players_data = self._process_new_snapshot(current_html, snapshot, budget)
+                    if raw_all_players_data is None:
+                        if self.decision_profiler:
+                            self.decision_profiler.end_cycle()
+                        time.sleep(1)
+                        continue
 
                 my_player_data = self.get_my_player()
-                raw_all_players_data = self.parser.analyze_players() # Make sure this is called to get player data
 
                 if my_player_data and my_player_data.get('has_turn'):
                     self.logger.info("My turn to act.")
@@ -580,7 +753,8 @@ class PokerBot:
                             "board": self.table_data.get('community_cards'),
                             "action_history": self.action_history
                         }
-                        action_tuple = self.decision_engine.make_decision(game_state_for_decision, my_player_index)
+                        with self.stage_timer.stage('decide'):
+                            action_tuple = self.decision_engine.make_decision(game_state_for_decision, my_player_index, budget=budget)
 
                     action = ""
                     amount = 0
@@ -651,19 +825,21 @@ class PokerBot:
                     if not is_recent_bot_action_same:
                         self.action_history.append(bot_action_record)
                         self.logger.info(f"Recorded bot action to action_history: {bot_action_record}")
-                        if self.opponent_tracker and my_player_data:
-                            self.opponent_tracker.log_action(
-                                player_name=bot_player_id, # Changed from player_id to player_name
-                                action_type=action.upper(), # Corrected parameter name
+                        if my_player_data and bot_player_id:
+                            self.action_log.append(
+                                player_name=bot_player_id,
+                                action_type=action,
                                 street=current_street_for_history,
-                                amount=float(amount) if amount is not None else 0.0, # Corrected parameter name
+                                amount=float(amount) if amount is not None else 0.0,
                                 # Position and pot_size for bot's own action might also need careful consideration
                                 # For now, using basic values or 'unknown' if not readily available.
                                 position=my_player_data.get('position', 'unknown'),
-                                pot_size_before_action=self.table_data.get('pot_size', 0), # Corrected parameter name
+                                pot_size_before=self.table_data.get('pot_size', 0),
                                 hand_id=self.current_hand_id_for_history
                             )
                     
+                    if self.decision_profiler:
+                        self.decision_profiler.end_cycle()
                     time.sleep(self.config.get_setting('delays', {}).get('after_action_delay', 5.0))
 
                 else: # Not my turn or no player data
@@ -676,6 +852,8 @@ class PokerBot:
                     else: # No player data at all (e.g. observing, or error)
                         self.logger.info("No player data found or not my turn. Waiting...")
                 
+                if self.decision_profiler:
+                    self.decision_profiler.end_cycle()
                 time.sleep(self.config.get_setting('delays', {}).get('main_loop_delay', 1.0))
 
         except KeyboardInterrupt:
@@ -683,8 +861,49 @@ class PokerBot:
         except Exception as e:
             self.logger.error(f"Critical error in main loop: {e}", exc_info=True)
         finally:
+            self.close_opponent_store()
+            self.export_stage_timings()
+            self.export_decision_profile()
             self.logger.info("Poker Bot - Main Loop Ended")
 
+    def export_stage_timings(self):
+        """Write and log p50/p95/p99 latency per decision-cycle stage."""
+        timer = getattr(self, 'stage_timer', None)
+        if timer is None or not timer.histograms:
+            return
+        timer.export()
+        self.logger.info("Decision cycle stage timings:\n" + timer.report())
+
+    def export_decision_profile(self):
+        """Write the folded stacks of profiled decision cycles and stop the sampler."""
+        profiler = getattr(self, 'decision_profiler', None)
+        if not profiler:
+            return
+        profiler.end_cycle()
+        if profiler.write():
+            hot = ', '.join(f"{frame} ({samples})" for frame, samples in profiler.top_frames(5))
+            self.logger.info(f"Hottest frames in profiled decisions: {hot}")
+        profiler.close()
+
+    def open_opponent_store(self):
+        """Open the opponent profile store if the config enables it; called by the live loops only."""
+        if self.opponent_store is None:
+            self.opponent_store = create_opponent_profile_store(self.config.settings)
+        if self.opponent_store:
+            self.opponent_tracker.profile_store = self.opponent_store
+            self.logger.info(f"Opponent profiles persist to {self.opponent_store.db_path}")
+        return self.opponent_store
+
+    def close_opponent_store(self):
+        """Save the opponent profiles of the unfinished hand and close the profile store."""
+        if not getattr(self, 'opponent_store', None):
+            return
+        try:
+            self.opponent_tracker.end_hand()
+            self.opponent_store.close()
+        except Exception as e:
+            self.logger.error(f"Error closing opponent profile store: {e}")
+
 if __name__ == "__main__":
     # Basic logging setup for the __main__ block with Unicode support
     import io
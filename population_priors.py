@@ -0,0 +1,367 @@
+# population_priors.py
+"""
+Population priors computed offline from archived hand data.
+
+Unknown opponents used to get hard-coded guesses: an average VPIP of 25, a fold
+equity of 0.5, and a fixed mix of opponent types. This module has two halves:
+
+- PopulationPriorJob, an offline job that streams the opponent profile store
+  (SQLite) and the GameLogger decision CSVs row by row and keeps only fixed-size
+  accumulators per (position, street, stat). Memory stays bounded however many
+  millions of actions the archive holds. Each stat gets a pooled mean and a prior
+  strength, estimated by method of moments from the spread of per-player rates.
+  The result is merged into a small JSON lookup file keyed by stake.
+
+- PopulationPriors, the lookup the trackers and opponent analyses load at
+  startup, with fallback from (position, street) to broader entries.
+
+Run the job with:
+    python population_priors.py --stake 0.02 --store logs/opponent_profiles.db --decisions logs/decisions_*.csv
+"""
+
+import argparse
+import csv
+import glob
+import json
+import logging
+import os
+import sqlite3
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from opponent_profile_store import SOURCE_BASIC, SOURCE_ENHANCED
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIORS_PATH = 'population_priors.json'
+FORMAT_VERSION = 1
+ALL = 'all'
+POSTFLOP_STREETS = ('flop', 'turn', 'river')
+MIN_PLAYER_OPPORTUNITIES = 20  # Players below this do not count towards the spread of rates
+PRIOR_STRENGTH_BOUNDS = (2.0, 200.0)
+
+# Decayed-stat name -> (position, street, stat) entry it is read from
+DECAYED_STAT_ENTRIES = {
+    'vpip': (ALL, ALL, 'vpip'),
+    'pfr': (ALL, ALL, 'pfr'),
+    'aggression_frequency': (ALL, ALL, 'aggression_frequency'),
+    'cbet': (ALL, 'flop', 'cbet'),
+    'fold_to_cbet': (ALL, 'flop', 'fold_to_cbet'),
+    'turn_aggression': (ALL, 'turn', 'aggression_frequency'),
+    'river_aggression': (ALL, 'river', 'aggression_frequency'),
+}
+
+
+class _Accumulator:
+    """Pooled hits/opportunities plus first and second moments of per-player rates."""
+
+    __slots__ = ('hits', 'opportunities', 'players', 'rate_sum', 'rate_sq_sum', 'player_opportunities')
+
+    def __init__(self):
+        self.hits = 0.0
+        self.opportunities = 0.0
+        self.players = 0
+        self.rate_sum = 0.0
+        self.rate_sq_sum = 0.0
+        self.player_opportunities = 0.0
+
+    def add(self, hits: float, opportunities: float, min_opportunities: float = 0):
+        if opportunities <= 0:
+            return
+        hits = min(hits, opportunities)
+        self.hits += hits
+        self.opportunities += opportunities
+        if min_opportunities and opportunities >= min_opportunities:
+            rate = hits / opportunities
+            self.players += 1
+            self.rate_sum += rate
+            self.rate_sq_sum += rate * rate
+            self.player_opportunities += opportunities
+
+    def prior_strength(self, mean: float) -> Optional[float]:
+        """Beta prior strength from the spread of player rates, net of sampling noise."""
+        if self.players < 5 or not 0.0 < mean < 1.0:
+            return None
+        rate_mean = self.rate_sum / self.players
+        variance = self.rate_sq_sum / self.players - rate_mean * rate_mean
+        average_n = self.player_opportunities / self.players
+        true_variance = variance - mean * (1.0 - mean) / average_n
+        low, high = PRIOR_STRENGTH_BOUNDS
+        if true_variance <= 0:
+            return high
+        return max(low, min(high, mean * (1.0 - mean) / true_variance - 1.0))
+
+    def to_entry(self, ratio: bool = True) -> Dict[str, float]:
+        mean = self.hits / self.opportunities
+        entry = {'mean': round(mean, 4), 'samples': int(self.opportunities)}
+        strength = self.prior_strength(mean) if ratio else None
+        if strength is not None:
+            entry['strength'] = round(strength, 1)
+            entry['players'] = self.players
+        return entry
+
+
+def classify_vpip_pfr(vpip_pct: float, pfr_pct: float) -> str:
+    """Opponent type in the fixed opponent integration's vocabulary."""
+    from fixed_opponent_integration import classify_vpip_pfr as classify
+    return classify(vpip_pct, pfr_pct)
+
+
+class PopulationPriorJob:
+    """Streams archived opponent data and decision CSVs into per-stake population priors."""
+
+    def __init__(self, stake: str, sources: Iterable[str] = (SOURCE_BASIC, SOURCE_ENHANCED),
+                 min_player_opportunities: int = MIN_PLAYER_OPPORTUNITIES):
+        self.stake = str(stake)
+        # A player tracked by several trackers is counted once, from the first source listed
+        self.sources = tuple(sources)
+        self.min_player_opportunities = min_player_opportunities
+        self._stats: Dict[Tuple[str, str, str], _Accumulator] = {}
+        self._means: Dict[Tuple[str, str, str], _Accumulator] = {}
+        self._type_counts: Dict[str, int] = {}
+        self.rows_read = 0
+
+    def _add(self, position: str, street: str, stat: str, hits: float, opportunities: float):
+        key = (position, street, stat)
+        accumulator = self._stats.get(key)
+        if accumulator is None:
+            accumulator = self._stats[key] = _Accumulator()
+        accumulator.add(hits, opportunities, self.min_player_opportunities)
+
+    def _add_mean(self, street: str, stat: str, value: float):
+        key = (ALL, street, stat)
+        accumulator = self._means.get(key)
+        if accumulator is None:
+            accumulator = self._means[key] = _Accumulator()
+        accumulator.hits += value
+        accumulator.opportunities += 1
+
+    def _preferred(self, rows: Iterable[tuple]) -> List[tuple]:
+        """Rows of one group that come from the most preferred source (source is column 0)."""
+        rows = list(rows)
+        for source in self.sources:
+            chosen = [row for row in rows if row[0] == source]
+            if chosen:
+                return chosen
+        return []
+
+    # --- Opponent profile store -----------------------------------------------
+
+    def add_profile_store(self, db_path: str):
+        """Stream every stored player, street and position aggregate from a profile store."""
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            placeholders = ', '.join('?' * len(self.sources))
+            players = conn.execute(
+                f"SELECT source, player_name, preflop_opportunities, vpip_hands, pfr_hands FROM players "
+                f"WHERE source IN ({placeholders}) ORDER BY player_name", self.sources)
+            for _, group in groupby(players, key=lambda row: row[1]):
+                for _, _, opportunities, vpip_hands, pfr_hands in self._preferred(group):
+                    self.rows_read += 1
+                    self._add(ALL, ALL, 'vpip', vpip_hands, opportunities)
+                    self._add(ALL, ALL, 'pfr', pfr_hands, opportunities)
+                    if opportunities >= self.min_player_opportunities:
+                        vpip_pct = 100.0 * vpip_hands / opportunities
+                        player_type = classify_vpip_pfr(vpip_pct, 100.0 * pfr_hands / opportunities)
+                        self._type_counts[player_type] = self._type_counts.get(player_type, 0) + 1
+
+            street_rows = conn.execute(
+                f"SELECT source, player_name, street, stat, value FROM street_stats "
+                f"WHERE source IN ({placeholders}) ORDER BY player_name, street", self.sources)
+            for (_, street), group in groupby(street_rows, key=lambda row: (row[1], row[2])):
+                rows = self._preferred(group)
+                if rows and street in POSTFLOP_STREETS:
+                    self._add_street(rows[0][0], street, {stat: value for _, _, _, stat, value in rows})
+
+            position_rows = conn.execute(
+                "SELECT source, player_name, position, stat, value FROM position_stats "
+                "WHERE source = ? ORDER BY player_name, position", (SOURCE_ENHANCED,))
+            for (_, position), group in groupby(position_rows, key=lambda row: (row[1], row[2])):
+                self._add_position(position, {stat: value for _, _, _, stat, value in group})
+        finally:
+            conn.close()
+
+    def _add_street(self, source: str, street: str, stats: Dict[str, float]):
+        self.rows_read += 1
+        if source == SOURCE_BASIC:
+            aggressive = stats.get('BET_count', 0) + stats.get('OPEN_BET_count', 0) + stats.get('RAISE_count', 0)
+            total = stats.get('total_actions_on_street', 0)
+            self._add(ALL, street, 'cbet', stats.get('cbets_made', 0), stats.get('cbet_opportunities', 0))
+            self._add(ALL, street, 'fold_to_cbet', stats.get('fold_to_cbet_count', 0),
+                      stats.get('faced_cbet_opportunities', 0))
+        else:
+            aggressive = stats.get('aggressive_actions', 0)
+            total = stats.get('total_actions', 0)
+        self._add(ALL, street, 'aggression_frequency', aggressive, total)
+        self._add(ALL, ALL, 'aggression_frequency', aggressive, total)
+
+    def _add_position(self, position: str, stats: Dict[str, float]):
+        self.rows_read += 1
+        total = stats.get('total_actions', 0)
+        aggressive = stats.get('bet', 0) + stats.get('raise', 0) + stats.get('all_in', 0)
+        self._add(position, ALL, 'aggression_frequency', aggressive, total)
+        self._add(position, ALL, 'fold_frequency', stats.get('fold', 0), total)
+
+    # --- Decision CSVs -----------------------------------------------------------
+
+    def add_decisions_csv(self, csv_path: str):
+        """Stream a GameLogger decisions CSV: how often, and how big, the bets we face are."""
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                self.rows_read += 1
+                street = (row.get('game_stage') or '').strip().lower()
+                if not street:
+                    continue
+                try:
+                    pot_size = float(row.get('pot_size') or 0)
+                    bet_to_call = float(row.get('bet_to_call') or 0)
+                except ValueError:
+                    continue
+                facing_bet = bet_to_call > 0
+                self._add_mean(street, 'facing_bet', 1.0 if facing_bet else 0.0)
+                if facing_bet and pot_size > bet_to_call:
+                    self._add_mean(street, 'bet_to_pot', bet_to_call / (pot_size - bet_to_call))
+
+    # --- Output ------------------------------------------------------------------
+
+    def result(self) -> Dict[str, Any]:
+        """Priors for this stake: {'entries': {position: {street: {stat: entry}}}, 'type_shares': ...}."""
+        entries: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (position, street, stat), accumulator in sorted(self._stats.items()):
+            if accumulator.opportunities > 0:
+                entries.setdefault(position, {}).setdefault(street, {})[stat] = accumulator.to_entry()
+        for (position, street, stat), accumulator in sorted(self._means.items()):
+            if accumulator.opportunities > 0:
+                entries.setdefault(position, {}).setdefault(street, {})[stat] = accumulator.to_entry(ratio=False)
+        typed = sum(self._type_counts.values())
+        type_shares = {name: round(count / typed, 4) for name, count in sorted(self._type_counts.items())} if typed else {}
+        return {'entries': entries, 'type_shares': type_shares, 'rows_read': self.rows_read}
+
+    def write(self, output_path: str = DEFAULT_PRIORS_PATH) -> Dict[str, Any]:
+        """Merge this stake's priors into the lookup file (other stakes are kept)."""
+        document = {'version': FORMAT_VERSION, 'stakes': {}}
+        if os.path.exists(output_path):
+            try:
+                with open(output_path, encoding='utf-8') as f:
+                    existing = json.load(f)
+                if existing.get('version') == FORMAT_VERSION:
+                    document = existing
+            except (OSError, ValueError) as e:
+                logger.warning(f"Replacing unreadable priors file {output_path}: {e}")
+        document['generated'] = time.time()
+        document['stakes'][self.stake] = self.result()
+        temp_path = f'{output_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, separators=(',', ':'))
+        os.replace(temp_path, output_path)
+        logger.info(f"Wrote population priors for stake {self.stake} ({self.rows_read} rows) to {output_path}")
+        return document
+
+
+class PopulationPriors:
+    """Lookup over a priors file, falling back to broader (position, street) entries."""
+
+    def __init__(self, document: Optional[Dict[str, Any]] = None, stake: Optional[str] = None):
+        self.stakes: Dict[str, Dict[str, Any]] = (document or {}).get('stakes', {})
+        self.stake = str(stake) if stake is not None and str(stake) in self.stakes else self._largest_stake()
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PRIORS_PATH, stake: Optional[str] = None) -> 'PopulationPriors':
+        try:
+            with open(path, encoding='utf-8') as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return cls(None, stake)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read population priors from {path}: {e}")
+            return cls(None, stake)
+        if document.get('version') != FORMAT_VERSION:
+            logger.warning(f"Ignoring population priors with unknown version in {path}")
+            return cls(None, stake)
+        return cls(document, stake)
+
+    def _largest_stake(self) -> Optional[str]:
+        if not self.stakes:
+            return None
+        return max(self.stakes, key=lambda stake: self.stakes[stake].get('rows_read', 0))
+
+    def __bool__(self) -> bool:
+        return self.stake is not None
+
+    def entry(self, stat: str, position: str = ALL, street: str = ALL,
+              stake: Optional[str] = None) -> Optional[Dict[str, float]]:
+        priors = self.stakes.get(str(stake) if stake is not None else self.stake)
+        if not priors:
+            return None
+        entries = priors.get('entries', {})
+        for pos, st in ((position, street), (position, ALL), (ALL, street), (ALL, ALL)):
+            found = entries.get(pos, {}).get(st, {}).get(stat)
+            if found:
+                return found
+        return None
+
+    def mean(self, stat: str, default: Optional[float] = None, **where) -> Optional[float]:
+        found = self.entry(stat, **where)
+        return found['mean'] if found else default
+
+    def decayed_stat_priors(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """(means, prior strengths) for the DecayedStats names that have entries."""
+        means, strengths = {}, {}
+        for name, (position, street, stat) in DECAYED_STAT_ENTRIES.items():
+            found = self.entry(stat, position, street)
+            if found and found.get('samples', 0) > 0:
+                means[name] = found['mean']
+                if 'strength' in found:
+                    strengths[name] = found['strength']
+        return means, strengths
+
+    def type_shares(self) -> Dict[str, float]:
+        return dict(self.stakes.get(self.stake, {}).get('type_shares', {})) if self.stake else {}
+
+
+# Global instance, loaded on first use
+_population_priors: Optional[PopulationPriors] = None
+_population_priors_key: Optional[Tuple[str, Optional[str]]] = None
+
+
+def create_population_priors(config: Optional[Dict] = None) -> PopulationPriors:
+    """Factory function reading the optional 'population_priors' config section."""
+    settings = (config or {}).get('population_priors', {}) if isinstance(config, dict) else {}
+    return PopulationPriors.load(settings.get('path', DEFAULT_PRIORS_PATH), settings.get('stake'))
+
+
+def get_population_priors(config: Optional[Dict] = None) -> PopulationPriors:
+    """The shared priors lookup (the file is read once per path and stake)."""
+    global _population_priors, _population_priors_key
+    settings = (config or {}).get('population_priors', {}) if isinstance(config, dict) else {}
+    key = (settings.get('path', DEFAULT_PRIORS_PATH), settings.get('stake'))
+    if _population_priors is None or key != _population_priors_key:
+        _population_priors = create_population_priors(config)
+        _population_priors_key = key
+    return _population_priors
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compute population priors from archived hand data.")
+    parser.add_argument('--stake', required=True, help="Stake label the inputs were played at (e.g. big blind 0.02)")
+    parser.add_argument('--store', action='append', default=[], help="Opponent profile store database")
+    parser.add_argument('--decisions', action='append', default=[], help="Decision CSV path or glob")
+    parser.add_argument('--output', default=DEFAULT_PRIORS_PATH)
+    parser.add_argument('--min-opportunities', type=int, default=MIN_PLAYER_OPPORTUNITIES)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    job = PopulationPriorJob(args.stake, min_player_opportunities=args.min_opportunities)
+    for db_path in args.store:
+        job.add_profile_store(db_path)
+    for pattern in args.decisions:
+        for csv_path in sorted(glob.glob(pattern)):
+            job.add_decisions_csv(csv_path)
+    job.write(args.output)
+    print(f"Processed {job.rows_read} rows into {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
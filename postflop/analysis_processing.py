@@ -2,6 +2,8 @@
 # filepath: h:\\Programming\\pokerplayer\\postflop\\analysis_processing.py
 import logging
 
+from board_features import get_board_features_safe
+
 # It's generally better for these specific analysis functions to handle their
 # own imports conditionally based on availability flags passed to them,
 # or for the main module to pass the imported functions/classes themselves.
@@ -92,18 +94,12 @@ def integrate_advanced_module_data(
     elif win_probability >= 0.45: hand_strength_advanced = 'medium'
     elif win_probability >= 0.30: hand_strength_advanced = 'weak_made'
 
-    # Basic board texture analysis
+    # Basic board texture analysis from the shared board-feature cache
     if community_cards and len(community_cards) >= 3:
-        suits = [card[-1] for card in community_cards if isinstance(card, str) and len(card) > 0]
-        if suits:
-            suit_counts = {suit: suits.count(suit) for suit in set(suits)}
-            board_texture_advanced['flush_possible'] = any(count >= 3 for count in suit_counts.values())
-        ranks = [card[:-1] for card in community_cards if isinstance(card, str) and len(card) > 0]
-        if ranks:
-            board_texture_advanced['paired'] = len(set(ranks)) < len(ranks)
-            # Basic straight detection (very simplified)
-            # This is a placeholder; real straight detection is complex
-            # For a more robust solution, a dedicated straight detection function is needed.
+        board_features = get_board_features_safe(community_cards)
+        if board_features is not None:
+            board_texture_advanced['flush_possible'] = board_features.max_suit_count >= 3
+            board_texture_advanced['paired'] = board_features.has_pair
 
 
     if ADVANCED_MODULES_AVAILABLE:
@@ -127,7 +123,7 @@ def integrate_advanced_module_data(
         if opponent_tracker: # Ensure opponent_tracker is not None
             try:
                 from advanced_opponent_modeling import AdvancedOpponentAnalyzer
-                analyzer = AdvancedOpponentAnalyzer()
+                analyzer = AdvancedOpponentAnalyzer(getattr(opponent_tracker, 'profile_store', None))
                 if hasattr(opponent_tracker, 'opponents') and opponent_tracker.opponents:
                     for opponent_name, profile in opponent_tracker.opponents.items():
                         if hasattr(profile, 'hands_seen') and profile.hands_seen > 0:
@@ -0,0 +1,200 @@
+# postflop/decision_context.py
+"""
+Compute-once context for a single postflop decision.
+
+Hand strength, board texture, opponent tendencies and the SPR plan used to be
+re-derived by every postflop helper that needed them. A PostflopDecisionContext
+is built once per decision and handed to those helpers; each derived feature is
+computed lazily on first use, memoised for the rest of the decision, and timed,
+so the features a decision actually touched (and what they cost) can be logged.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from board_features import get_board_features_safe
+from stage_timing import record_stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPPONENT_ANALYSIS = {'table_type': 'unknown', 'is_weak_passive': False, 'fold_to_cbet': 0.5}
+
+
+def _freeze(value: Any) -> Any:
+    """Turn dicts/lists into hashable tuples so they can be part of a memo key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def basic_board_texture(community_cards: Optional[List[str]]) -> str:
+    """Suit-count texture used when the enhanced board analyzer is unavailable."""
+    features = get_board_features_safe(community_cards)
+    if features is not None and features.num_cards >= 3 and features.distinct_suits <= 2:
+        return "wet_flush_possible"
+    return "unknown"
+
+
+class PostflopDecisionContext:
+    """Lazily evaluated, memoised features of one postflop decision."""
+
+    def __init__(self, numerical_hand_rank: int, win_probability: float, street: str,
+                 spr: float = 0.0, position: str = 'Unknown',
+                 community_cards: Optional[List[str]] = None, opponent_tracker=None,
+                 active_opponents_count: int = 1, pot_size: float = 0.0,
+                 bet_to_call: float = 0.0, my_stack: float = 0.0,
+                 hand_description: str = ""):
+        self.numerical_hand_rank = numerical_hand_rank
+        self.win_probability = win_probability
+        self.street = street
+        self.spr = spr
+        self.position = position
+        self.community_cards = community_cards
+        self.opponent_tracker = opponent_tracker
+        self.active_opponents_count = active_opponents_count
+        self.pot_size = pot_size
+        self.bet_to_call = bet_to_call
+        self.my_stack = my_stack
+        self.hand_description = hand_description
+
+        self._memo: Dict[Tuple, Any] = {}
+        # Feature name -> seconds spent computing it / number of memo hits
+        self.feature_timings: Dict[str, float] = {}
+        self.feature_hits: Dict[str, int] = {}
+
+    def get_feature(self, name: str, compute: Callable[[], Any], *key: Any) -> Any:
+        """
+        Return feature `name`, computing it at most once per distinct key.
+
+        `key` holds the inputs that vary between callers (e.g. the board texture a
+        classifier was given); inputs fixed for the whole decision need not be
+        repeated. Failures are not memoised, so a later caller can retry.
+        """
+        memo_key = (name,) + tuple(_freeze(part) for part in key)
+        if memo_key in self._memo:
+            self.feature_hits[name] = self.feature_hits.get(name, 0) + 1
+            return self._memo[memo_key]
+
+        start = time.perf_counter()
+        value = compute()
+        elapsed = time.perf_counter() - start
+        self.feature_timings[name] = self.feature_timings.get(name, 0.0) + elapsed
+        # Each enhancement module shows up as its own stage in the session timings
+        record_stage(f'postflop.{name}', elapsed * 1000.0)
+        self._memo[memo_key] = value
+        return value
+
+    @property
+    def features_used(self) -> List[str]:
+        """Features computed during this decision, in first-use order."""
+        return list(self.feature_timings)
+
+    def get_usage_report(self) -> Dict[str, Any]:
+        """Per-feature compute time and memo hits for this decision."""
+        return {
+            'features_used': self.features_used,
+            'compute_ms': {name: seconds * 1000.0 for name, seconds in self.feature_timings.items()},
+            'memo_hits': dict(self.feature_hits),
+            'total_compute_ms': sum(self.feature_timings.values()) * 1000.0,
+        }
+
+    # --- Standard features -------------------------------------------------
+
+    @property
+    def board_analysis(self) -> Dict[str, Any]:
+        """EnhancedBoardAnalyzer output, or {} when it is unavailable."""
+        return self.get_feature('board_analysis', self._compute_board_analysis)
+
+    def _compute_board_analysis(self) -> Dict[str, Any]:
+        if self.community_cards is None:
+            logger.warning("Community cards are None, cannot perform advanced board analysis.")
+            return {}
+        try:
+            from enhanced_board_analysis import EnhancedBoardAnalyzer
+        except ImportError:
+            logger.debug("EnhancedBoardAnalyzer not available for advanced board analysis.")
+            return {}
+        try:
+            return EnhancedBoardAnalyzer().analyze_board(self.community_cards) or {}
+        except Exception as e:
+            logger.warning(f"Could not perform advanced board analysis: {e}")
+            return {}
+
+    @property
+    def board_texture(self) -> str:
+        """Overall texture label from the board analysis, or the basic suit-count texture."""
+        return self.get_feature('board_texture', self._compute_board_texture)
+
+    def _compute_board_texture(self) -> str:
+        analysis = self.board_analysis
+        if analysis:
+            return analysis.get('overall_texture', 'unknown')
+        return basic_board_texture(self.community_cards)
+
+    @property
+    def opponent_analysis(self) -> Dict[str, Any]:
+        """Fixed opponent-integration analysis with the keys postflop logic relies on."""
+        return self.get_feature('opponent_analysis', self._compute_opponent_analysis)
+
+    def _compute_opponent_analysis(self) -> Dict[str, Any]:
+        if not self.opponent_tracker:
+            return dict(DEFAULT_OPPONENT_ANALYSIS)
+        try:
+            from fixed_opponent_integration import get_fixed_opponent_analysis
+            analysis = get_fixed_opponent_analysis(
+                opponent_tracker=self.opponent_tracker,
+                active_opponents_count=self.active_opponents_count
+            )
+        except Exception as e:
+            logger.error(f"Error getting fixed opponent analysis: {e}")
+            return dict(DEFAULT_OPPONENT_ANALYSIS)
+        if not isinstance(analysis, dict):
+            logger.warning(f"Opponent analysis returned non-dict: {analysis}. Using default.")
+            return dict(DEFAULT_OPPONENT_ANALYSIS)
+        for key, default in DEFAULT_OPPONENT_ANALYSIS.items():
+            analysis.setdefault(key, default)
+        return analysis
+
+    @property
+    def hand_classification(self) -> Tuple[str, Dict[str, Any]]:
+        """(strength, details) from the enhanced hand classifier on the real board texture."""
+        from enhanced_hand_classification import classify_hand_strength_enhanced
+        return classify_hand_strength_enhanced(
+            numerical_hand_rank=self.numerical_hand_rank,
+            win_probability=self.win_probability,
+            street=self.street,
+            board_texture=self.board_texture,
+            decision_context=self
+        )
+
+    @property
+    def hand_strength(self) -> str:
+        return self.hand_classification[0]
+
+    @property
+    def pot_commitment_ratio(self) -> float:
+        return (self.pot_size + self.bet_to_call) / max(self.my_stack, 0.01) if self.my_stack > 0 else 0
+
+    @property
+    def spr_strategy(self) -> Dict[str, Any]:
+        """SPR strategy recommendation for the classified hand strength."""
+        from enhanced_spr_strategy import get_spr_strategy_recommendation
+        return get_spr_strategy_recommendation(
+            spr=self.spr, hand_strength=self.hand_strength, street=self.street,
+            position=self.position, opponent_count=self.active_opponents_count,
+            board_texture=self.board_texture, decision_context=self
+        )
+
+    @property
+    def stack_commitment(self) -> Tuple[bool, str]:
+        """(should_commit, reason) from the SPR commitment rules."""
+        from enhanced_spr_strategy import should_commit_stack_spr
+        return should_commit_stack_spr(
+            spr=self.spr, hand_strength=self.hand_strength,
+            pot_commitment_ratio=self.pot_commitment_ratio, street=self.street,
+            decision_context=self
+        )
+
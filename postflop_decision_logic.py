@@ -23,7 +23,6 @@ except ImportError as e:
 # Import advanced enhancement modules
 try:
     from advanced_opponent_modeling import AdvancedOpponentAnalyzer
-    from enhanced_board_analysis import EnhancedBoardAnalyzer
     from performance_monitoring import PerformanceMetrics
     ADVANCED_MODULES_AVAILABLE = True
     logger.info("Advanced enhancement modules successfully imported")
@@ -36,6 +35,7 @@ from postflop.utils import is_drawing_hand
 from postflop.bet_sizing import get_dynamic_bet_size
 from postflop.opponent_analysis import estimate_opponent_range, calculate_fold_equity # analyze_opponents is in analysis_processing now
 from postflop.strategy import is_thin_value_spot, should_call_bluff, calculate_spr_adjustments
+from postflop.decision_context import PostflopDecisionContext
 from postflop.analysis_processing import (
     process_initial_enhanced_analysis,
     integrate_advanced_module_data,
@@ -70,7 +70,7 @@ if ENHANCED_MODULES_AVAILABLE:
 
 # Create file handler if it doesn't exist
 if not logger.handlers:
-    handler = logging.FileHandler('debug_postflop_decision_logic.log', mode='a', encoding='utf-8') # Added encoding='utf-8'
+    handler = logging.FileHandler('debug_postflop_decision_logic.log', mode='a', encoding='utf-8', delay=True) # Opened on first record
     handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
@@ -132,7 +132,8 @@ def make_postflop_decision(
     active_opponents_count=1, # Add opponent count for multiway considerations
     opponent_tracker=None,  # Add opponent tracking data
     all_players_raw_data=None, # New parameter for all players' data from parser
-    action_history=None # Add action_history here
+    action_history=None, # Add action_history here
+    decision_context=None # Shared PostflopDecisionContext; built here if not supplied
 ):
     street = game_stage # Use game_stage as street    
     
@@ -262,9 +263,15 @@ def make_postflop_decision(
     estimated_opponent_stack_for_implied_odds = my_stack # Default/fallback
     if all_players_raw_data and active_opponents_count > 0: # Check active_opponents_count too
         opponent_stacks = []
-        for p_id, p_data in all_players_raw_data.items():
+        # Game states carry a list of player dicts; older callers passed a name -> data mapping
+        if isinstance(all_players_raw_data, dict):
+            player_items = all_players_raw_data.items()
+        else:
+            player_items = ((p.get('name'), p) for p in all_players_raw_data if p)
+        for p_id, p_data in player_items:
             # Check if player is still in hand (not folded) and not the bot
-            is_active_opponent = p_data.get('is_active_player', True) and not p_data.get('folded', False) and p_id != my_player_data.get('name')
+            is_active_opponent = (p_data.get('is_active', p_data.get('is_active_player', True))
+                                  and not p_data.get('folded', False) and p_id != my_player_data.get('name'))
             if is_active_opponent:
                  opponent_stacks.append(_parse_stack_value_for_postflop(p_data.get('stack', 0)))
         if opponent_stacks:
@@ -272,53 +279,35 @@ def make_postflop_decision(
 
     logger.debug(f"Estimated opponent stack for implied odds: {estimated_opponent_stack_for_implied_odds}")
 
+    # Board texture, opponent analysis, hand strength and SPR plan are computed once
+    # through the shared context and reused by every helper below
+    if decision_context is None:
+        decision_context = PostflopDecisionContext(
+            numerical_hand_rank=numerical_hand_rank, win_probability=win_probability,
+            street=street, spr=spr, position=position, community_cards=community_cards,
+            opponent_tracker=opponent_tracker, active_opponents_count=active_opponents_count,
+            pot_size=pot_size, bet_to_call=bet_to_call, my_stack=my_stack,
+            hand_description=hand_description
+        )
+    if decision_engine_instance is not None:
+        # Lets the engine report which features this decision touched
+        decision_engine_instance.last_postflop_context = decision_context
+
     if ADVANCED_MODULES_AVAILABLE:
-        try:
-            if community_cards is not None: # Ensure community_cards is not None
-                board_analyzer = EnhancedBoardAnalyzer()
-                board_texture_analysis = board_analyzer.analyze_board(community_cards)
-                board_texture = board_texture_analysis.get('overall_texture', 'unknown')
-                logger.debug(f"Advanced board analysis: {board_texture_analysis}")
-            else:
-                logger.warning("Community cards are None, cannot perform advanced board analysis.")
-        except NameError: # EnhancedBoardAnalyzer might not be defined if import failed silently
-            logger.warning("EnhancedBoardAnalyzer not available for advanced board analysis.")
-        except Exception as e:
-            logger.warning(f"Could not perform advanced board analysis: {e}")
-    else: # Fallback basic board texture
-        if community_cards and len(community_cards) >= 3:
-            suits = [card[-1] for card in community_cards if isinstance(card, str) and len(card) > 1]
-            if len(set(suits)) <= 2 and len(suits) >=3 : board_texture = "wet_flush_possible"
-        logger.debug(f"Basic board texture (placeholder): {board_texture}")
+        board_texture_analysis = decision_context.board_analysis
+        logger.debug(f"Advanced board analysis: {board_texture_analysis}")
+    board_texture = decision_context.board_texture
+    logger.debug(f"Board texture: {board_texture}")
 
     if ENHANCED_MODULES_AVAILABLE and _get_fixed_opponent_analysis_func and opponent_tracker:
-        try:
-            final_opponent_analysis = _get_fixed_opponent_analysis_func(
-                opponent_tracker=opponent_tracker, 
-                active_opponents_count=active_opponents_count
-            )
-            if not isinstance(final_opponent_analysis, dict): # Ensure it's a dict
-                logger.warning(f"Opponent analysis returned non-dict: {final_opponent_analysis}. Using default.")
-                final_opponent_analysis = {'table_type': 'unknown', 'is_weak_passive': False, 'fold_to_cbet': 0.5}
-            else: # Ensure essential keys exist
-                final_opponent_analysis.setdefault('table_type', 'unknown')
-                final_opponent_analysis.setdefault('is_weak_passive', False)
-                final_opponent_analysis.setdefault('fold_to_cbet', 0.5) # Default fold to cbet
-            logger.debug(f"Fixed opponent analysis: {final_opponent_analysis}")
-        except Exception as e:
-            logger.error(f"Error getting fixed opponent analysis: {e}")
-            final_opponent_analysis = {'table_type': 'unknown', 'is_weak_passive': False, 'fold_to_cbet': 0.5}
+        final_opponent_analysis = decision_context.opponent_analysis
+        logger.debug(f"Fixed opponent analysis: {final_opponent_analysis}")
     else:
         logger.warning("Enhanced opponent analysis not available or opponent_tracker missing.")
     
     try:
         if _classify_hand_strength_basic_func:
-            hand_strength_final_decision, hand_details = _classify_hand_strength_basic_func(
-                numerical_hand_rank=numerical_hand_rank,
-                win_probability=win_probability,
-                street=street,
-                board_texture=board_texture
-            )
+            hand_strength_final_decision, hand_details = decision_context.hand_classification
             logger.debug(f"Determined final hand strength: {hand_strength_final_decision}")
         else:
             # Fallback classification
@@ -361,7 +350,8 @@ def make_postflop_decision(
         try:
             spr_strategy_result = _get_spr_strategy_recommendation_func( # Renamed to avoid conflict
                 spr=spr, hand_strength=hand_strength_final_decision, street=street,
-                position=position, opponent_count=active_opponents_count, board_texture=board_texture
+                position=position, opponent_count=active_opponents_count, board_texture=board_texture,
+                decision_context=decision_context
             )
             if isinstance(spr_strategy_result, dict): spr_strategy = spr_strategy_result
             
@@ -369,7 +359,8 @@ def make_postflop_decision(
                 spr=spr, 
                 hand_strength=hand_strength_final_decision,
                 pot_commitment_ratio=pot_commitment_ratio,
-                street=street
+                street=street,
+                decision_context=decision_context
             )
             if isinstance(is_pot_committed_result, bool): is_pot_committed = is_pot_committed_result
             logger.debug(f"SPR Strategy: {spr_strategy}, Pot Committed: {is_pot_committed}")
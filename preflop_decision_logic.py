@@ -15,6 +15,20 @@ ACTION_CHECK = 'check'
 ACTION_CALL = 'call'
 ACTION_RAISE = 'raise'
 
+# Confidence in a profile's type (see OpponentProfile.get_type_confidence) below which it is
+# still mostly the population prior; about 7 effective hands at the default prior strength
+MIN_TYPE_CONFIDENCE = 0.4
+
+
+def _exploitable_player_type(profile) -> str:
+    """The profile's type, or 'unknown' while its confidence is too low to deviate from standard play."""
+    if not profile:
+        return 'unknown'
+    type_confidence = getattr(profile, 'get_type_confidence', None)
+    if type_confidence is not None and type_confidence()[0] < MIN_TYPE_CONFIDENCE:
+        return 'unknown'
+    return profile.classify_player_type()
+
 # Add action_history and opponent_tracker as parameters
 def make_preflop_decision(
     my_player, hand_category, position, bet_to_call, can_check,
@@ -111,6 +125,7 @@ def make_preflop_decision(
     if opponent_tracker and last_aggressor_name_from_history:
         last_aggressor_profile = opponent_tracker.get_opponent_profile(last_aggressor_name_from_history)
         logger.debug(f"Last aggressor ({last_aggressor_name_from_history}) profile: {last_aggressor_profile}")
+    last_aggressor_type = _exploitable_player_type(last_aggressor_profile)
 
     table_dynamics = None
     if opponent_tracker:
@@ -278,7 +293,7 @@ def make_preflop_decision(
     
     logger.info(f"Preflop Logic: Pos: {position}, Cat: {hand_category}, B2Call: {bet_to_call}, CanChk: {can_check}, CalcRaise: {raise_amount_calculated}, MyStack: {my_stack}, MyBet: {my_current_bet_this_street}, MaxOppBet: {max_bet_on_table}, MinRaise: {min_raise}, Pot: {pot_size}, Opps: {active_opponents_count}, BB: {big_blind}, is_bb: {is_bb}, NumLimpers: {num_limpers}, NumRaises: {num_raises_this_street}")
     if last_aggressor_profile:
-        logger.info(f"Last Aggressor ({last_aggressor_name_from_history}): VPIP={last_aggressor_profile.get_vpip():.1f}, PFR={last_aggressor_profile.get_pfr():.1f}, Type={last_aggressor_profile.classify_player_type()}")
+        logger.info(f"Last Aggressor ({last_aggressor_name_from_history}): VPIP={last_aggressor_profile.get_vpip():.1f}, PFR={last_aggressor_profile.get_pfr():.1f}, Type={last_aggressor_type}")
 
 
     # --- Decision Logic (incorporating opponent tendencies) ---
@@ -307,7 +322,7 @@ def make_preflop_decision(
         if can_make_valid_raise:
             # QQ facing a 3-bet or 4-bet from a very tight player might consider calling if deep.
             if num_raises_this_street >= 2 and "Q" in str(my_player.get('hand', ['','']))[1]: # Simplified QQ check
-                if last_aggressor_profile and last_aggressor_profile.classify_player_type() in ["tight_aggressive", "tight_passive"] and last_aggressor_profile.get_pfr() < 10:
+                if last_aggressor_type in ["tight_aggressive", "tight_passive"] and last_aggressor_profile.get_pfr() < 10:
                     logger.info("QQ facing 3bet+ from tight player.")
                     # Effective stack for calling decision
                     effective_stack_for_call = min(my_stack, last_raiser_action_info.get('stack_before_action', my_stack) if last_raiser_action_info else my_stack)
@@ -394,7 +409,7 @@ def make_preflop_decision(
                 effective_stack = min(my_stack, last_raiser_action_info.get('stack_before_action', my_stack) if last_raiser_action_info else my_stack)
                 # Adjust threshold based on aggressor type
                 call_threshold_multiplier = 0.30
-                if last_aggressor_profile and last_aggressor_profile.classify_player_type() in ["loose_aggressive", "maniac"]:
+                if last_aggressor_type in ["loose_aggressive", "maniac"]:
                     call_threshold_multiplier = 0.40 # Call wider vs LAGs/Maniacs
                 
                 if bet_to_call < effective_stack * call_threshold_multiplier:
@@ -461,7 +476,7 @@ def make_preflop_decision(
             if last_aggressor_profile:
                 fold_to_3bet_stat = last_aggressor_profile.get_fold_to_3bet_percentage()
                 pfr_stat = last_aggressor_profile.get_pfr()
-                raiser_player_type = last_aggressor_profile.classify_player_type()
+                raiser_player_type = last_aggressor_type
                 logger.debug(f"Aggressor {last_aggressor_name_from_history} stats: FoldTo3Bet={fold_to_3bet_stat}, PFR={pfr_stat}, Type={raiser_player_type}")
 
             # Conditions for 3-betting as a semi-bluff
@@ -593,7 +608,7 @@ def make_preflop_decision(
             is_multiway_potential = active_opponents_count > 1 or len(callers_on_street) > 0 # More than just us and the raiser, or callers already in.
             
             raiser_is_loose_or_fishy = False
-            if last_aggressor_profile and last_aggressor_profile.classify_player_type() in ["loose_aggressive", "loose_passive", "maniac", "whale"]:
+            if last_aggressor_type in ["loose_aggressive", "loose_passive", "maniac", "whale"]:
                 raiser_is_loose_or_fishy = True
 
             can_call_for_implied_odds = False
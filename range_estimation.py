@@ -0,0 +1,513 @@
+# range_estimation.py
+"""
+Bayesian per-opponent hand-range estimation over the 1326 two-card combos.
+
+`postflop.opponent_analysis.estimate_opponent_range` reduces an opponent to a
+label such as 'wide_medium'. The RangeEstimator instead keeps a weight per combo
+for each opponent in the current hand and, at every observed action, multiplies
+it by P(action | hand strength) read from precomputed likelihood tables indexed
+by position group, action, sizing bucket, opponent type and street phase.
+
+Combos are mapped to one of STRENGTH_BUCKETS strength buckets once: preflop from
+a Chen-style ranking, postflop once per board with a coarse vectorised made-hand
+classifier. An update is then one gather from a 20-entry table row and one
+multiply over 1326 floats, a few microseconds with numpy.
+
+The estimator is an ActionLog view (`on_logged_action`), and the narrowed weights
+feed `EquityCalculator.calculate_equity_monte_carlo(opponent_weights=...)` and
+`fold_equity()` directly.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+SUITS = ('♠', '♥', '♦', '♣')
+SUIT_ALIASES = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+
+POSITION_GROUPS = ('early', 'middle', 'late', 'blinds', 'unknown')
+POSITION_TO_GROUP = {
+    'UTG': 'early', 'UTG+1': 'early', 'EP': 'early', 'early': 'early',
+    'MP': 'middle', 'HJ': 'middle', 'middle': 'middle',
+    'CO': 'late', 'BTN': 'late', 'late': 'late',
+    'SB': 'blinds', 'BB': 'blinds', 'blinds': 'blinds',
+}
+ACTIONS = ('fold', 'check', 'call', 'bet', 'raise', 'all_in')
+AGGRESSIVE_ACTIONS = ('bet', 'raise', 'all_in')
+SIZING_BUCKETS = ('none', 'small', 'medium', 'large', 'overbet')
+TYPE_GROUPS = ('tight_passive', 'tight_aggressive', 'loose_passive', 'loose_aggressive', 'unknown')
+PHASES = ('preflop', 'postflop')
+
+STRENGTH_BUCKETS = 20
+TABLE_SHAPE = (len(POSITION_GROUPS), len(ACTIONS), len(SIZING_BUCKETS), len(TYPE_GROUPS), len(PHASES), STRENGTH_BUCKETS)
+BOARD_CACHE_SIZE = 64
+
+# Fraction of hands played preflop and share of those that are raised, per type group
+TYPE_WIDTH = {'tight_passive': 0.15, 'tight_aggressive': 0.18, 'loose_passive': 0.38,
+              'loose_aggressive': 0.35, 'unknown': 0.24}
+TYPE_AGGRESSION = {'tight_passive': 0.3, 'tight_aggressive': 0.65, 'loose_passive': 0.25,
+                   'loose_aggressive': 0.6, 'unknown': 0.45}
+POSITION_WIDTH_FACTOR = {'early': 0.7, 'middle': 0.85, 'late': 1.3, 'blinds': 1.1, 'unknown': 1.0}
+# Shift of the strength threshold for betting/continuing at each sizing bucket
+SIZING_THRESHOLD_SHIFT = {'none': 0.0, 'small': -0.06, 'medium': 0.0, 'large': 0.05, 'overbet': 0.1}
+
+
+def _card_index(card: str) -> Optional[int]:
+    """0..51 index of a card like 'A♠', 'Ah', '10h' or 'Th' (None if unparseable)."""
+    if not isinstance(card, str) or len(card) < 2:
+        return None
+    rank, suit = card[:-1].upper(), card[-1]
+    if rank == 'T':
+        rank = '10'
+    suit = SUIT_ALIASES.get(suit.lower(), suit)
+    if rank not in RANKS or suit not in SUITS:
+        return None
+    return RANKS.index(rank) * 4 + SUITS.index(suit)
+
+
+def card_indices(cards: Optional[Iterable[str]]) -> List[int]:
+    """Indices of the parseable cards in `cards`."""
+    indices = (_card_index(card) for card in (cards or ()))
+    return [index for index in indices if index is not None]
+
+
+def _build_combos() -> np.ndarray:
+    first, second = np.triu_indices(52, k=1)
+    return np.stack([first, second], axis=1).astype(np.int16)
+
+
+COMBOS = _build_combos()  # (1326, 2) card indices, first < second
+NUM_COMBOS = len(COMBOS)
+COMBO_RANKS = COMBOS // 4
+COMBO_SUITS = COMBOS % 4
+DECK_STRINGS = [rank + suit for rank in RANKS for suit in SUITS]
+
+
+def _chen_score(high: int, low: int, suited: bool) -> float:
+    """Chen formula on rank indices (0 = deuce .. 12 = ace)."""
+    points = {12: 10.0, 11: 8.0, 10: 7.0, 9: 6.0}
+    score = points.get(high, (high + 2) / 2.0)
+    if high == low:
+        return max(5.0, score * 2)
+    if suited:
+        score += 2
+    gap = high - low - 1
+    score -= (0, 1, 2, 4)[gap] if gap < 4 else 5
+    if gap <= 1 and high < 10:
+        score += 1
+    return score
+
+
+def _preflop_strength() -> np.ndarray:
+    """Percentile (0..1] of each combo in a Chen-score ordering of all 1326 combos."""
+    high = COMBO_RANKS.max(axis=1)
+    low = COMBO_RANKS.min(axis=1)
+    suited = COMBO_SUITS[:, 0] == COMBO_SUITS[:, 1]
+    scores = np.array([_chen_score(int(h), int(l), bool(s)) for h, l, s in zip(high, low, suited)])
+    order = np.sort(scores)
+    return np.searchsorted(order, scores, side='right') / float(NUM_COMBOS)
+
+
+PREFLOP_STRENGTH = _preflop_strength()
+
+
+def _straight_windows() -> np.ndarray:
+    # Rank bit r + 1 per rank, with the ace also on bit 0 for the wheel
+    return np.array([0b11111 << low for low in range(10)], dtype=np.int32)
+
+
+STRAIGHT_WINDOWS = _straight_windows()
+
+
+def _rank_masks(ranks: np.ndarray) -> np.ndarray:
+    masks = np.left_shift(1, ranks.astype(np.int32) + 1)
+    return masks | np.where(ranks == 12, 1, 0)
+
+
+def board_strength(board: Sequence[int]) -> np.ndarray:
+    """
+    Coarse postflop strength (0..1) of every combo on a board of card indices.
+    Made hands (flush, straight, sets, two pair, overpairs, pairs by rank) and
+    flush draws are classified in vectorised form; other combos keep a scaled
+    preflop strength. It orders combos for likelihood lookups, it is not an evaluator.
+    """
+    board = np.asarray(board, dtype=np.int16)
+    board_ranks = board // 4
+    board_suits = board % 4
+    top = int(board_ranks.max())
+    distinct = np.unique(board_ranks)[::-1]
+    second = int(distinct[1]) if len(distinct) > 1 else -1
+
+    ranks, suits = COMBO_RANKS, COMBO_SUITS
+    strength = 0.3 * PREFLOP_STRENGTH
+    pocket_pair = ranks[:, 0] == ranks[:, 1]
+    hits = np.isin(ranks, board_ranks)
+    kicker = np.where(ranks[:, 0] == top, ranks[:, 1], ranks[:, 0]) / 12.0
+
+    made = np.zeros(NUM_COMBOS)
+    made = np.where(~pocket_pair & hits.any(axis=1), 0.35, made)
+    made = np.where(pocket_pair & (ranks[:, 0] < top), 0.33, made)
+    made = np.where(~pocket_pair & (ranks == second).any(axis=1), 0.45, made)
+    made = np.where(~pocket_pair & (ranks == top).any(axis=1), 0.6 + 0.15 * kicker, made)
+    made = np.where(pocket_pair & (ranks[:, 0] > top), 0.78, made)
+    made = np.where(~pocket_pair & hits.all(axis=1), 0.88, made)
+    made = np.where(pocket_pair & hits[:, 0], 0.95, made)
+
+    # Straights: the combo's ranks complete a five-rank window the board alone does not
+    board_mask = int(np.bitwise_or.reduce(_rank_masks(board_ranks)))
+    combo_masks = _rank_masks(ranks[:, 0]) | _rank_masks(ranks[:, 1]) | board_mask
+    windows = STRAIGHT_WINDOWS[(board_mask & STRAIGHT_WINDOWS) != STRAIGHT_WINDOWS]
+    if len(windows):
+        straight = ((combo_masks[:, None] & windows) == windows).any(axis=1)
+        made = np.where(straight, np.maximum(made, 0.92), made)
+
+    # Flushes and flush draws
+    suit_counts = np.bincount(board_suits, minlength=4)
+    suited = suits[:, 0] == suits[:, 1]
+    suited_count = suit_counts[suits[:, 0]] + 2
+    off_count = np.maximum(suit_counts[suits[:, 0]], suit_counts[suits[:, 1]]) + 1
+    flush = (suited & (suited_count >= 5)) | (~suited & (off_count >= 5))
+    made = np.where(flush, np.maximum(made, 0.97), made)
+    if len(board) < 5:
+        draw = suited & (suited_count == 4)
+        made = np.where(draw, np.maximum(made, 0.42), made)
+
+    strength = np.maximum(strength, made)
+    # Combos that use a board card are impossible
+    blocked = np.isin(COMBOS, board).any(axis=1)
+    return np.where(blocked, 0.0, strength)
+
+
+def strength_buckets(strength: np.ndarray) -> np.ndarray:
+    return np.minimum((strength * STRENGTH_BUCKETS).astype(np.intp), STRENGTH_BUCKETS - 1)
+
+
+PREFLOP_BUCKETS = strength_buckets(PREFLOP_STRENGTH)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def build_likelihood_tables() -> np.ndarray:
+    """
+    P(action | strength bucket) for every (position group, action, sizing bucket,
+    type group, phase), shape (5, 6, 5, 5, 2, STRENGTH_BUCKETS), float32.
+
+    The model is threshold-based: an opponent continues with hands above a
+    strength threshold set by their type width and position, plays aggressively
+    above a higher threshold moved by the sizing, and keeps a floor of bluffs and
+    mistakes so no combo is ever ruled out by a single action. Tables with the
+    same shape can be loaded instead via the 'range_estimation.tables_path' setting.
+    """
+    centres = (np.arange(STRENGTH_BUCKETS) + 0.5) / STRENGTH_BUCKETS
+    tables = np.zeros(TABLE_SHAPE, dtype=np.float32)
+    softness = 0.04
+    for p, position in enumerate(POSITION_GROUPS):
+        for t, type_group in enumerate(TYPE_GROUPS):
+            aggression = TYPE_AGGRESSION[type_group]
+            for z, sizing in enumerate(SIZING_BUCKETS):
+                shift = SIZING_THRESHOLD_SHIFT[sizing]
+                for h, phase in enumerate(PHASES):
+                    if phase == 'preflop':
+                        width = min(0.95, TYPE_WIDTH[type_group] * POSITION_WIDTH_FACTOR[position])
+                        continue_at = 1.0 - width + shift
+                        aggressive_at = 1.0 - width * aggression + shift
+                        bluff = 0.005
+                        floor = 0.002
+                    else:
+                        looseness = TYPE_WIDTH[type_group] - TYPE_WIDTH['unknown']
+                        continue_at = 0.4 - looseness + shift
+                        aggressive_at = 0.72 - 0.3 * (aggression - 0.45) + shift
+                        bluff = 0.01 + 0.04 * aggression
+                        if sizing == 'overbet':
+                            bluff += 0.02  # Overbets are polarised
+                        floor = 0.01
+                    continues = _sigmoid((centres - continue_at) / softness)
+                    aggressive = _sigmoid((centres - aggressive_at) / softness)
+                    values = {
+                        'fold': np.clip(1.0 - continues, 0.0, 1.0) * 0.97 + 0.01,
+                        'check': np.clip(1.0 - aggressive, 0.0, 1.0) * 0.9 + 0.1 * (1.0 - bluff),
+                        'call': np.clip(continues - aggressive, 0.0, 1.0) * 0.95 + 0.03,
+                        'bet': aggressive * (1.0 - bluff) + bluff * (1.0 - continues) + floor,
+                        'raise': aggressive * (1.0 - bluff) + bluff * (1.0 - continues) + floor,
+                    }
+                    shove_at = min(0.98, aggressive_at + 0.1)
+                    values['all_in'] = (_sigmoid((centres - shove_at) / softness) * (1.0 - bluff)
+                                        + 0.5 * bluff * (1.0 - continues) + floor / 2)
+                    for a, action in enumerate(ACTIONS):
+                        tables[p, a, z, t, h] = values[action]
+    return tables
+
+
+def sizing_bucket(amount: float, pot_size: float) -> str:
+    if not amount or amount <= 0:
+        return 'none'
+    if not pot_size or pot_size <= 0:
+        return 'medium'
+    ratio = amount / pot_size
+    if ratio < 0.4:
+        return 'small'
+    if ratio <= 0.75:
+        return 'medium'
+    if ratio <= 1.1:
+        return 'large'
+    return 'overbet'
+
+
+def opponent_type_group(label) -> str:
+    """Map a tracker classification ('tight_aggressive', 'whale', PlayingStyle...) to a type group."""
+    label = str(getattr(label, 'value', label) or 'unknown').lower()
+    if label in TYPE_GROUPS:
+        return label
+    if label in ('maniac',) or label.startswith('loose'):
+        return 'loose_aggressive' if 'passive' not in label else 'loose_passive'
+    if label in ('whale', 'calling_station', 'fish'):
+        return 'loose_passive'
+    if label in ('rock', 'nit') or label.startswith('tight'):
+        return 'tight_aggressive' if 'aggressive' in label else 'tight_passive'
+    return 'unknown'
+
+
+def sample_combos(weights: np.ndarray, count: int, dead_cards: Iterable[str] = (),
+                  rng: Optional[np.random.Generator] = None) -> List[Tuple[str, str]]:
+    """
+    Draw `count` opponent hands (as card-string pairs) from a combo weight vector,
+    skipping combos that use a dead card. Returns [] when no live combo has weight.
+    """
+    dead = card_indices(dead_cards)
+    live = np.asarray(weights, dtype=np.float64).copy()
+    if dead:
+        live[np.isin(COMBOS, dead).any(axis=1)] = 0.0
+    total = live.sum()
+    if count <= 0 or total <= 0:
+        return []
+    rng = rng or np.random.default_rng()
+    drawn = rng.choice(NUM_COMBOS, size=count, p=live / total)
+    return [(DECK_STRINGS[COMBOS[i, 0]], DECK_STRINGS[COMBOS[i, 1]]) for i in drawn]
+
+
+class _PlayerRange:
+    __slots__ = ('weights', 'position', 'type_group', 'type_confidence', 'actions')
+
+    def __init__(self):
+        self.weights = np.ones(NUM_COMBOS)
+        self.position = 'unknown'
+        self.type_group = 'unknown'
+        self.type_confidence = 1.0
+        self.actions = 0
+
+
+class RangeEstimator:
+    """Per-opponent combo weights for the current hand, updated from observed actions."""
+
+    def __init__(self, tables: Optional[np.ndarray] = None,
+                 type_lookup: Optional[Callable[[str], object]] = None):
+        """
+        `type_lookup(player_name)` returns the tracker's classification of a player
+        (any label opponent_type_group understands), optionally as a (label, confidence)
+        pair; without it every player is 'unknown'. A type with confidence below 1 is
+        blended with the 'unknown' likelihoods in proportion.
+        """
+        self.tables = build_likelihood_tables() if tables is None else tables
+        self.type_lookup = type_lookup
+        self.hand_id: Optional[str] = None
+        self.board: Tuple[int, ...] = ()
+        self._board_buckets: Optional[np.ndarray] = None
+        self._board_strength: Optional[np.ndarray] = None
+        self._board_cache: 'OrderedDict[Tuple[int, ...], Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+        self._ranges: Dict[str, _PlayerRange] = {}
+        self.stats = {'updates': 0, 'board_builds': 0, 'resets': 0}
+
+    # --- Hand and board state --------------------------------------------------
+
+    def new_hand(self, hand_id: Optional[str] = None):
+        """Forget every range and the board; called when a new hand starts."""
+        self.hand_id = hand_id
+        self._ranges.clear()
+        self.set_board(())
+
+    def set_board(self, board_cards: Optional[Iterable[str]]):
+        board = tuple(card_indices(board_cards))
+        if board == self.board:
+            return
+        self.board = board
+        if len(board) < 3:
+            self._board_buckets = None
+            self._board_strength = None
+            return
+        key = tuple(sorted(board))
+        cached = self._board_cache.get(key)
+        if cached is None:
+            strength = board_strength(key)
+            cached = (strength, strength_buckets(strength))
+            self._board_cache[key] = cached
+            if len(self._board_cache) > BOARD_CACHE_SIZE:
+                self._board_cache.popitem(last=False)
+            self.stats['board_builds'] += 1
+        else:
+            self._board_cache.move_to_end(key)
+        self._board_strength, self._board_buckets = cached
+        # Board cards are dead for every range
+        blocked = np.isin(COMBOS, board).any(axis=1)
+        for player_range in self._ranges.values():
+            player_range.weights[blocked] = 0.0
+
+    def _range(self, player_name: str) -> _PlayerRange:
+        player_range = self._ranges.get(player_name)
+        if player_range is None:
+            player_range = _PlayerRange()
+            if self.board:
+                player_range.weights[np.isin(COMBOS, self.board).any(axis=1)] = 0.0
+            self._ranges[player_name] = player_range
+        return player_range
+
+    def _buckets(self, street: str) -> np.ndarray:
+        if street != 'preflop' and self._board_buckets is not None:
+            return self._board_buckets
+        return PREFLOP_BUCKETS
+
+    def _context_index(self, position_group: str, action: str, sizing: str, type_group: str, street: str):
+        return (POSITION_GROUPS.index(position_group), ACTIONS.index(action),
+                SIZING_BUCKETS.index(sizing), TYPE_GROUPS.index(type_group),
+                0 if street == 'preflop' else 1)
+
+    def _likelihood(self, player_range: _PlayerRange, action: str, sizing: str, street: str) -> np.ndarray:
+        """Likelihood row of the player's type group, blended towards 'unknown' by the type's confidence."""
+        row = self.tables[self._context_index(player_range.position, action, sizing,
+                                              player_range.type_group, street)]
+        confidence = player_range.type_confidence
+        if player_range.type_group == 'unknown' or confidence >= 1.0:
+            return row
+        unknown = self.tables[self._context_index(player_range.position, action, sizing, 'unknown', street)]
+        return confidence * row + (1.0 - confidence) * unknown
+
+    # --- Updates ---------------------------------------------------------------
+
+    def observe(self, player_name: str, action_type: str, street: str, position: Optional[str] = None,
+                amount: float = 0.0, pot_size_before: float = 0.0,
+                opponent_type: Optional[object] = None) -> Optional[np.ndarray]:
+        """Apply one observed action to the player's range; returns the new weights."""
+        action = str(action_type or '').lower().replace('-', '_')
+        if action not in ACTIONS:
+            return None
+        street = (street or 'preflop').lower()
+        player_range = self._range(player_name)
+        if position:
+            player_range.position = POSITION_TO_GROUP.get(position, POSITION_TO_GROUP.get(position.upper(), 'unknown'))
+        if opponent_type is None and self.type_lookup is not None:
+            try:
+                opponent_type = self.type_lookup(player_name)
+            except Exception as e:
+                logger.debug(f"Type lookup failed for {player_name}: {e}")
+        confidence = 1.0
+        if isinstance(opponent_type, tuple):
+            opponent_type, confidence = opponent_type
+        player_range.type_group = opponent_type_group(opponent_type)
+        player_range.type_confidence = min(1.0, max(0.0, float(confidence)))
+
+        sizing = sizing_bucket(amount, pot_size_before) if action != 'all_in' else 'overbet'
+        row = self._likelihood(player_range, action, sizing, street)
+        weights = player_range.weights
+        weights *= row[self._buckets(street)]
+        total = weights.sum()
+        if total <= 0.0:
+            # Inconsistent observations; start again from the uniform prior
+            self.stats['resets'] += 1
+            weights[:] = 1.0
+            if self.board:
+                weights[np.isin(COMBOS, self.board).any(axis=1)] = 0.0
+            total = weights.sum()
+        weights /= total
+        player_range.actions += 1
+        self.stats['updates'] += 1
+        return weights
+
+    def on_logged_action(self, action):
+        """ActionLog view: a row from a new hand resets all ranges first."""
+        if action.hand_id and action.hand_id != self.hand_id:
+            self.new_hand(action.hand_id)
+        self.observe(action.player_name, action.action_type, action.street, position=action.position,
+                     amount=action.amount, pot_size_before=action.pot_size_before)
+
+    # --- Reading ---------------------------------------------------------------
+
+    def weights(self, player_name: str) -> Optional[np.ndarray]:
+        """Normalised combo weights of a player seen this hand (None if not seen)."""
+        player_range = self._ranges.get(player_name)
+        if player_range is None:
+            return None
+        total = player_range.weights.sum()
+        return player_range.weights / total if total > 0 else None
+
+    def weights_for(self, player_names: Iterable[str], hand_id: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        The narrowed range when exactly one of `player_names` has acted this hand.
+
+        With a hand_id, ranges narrowed in another hand are never returned: the first
+        snapshot of a new hand is analysed before the estimator hears of the new hand.
+        """
+        if hand_id and hand_id != self.hand_id:
+            return None
+        seen = [name for name in player_names if name in self._ranges and self._ranges[name].actions]
+        return self.weights(seen[0]) if len(seen) == 1 else None
+
+    def range_width(self, player_name: str) -> float:
+        """Effective fraction of the combos still in range (inverse Simpson index / 1326)."""
+        weights = self.weights(player_name)
+        if weights is None:
+            return 1.0
+        return 1.0 / (float(weights @ weights) * NUM_COMBOS)
+
+    def average_strength(self, player_name: str) -> float:
+        weights = self.weights(player_name)
+        if weights is None:
+            return 0.5
+        strength = self._board_strength if self._board_strength is not None else PREFLOP_STRENGTH
+        return float(weights @ strength)
+
+    def fold_equity(self, player_name: str, bet_size: float, pot_size: float) -> Optional[float]:
+        """P(fold) of the player's current range facing a bet of `bet_size` into `pot_size`."""
+        player_range = self._ranges.get(player_name)
+        weights = self.weights(player_name)
+        if player_range is None or weights is None:
+            return None
+        street = 'preflop' if self._board_buckets is None else 'postflop'
+        row = self._likelihood(player_range, 'fold', sizing_bucket(bet_size, pot_size), street)
+        return float(weights @ row[self._buckets(street)])
+
+    def describe(self, player_name: str) -> str:
+        """Label in the vocabulary of estimate_opponent_range ('tight_strong', 'wide_weak', ...)."""
+        if self.weights(player_name) is None:
+            return 'unknown'
+        width = 'tight' if self.range_width(player_name) < 0.25 else 'wide'
+        strength = self.average_strength(player_name)
+        if strength >= 0.7:
+            return f'{width}_strong'
+        if strength >= 0.45:
+            return f'{width}_medium'
+        return f'{width}_weak'
+
+
+def create_range_estimator(config: Optional[Dict] = None,
+                           type_lookup: Optional[Callable[[str], object]] = None) -> Optional[RangeEstimator]:
+    """Factory function reading the optional 'range_estimation' config section (enabled by default)."""
+    settings = (config or {}).get('range_estimation', {}) if isinstance(config, dict) else {}
+    if not settings.get('enabled', True):
+        return None
+    tables = None
+    tables_path = settings.get('tables_path')
+    if tables_path:
+        try:
+            tables = np.load(tables_path)
+            if tables.shape != TABLE_SHAPE:
+                raise ValueError(f"expected shape {TABLE_SHAPE}, got {tables.shape}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load likelihood tables from {tables_path}, using built-in model: {e}")
+            tables = None
+    return RangeEstimator(tables=tables, type_lookup=type_lookup)
@@ -0,0 +1,120 @@
+# record_journal.py
+"""
+Append-only JSON-lines journal with periodic compaction snapshots.
+
+Trackers that persisted by rewriting one JSON document on every save (and
+reading all of it back at startup) keep their state in two files instead:
+
+- <path>          the latest compaction snapshot: {"format", "sequence", "state"}
+- <path>.journal  one {"seq", "record"} line per change since that snapshot
+
+A save appends only the new records. Once enough records have built up, the
+owner folds them into its state and writes a new snapshot (temp file plus
+atomic replace), then truncates the journal. Startup reads the snapshot and
+replays only the journal tail. Records whose sequence number is already
+covered by the snapshot are skipped, so a crash between the snapshot write and
+the truncation is harmless. A torn last line is dropped. A snapshot file in the
+old whole-document format is handed to a migrate callback once.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 'record-journal-snapshot'
+JOURNAL_SUFFIX = '.journal'
+DEFAULT_COMPACT_EVERY = 500  # Journal records before the owner should compact
+
+
+class RecordJournal:
+    """Snapshot plus append-only tail for one tracker's persistent state."""
+
+    def __init__(self, path: str, compact_every: int = DEFAULT_COMPACT_EVERY):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.sequence = 0
+        self.records_since_snapshot = 0
+        self.stats = {'appended': 0, 'replayed': 0, 'compactions': 0}
+
+    def load(self, initial: Any, fold: Callable[[Any, Dict], Any],
+             migrate: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Read the snapshot and replay the journal tail through `fold(state, record) -> state`."""
+        state = initial
+        snapshot_sequence = 0
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+                if isinstance(document, dict) and document.get('format') == SNAPSHOT_FORMAT:
+                    state = document['state']
+                    snapshot_sequence = document.get('sequence', 0)
+                elif migrate is not None:
+                    state = migrate(document)
+                    logger.info(f"Migrating {self.path} from the whole-file format")
+            except Exception as e:
+                logger.warning(f"Could not read snapshot {self.path}: {e}")
+        self.sequence = snapshot_sequence
+        self.records_since_snapshot = 0
+
+        if os.path.exists(self.journal_path):
+            good_offset = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Dropping torn tail of {self.journal_path} at byte {good_offset}")
+                        break
+                    good_offset += len(line)
+                    sequence = entry.get('seq', 0)
+                    if sequence <= snapshot_sequence:
+                        continue
+                    state = fold(state, entry['record'])
+                    self.sequence = max(self.sequence, sequence)
+                    self.records_since_snapshot += 1
+                    self.stats['replayed'] += 1
+            if good_offset < os.path.getsize(self.journal_path):
+                # New appends must not land after a partial line
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_offset)
+        return state
+
+    def append(self, records: Iterable[Dict]) -> int:
+        """Append records to the journal; returns how many were written."""
+        lines = []
+        for record in records:
+            self.sequence += 1
+            lines.append(json.dumps({'seq': self.sequence, 'record': record}, separators=(',', ':'), default=str))
+        if not lines:
+            return 0
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        self.records_since_snapshot += len(lines)
+        self.stats['appended'] += len(lines)
+        return len(lines)
+
+    @property
+    def should_compact(self) -> bool:
+        return self.records_since_snapshot >= self.compact_every
+
+    def compact(self, state: Any):
+        """Write `state` (which must include every journaled record) as the new snapshot."""
+        document = {
+            'format': SNAPSHOT_FORMAT,
+            'sequence': self.sequence,
+            'saved_at': datetime.now().isoformat(),
+            'state': state,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f, default=str)
+        os.replace(tmp_path, self.path)
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+        self.records_since_snapshot = 0
+        self.stats['compactions'] += 1
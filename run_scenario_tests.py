@@ -0,0 +1,133 @@
+# run_scenario_tests.py
+"""
+Run the scenario suites across worker processes.
+
+The scenario tests decide on the shared headless DecisionCore (decision_core.py),
+whose seeded equity makes each outcome independent of test order and process.
+So tests can be spread over workers freely. Each worker builds its core once
+and runs a round-robin share of the test ids.
+
+    python run_scenario_tests.py                    # test_scenarios/, all cores
+    python run_scenario_tests.py --workers 1 -v
+    python run_scenario_tests.py test_scenarios/test_flop.py test_scenarios/test_river.py
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SUITES = ['test_scenarios']
+
+logger = logging.getLogger(__name__)
+
+
+def _module_name(path: str) -> str:
+    relative = os.path.relpath(os.path.abspath(path), ROOT)
+    return os.path.splitext(relative)[0].replace(os.sep, '.')
+
+
+def discover_test_ids(paths: List[str]) -> List[str]:
+    """Test ids (module.Class.method) in the given suite directories or test files."""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, 'test_*.py'))))
+        else:
+            files.append(path)
+    ids = []
+    loader = unittest.TestLoader()
+    for path in files:
+        suite = loader.loadTestsFromName(_module_name(path))
+        stack = [suite]
+        while stack:
+            item = stack.pop(0)
+            if isinstance(item, unittest.TestSuite):
+                stack.extend(item)
+            else:
+                ids.append(item.id())
+    return ids
+
+
+def _init_worker(log_level: int):
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    logging.disable(log_level)
+
+
+def _run_ids(test_ids: List[str]) -> Dict:
+    """Run a share of the tests in this process; tracebacks come back as text."""
+    result = unittest.TestResult()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull  # scenario tests print their decisions
+        try:
+            unittest.TestLoader().loadTestsFromNames(test_ids).run(result)
+        finally:
+            sys.stdout = stdout
+    return {
+        'run': result.testsRun,
+        'failures': [(test.id(), trace) for test, trace in result.failures],
+        'errors': [(test.id(), trace) for test, trace in result.errors],
+        'skipped': len(result.skipped),
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def run_scenarios(paths: Optional[List[str]] = None, workers: Optional[int] = None,
+                  log_level: int = logging.CRITICAL) -> Dict:
+    """Run the suites, serially when workers == 1, and return merged counts and failure tracebacks."""
+    test_ids = discover_test_ids(paths or [os.path.join(ROOT, suite) for suite in DEFAULT_SUITES])
+    workers = max(1, min(workers or os.cpu_count() or 1, len(test_ids) or 1))
+    shares = [test_ids[i::workers] for i in range(workers)]
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(log_level)
+        try:
+            parts = [_run_ids(shares[0])]
+        finally:
+            logging.disable(logging.NOTSET)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(log_level,)) as pool:
+            parts = list(pool.map(_run_ids, shares))
+    summary = {'run': 0, 'failures': [], 'errors': [], 'skipped': 0, 'workers': workers}
+    for part in parts:
+        summary['run'] += part['run']
+        summary['skipped'] += part['skipped']
+        summary['failures'].extend(part['failures'])
+        summary['errors'].extend(part['errors'])
+    summary['failures'].sort()
+    summary['errors'].sort()
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the scenario test suites in parallel.")
+    parser.add_argument('paths', nargs='*', help="Suite directories or test files (default: test_scenarios/)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Print failure tracebacks")
+    args = parser.parse_args(argv)
+
+    summary = run_scenarios(args.paths, args.workers)
+    for kind in ('failures', 'errors'):
+        for test_id, trace in summary[kind]:
+            print(f"{kind[:-1].upper()}: {test_id}")
+            if args.verbose:
+                print(trace)
+    print(f"Ran {summary['run']} tests on {summary['workers']} worker(s) in {summary['elapsed']:.1f}s: "
+          f"{len(summary['failures'])} failures, {len(summary['errors'])} errors, {summary['skipped']} skipped")
+    return 0 if not summary['failures'] and not summary['errors'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,271 @@
+# scenario_corpus.py
+"""
+Serialised scenario corpus for strategy regression sweeps.
+
+A corpus is a JSON Lines file with one compact record per decision spot:
+
+    {"id": "test_flop.TestFlopScenarios.test_x#0", "street": "flop", "blinds": [0.01, 0.02],
+     "pot": 0.1, "min_raise": 0.04, "board": ["As", "Kd", "7h"], "hero": 0, "equity": 0.85,
+     "players": [{"name": "TestBot", "pos": "BTN", "stack": 1.0, "bet": 0.0, "cards": ["Ad", "Kc"], "to_call": 0.0},
+                 {"name": "Opponent2", "pos": "BB", "stack": 1.0, "bet": 0.0}],
+     "history": [["Opponent2", "CHECK", 0.0, "flop"]],
+     "expect": ["raise"]}
+
+Players are in seat order. `hero` indexes the deciding player, whose record
+adds its cards and bet to call; a player is inactive only when it has
+"active": false. `equity` is the hero's win probability (omitted, it is
+computed when deciding). `expect` is the set of acceptable actions.
+
+Scenario.to_game_state() expands a record into the parser-shaped game state
+that DecisionEngine.make_decision takes. check_corpus() runs a whole corpus
+through DecisionEngine.decide_batch and reports the spots whose action falls
+outside the expected set.
+
+capture_corpus() builds a corpus from the scenario test suites. It runs the
+tests on the shared decision core (decision_core.py), keeps the spots of tests
+that pass, and uses the action they were accepted with as the expected set.
+It then keeps only spots whose compact record reproduces that action on its
+own.
+
+    python scenario_corpus.py capture -o test_scenarios/corpus.jsonl
+    python scenario_corpus.py check test_scenarios/corpus.jsonl
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import sys
+import time
+import unittest
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from decision_engine import parse_monetary_value, count_active_opponents
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPUS_PATH = os.path.join(ROOT, 'test_scenarios', 'corpus.jsonl')
+STREET_NAMES = {'pre-flop': 'preflop', 'preflop': 'preflop', 'flop': 'flop', 'turn': 'turn', 'river': 'river'}
+AVAILABLE_ACTIONS = ['fold', 'check', 'call', 'raise']
+
+
+@dataclass
+class Scenario:
+    """One decision spot; see the module docstring for the record layout."""
+    id: str
+    street: str
+    board: List[str]
+    pot: float
+    players: List[Dict[str, Any]]
+    hero: int = 0
+    small_blind: float = 0.01
+    big_blind: float = 0.02
+    min_raise: Optional[float] = None
+    history: List[Tuple[str, str, float, str]] = field(default_factory=list)
+    win_probability: Optional[float] = None
+    expected: List[str] = field(default_factory=list)
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {'id': self.id, 'street': self.street, 'blinds': [self.small_blind, self.big_blind],
+                  'pot': self.pot}
+        if self.min_raise is not None:
+            record['min_raise'] = self.min_raise
+        record.update({'board': list(self.board), 'hero': self.hero})
+        if self.win_probability is not None:
+            record['equity'] = self.win_probability
+        record['players'] = self.players
+        if self.history:
+            record['history'] = [list(action) for action in self.history]
+        record['expect'] = list(self.expected)
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Scenario':
+        small_blind, big_blind = record.get('blinds', [0.01, 0.02])
+        return cls(id=record['id'], street=record['street'], board=list(record.get('board', [])),
+                   pot=record['pot'], players=record['players'], hero=record.get('hero', 0),
+                   small_blind=small_blind, big_blind=big_blind, min_raise=record.get('min_raise'),
+                   history=[tuple(action) for action in record.get('history', [])],
+                   win_probability=record.get('equity'), expected=list(record.get('expect', [])))
+
+    def to_game_state(self) -> Tuple[Dict[str, Any], int]:
+        """The parser-shaped (game_state, player_index) pair for this spot."""
+        players = []
+        for seat, compact in enumerate(self.players):
+            is_hero = seat == self.hero
+            cards = list(compact.get('cards', [])) if is_hero else []
+            active = compact.get('active', True)
+            player = {
+                'seat': str(seat + 1), 'id': str(seat + 1), 'name': compact['name'],
+                'stack': compact['stack'], 'bet': compact.get('bet', 0.0), 'current_bet': compact.get('bet', 0.0),
+                'is_my_player': is_hero, 'is_empty': False, 'cards': cards, 'hand': cards,
+                'has_turn': is_hero, 'has_hidden_cards': active and not is_hero, 'is_active': active,
+                'is_all_in': False, 'position': compact.get('pos', ''),
+            }
+            if is_hero:
+                player['bet_to_call'] = compact.get('to_call', 0.0)
+                player['available_actions'] = list(AVAILABLE_ACTIONS)
+                if self.win_probability is not None:
+                    player['win_probability'] = self.win_probability
+            players.append(player)
+        positions = {compact['name']: compact.get('pos', '') for compact in self.players}
+        game_state = {
+            'players': players, 'pot_size': self.pot, 'community_cards': list(self.board), 'board': list(self.board),
+            'current_round': self.street, 'street': self.street,
+            'big_blind': self.big_blind, 'small_blind': self.small_blind,
+            'min_raise': self.min_raise if self.min_raise is not None else self.big_blind * 2,
+            'action_history': [{'player_name': name, 'action_type': action, 'amount': amount, 'street': street,
+                                'is_bot': name == self.players[self.hero]['name'], 'position': positions.get(name, '')}
+                               for name, action, amount, street in self.history],
+        }
+        return game_state, self.hero
+
+    @classmethod
+    def from_game_state(cls, game_state: Dict[str, Any], player_index: int, scenario_id: str,
+                        expected: Iterable[str] = (), win_probability: Optional[float] = None) -> 'Scenario':
+        """Compact a parser- or test-shaped game state into a Scenario."""
+        players = []
+        for seat, player in enumerate(game_state['players']):
+            compact = {'name': player.get('name') or f'Player{seat + 1}', 'pos': player.get('position', ''),
+                       'stack': parse_monetary_value(player.get('stack', 0.0)),
+                       'bet': parse_monetary_value(player.get('current_bet', player.get('bet', 0.0)))}
+            if seat == player_index:
+                compact['cards'] = list(player.get('hand') or player.get('cards') or [])
+                compact['to_call'] = parse_monetary_value(player.get('bet_to_call', 0.0))
+            elif not player.get('is_active', player.get('is_active_player', not player.get('isFolded', False))):
+                compact['active'] = False
+            players.append(compact)
+        me = game_state['players'][player_index]
+        if win_probability is None and me.get('win_probability') is not None:
+            win_probability = float(me['win_probability'])
+        street = str(game_state.get('current_round') or game_state.get('street') or 'preflop').lower()
+        min_raise = game_state.get('min_raise')
+        return cls(
+            id=scenario_id, street=STREET_NAMES.get(street, street), board=list(game_state.get('community_cards') or []),
+            pot=parse_monetary_value(game_state.get('pot_size', game_state.get('pot', 0.0))), players=players,
+            hero=player_index, small_blind=game_state.get('small_blind', 0.01),
+            big_blind=game_state.get('big_blind', 0.02),
+            min_raise=parse_monetary_value(min_raise) if min_raise is not None else None,
+            history=[(a.get('player_name', ''), str(a.get('action_type', '')).upper(),
+                      parse_monetary_value(a.get('amount', 0.0)), str(a.get('street', '')).lower())
+                     for a in game_state.get('action_history') or []],
+            win_probability=win_probability, expected=list(expected))
+
+
+def load_corpus(path: str = DEFAULT_CORPUS_PATH) -> List[Scenario]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [Scenario.from_record(json.loads(line)) for line in f if line.strip()]
+
+
+def save_corpus(scenarios: Iterable[Scenario], path: str = DEFAULT_CORPUS_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        for scenario in scenarios:
+            f.write(json.dumps(scenario.to_record(), ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def check_corpus(scenarios: List[Scenario], engine=None) -> Dict[str, Any]:
+    """Decide every spot in one batch; mismatches are spots whose action is not in the expected set."""
+    if engine is None:
+        from decision_core import get_decision_core
+        engine = get_decision_core().decision_engine
+    start = time.perf_counter()
+    decisions = engine.decide_batch(scenarios)
+    elapsed = time.perf_counter() - start
+    mismatches = [{'id': scenario.id, 'expected': scenario.expected, 'action': action, 'amount': amount}
+                  for scenario, (action, amount) in zip(scenarios, decisions)
+                  if scenario.expected and action not in scenario.expected]
+    return {'spots': len(scenarios), 'mismatches': mismatches, 'elapsed': elapsed,
+            'spots_per_second': len(scenarios) / elapsed if elapsed > 0 else 0.0}
+
+
+def capture_corpus(paths: Optional[List[str]] = None) -> Tuple[List[Scenario], Dict[str, int]]:
+    """Scenarios from the passing tests of the scenario suites, and capture counts."""
+    from decision_core import SeededDecisionEngine, get_decision_core
+    from run_scenario_tests import DEFAULT_SUITES, discover_test_ids
+
+    recorded: List[Tuple[Dict, int, str]] = []
+    original = SeededDecisionEngine.make_decision
+
+    def recording(engine, game_state, player_index, budget=None):
+        state = copy.deepcopy(game_state)
+        decision = original(engine, game_state, player_index, budget)
+        recorded.append((state, player_index, decision[0]))
+        return decision
+
+    counts = {'tests': 0, 'passed': 0, 'spots': 0, 'kept': 0}
+    candidates = []
+    SeededDecisionEngine.make_decision = recording
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.INFO)
+    try:
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                for test_id in discover_test_ids(paths or [os.path.join(ROOT, suite) for suite in DEFAULT_SUITES]):
+                    recorded.clear()
+                    result = unittest.TestResult()
+                    unittest.TestLoader().loadTestsFromName(test_id).run(result)
+                    counts['tests'] += 1
+                    if not result.wasSuccessful():
+                        continue
+                    counts['passed'] += 1
+                    for n, (state, index, action) in enumerate(recorded):
+                        if action is not None:
+                            candidates.append((f"{test_id.split('.', 1)[-1]}#{n}", state, index, action))
+            finally:
+                sys.stdout = stdout
+    finally:
+        SeededDecisionEngine.make_decision = original
+        logging.disable(previous_disable)
+
+    # Fill in the equity each spot was decided with, then keep the spots whose record reproduces the action
+    engine = get_decision_core().decision_engine
+    scenarios = []
+    for scenario_id, state, index, action in candidates:
+        me = state['players'][index]
+        win_probability = None
+        if me.get('win_probability') is None:
+            win_probability = engine.equity_calculator.calculate_win_probability(
+                me.get('hand', []), state.get('community_cards', []), count_active_opponents(state['players']))
+        scenarios.append(Scenario.from_game_state(state, index, scenario_id, [action], win_probability))
+    counts['spots'] = len(scenarios)
+    kept = []
+    for scenario in scenarios:
+        engine = get_decision_core().decision_engine
+        if engine.decide_batch([scenario])[0][0] in scenario.expected:
+            kept.append(scenario)
+    counts['kept'] = len(kept)
+    return kept, counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build or check the strategy scenario corpus.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    capture = commands.add_parser('capture', help="Capture a corpus from the scenario test suites")
+    capture.add_argument('paths', nargs='*', help="Suite directories or test files (default: test_scenarios/)")
+    capture.add_argument('-o', '--output', default=DEFAULT_CORPUS_PATH)
+    check = commands.add_parser('check', help="Sweep a corpus through DecisionEngine.decide_batch")
+    check.add_argument('corpus', nargs='?', default=DEFAULT_CORPUS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'capture':
+        scenarios, counts = capture_corpus(args.paths)
+        save_corpus(scenarios, args.output)
+        print(f"{counts['passed']}/{counts['tests']} tests passed; kept {counts['kept']} of {counts['spots']} spots "
+              f"-> {args.output}")
+        return 0
+
+    summary = check_corpus(load_corpus(args.corpus))
+    for mismatch in summary['mismatches']:
+        print(f"MISMATCH {mismatch['id']}: expected {mismatch['expected']}, got {mismatch['action']} "
+              f"{mismatch['amount']}")
+    print(f"{summary['spots']} spots in {summary['elapsed']:.2f}s ({summary['spots_per_second']:,.0f} spots/s), "
+          f"{len(summary['mismatches'])} mismatches")
+    return 1 if summary['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
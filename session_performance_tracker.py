@@ -2,18 +2,52 @@
 """
 Session performance tracking and adaptive strategy system.
 Tracks win rates, decision outcomes, and adjusts strategy dynamically.
+
+Saved data goes to an append-only record journal (see record_journal.py): each
+save appends the hands recorded since the previous save plus a session summary,
+and the file is compacted into a snapshot of past session summaries
+periodically. When a HandArchiveWriter is attached, hands, decisions and the
+saved summaries are also appended to the columnar hand archive for analytics.
 """
 
+import json
 import logging
 import time
-import json
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from collections import defaultdict, deque
 from datetime import datetime
 
+from hand_archive import HandArchiveWriter, archive_record
+from record_journal import RecordJournal, DEFAULT_COMPACT_EVERY
+
 logger = logging.getLogger(__name__)
 
+MAX_STORED_SESSIONS = 100
+
+
+def _fold_session_record(state: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply one journal record to the stored per-session summaries."""
+    sessions = state['sessions']
+    key = record.get('session_start_time')
+    entry = next((session for session in reversed(sessions) if session.get('session_start_time') == key), None)
+    if entry is None:
+        entry = {'session_start_time': key, 'hands_played_count': 0, 'session_profit': 0.0}
+        sessions.append(entry)
+        del sessions[:-MAX_STORED_SESSIONS]
+    if record['type'] == 'hand':
+        # Keeps a crashed session's totals up to date between summaries
+        entry['hands_played_count'] += 1
+        entry['session_profit'] += record['hand'].get('profit_loss') or 0.0
+    elif record['type'] == 'summary':
+        entry.update(record['summary'])
+    return state
+
+
+def _migrate_session_document(document: Any) -> Dict[str, Any]:
+    """Old files held a single session summary."""
+    return {'sessions': [document] if isinstance(document, dict) else []}
+
 @dataclass
 class HandResult:
     """Track individual hand results."""
@@ -49,8 +83,14 @@ class HandResult:
 class SessionPerformanceTracker:
     """Track session performance and provide adaptive recommendations."""
     
-    def __init__(self, session_file: str = "session_performance.json"):
+    def __init__(self, session_file: str = "session_performance.json", compact_every: int = DEFAULT_COMPACT_EVERY,
+                 archive: Optional[HandArchiveWriter] = None):
         self.session_file = session_file
+        self.journal = RecordJournal(session_file, compact_every)
+        self.archive = archive
+        self.stored_sessions: List[Dict[str, Any]] = []  # Summaries of saved sessions, oldest first
+        self._journal_state = {'sessions': self.stored_sessions}
+        self._saved_hand_count = 0
         self.session_start_time = time.time()
         self.hands_played = []
         self.decisions_made = defaultdict(int)
@@ -101,6 +141,24 @@ class SessionPerformanceTracker:
         hour = int((time.time() - self.session_start_time) / 3600)
         self.hourly_performance[hour].append(profit_loss)
         
+        estimates = hand_result.win_probability_estimates
+        archive_record(self.archive, 'session_hands', {
+            'timestamp': hand_result.end_time,
+            'hand_id': hand_result.hand_id,
+            'position': hand_result.position,
+            'starting_stack': hand_result.starting_stack,
+            'ending_stack': hand_result.ending_stack,
+            'pot_won': hand_result.pot_won,
+            'profit_loss': profit_loss,
+            'hand_strength': hand_result.hand_strength,
+            'final_outcome': hand_result.final_outcome,
+            'showdown': hand_result.showdown,
+            'actions_taken': hand_result.actions_taken,
+            'opponent_types': hand_result.opponent_types,
+            'win_probability_avg': sum(estimates) / len(estimates) if estimates else None,
+            'hand_duration': hand_result.end_time - hand_result.start_time,
+        })
+
         logger.info(f"Hand {hand_result.hand_id} recorded: {profit_loss:+.2f} "
                    f"(Total: ${self.current_bankroll:.2f})")
           # Check for performance patterns
@@ -126,6 +184,14 @@ class SessionPerformanceTracker:
         
         if outcome:
             self.decision_outcomes[decision_type].append(outcome)
+
+        archive_record(self.archive, 'session_decisions', {
+            'timestamp': decision_record['timestamp'],
+            'hand_id': context.get('hand_id'),
+            'decision_type': decision_type,
+            'outcome': outcome,
+            'context': json.dumps(context, default=str),
+        })
         
         logger.debug(f"Decision recorded: {decision_type} -> {outcome}")
     
@@ -398,19 +464,19 @@ class SessionPerformanceTracker:
                     recommendations['position_adjustments'][position] = "can_loosen_slightly"
     
     def _load_session_data(self):
-        """Load previous session data if available."""
+        """Load previous session summaries: the latest snapshot plus the journal tail."""
         try:
-            with open(self.session_file, 'r') as f:
-                data = json.load(f)
-                # Load relevant data for continuation
-                logger.info("Previous session data loaded")
-        except FileNotFoundError:
-            logger.info("No previous session data found - starting fresh")
+            self._journal_state = self.journal.load({'sessions': []}, _fold_session_record, _migrate_session_document)
+            self.stored_sessions = self._journal_state['sessions']
+            if self.stored_sessions:
+                logger.info(f"Previous session data loaded ({len(self.stored_sessions)} sessions)")
+            else:
+                logger.info("No previous session data found - starting fresh")
         except Exception as e:
             logger.warning(f"Error loading session data: {e}")
     
     def save_session_data(self):
-        """Save current session data."""
+        """Append the hands recorded since the last save and a session summary to the journal."""
         try:
             session_data = {
                 'session_start_time': self.session_start_time,
@@ -422,8 +488,28 @@ class SessionPerformanceTracker:
                 'timestamp': datetime.now().isoformat()
             }
             
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            records = [
+                {'type': 'hand', 'session_start_time': self.session_start_time, 'hand': asdict(hand)}
+                for hand in self.hands_played[self._saved_hand_count:]
+            ]
+            records.append({'type': 'summary', 'session_start_time': self.session_start_time,
+                            'summary': session_data})
+            self.journal.append(records)
+            self._saved_hand_count = len(self.hands_played)
+            for record in records:
+                _fold_session_record(self._journal_state, record)
+            if self.journal.should_compact:
+                self.journal.compact(self._journal_state)
+
+            if self.archive is not None:
+                archive_record(self.archive, 'session_summaries', {
+                    'source': 'session_tracker',
+                    'session_id': str(self.session_start_time),
+                    'hands_played': session_data['hands_played_count'],
+                    'profit': session_data['session_profit'],
+                    'details': json.dumps(session_data, default=str),
+                })
+                self.archive.flush()
                 
             logger.info(f"Session data saved to {self.session_file}")
             
@@ -0,0 +1,307 @@
+# snapshot_replay.py
+"""
+Offline bulk replay of archived HTML table snapshots.
+
+Streams a directory, a single snapshot, or a .zip/.tar(.gz) archive of HTML
+snapshots through PokerBot.run_test_html (PokerPageParser + DecisionEngine)
+across a process pool, writes the decisions as columnar .npz shards (one array
+per column, a fixed number of rows per shard, so memory stays flat however
+large the archive is) and reports throughput and per-stage latency.
+load_decisions() concatenates the shards back into one set of columns.
+
+Usage:
+    python snapshot_replay.py SNAPSHOTS [-o decisions.npz] [-w WORKERS] [--shard-rows N] [--config config.json]
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from decision_budget import DecisionBudget
+from stage_timing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_EXTENSIONS = ('.html', '.htm')
+STAGES = ('parse', 'analyze', 'decide')
+
+DECISION_COLUMNS = (
+    'source', 'hand_id', 'street', 'has_turn', 'action', 'amount',
+    'parse_ms', 'analyze_ms', 'decide_ms', 'total_ms', 'degradation', 'error'
+)
+DEFAULT_SHARD_ROWS = 10000
+
+# Per-process bot, created once by the pool initializer
+_worker_bot = None
+
+
+def _is_snapshot_name(name: str) -> bool:
+    return name.lower().endswith(SNAPSHOT_EXTENSIONS)
+
+
+def iter_snapshots(source: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield (name, html) pairs for every snapshot in source.
+
+    For plain files html is None and the worker reads the file itself, so only
+    paths cross the process boundary. Archive members are read here, one at a
+    time, and shipped as text.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for file_name in sorted(files):
+                if _is_snapshot_name(file_name):
+                    yield os.path.join(root, file_name), None
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and _is_snapshot_name(member.filename):
+                    yield member.filename, archive.read(member).decode('utf-8', 'replace')
+    elif tarfile.is_tarfile(source):
+        # Stream mode: members are read sequentially without building an index
+        with tarfile.open(source, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and _is_snapshot_name(member.name):
+                    handle = archive.extractfile(member)
+                    if handle is not None:
+                        yield member.name, handle.read().decode('utf-8', 'replace')
+    elif os.path.isfile(source):
+        yield source, None
+    else:
+        raise FileNotFoundError(f"Snapshot source not found: {source}")
+
+
+def _init_worker(config_path: str):
+    """Build one quiet PokerBot per worker process."""
+    global _worker_bot
+    from poker_bot import PokerBot
+    _worker_bot = PokerBot(config_path)
+    _worker_bot.logger.setLevel(logging.WARNING)
+    # Replayed hands must not leak into the persistent opponent profiles
+    _worker_bot.opponent_tracker.profile_store = None
+    _worker_bot.opponent_store = None
+
+
+def _replay_snapshot(item: Tuple[str, Optional[str]]) -> Dict[str, Any]:
+    """Replay one snapshot on this process's bot and return its decision record."""
+    name, html = item
+    record = {column: None for column in DECISION_COLUMNS}
+    record['source'] = name
+    stage_timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    try:
+        if html is None:
+            with open(name, 'r', encoding='utf-8') as f:
+                html = f.read()
+        action, amount = _worker_bot.run_test_html(html, source=name, stage_timings=stage_timings)
+        # run_test_html falls back to FOLD on failure; the reason tells it apart from a real fold
+        record['error'] = _worker_bot.last_run_error
+        my_player = _worker_bot.get_my_player() or {}
+        record['hand_id'] = _worker_bot.table_data.get('hand_id', '')
+        record['street'] = _worker_bot.table_data.get('game_stage', '')
+        record['has_turn'] = bool(my_player.get('has_turn'))
+        record['action'] = action or ''
+        record['amount'] = float(amount or 0.0)
+        budget = getattr(_worker_bot, 'last_decision_budget', None)
+        if isinstance(budget, DecisionBudget):
+            record['degradation'] = budget.summary()['degradation']
+    except Exception as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['total_ms'] = (time.perf_counter() - start) * 1000.0
+    for stage in STAGES:
+        if stage in stage_timings:
+            record[f'{stage}_ms'] = stage_timings[stage] * 1000.0
+    return record
+
+
+class ColumnarDecisionWriter:
+    """
+    Accumulates decision records column-wise and flushes them as .npz shards.
+
+    Every shard_rows records the buffered columns are saved as
+    `<output>-NNNNN.npz` (output_path without its .npz suffix) and the buffers
+    are dropped, so at most one shard's rows are held in memory.
+    """
+
+    FLOAT_COLUMNS = ('amount', 'parse_ms', 'analyze_ms', 'decide_ms', 'total_ms')
+    BOOL_COLUMNS = ('has_turn',)
+
+    def __init__(self, output_path: str, columns: Tuple[str, ...] = DECISION_COLUMNS,
+                 shard_rows: int = DEFAULT_SHARD_ROWS):
+        self.output_path = output_path
+        self.column_names = tuple(columns)
+        self.shard_rows = max(1, shard_rows)
+        self.columns = self._empty_columns()
+        self.row_count = 0
+        self.shard_paths: List[str] = []
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        # Shards left by an earlier run into the same output would be picked up by load_decisions
+        for stale in shard_paths(output_path):
+            os.remove(stale)
+
+    def _empty_columns(self) -> Dict[str, List[Any]]:
+        return {column: [] for column in self.column_names}
+
+    def append(self, record: Dict[str, Any]):
+        for column, values in self.columns.items():
+            values.append(record.get(column))
+        self.row_count += 1
+        if self.row_count % self.shard_rows == 0:
+            self.flush()
+
+    def _to_array(self, column: str, values: List[Any]) -> np.ndarray:
+        if column in self.FLOAT_COLUMNS:
+            # Stages that did not run (e.g. no decision when it is not our turn) become NaN
+            return np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+        if column in self.BOOL_COLUMNS:
+            return np.array([bool(v) for v in values], dtype=bool)
+        return np.array(['' if v is None else str(v) for v in values], dtype=str)
+
+    def flush(self):
+        """Write the buffered rows as the next shard."""
+        if not self.columns[self.column_names[0]]:
+            return
+        arrays = {column: self._to_array(column, values) for column, values in self.columns.items()}
+        path = f"{_shard_root(self.output_path)}-{len(self.shard_paths):05d}.npz"
+        np.savez_compressed(path, **arrays)
+        self.shard_paths.append(path)
+        self.columns = self._empty_columns()
+
+    def close(self) -> List[str]:
+        self.flush()
+        return self.shard_paths
+
+
+def _shard_root(output_path: str) -> str:
+    return output_path[:-4] if output_path.lower().endswith('.npz') else output_path
+
+
+def shard_paths(output_path: str) -> List[str]:
+    """Shard files written for output_path, in write order."""
+    return sorted(glob.glob(glob.escape(_shard_root(output_path)) + '-[0-9][0-9][0-9][0-9][0-9].npz'))
+
+
+def load_decisions(output_path: str) -> Dict[str, np.ndarray]:
+    """Concatenate every shard written for output_path into one array per column."""
+    parts: Dict[str, List[np.ndarray]] = {}
+    for path in shard_paths(output_path):
+        with np.load(path) as data:
+            for column in data.files:
+                parts.setdefault(column, []).append(data[column])
+    return {column: np.concatenate(arrays) for column, arrays in parts.items()}
+
+
+def summarize_latencies(histograms: Dict[str, LatencyHistogram]) -> Dict[str, Dict[str, float]]:
+    """Count, mean and percentile latency (ms) for each stage that has samples."""
+    return {stage: histogram.summary() for stage, histogram in histograms.items() if histogram.count}
+
+
+def _iter_results(snapshots, workers: int, config_path: str, max_pending: int):
+    """Yield replay records, keeping at most max_pending snapshots in flight."""
+    if workers <= 1:
+        _init_worker(config_path)
+        for item in snapshots:
+            yield _replay_snapshot(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(config_path,)) as executor:
+        pending = set()
+        for item in snapshots:
+            pending.add(executor.submit(_replay_snapshot, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+
+def run_replay(source: str, output_path: str, workers: int = 1,
+               config_path: str = 'config.json', max_pending: Optional[int] = None,
+               shard_rows: int = DEFAULT_SHARD_ROWS) -> Dict[str, Any]:
+    """Replay every snapshot in source and write the columnar decision shards."""
+    max_pending = max_pending or max(1, workers) * 4
+    writer = ColumnarDecisionWriter(output_path, shard_rows=shard_rows)
+    stage_latency = {stage: LatencyHistogram() for stage in STAGES + ('total',)}
+    errors = 0
+    decisions = 0
+
+    start = time.perf_counter()
+    for record in _iter_results(iter_snapshots(source), workers, config_path, max_pending):
+        writer.append(record)
+        if record.get('error'):
+            errors += 1
+        if record.get('decide_ms') is not None:
+            decisions += 1
+        for stage, histogram in stage_latency.items():
+            value = record.get(f'{stage}_ms')
+            if value is not None:
+                histogram.record(value)
+    elapsed = time.perf_counter() - start
+
+    shards = writer.close()
+    snapshots = writer.row_count
+    return {
+        'source': source,
+        'output_path': output_path,
+        'shards': len(shards),
+        'workers': workers,
+        'snapshots': snapshots,
+        'decisions': decisions,
+        'errors': errors,
+        'elapsed_seconds': elapsed,
+        'snapshots_per_second': snapshots / elapsed if elapsed > 0 else 0.0,
+        'stage_latency': summarize_latencies(stage_latency),
+    }
+
+
+def format_replay_report(summary: Dict[str, Any]) -> str:
+    """Human-readable report of a replay run."""
+    lines = [
+        f"Replayed {summary['snapshots']} snapshots from {summary['source']} "
+        f"with {summary['workers']} worker(s) in {summary['elapsed_seconds']:.2f}s",
+        f"Throughput: {summary['snapshots_per_second']:.1f} snapshots/sec",
+        f"Decisions: {summary['decisions']}, errors: {summary['errors']}",
+        f"Decisions written to {summary['shards']} shard(s) of {summary['output_path']}",
+        "Per-stage latency (ms):",
+    ]
+    for stage, stats in summary['stage_latency'].items():
+        lines.append(
+            f"  {stage:<8} n={stats['count']:<7} mean={stats['mean_ms']:.2f} "
+            f"p50={stats['p50_ms']:.2f} p95={stats['p95_ms']:.2f} max={stats['max_ms']:.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay archived HTML snapshots through the parser and decision engine.")
+    parser.add_argument('source', help="Directory, .html file, or .zip/.tar(.gz) archive of snapshots")
+    parser.add_argument('-o', '--output', default='replay_decisions.npz', help="Columnar decisions output (.npz, written as numbered shards)")
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS, help="Decisions per .npz shard")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument('--config', default='config.json', help="Bot configuration file")
+    parser.add_argument('--max-pending', type=int, default=None, help="Snapshots in flight at once (default 4 per worker)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    summary = run_replay(args.source, args.output, args.workers, args.config, args.max_pending,
+                         args.shard_rows)
+    print(format_replay_report(summary))
+    return 0 if summary['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# stage_timing.py
+"""
+Hot-path stage timing with HDR-style latency histograms.
+
+Decision-cycle stages (parse, analyze_players, equity, opponent analysis, each
+postflop enhancement feature, decision, logging) are wrapped in
+`stage_timer.stage(name)` blocks or the `@timed(name)` decorator. Each
+stage's latencies go into a LatencyHistogram. The histogram has log-linear
+buckets: 128 exact microsecond buckets, then 64 sub-buckets per power of two.
+That keeps percentiles within ~1.6% over any range of values at a fixed cost
+per sample. At session end the bot exports count, mean, p50, p95, p99 and max
+per stage.
+
+Timing is on by default. When it is disabled, stage() returns a shared no-op
+context manager and record() returns immediately, so instrumented code pays
+one attribute check.
+"""
+
+import functools
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS      # Values below this (in microseconds) are counted exactly
+HALF_BUCKETS = SUB_BUCKETS >> 1
+DEFAULT_OUTPUT_DIR = 'logs'
+REPORT_PERCENTILES = (50.0, 95.0, 99.0)
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < SUB_BUCKETS:
+        return micros
+    shift = micros.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + ((micros >> shift) - HALF_BUCKETS)
+
+
+def _bucket_bounds(index: int):
+    """[lower, upper) microsecond range of a bucket."""
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    offset = index - SUB_BUCKETS
+    shift = offset // HALF_BUCKETS + 1
+    sub = offset % HALF_BUCKETS + HALF_BUCKETS
+    return sub << shift, (sub + 1) << shift
+
+
+class LatencyHistogram:
+    """Log-linear bucketed latency histogram (microsecond resolution, milliseconds in and out)."""
+
+    __slots__ = ('counts', 'count', 'total_ms', 'min_ms', 'max_ms')
+
+    def __init__(self):
+        self.counts: List[int] = []
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float):
+        value_ms = max(0.0, value_ms)
+        index = _bucket_index(int(value_ms * 1000.0))
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: 'LatencyHistogram'):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, value in enumerate(other.counts):
+            self.counts[index] += value
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in ms at or below which `percent` of the samples fall (bucket midpoint)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(percent / 100.0 * self.count))
+        seen = 0
+        for index, value in enumerate(self.counts):
+            seen += value
+            if seen >= rank:
+                lower, upper = _bucket_bounds(index)
+                midpoint = (lower + upper - 1) / 2000.0
+                return min(max(midpoint, self.min_ms), self.max_ms)
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def summary(self) -> Dict[str, float]:
+        result = {'count': self.count, 'mean_ms': self.mean_ms}
+        for percent in REPORT_PERCENTILES:
+            result[f'p{percent:g}_ms'] = self.percentile(percent)
+        result['max_ms'] = self.max_ms
+        return result
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _StageSpan:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: 'StageTimer', name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.timer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.record(self.name, (self.timer.clock() - self.start) * 1000.0)
+        return False
+
+
+class StageTimer:
+    """Per-stage latency histograms for the decision cycle."""
+
+    def __init__(self, enabled: bool = True, output_dir: str = DEFAULT_OUTPUT_DIR,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.enabled = enabled
+        self.output_dir = output_dir
+        self.clock = clock
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def stage(self, name: str):
+        """Context manager timing one occurrence of `name`."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageSpan(self, name)
+
+    def record(self, name: str, value_ms: float):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(value_ms)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def report(self) -> str:
+        lines = [f"{'stage':<32} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<32} {stats['count']:>7} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                         f"{stats['p99_ms']:>9.2f} {stats['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def export(self, session_id: Optional[str] = None, path: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Write the per-stage summary as JSON (stage_timings_<session>.json by default) and return it."""
+        summary = self.summary()
+        if not summary:
+            return summary
+        session_id = session_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = path or os.path.join(self.output_dir, f"stage_timings_{session_id}.json")
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'session_id': session_id, 'exported_at': datetime.now().isoformat(),
+                           'stages': summary}, f, indent=2)
+            logger.info(f"Stage timings written to {path}")
+        except OSError as e:
+            logger.error(f"Failed to write stage timings to {path}: {e}")
+        return summary
+
+    def reset(self):
+        self.histograms.clear()
+
+
+# Global timer instance shared by all instrumented modules
+_stage_timer = StageTimer()
+
+
+def get_stage_timer() -> StageTimer:
+    """Get the global stage timer."""
+    return _stage_timer
+
+
+def configure_stage_timer(config: Optional[Dict] = None) -> StageTimer:
+    """Apply the optional 'stage_timing' config section to the global timer and return it."""
+    settings = (config or {}).get('stage_timing', {}) if isinstance(config, dict) else {}
+    _stage_timer.enabled = settings.get('enabled', True)
+    _stage_timer.output_dir = settings.get('output_dir', DEFAULT_OUTPUT_DIR)
+    return _stage_timer
+
+
+def stage(name: str):
+    """Time a block on the global timer: `with stage('equity'): ...`."""
+    return _stage_timer.stage(name)
+
+
+def record_stage(name: str, value_ms: float):
+    _stage_timer.record(name, value_ms)
+
+
+def timed(name: Optional[str] = None):
+    """Decorator timing every call of the wrapped function as stage `name` (default: its qualified name)."""
+    def decorator(func: Callable) -> Callable:
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timer = _stage_timer
+            if not timer.enabled:
+                return func(*args, **kwargs)
+            start = timer.clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer.record(stage_name, (timer.clock() - start) * 1000.0)
+        return wrapper
+    return decorator
@@ -0,0 +1,100 @@
+# table_dynamics.py
+"""
+Incrementally maintained table-level opponent aggregates.
+
+Table dynamics (average VPIP, PFR, aggression over the tracked opponents) used to
+be recomputed from every profile on each call, several times per decision. A
+TableDynamicsCache keeps each profile's contribution and the running sums; a
+profile that changes only sets its dirty flag, and the next read re-summarises
+just the dirty profiles. Between actions, reads are O(1).
+
+Every change bumps `version`, so derived results (opponent analyses, decision
+caches) can be memoised against it with `memo()`.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TableDynamicsCache:
+    """Running sums of per-profile stat tuples, refreshed only for dirty profiles."""
+
+    def __init__(self, profiles: Mapping[str, Any], fields: Sequence[str],
+                 summarize: Callable[[Any], Optional[Tuple[float, ...]]]):
+        """
+        `profiles` is the tracker's live name -> profile mapping. `summarize` returns
+        a profile's values for `fields`, or None when the profile should not count
+        (e.g. too few hands yet).
+        """
+        self._profiles = profiles
+        self.fields = tuple(fields)
+        self._summarize = summarize
+        self._contributions: Dict[str, Tuple[float, ...]] = {}
+        self._sums = [0.0] * len(self.fields)
+        self._dirty: Set[str] = set()
+        self._memo: Dict[Hashable, Tuple[int, Any]] = {}
+        self.version = 0
+        self.stats = {'refreshed_profiles': 0, 'memo_hits': 0, 'memo_misses': 0}
+
+    def mark_dirty(self, player_name: str):
+        """Flag a profile as changed (or added/removed); O(1)."""
+        self._dirty.add(player_name)
+        self.version += 1
+
+    def invalidate(self):
+        """Flag every known profile as changed."""
+        self._dirty.update(self._profiles.keys())
+        self._dirty.update(self._contributions.keys())
+        self.version += 1
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        for player_name in self._dirty:
+            old = self._contributions.pop(player_name, None)
+            if old is not None:
+                for i, value in enumerate(old):
+                    self._sums[i] -= value
+            profile = self._profiles.get(player_name)
+            new = None
+            if profile is not None:
+                try:
+                    new = self._summarize(profile)
+                except Exception as e:
+                    logger.debug(f"Could not summarise profile {player_name}: {e}")
+            if new is not None:
+                self._contributions[player_name] = tuple(new)
+                for i, value in enumerate(new):
+                    self._sums[i] += value
+            self.stats['refreshed_profiles'] += 1
+        self._dirty.clear()
+        if not self._contributions:
+            # Drop accumulated floating-point drift once nothing is counted
+            self._sums = [0.0] * len(self.fields)
+
+    @property
+    def count(self) -> int:
+        """Number of profiles currently contributing."""
+        self._refresh()
+        return len(self._contributions)
+
+    def averages(self) -> Optional[Dict[str, float]]:
+        """Mean of each field over the contributing profiles, or None when there are none."""
+        self._refresh()
+        count = len(self._contributions)
+        if count == 0:
+            return None
+        return {field: total / count for field, total in zip(self.fields, self._sums)}
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Result of `compute()`, reused until the next change to any profile."""
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] == self.version:
+            self.stats['memo_hits'] += 1
+            return cached[1]
+        self.stats['memo_misses'] += 1
+        value = compute()
+        self._memo[key] = (self.version, value)
+        return value
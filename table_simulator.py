@@ -0,0 +1,863 @@
+# table_simulator.py
+"""
+Headless No-Limit Hold'em table for exercising the decision engines end to end.
+
+NLHETable deals hands between seated agents. It handles blinds, the four
+betting rounds with min-raise rules and short all-ins, uncalled-bet refunds,
+side pots and showdown. Nothing touches the UI, the clipboard or HTML. Each
+agent receives the same game-state dict PokerBot builds from the parser output
+('players', 'pot_size', 'community_cards', 'current_round', 'action_history',
+...), with only its own hole cards visible. It returns an (action, amount)
+pair; as in the live bot, a raise amount is the total to raise to.
+
+Amounts are held in integer chips (chip_size currency units each), so pots
+split exactly. Hands are scored by a bitmask 7-card evaluator rather than the
+combination-based HandEvaluator. That keeps the table's own cost to tens of
+microseconds per hand, so throughput is bounded by the seated engines.
+Scripted baselines alone play well over 100k hands per hour per core.
+
+A simulation is played in fixed-size seeded chunks, each with fresh agents and
+table. run_simulation() plays the chunks in-process. run_parallel() spreads
+them over a ProcessPoolExecutor and merges the per-seat results, so a given
+seed gives the same totals whatever the worker count.
+
+    python table_simulator.py --hands 20000 --workers 4 --seats decision_engine,tag,tag,lag,station,station
+"""
+
+import argparse
+import logging
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+RANKS = '23456789TJQKA'
+SUITS = 'shdc'
+DECK = tuple(rank + suit for rank in RANKS for suit in SUITS)  # Card index = rank * 4 + suit
+CARD_INDEX = {card: index for index, card in enumerate(DECK)}
+STREETS = ('preflop', 'flop', 'turn', 'river')
+BOARD_SIZES = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+DEFAULT_SMALL_BLIND = 0.01
+DEFAULT_BIG_BLIND = 0.02
+DEFAULT_STACK_BB = 100
+DEFAULT_CHIP_SIZE = 0.01
+DEFAULT_EQUITY_TRIALS = 200
+DEFAULT_CHUNK_HANDS = 500
+DEFAULT_SEATS = 'decision_engine,tag,tag,lag,station,station'
+
+RAISE_ACTIONS = ('raise', 'bet', 'all_in', 'allin', 'all-in')
+
+HIGH_CARD, PAIR, TWO_PAIR, TRIPS, STRAIGHT, FLUSH, FULL_HOUSE, QUADS, STRAIGHT_FLUSH = range(9)
+CATEGORY_SHIFT = 20  # Score = category << 20 | five 4-bit kicker ranks
+
+
+# --- Hand evaluation -------------------------------------------------------------
+
+def _build_straight_table() -> List[int]:
+    """High rank of the best straight in each 13-bit rank mask, or -1."""
+    table = [-1] * 8192
+    for mask in range(8192):
+        for high in range(12, 3, -1):
+            window = 0x1F << (high - 4)
+            if mask & window == window:
+                table[mask] = high
+                break
+        else:
+            if mask & 0x100F == 0x100F:  # A-2-3-4-5
+                table[mask] = 3
+    return table
+
+
+_STRAIGHT_HIGH = _build_straight_table()
+_POPCOUNT = [bin(mask).count('1') for mask in range(8192)]
+
+
+def _score(category: int, ranks: Sequence[int]) -> int:
+    value = category
+    for i in range(5):
+        value = (value << 4) | (ranks[i] + 1 if i < len(ranks) else 0)
+    return value
+
+
+def _top_ranks(mask: int, count: int) -> List[int]:
+    ranks = []
+    rank = 12
+    while rank >= 0 and len(ranks) < count:
+        if mask >> rank & 1:
+            ranks.append(rank)
+        rank -= 1
+    return ranks
+
+
+def evaluate_cards(cards: Sequence[int]) -> int:
+    """Score of the best five-card hand among 5-7 card indices; higher scores win."""
+    counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        rank = card >> 2
+        counts[rank] += 1
+        suit_masks[card & 3] |= 1 << rank
+    for suit_mask in suit_masks:
+        if _POPCOUNT[suit_mask] >= 5:
+            high = _STRAIGHT_HIGH[suit_mask]
+            if high >= 0:
+                return _score(STRAIGHT_FLUSH, (high,))
+            return _score(FLUSH, _top_ranks(suit_mask, 5))
+
+    quads, trips, pairs, singles = [], [], [], []
+    mask = 0
+    for rank in range(12, -1, -1):
+        count = counts[rank]
+        if count:
+            mask |= 1 << rank
+            if count == 4:
+                quads.append(rank)
+            elif count == 3:
+                trips.append(rank)
+            elif count == 2:
+                pairs.append(rank)
+            else:
+                singles.append(rank)
+    if quads:
+        return _score(QUADS, (quads[0], max(trips + pairs + singles, default=0)))
+    if trips and (len(trips) > 1 or pairs):
+        return _score(FULL_HOUSE, (trips[0], max(trips[1:] + pairs)))
+    high = _STRAIGHT_HIGH[mask]
+    if high >= 0:
+        return _score(STRAIGHT, (high,))
+    if trips:
+        return _score(TRIPS, [trips[0]] + singles[:2])
+    if len(pairs) >= 2:
+        return _score(TWO_PAIR, pairs[:2] + sorted(pairs[2:] + singles, reverse=True)[:1])
+    if pairs:
+        return _score(PAIR, pairs[:1] + singles[:3])
+    return _score(HIGH_CARD, singles[:5])
+
+
+def hand_category(score: int) -> int:
+    return score >> CATEGORY_SHIFT
+
+
+def parse_cards(cards: Sequence[str]) -> List[int]:
+    """Card indices for strings like 'As' or 'Td' ('10d' is accepted too)."""
+    return [CARD_INDEX[card.replace('10', 'T')] for card in cards]
+
+
+def monte_carlo_equity(hole: Sequence[int], board: Sequence[int], opponents: int,
+                       trials: int, rng: random.Random) -> float:
+    """Share of pots won by `hole` against `opponents` random hands (ties split)."""
+    if trials <= 0:
+        return 0.0
+    opponents = max(1, opponents)
+    known = set(hole) | set(board)
+    deck = [card for card in range(52) if card not in known]
+    needed = 5 - len(board)
+    draw = needed + 2 * opponents
+    won = 0.0
+    for _ in range(trials):
+        sample = rng.sample(deck, draw)
+        full_board = list(board) + sample[:needed]
+        hero = evaluate_cards(list(hole) + full_board)
+        ties = 0
+        for start in range(needed, draw, 2):
+            score = evaluate_cards(sample[start:start + 2] + full_board)
+            if score > hero:
+                break
+            if score == hero:
+                ties += 1
+        else:
+            won += 1.0 / (ties + 1)
+    return won / trials
+
+
+def distribute_pots(invested: Sequence[int], live: Sequence[int], scores: Dict[int, int],
+                    button: int) -> List[int]:
+    """
+    Chips won per seat at showdown. Each all-in level among the live players
+    forms a pot contested by those who reached it; odd chips go to the first
+    winner left of the button.
+    """
+    seats = len(invested)
+    winnings = [0] * seats
+    previous = 0
+    winners: List[int] = []
+    for level in sorted({invested[seat] for seat in live}):
+        pot = sum(min(amount, level) - min(amount, previous) for amount in invested)
+        eligible = [seat for seat in live if invested[seat] >= level]
+        best = max(scores[seat] for seat in eligible)
+        winners = sorted((seat for seat in eligible if scores[seat] == best),
+                         key=lambda seat: (seat - button - 1) % seats)
+        share, odd = divmod(pot, len(winners))
+        for index, seat in enumerate(winners):
+            winnings[seat] += share + (1 if index < odd else 0)
+        previous = level
+    leftover = sum(max(0, amount - previous) for amount in invested)
+    if leftover and winners:  # Dead money above every live player's level
+        winnings[winners[0]] += leftover
+    return winnings
+
+
+def position_names(seats: int) -> List[str]:
+    """Position labels by offset from the button, using the names the strategy code expects."""
+    if seats == 2:
+        return ['SB', 'BB']  # Heads-up the button posts the small blind
+    between = seats - 3
+    names = ['BTN', 'SB', 'BB']
+    if between:
+        early = between - 1
+        utg = (early + 1) // 2
+        names += ['UTG'] * utg + ['MP'] * (early - utg) + ['CO']
+    return names
+
+
+# --- Agents ----------------------------------------------------------------------
+
+class Agent:
+    """A seat's strategy: decide() returns (action, amount), amount being the raise-to total."""
+
+    name = 'agent'
+
+    def decide(self, game_state: Dict, player_index: int) -> Tuple[str, float]:
+        raise NotImplementedError
+
+    def hand_finished(self, result: 'HandResult'):
+        pass
+
+
+def _hero_view(game_state: Dict, player_index: int):
+    me = game_state['players'][player_index]
+    return (parse_cards(me['hand']), parse_cards(game_state['community_cards']),
+            me['bet_to_call'], game_state['pot_size'], me['stack'])
+
+
+def _preflop_strength(hole: Sequence[int]) -> float:
+    """Rough 0-1 starting-hand strength for the scripted baselines."""
+    high, low = sorted((card >> 2 for card in hole), reverse=True)
+    if high == low:
+        return 0.5 + high / 24.0
+    suited = (hole[0] & 3) == (hole[1] & 3)
+    strength = (high + low) / 24.0 * 0.7 + (0.06 if suited else 0.0) + (0.04 if high - low == 1 else 0.0)
+    return min(strength, 0.95)
+
+
+def _raise_to(game_state: Dict, player_index: int, pot_fraction: float) -> float:
+    """Raise-to total that adds pot_fraction of the pot on top of the current bet."""
+    me = game_state['players'][player_index]
+    current = me['current_bet'] + me['bet_to_call']
+    return round(max(game_state['min_raise'], current + game_state['pot_size'] * pot_fraction), 2)
+
+
+class CallingStationAgent(Agent):
+    """Never folds and never raises."""
+
+    name = 'station'
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        pass
+
+    def decide(self, game_state, player_index):
+        to_call = game_state['players'][player_index]['bet_to_call']
+        return ('call', to_call) if to_call > 0 else ('check', 0)
+
+
+class TightAggressiveAgent(Agent):
+    """Plays strong starting hands, raises made hands, gives up without one."""
+
+    name = 'tag'
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        pass
+
+    def decide(self, game_state, player_index):
+        hole, board, to_call, pot, stack = _hero_view(game_state, player_index)
+        big_blind = game_state['big_blind']
+        if not board:
+            strength = _preflop_strength(hole)
+            if strength >= 0.75:
+                return 'raise', max(3 * big_blind, _raise_to(game_state, player_index, 1.0))
+            if strength >= 0.6 and to_call <= 4 * big_blind:
+                return ('call', to_call) if to_call > 0 else ('check', 0)
+            return ('check', 0) if to_call == 0 else ('fold', 0)
+        category = hand_category(evaluate_cards(hole + board))
+        if category >= TWO_PAIR:
+            return 'raise', _raise_to(game_state, player_index, 0.75)
+        if category == PAIR and to_call <= pot * 0.5:
+            return ('call', to_call) if to_call > 0 else ('check', 0)
+        return ('check', 0) if to_call == 0 else ('fold', 0)
+
+
+class LooseAggressiveAgent(Agent):
+    """Plays most hands and bets or raises a fixed share of the time regardless of strength."""
+
+    name = 'lag'
+
+    def __init__(self, aggression: float = 0.35, rng: Optional[random.Random] = None):
+        self.aggression = aggression
+        self.rng = rng or random.Random()
+
+    def decide(self, game_state, player_index):
+        hole, board, to_call, pot, stack = _hero_view(game_state, player_index)
+        if not board:
+            if _preflop_strength(hole) < 0.35 and to_call > 0:
+                return 'fold', 0
+            if self.rng.random() < self.aggression:
+                return 'raise', _raise_to(game_state, player_index, 1.0)
+            return ('call', to_call) if to_call > 0 else ('check', 0)
+        made = hand_category(evaluate_cards(hole + board)) >= PAIR
+        if made or self.rng.random() < self.aggression:
+            return 'raise', _raise_to(game_state, player_index, 0.66)
+        if to_call == 0:
+            return 'check', 0
+        return ('call', to_call) if to_call <= pot * 0.3 else ('fold', 0)
+
+
+def merge_settings(base: Dict, overrides: Optional[Dict]) -> Dict:
+    """Copy of `base` with `overrides` applied; dict sections are merged one level deep."""
+    merged = dict(base)
+    for key, value in (overrides or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+class DecisionEngineAgent(Agent):
+    """
+    Seats DecisionEngine.make_decision, the PokerBot decision path.
+    With equity_trials set, win_probability is filled in from this module's
+    evaluator so the engine skips its own (much slower) Monte Carlo run; pass
+    None to exercise EquityCalculator as the live bot does. `settings` are
+    merged over the config file (sections such as 'strategy' key by key).
+    """
+
+    name = 'decision_engine'
+
+    def __init__(self, engine=None, config_path: Optional[str] = None, settings: Optional[Dict] = None,
+                 equity_trials: Optional[int] = DEFAULT_EQUITY_TRIALS, rng: Optional[random.Random] = None):
+        if engine is None:
+            # Imported here so scripted-only sweeps don't load the strategy modules
+            from config import Config
+            from decision_engine import DecisionEngine
+            from hand_evaluator import HandEvaluator
+            config_path = config_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+            config = Config(config_path)
+            config.settings = merge_settings(config.settings, settings)
+            engine = DecisionEngine(HandEvaluator(), config)
+        self.engine = engine
+        self.equity_trials = equity_trials
+        self.rng = rng or random.Random()
+
+    def decide(self, game_state, player_index):
+        me = game_state['players'][player_index]
+        if self.equity_trials:
+            opponents = sum(1 for i, p in enumerate(game_state['players']) if i != player_index and p['is_active'])
+            me['win_probability'] = monte_carlo_equity(parse_cards(me['hand']), parse_cards(game_state['community_cards']),
+                                                       opponents, self.equity_trials, self.rng)
+        self.engine.big_blind_amount = game_state['big_blind']
+        self.engine.small_blind_amount = game_state['small_blind']
+        return self.engine.make_decision(game_state, player_index)
+
+
+class AdvancedEngineAgent(Agent):
+    """Seats AdvancedDecisionEngine.make_advanced_decision, the EnhancedPokerBot decision path."""
+
+    name = 'advanced'
+
+    def __init__(self, engine=None, settings: Optional[Dict] = None, equity_trials: int = DEFAULT_EQUITY_TRIALS,
+                 rng: Optional[random.Random] = None):
+        from advanced_decision_engine import create_advanced_decision_engine
+        from hand_evaluator import HandEvaluator
+        self.engine = engine or create_advanced_decision_engine(settings)
+        self.hand_evaluator = HandEvaluator()
+        self.equity_trials = equity_trials
+        self.rng = rng or random.Random()
+
+    def decide(self, game_state, player_index):
+        from advanced_decision_engine import BoardTexture, DecisionContext, OpponentProfile
+        players = game_state['players']
+        me = players[player_index]
+        board = game_state['community_cards']
+        opponents = [OpponentProfile(name=p['name'], stack_size=p['stack'])
+                     for i, p in enumerate(players) if i != player_index and p['is_active']]
+        pot_size = game_state['pot_size']
+        bet_to_call = me['bet_to_call']
+        context = DecisionContext(
+            hand_strength=self.hand_evaluator.evaluate_hand(me['hand'], board)['description'],
+            position=me['position'],
+            pot_size=pot_size,
+            bet_to_call=bet_to_call,
+            stack_size=me['stack'],
+            pot_odds=bet_to_call / (pot_size + bet_to_call) if pot_size + bet_to_call > 0 else 0.0,
+            win_probability=monte_carlo_equity(parse_cards(me['hand']), parse_cards(board), len(opponents),
+                                               self.equity_trials, self.rng),
+            opponents=opponents,
+            board_texture=BoardTexture.from_cards(board),
+            street=game_state['current_round'],
+            spr=me['stack'] / max(pot_size, 0.01),
+            actions_available=me['available_actions'],
+            betting_history=game_state['action_history'][-10:],
+        )
+        action, amount, _reasoning = self.engine.make_advanced_decision(context)
+        return action, amount
+
+
+AGENT_FACTORIES: Dict[str, Callable[..., Agent]] = {
+    'decision_engine': DecisionEngineAgent,
+    'advanced': AdvancedEngineAgent,
+    'station': CallingStationAgent,
+    'tag': TightAggressiveAgent,
+    'lag': LooseAggressiveAgent,
+}
+
+SeatSpec = Union[str, Tuple[str, Dict[str, Any]]]
+
+
+def build_agent(spec: SeatSpec, rng: random.Random) -> Agent:
+    """Agent for a seat spec: a factory name, or (name, constructor kwargs)."""
+    kind, kwargs = (spec, {}) if isinstance(spec, str) else spec
+    if kind not in AGENT_FACTORIES:
+        raise ValueError(f"Unknown agent '{kind}' (known: {', '.join(sorted(AGENT_FACTORIES))})")
+    return AGENT_FACTORIES[kind](rng=rng, **kwargs)
+
+
+def seat_label(spec: SeatSpec) -> str:
+    return spec if isinstance(spec, str) else spec[0]
+
+
+# --- Table -----------------------------------------------------------------------
+
+@dataclass
+class HandResult:
+    """Outcome of one hand; amounts in currency units."""
+    hand_id: int
+    button: int
+    board: List[str]
+    hole_cards: List[List[str]]
+    net: List[float]
+    winners: List[int]
+    showdown: bool
+    street: str                 # Last street reached
+    actions: List[Dict] = field(default_factory=list)
+
+
+class _HandState:
+    __slots__ = ('hand_id', 'stacks', 'bets', 'invested', 'folded', 'all_in', 'acted', 'holes', 'board',
+                 'board_count', 'street', 'current_bet', 'min_raise', 'actions')
+
+    def __init__(self, hand_id: int, stacks: List[int], holes: List[List[int]], board: List[int]):
+        seats = len(stacks)
+        self.hand_id = hand_id
+        self.stacks = stacks
+        self.bets = [0] * seats
+        self.invested = [0] * seats
+        self.folded = [False] * seats
+        self.all_in = [False] * seats
+        self.acted = [False] * seats
+        self.holes = holes
+        self.board = board
+        self.board_count = 0
+        self.street = 'preflop'
+        self.current_bet = 0
+        self.min_raise = 0
+        self.actions: List[Dict] = []
+
+
+class NLHETable:
+    """No-Limit Hold'em cash table; stacks are topped up to the starting stack every hand."""
+
+    def __init__(self, agents: Sequence[Agent], small_blind: float = DEFAULT_SMALL_BLIND,
+                 big_blind: float = DEFAULT_BIG_BLIND, starting_stack_bb: Union[float, Sequence[float]] = DEFAULT_STACK_BB,
+                 chip_size: float = DEFAULT_CHIP_SIZE, rng: Optional[random.Random] = None,
+                 names: Optional[Sequence[str]] = None):
+        if not 2 <= len(agents) <= 9:
+            raise ValueError(f"A table seats 2-9 agents, got {len(agents)}")
+        self.agents = list(agents)
+        self.seats = len(self.agents)
+        self.chip_size = chip_size
+        self.small_blind = self._chips(small_blind)
+        self.big_blind = self._chips(big_blind)
+        if isinstance(starting_stack_bb, (int, float)):
+            starting_stack_bb = [starting_stack_bb] * self.seats
+        self.starting_stacks = [int(round(bb * self.big_blind)) for bb in starting_stack_bb]
+        self.rng = rng or random.Random()
+        self.names = list(names) if names else [f"Seat{i + 1}_{agent.name}" for i, agent in enumerate(self.agents)]
+        self.positions = position_names(self.seats)
+        self.button = 0
+        self.hands_played = 0
+        self.decisions = [0] * self.seats
+        self.decision_seconds = [0.0] * self.seats
+        self.errors = 0
+
+    def _chips(self, amount: float) -> int:
+        return int(round(float(amount) / self.chip_size))
+
+    def _money(self, chips: int) -> float:
+        return round(chips * self.chip_size, 6)
+
+    # --- Hand flow -------------------------------------------------------------
+
+    def play_hand(self, deck: Optional[Sequence[int]] = None) -> HandResult:
+        """Play one hand; `deck` fixes the card order (dealt from the end) instead of a fresh shuffle."""
+        seats = self.seats
+        button = self.button
+        self.hands_played += 1
+        if deck is None:
+            deck = list(range(52))
+            self.rng.shuffle(deck)
+        else:
+            deck = list(deck)
+        holes = [[deck.pop(), deck.pop()] for _ in range(seats)]
+        hand = _HandState(self.hands_played, list(self.starting_stacks), holes, [deck.pop() for _ in range(5)])
+
+        if seats == 2:
+            small, big, first_preflop, first_postflop = button, (button + 1) % 2, button, (button + 1) % 2
+        else:
+            small, big = (button + 1) % seats, (button + 2) % seats
+            first_preflop, first_postflop = (button + 3) % seats, (button + 1) % seats
+        self._commit(hand, small, self.small_blind)
+        self._commit(hand, big, self.big_blind)
+        hand.current_bet = max(hand.bets)
+        hand.min_raise = self.big_blind
+
+        for street in STREETS:
+            if street != 'preflop':
+                hand.street = street
+                hand.board_count = BOARD_SIZES[street]
+                hand.bets = [0] * seats
+                hand.acted = [False] * seats
+                hand.current_bet = 0
+                hand.min_raise = self.big_blind
+            self._betting_round(hand, first_preflop if street == 'preflop' else first_postflop)
+            if sum(1 for folded in hand.folded if not folded) == 1:
+                break
+
+        result = self._settle(hand, button)
+        self.button = (button + 1) % seats
+        for agent in self.agents:
+            agent.hand_finished(result)
+        return result
+
+    def _commit(self, hand: _HandState, seat: int, chips: int):
+        chips = min(chips, hand.stacks[seat])
+        hand.stacks[seat] -= chips
+        hand.bets[seat] += chips
+        hand.invested[seat] += chips
+        if hand.stacks[seat] == 0:
+            hand.all_in[seat] = True
+
+    def _betting_round(self, hand: _HandState, first: int):
+        seats = self.seats
+        seat = first
+        while True:
+            able = [i for i in range(seats) if not hand.folded[i] and not hand.all_in[i]]
+            live = sum(1 for folded in hand.folded if not folded)
+            if live == 1 or not able or (len(able) == 1 and hand.bets[able[0]] >= hand.current_bet):
+                return
+            actor = None
+            for step in range(seats):
+                i = (seat + step) % seats
+                if hand.folded[i] or hand.all_in[i]:
+                    continue
+                if not hand.acted[i] or hand.bets[i] < hand.current_bet:
+                    actor = i
+                    break
+            if actor is None:
+                return
+            self._act(hand, actor)
+            seat = (actor + 1) % seats
+
+    def _act(self, hand: _HandState, seat: int):
+        state = self.game_state(hand, seat)
+        start = time.perf_counter()
+        try:
+            decision = self.agents[seat].decide(state, seat)
+        except Exception as e:
+            logger.error(f"Agent {self.names[seat]} failed to decide: {e}", exc_info=True)
+            self.errors += 1
+            decision = ('fold', 0)
+        self.decision_seconds[seat] += time.perf_counter() - start
+        self.decisions[seat] += 1
+
+        if isinstance(decision, tuple) and len(decision) >= 2:
+            action, amount = decision[0], decision[1]
+        else:
+            action, amount = decision, 0
+        action = str(action or 'fold').lower()
+        to_call = hand.current_bet - hand.bets[seat]
+        max_to = hand.bets[seat] + hand.stacks[seat]
+
+        if action in RAISE_ACTIONS and max_to > hand.current_bet:
+            previous_bet = hand.current_bet
+            target = max_to if action in ('all_in', 'allin', 'all-in') else self._chips(amount or 0)
+            target = min(max(target, previous_bet + hand.min_raise), max_to)
+            self._commit(hand, seat, target - hand.bets[seat])
+            if target - previous_bet >= hand.min_raise:
+                hand.min_raise = target - previous_bet
+                hand.acted = [False] * self.seats  # A full raise reopens the action
+            hand.current_bet = target
+            action_type = 'BET' if previous_bet == 0 else 'RAISE'
+        elif to_call <= 0 and action != 'call':
+            action_type = 'CHECK'  # Folding (or raising nothing) when checking is free is a check
+        elif action in ('call',) + RAISE_ACTIONS:
+            self._commit(hand, seat, to_call)
+            action_type = 'CALL' if to_call > 0 else 'CHECK'
+        else:
+            hand.folded[seat] = True  # Folds, and checks facing a bet
+            action_type = 'FOLD'
+        hand.acted[seat] = True
+        hand.actions.append({
+            'player_name': self.names[seat], 'player_id': self.names[seat], 'action_type': action_type,
+            'amount': self._money(hand.bets[seat]), 'street': hand.street, 'is_bot': False,
+            'position': self.positions[(seat - self.button) % self.seats], 'seat': seat,
+        })
+
+    def _settle(self, hand: _HandState, button: int) -> HandResult:
+        invested = hand.invested
+        top = max(range(self.seats), key=lambda seat: invested[seat])
+        second = max(amount for seat, amount in enumerate(invested) if seat != top)
+        if invested[top] > second:  # Uncalled part of the last bet goes back
+            hand.stacks[top] += invested[top] - second
+            invested[top] = second
+
+        live = [seat for seat in range(self.seats) if not hand.folded[seat]]
+        showdown = len(live) > 1
+        if showdown:
+            hand.board_count = 5
+            scores = {seat: evaluate_cards(hand.holes[seat] + hand.board) for seat in live}
+            winnings = distribute_pots(invested, live, scores, button)
+        else:
+            winnings = [0] * self.seats
+            winnings[live[0]] = sum(invested)
+
+        return HandResult(
+            hand_id=hand.hand_id,
+            button=button,
+            board=[DECK[card] for card in hand.board[:hand.board_count]],
+            hole_cards=[[DECK[card] for card in hole] for hole in hand.holes],
+            net=[self._money(winnings[seat] - invested[seat]) for seat in range(self.seats)],
+            winners=[seat for seat in range(self.seats) if winnings[seat] > 0],
+            showdown=showdown,
+            street=hand.street,
+            actions=hand.actions,
+        )
+
+    # --- Agent view ------------------------------------------------------------
+
+    def game_state(self, hand: _HandState, index: int) -> Dict:
+        """The parser-shaped game state as seen from seat `index`."""
+        money = self._money
+        board = [DECK[card] for card in hand.board[:hand.board_count]]
+        players = []
+        for seat in range(self.seats):
+            mine = seat == index
+            cards = [DECK[card] for card in hand.holes[seat]] if mine else []
+            bet = money(hand.bets[seat])
+            players.append({
+                'seat': str(seat + 1), 'id': str(seat + 1), 'name': self.names[seat],
+                'stack': money(hand.stacks[seat]), 'bet': bet, 'current_bet': bet,
+                'is_my_player': mine, 'is_empty': False, 'cards': cards, 'hand': cards,
+                'has_turn': mine, 'has_hidden_cards': not mine and not hand.folded[seat],
+                'is_active': not hand.folded[seat], 'is_all_in': hand.all_in[seat],
+                'position': self.positions[(seat - self.button) % self.seats],
+            })
+        to_call = min(max(0, hand.current_bet - hand.bets[index]), hand.stacks[index])
+        me = players[index]
+        me['bet_to_call'] = money(to_call)
+        if to_call == 0:
+            me['available_actions'] = ['check', 'bet', 'raise']
+        elif hand.stacks[index] > to_call:
+            me['available_actions'] = ['fold', 'call', 'raise']
+        else:
+            me['available_actions'] = ['fold', 'call']
+        return {
+            'players': players,
+            'pot_size': money(sum(hand.invested)),
+            'community_cards': board,
+            'board': board,
+            'current_round': hand.street,
+            'street': hand.street,
+            'big_blind': money(self.big_blind),
+            'small_blind': money(self.small_blind),
+            'min_raise': money(hand.current_bet + hand.min_raise),
+            'action_history': list(hand.actions),
+            'hand_id': str(hand.hand_id),
+            'dealer_position': str(self.button + 1),
+        }
+
+
+# --- Simulation runs -------------------------------------------------------------
+
+@dataclass
+class SimulationResult:
+    """Per-seat totals over a run; net amounts in big blinds."""
+    seats: List[str]
+    hands: int = 0
+    showdowns: int = 0
+    errors: int = 0
+    net_bb: List[float] = field(default_factory=list)
+    net_bb_squares: List[float] = field(default_factory=list)
+    decisions: List[int] = field(default_factory=list)
+    decision_seconds: List[float] = field(default_factory=list)
+    elapsed: float = 0.0        # Wall-clock seconds for the whole run
+    worker_seconds: float = 0.0  # Seconds spent playing, summed over chunks
+
+    def __post_init__(self):
+        count = len(self.seats)
+        for name in ('net_bb', 'net_bb_squares', 'decisions', 'decision_seconds'):
+            if not getattr(self, name):
+                setattr(self, name, [0] * count if name == 'decisions' else [0.0] * count)
+
+    def add_hand(self, result: HandResult, big_blind: float):
+        self.hands += 1
+        self.showdowns += result.showdown
+        for seat, net in enumerate(result.net):
+            net_bb = net / big_blind
+            self.net_bb[seat] += net_bb
+            self.net_bb_squares[seat] += net_bb * net_bb
+
+    def merge(self, other: 'SimulationResult'):
+        self.hands += other.hands
+        self.showdowns += other.showdowns
+        self.errors += other.errors
+        self.worker_seconds += other.worker_seconds
+        for seat in range(len(self.seats)):
+            self.net_bb[seat] += other.net_bb[seat]
+            self.net_bb_squares[seat] += other.net_bb_squares[seat]
+            self.decisions[seat] += other.decisions[seat]
+            self.decision_seconds[seat] += other.decision_seconds[seat]
+
+    def bb_per_100(self, seat: int) -> float:
+        return self.net_bb[seat] / self.hands * 100.0 if self.hands else 0.0
+
+    def bb_per_100_stderr(self, seat: int) -> float:
+        """Standard error of bb/100, treating hands as independent."""
+        if self.hands < 2:
+            return 0.0
+        mean = self.net_bb[seat] / self.hands
+        variance = max(0.0, (self.net_bb_squares[seat] - self.hands * mean * mean) / (self.hands - 1))
+        return math.sqrt(variance / self.hands) * 100.0
+
+    @property
+    def hands_per_hour(self) -> float:
+        return self.hands / self.elapsed * 3600.0 if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'hands': self.hands,
+            'elapsed_s': self.elapsed,
+            'hands_per_hour': self.hands_per_hour,
+            'showdown_rate': self.showdowns / self.hands if self.hands else 0.0,
+            'errors': self.errors,
+            'seats': [{
+                'seat': seat + 1,
+                'agent': name,
+                'bb_per_100': self.bb_per_100(seat),
+                'bb_per_100_stderr': self.bb_per_100_stderr(seat),
+                'mean_decision_ms': (self.decision_seconds[seat] / self.decisions[seat] * 1000.0
+                                     if self.decisions[seat] else 0.0),
+            } for seat, name in enumerate(self.seats)],
+        }
+
+    def report(self) -> str:
+        summary = self.summary()
+        lines = [f"{summary['hands']} hands in {summary['elapsed_s']:.1f}s "
+                 f"({summary['hands_per_hour']:,.0f} hands/hour), {summary['errors']} agent errors",
+                 f"{'seat':<5} {'agent':<16} {'bb/100':>9} {'+/-':>8} {'ms/decision':>12}"]
+        for seat in summary['seats']:
+            lines.append(f"{seat['seat']:<5} {seat['agent']:<16} {seat['bb_per_100']:>9.2f} "
+                         f"{seat['bb_per_100_stderr']:>8.2f} {seat['mean_decision_ms']:>12.3f}")
+        return "\n".join(lines)
+
+
+def _chunk_seed(seed: Optional[int], index: int) -> Optional[int]:
+    return None if seed is None else seed * 1_000_003 + index
+
+
+def _play_chunk(job: Tuple[List[SeatSpec], int, Optional[int], Dict]) -> SimulationResult:
+    """Play one seeded chunk with fresh agents and table (runs inside pool workers)."""
+    seats, hands, seed, table_kwargs = job
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    agents = [build_agent(spec, random.Random(rng.getrandbits(64))) for spec in seats]
+    table = NLHETable(agents, rng=random.Random(rng.getrandbits(64)), **table_kwargs)
+    result = SimulationResult([seat_label(spec) for spec in seats])
+    big_blind = table._money(table.big_blind)
+    for _ in range(hands):
+        result.add_hand(table.play_hand(), big_blind)
+    result.errors = table.errors
+    result.decisions = list(table.decisions)
+    result.decision_seconds = list(table.decision_seconds)
+    result.worker_seconds = result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _chunk_jobs(seats, hands, seed, chunk_hands, table_kwargs):
+    return [(list(seats), min(chunk_hands, hands - offset), _chunk_seed(seed, index), dict(table_kwargs or {}))
+            for index, offset in enumerate(range(0, hands, chunk_hands))]
+
+
+def _quiet_worker(level: int):
+    logging.getLogger().setLevel(level)
+
+
+def run_simulation(seats: Sequence[SeatSpec], hands: int, seed: Optional[int] = None,
+                   chunk_hands: int = DEFAULT_CHUNK_HANDS, table_kwargs: Optional[Dict] = None) -> SimulationResult:
+    """Play `hands` hands in-process."""
+    start = time.perf_counter()
+    result = SimulationResult([seat_label(spec) for spec in seats])
+    for job in _chunk_jobs(seats, hands, seed, chunk_hands, table_kwargs):
+        result.merge(_play_chunk(job))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_parallel(seats: Sequence[SeatSpec], hands: int, workers: Optional[int] = None, seed: Optional[int] = None,
+                 chunk_hands: int = DEFAULT_CHUNK_HANDS, table_kwargs: Optional[Dict] = None,
+                 worker_log_level: int = logging.WARNING) -> SimulationResult:
+    """Play `hands` hands over a process pool; totals match run_simulation for the same seed."""
+    workers = workers or os.cpu_count() or 1
+    jobs = _chunk_jobs(seats, hands, seed, chunk_hands, table_kwargs)
+    if workers <= 1 or len(jobs) <= 1:
+        return run_simulation(seats, hands, seed, chunk_hands, table_kwargs)
+    start = time.perf_counter()
+    result = SimulationResult([seat_label(spec) for spec in seats])
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_quiet_worker,
+                             initargs=(worker_log_level,)) as pool:
+        for part in pool.map(_play_chunk, jobs):
+            result.merge(part)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play headless NLHE hands between decision engines and baselines.")
+    parser.add_argument('--seats', default=DEFAULT_SEATS,
+                        help=f"Comma-separated agents, one per seat ({', '.join(sorted(AGENT_FACTORIES))})")
+    parser.add_argument('--hands', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--chunk-hands', type=int, default=DEFAULT_CHUNK_HANDS)
+    parser.add_argument('--stack-bb', type=float, default=DEFAULT_STACK_BB)
+    parser.add_argument('--small-blind', type=float, default=DEFAULT_SMALL_BLIND)
+    parser.add_argument('--big-blind', type=float, default=DEFAULT_BIG_BLIND)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    seats = [name.strip() for name in args.seats.split(',') if name.strip()]
+    table_kwargs = {'small_blind': args.small_blind, 'big_blind': args.big_blind, 'starting_stack_bb': args.stack_bb}
+    result = run_parallel(seats, args.hands, workers=args.workers, seed=args.seed,
+                          chunk_hands=args.chunk_hands, table_kwargs=table_kwargs)
+    print(result.report())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
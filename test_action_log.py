@@ -0,0 +1,105 @@
+"""
+Tests for the columnar action log and the tracker views fed from it.
+"""
+
+import unittest
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from action_log import ActionLog, create_action_log
+from opponent_tracking import OpponentTracker
+from enhanced_opponent_tracking import EnhancedOpponentTracker
+
+QUIET = logging.getLogger('test_action_log')
+QUIET.setLevel(logging.CRITICAL)
+
+
+class TestActionLog(unittest.TestCase):
+    def test_rows_round_trip_through_codes(self):
+        log = ActionLog()
+        row = log.append('villain', 'RAISE', 'Preflop', position='BTN', amount=0.06,
+                         pot_size_before=0.03, stack_size=2.0, hand_id='h1', timestamp=5.0)
+        self.assertEqual((row.player_name, row.action_type, row.street, row.position), ('villain', 'raise', 'preflop', 'BTN'))
+        self.assertEqual(log.get_row(row.row_id), row)
+        log.append('villain', 'all-in', 'flop', hand_id='h1')
+        self.assertEqual([a.action_type for a in log.player_actions('villain')], ['raise', 'all_in'])
+        self.assertEqual(log.action_counts('villain', street='flop'), {'all_in': 1})
+        self.assertEqual(log.action_counts('nobody'), {})
+
+    def test_compaction_keeps_recent_rows_and_ids(self):
+        log = create_action_log({'action_log': {'max_rows': 8}})
+        rows = [log.append('p1' if i % 2 else 'p2', 'call', 'flop', hand_id=str(i)) for i in range(20)]
+        self.assertLessEqual(len(log), 8)
+        self.assertEqual(log.get_row(rows[-1].row_id).hand_id, '19')
+        with self.assertRaises(IndexError):
+            log.get_row(rows[0].row_id)
+        self.assertEqual([a.hand_id for a in log.player_actions('p1', last=2)], ['17', '19'])
+
+    def test_compaction_prunes_player_and_hand_tables(self):
+        log = ActionLog(max_rows=40)
+        for i in range(5000):
+            log.append(f'seat{i // 50}', 'call', 'flop', position='BTN', hand_id=f'hand{i // 6}')
+        tables = log.interned_counts()
+        # Only the players and hands of the <= 40 rows still held remain interned
+        self.assertLessEqual(tables['players'], 2)
+        self.assertLessEqual(tables['hands'], 8)
+        self.assertEqual(log.players(), ['seat99'])
+        last = list(log.player_actions('seat99', last=1))[0]
+        self.assertEqual((last.player_name, last.hand_id), ('seat99', 'hand833'))
+        self.assertEqual(log.action_counts('seat98'), {})
+        self.assertEqual(log.append('seat0', 'fold', 'turn', hand_id='hand0').player_name, 'seat0')
+
+    def test_trackers_are_fed_from_one_append(self):
+        log = ActionLog()
+        basic = OpponentTracker(logger_instance=QUIET, action_log=log)
+        enhanced = EnhancedOpponentTracker(logger_instance=QUIET, action_log=log)
+
+        log.append('villain', 'raise', 'preflop', position='CO', amount=0.06, hand_id='h1')
+        log.append('villain', 'bet', 'flop', position='CO', amount=0.1, pot_size_before=0.15, hand_id='h1')
+
+        profile = basic.get_opponent_profile('villain')
+        self.assertEqual(profile.preflop_pfr_actions, 1)
+        self.assertEqual(profile.street_stats['flop']['BET_count'], 1)
+        self.assertAlmostEqual(profile.get_average_bet_size('flop', 'bet'), 0.1 / 0.15)
+        enhanced_profile = enhanced.get_or_create_opponent('villain')
+        self.assertEqual(enhanced_profile.street_stats['flop']['aggressive_actions'], 1)
+        self.assertEqual(len(enhanced_profile.recent_actions), 2)
+
+    def test_tracker_views_hold_row_ids_not_copies(self):
+        basic = OpponentTracker(logger_instance=QUIET)
+        basic.log_action('villain', 'RAISE', 'preflop', position='CO', amount=0.06, hand_id='h1')
+        basic.log_action('villain', 'BET', 'flop', position='CO', amount=0.1, pot_size_before_action=0.15, hand_id='h1')
+        basic.log_action('villain', 'FOLD', 'preflop', position='BB', hand_id='h2')
+        profile = basic.get_opponent_profile('villain')
+        self.assertEqual(len(basic.action_log), 3)
+        (hand_id, rows), = profile.hand_action_history
+        self.assertEqual((hand_id, list(rows)), ('h1', [0, 1]))
+        self.assertEqual([a.action_type for _, actions in profile.recent_hands() for a in actions], ['raise', 'bet'])
+        self.assertEqual([a.action_type for a in profile.current_hand_actions], ['fold'])
+        self.assertEqual(profile.hands_played_count, 2)
+
+    def test_enhanced_tracker_built_late_replays_the_log(self):
+        log = ActionLog()
+        log.append('villain', 'call', 'preflop', position='BTN', stack_size=2.0, hand_id='h1')
+        log.append('villain', 'check', 'flop', position='BTN', stack_size=2.0, hand_id='h1')
+        enhanced = EnhancedOpponentTracker(logger_instance=QUIET, action_log=log)
+        log.append('villain', 'bet', 'turn', position='BTN', amount=0.2, hand_id='h1')
+        profile = enhanced.get_or_create_opponent('villain')
+        self.assertEqual(sum(stats['total_actions'] for stats in profile.street_stats.values()), 3)
+        self.assertEqual([a.street for a in profile.recent_actions], ['preflop', 'flop', 'turn'])
+        self.assertEqual(len(log), 3)
+
+    def test_failing_view_does_not_block_others(self):
+        log = ActionLog()
+        seen = []
+        log.subscribe(lambda action: 1 / 0)
+        log.subscribe(seen.append)
+        log.append('villain', 'check', 'turn')
+        self.assertEqual(len(seen), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
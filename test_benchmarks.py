@@ -0,0 +1,86 @@
+"""
+Tests for the benchmark suite runner and baseline comparison.
+"""
+
+import unittest
+import json
+import tempfile
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks import (BENCHMARKS, BenchmarkSkipped, measure, run_benchmarks, compare_results, simulated_states,
+                        main)
+
+
+def _document(rates):
+    return {'benchmarks': {name: {'unit': 'ops/s', 'rate': rate, 'median_rate': rate} for name, rate in rates.items()}}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_measure_reports_rates(self):
+        calls = []
+        result = measure(lambda: calls.append(1) or 10, min_time=0.0, repeat=3)
+        self.assertEqual(result['rounds'], 3)
+        self.assertEqual(result['operations'], 30)
+        self.assertEqual(len(calls), 4)  # warm-up plus one call per round
+        self.assertGreaterEqual(result['rate'], result['median_rate'])
+
+    def test_registry_covers_hot_paths(self):
+        for name in ('hand_evaluator.calculate_best_hand', 'equity.monte_carlo.preflop', 'equity.monte_carlo.river',
+                     'parser.parse_html', 'decision.make_decision.scenarios', 'decision.make_decision.simulated',
+                     'decision.decide_batch.corpus',
+                     'startup.import.poker_bot', 'startup.import.enhanced_poker_bot'):
+            self.assertIn(name, BENCHMARKS)
+        states = simulated_states(3, count=5)
+        self.assertEqual(len(states), 5)
+        state, index = states[0]
+        self.assertTrue(state['players'][index]['is_my_player'])
+
+    def test_run_benchmarks_records_results_and_skips(self):
+        def unavailable(seed):
+            raise BenchmarkSkipped("no inputs")
+
+        BENCHMARKS['test.unavailable'] = ('ops/s', unavailable)
+        try:
+            document = run_benchmarks(['calculate_best_hand', 'test.unavailable'], min_time=0.0, repeat=1)
+        finally:
+            del BENCHMARKS['test.unavailable']
+        self.assertEqual(set(document['benchmarks']), {'hand_evaluator.calculate_best_hand', 'test.unavailable'})
+        self.assertGreater(document['benchmarks']['hand_evaluator.calculate_best_hand']['median_rate'], 0)
+        self.assertEqual(document['benchmarks']['test.unavailable']['skipped'], 'no inputs')
+        json.loads(json.dumps(document))
+
+    def test_compare_flags_regressions(self):
+        baseline = _document({'fast': 100.0, 'slow': 100.0, 'steady': 100.0, 'gone': 5.0})
+        current = _document({'fast': 150.0, 'slow': 80.0, 'steady': 95.0, 'added': 1.0})
+        statuses = {row['name']: row['status'] for row in compare_results(current, baseline, threshold=0.10)}
+        self.assertEqual(statuses, {'fast': 'improvement', 'slow': 'regression', 'steady': 'ok',
+                                    'gone': 'missing', 'added': 'new'})
+
+    def test_cli_writes_json_and_fails_on_regression(self):
+        output = os.path.join(self.tmpdir, 'results.json')
+        args = ['--only', 'calculate_best_hand', '--min-time', '0', '--repeat', '1']
+        self.assertEqual(main(args + ['-o', output]), 0)
+        with open(output, encoding='utf-8') as f:
+            document = json.load(f)
+        self.assertEqual(document['format'], 'pokerbot-benchmarks')
+
+        baseline = os.path.join(self.tmpdir, 'baseline.json')
+        document['benchmarks']['hand_evaluator.calculate_best_hand']['median_rate'] *= 1000
+        with open(baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+        self.assertEqual(main(args + ['--baseline', baseline]), 1)
+        self.assertEqual(main(args + ['--baseline', baseline, '--threshold', '1.0']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
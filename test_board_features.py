@@ -0,0 +1,61 @@
+"""
+Tests for the shared canonical board-feature cache.
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from board_features import BoardFeatureService, canonical_board, parse_card
+from enhanced_board_analysis import BoardTexture as DirectBoardTexture, EnhancedBoardAnalyzer
+from advanced_decision_engine import BoardTexture
+
+
+class TestCanonicalBoard(unittest.TestCase):
+    def test_card_formats(self):
+        self.assertEqual(parse_card('10♠'), (10, 's'))
+        self.assertEqual(parse_card('Td'), (10, 'd'))
+        with self.assertRaises(ValueError):
+            parse_card('Xx')
+
+    def test_isomorphic_boards_share_id(self):
+        self.assertEqual(canonical_board(['As', 'Ks', '7h']), canonical_board(['7c', 'Kd', 'Ad']))
+        self.assertNotEqual(canonical_board(['As', 'Ks', '7h']), canonical_board(['As', 'Kh', '7d']))
+
+    def test_flop_count(self):
+        service = BoardFeatureService()
+        self.assertEqual(service.warm_flops(), 1755)
+
+
+class TestBoardFeatureService(unittest.TestCase):
+    def test_isomorphic_lookup_reuses_features(self):
+        service = BoardFeatureService()
+        first = service.get_features(['A♠', 'K♠', '7♠'])
+        second = service.get_features(['Kh', '7h', 'Ah'])
+        self.assertIs(first, second)
+        self.assertEqual(service.get_stats()['computed'], 1)
+        self.assertEqual(service.get_stats()['canonical_hits'], 1)
+        self.assertTrue(first.has_flush_draw)
+
+    def test_analyzer_output_matches_direct_texture(self):
+        board = ['Qh', 'Jh', '9c', '9d']
+        analysis = EnhancedBoardAnalyzer().analyze_board(board)
+        direct = DirectBoardTexture(board)
+        self.assertEqual(analysis['texture_type'], direct.get_texture_type())
+        self.assertEqual(analysis['wetness_score'], direct._calculate_wetness_score())
+        self.assertEqual(analysis['straight_draws'], direct._analyze_straight_draws())
+        self.assertTrue(analysis['has_pair'])
+        analysis['betting_implications']['mutated'] = True
+        self.assertNotIn('mutated', EnhancedBoardAnalyzer().analyze_board(['Ah', '7c', '2d'])['betting_implications'])
+
+    def test_simple_texture_labels(self):
+        self.assertEqual(BoardTexture.from_cards(['As', 'Kd', '7h']), BoardTexture.RAINBOW)
+        self.assertEqual(BoardTexture.from_cards(['As', 'Ks', '7s']), BoardTexture.WET)
+        self.assertEqual(BoardTexture.from_cards(['As', 'Kd', 'Qh']), BoardTexture.COORDINATED)
+        self.assertEqual(BoardTexture.from_cards(['As']), BoardTexture.DRY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for the time-decayed, prior-shrunk opponent statistics.
+"""
+
+import unittest
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decayed_stats import DecayedRate, DecayedStats, create_decayed_stats, POPULATION_PRIORS
+from opponent_tracking import OpponentTracker, OpponentProfile
+from advanced_opponent_modeling import OpponentProfile as AdvancedProfile
+from preflop_decision_logic import _exploitable_player_type
+
+QUIET = logging.getLogger('test_decayed_stats')
+QUIET.setLevel(logging.CRITICAL)
+
+
+class TestDecayedRate(unittest.TestCase):
+    def test_shrinks_towards_prior_until_data_dominates(self):
+        rate = DecayedRate(prior=0.25, prior_strength=10, half_life=None)
+        self.assertEqual(rate.estimate, 0.25)
+        self.assertEqual(rate.confidence, 0.0)
+        for _ in range(10):
+            rate.update(True)
+        self.assertAlmostEqual(rate.estimate, (10 + 2.5) / 20)
+        self.assertAlmostEqual(rate.effective_sample_size, 10)
+        self.assertAlmostEqual(rate.confidence, 0.5)
+        for _ in range(990):
+            rate.update(True)
+        self.assertGreater(rate.estimate, 0.99)
+
+    def test_old_observations_fade_with_half_life(self):
+        rate = DecayedRate(prior=0.5, prior_strength=0, half_life=10)
+        for _ in range(100):
+            rate.update(True)
+        for _ in range(10):
+            rate.update(False)
+        self.assertAlmostEqual(rate.observed, 0.5, delta=0.05)
+        # Decayed weights cap the effective sample size well below the raw count
+        self.assertLess(rate.effective_sample_size, 30)
+
+    def test_seed_and_restore(self):
+        rate = DecayedRate(prior=0.2, prior_strength=5)
+        rate.seed(3, 12)
+        self.assertAlmostEqual(rate.observed, 0.25)
+        copy = DecayedRate(prior=0.2, prior_strength=5)
+        copy.restore(rate.to_tuple())
+        self.assertAlmostEqual(copy.estimate, rate.estimate)
+
+    def test_stats_book_uses_population_and_configured_priors(self):
+        stats = create_decayed_stats({'decayed_stats': {'priors': {'vpip': 0.3}, 'prior_strength': 4}})
+        self.assertEqual(stats.estimate('vpip'), 0.3)
+        self.assertEqual(stats.estimate('pfr'), POPULATION_PRIORS['pfr'])
+        stats.set_priors({'pfr': 0.1})
+        self.assertEqual(stats.estimate('pfr'), 0.1)
+        self.assertEqual(DecayedStats().effective_sample_size('never_used'), 0.0)
+
+
+class TestProfilesUseDecayedStats(unittest.TestCase):
+    def test_classification_no_longer_waits_for_twenty_hands(self):
+        tracker = OpponentTracker(logger_instance=QUIET)
+        for index in range(5):
+            tracker.log_action('nit', 'FOLD', 'preflop', position='UTG', hand_id=f'h{index}')
+        early = tracker.get_opponent_profile('nit')
+        # Classified from the shrunk estimates right away; the confidence tells callers how far to trust it
+        self.assertTrue(early.classify_player_type().startswith('tight'))
+        early_confidence, early_sample = early.get_type_confidence()
+        self.assertAlmostEqual(early_sample, 5.0, places=1)
+        self.assertEqual(_exploitable_player_type(early), 'unknown')
+        for index in range(5, 12):
+            tracker.log_action('nit', 'FOLD', 'preflop', position='UTG', hand_id=f'h{index}')
+        profile = tracker.get_opponent_profile('nit')
+        self.assertLess(profile.hands_seen_count, 20)
+        self.assertTrue(profile.classify_player_type().startswith('tight'))
+        self.assertGreater(profile.get_type_confidence()[0], early_confidence)
+        self.assertTrue(_exploitable_player_type(profile).startswith('tight'))
+        vpip, confidence = profile.get_stat_estimate('vpip')
+        self.assertGreater(vpip, 0.0)  # Shrunk towards the population, not a raw 0%
+        self.assertTrue(0.0 < confidence < 1.0)
+
+    def test_unseen_player_gets_the_population_type_with_no_confidence(self):
+        profile = OpponentProfile('stranger', logger_instance=QUIET)
+        self.assertNotEqual(profile.classify_player_type(), 'unknown_low_sample')
+        self.assertEqual(profile.get_type_confidence(), (0.0, 0.0))
+        self.assertEqual(_exploitable_player_type(profile), 'unknown')
+        self.assertEqual(_exploitable_player_type(None), 'unknown')
+
+    def test_restored_counters_seed_estimates(self):
+        profile = OpponentProfile('villain', logger_instance=QUIET)
+        profile.restore_aggregates({'counters': {'hands_seen': 50, 'preflop_opportunities': 50,
+                                                 'vpip_hands': 15, 'pfr_hands': 12}})
+        self.assertAlmostEqual(profile.get_stat_estimate('vpip')[0], (15 + 2.4) / 60)
+        self.assertEqual(profile.classify_player_type(), 'loose_aggressive')
+
+    def test_advanced_profile_counts_passive_actions(self):
+        profile = AdvancedProfile('villain')
+        self.assertAlmostEqual(profile.cbet_frequency, POPULATION_PRIORS['cbet'])
+        for _ in range(20):
+            profile.update_postflop_action('flop', 'check', 0, 1.0)
+        self.assertLess(profile.cbet_frequency, 0.25)
+        self.assertEqual(profile.get_betting_tendency('flop'), 'passive')
+        profile.update_fold_to_bet('flop', 'cbet', folded=False)
+        self.assertLess(profile.fold_to_cbet, POPULATION_PRIORS['fold_to_cbet'])
+
+
+if __name__ == '__main__':
+    unittest.main()
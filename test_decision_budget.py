@@ -0,0 +1,173 @@
+"""
+Tests for the per-decision latency budget and budgeted equity.
+"""
+
+import unittest
+import json
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_budget import (
+    DecisionBudget, StageCostEstimates, create_decision_budget,
+    DEGRADATION_NONE, DEGRADATION_REDUCED_TRIALS, DEGRADATION_CACHED_EQUITY, DEGRADATION_SKIPPED_STAGES
+)
+from equity_calculator import EquityCalculator
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDecisionBudget(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.budget = DecisionBudget(budget_ms=1000, reserve_ms=100, min_equity_trials=100, clock=self.clock)
+
+    def test_trials_fit_the_remaining_time(self):
+        self.assertEqual(self.budget.plan_trials(500, cost_per_trial_ms=1.0), 500)
+        self.assertEqual(self.budget.degradation_level, DEGRADATION_NONE)
+
+        self.clock.now += 0.6  # 400ms left, 300ms available after the reserve
+        self.assertEqual(self.budget.plan_trials(500, cost_per_trial_ms=1.0), 300)
+        self.assertEqual(self.budget.degradation_level, DEGRADATION_REDUCED_TRIALS)
+
+        self.clock.now += 0.25  # 50ms available: below the minimum run
+        self.assertEqual(self.budget.plan_trials(500, cost_per_trial_ms=1.0), 0)
+
+    def test_optional_stages_run_while_their_estimate_fits(self):
+        estimates = StageCostEstimates({'range': 5.0})
+        self.assertTrue(self.budget.try_stage('range', estimates.get('range')))
+        estimates.update('range', 15.0)
+        self.assertAlmostEqual(estimates.get('range'), 8.0)
+        self.clock.now += 0.895  # 5ms left, none available after the reserve
+        self.assertFalse(self.budget.try_stage('range', estimates.get('range')))
+        self.assertEqual(self.budget.degradation_level, DEGRADATION_SKIPPED_STAGES)
+        self.assertEqual(self.budget.degradation_reasons, ['range skipped'])
+
+    def test_stage_share_caps_trials_and_leaves_time_for_later_stages(self):
+        budget = DecisionBudget(budget_ms=1000, reserve_ms=100, stage_shares={'equity': 0.5}, clock=self.clock)
+        self.assertEqual(budget.plan_trials(800, cost_per_trial_ms=1.0), 500)
+        self.assertEqual(budget.degradation_level, DEGRADATION_REDUCED_TRIALS)
+        self.assertAlmostEqual(budget.stage_deadline('equity'), self.clock.now + 0.5)
+        with budget.stage('equity'):
+            self.clock.now += 0.4
+        self.assertAlmostEqual(budget.stage_allowance_ms('equity'), 100.0)
+        self.assertAlmostEqual(budget.stage_allowance_ms('opponent_profiles'), 500.0)  # No share: all that is available
+        deadline = budget.stage_deadline('equity')
+        self.clock.now += 0.05
+        self.assertFalse(budget.past(deadline))
+        self.clock.now += 0.05
+        self.assertTrue(budget.past(deadline))
+        self.assertTrue(budget.can_afford(300))
+
+    def test_stage_costs_and_summary(self):
+        with self.budget.stage('equity'):
+            self.clock.now += 0.25
+        self.budget.degrade(DEGRADATION_CACHED_EQUITY, 'test')
+        self.budget.degrade(DEGRADATION_REDUCED_TRIALS, 'milder')
+        summary = self.budget.summary()
+        self.assertAlmostEqual(summary['stage_costs_ms']['equity'], 250.0)
+        self.assertEqual(summary['degradation'], 'cached_equity')
+        self.assertTrue(summary['within_budget'])
+
+    def test_factory(self):
+        self.assertIsNone(create_decision_budget({'decision_budget': {'enabled': False}}))
+        budget = create_decision_budget({'decision_budget': {'budget_ms': 250}})
+        self.assertEqual(budget.budget_ms, 250)
+        self.assertEqual(budget.stage_shares, {'equity': 0.6})
+        budget = create_decision_budget({'decision_budget': {'stage_shares': {}}})
+        self.assertEqual(budget.stage_shares, {})
+
+
+class TestBudgetedEquity(unittest.TestCase):
+    def setUp(self):
+        self.calculator = EquityCalculator()
+        self.hand = [['A♠', 'A♥']]
+        self.board = ['K♦', '7♣', '2♠']
+
+    def test_exhausted_budget_uses_cached_equity(self):
+        full = self.calculator.calculate_equity_monte_carlo(self.hand, self.board, None, 300)
+        spent = DecisionBudget(budget_ms=0, reserve_ms=0)
+        result = self.calculator.calculate_equity_monte_carlo(self.hand, self.board, None, 300, budget=spent)
+        self.assertEqual(result, full)
+        self.assertEqual(spent.degradation_level, DEGRADATION_CACHED_EQUITY)
+
+    def test_exhausted_budget_without_cache_runs_minimum(self):
+        spent = DecisionBudget(budget_ms=0, reserve_ms=0, min_equity_trials=40)
+        win, _, equity = self.calculator.calculate_equity_monte_carlo(self.hand, self.board, None, 300, budget=spent)
+        self.assertGreater(equity, 0.5)
+        self.assertEqual(spent.degradation_level, DEGRADATION_REDUCED_TRIALS)
+        self.assertIn('equity', spent.stage_costs)
+
+
+class TestDefaultBudgetDecision(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(ROOT, 'config.json'), encoding='utf-8') as f:
+            settings = json.load(f)
+        settings['LOG_FILE_PATH'] = os.path.join(self.tmp.name, 'bot.log')
+        settings['opponent_store'] = {'enabled': False}
+        settings['stage_timing'] = dict(settings.get('stage_timing', {}), output_dir=self.tmp.name)
+        self.config_path = os.path.join(self.tmp.name, 'config.json')
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_default_config_decision_keeps_profile_stage(self):
+        from enhanced_poker_bot import EnhancedPokerBot
+        bot = EnhancedPokerBot(self.config_path)
+        try:
+            with open(os.path.join(ROOT, 'examples', 'flop_my_turn_raised.html'), encoding='utf-8') as f:
+                html = f.read()
+            budget = create_decision_budget(bot.config.settings)
+            game_analysis = bot._enhanced_game_analysis(bot._enhanced_parse_html(html, budget))
+            self.assertTrue(game_analysis['my_turn'])
+            self.assertIsNotNone(bot._make_enhanced_decision(game_analysis, budget))
+        finally:
+            bot.close_logger()
+        self.assertNotIn('opponent profiles skipped', budget.degradation_reasons)
+        self.assertIn('opponent_profiles', budget.stage_costs)
+        self.assertIn('range', budget.stage_costs)
+        # Equity stays within its share (deadline checks run every few dozen trials)
+        self.assertLess(budget.stage_costs['equity'], budget.budget_ms * budget.stage_shares['equity'] + 50)
+
+    def test_full_trial_request_when_time_allows(self):
+        from poker_bot import PokerBot, DEFAULT_EQUITY_TRIALS
+        self.assertEqual(DEFAULT_EQUITY_TRIALS, 5000)
+        with open(self.config_path, encoding='utf-8') as f:
+            settings = json.load(f)
+        settings['decision_budget'] = dict(settings.get('decision_budget', {}), budget_ms=60000)
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+        bot = PokerBot(self.config_path)
+        try:
+            requested = []
+            original = bot.equity_calculator.calculate_equity_monte_carlo
+
+            def spy(*args, **kwargs):
+                requested.append(kwargs['num_simulations'])
+                return original(*args, **kwargs)
+
+            bot.equity_calculator.calculate_equity_monte_carlo = spy
+            with open(os.path.join(ROOT, 'examples', 'flop_my_turn_raised.html'), encoding='utf-8') as f:
+                html = f.read()
+            bot.run_test_html(html)
+        finally:
+            bot.close_logger()
+        self.assertEqual(requested, [DEFAULT_EQUITY_TRIALS])
+        self.assertEqual(bot.last_decision_budget.degradation_level, DEGRADATION_NONE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for the shared headless decision core and the parallel scenario runner.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_core import DecisionCore, SeededEquityCalculator, get_decision_core
+from run_scenario_tests import discover_test_ids, run_scenarios
+from table_simulator import NLHETable, CallingStationAgent, TightAggressiveAgent
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class _RecordingAgent(CallingStationAgent):
+    def __init__(self):
+        self.states = []
+
+    def decide(self, game_state, player_index):
+        self.states.append((game_state, player_index))
+        return super().decide(game_state, player_index)
+
+
+def _states(count=6):
+    recorder = _RecordingAgent()
+    table = NLHETable([recorder, TightAggressiveAgent(), CallingStationAgent()], rng=random.Random(4))
+    while len(recorder.states) < count:
+        table.play_hand()
+    return recorder.states[:count]
+
+
+def _copy(state):
+    return dict(state, players=[dict(player) for player in state['players']])
+
+
+class TestDecisionCore(unittest.TestCase):
+    def test_decisions_are_reproducible_across_cores_and_order(self):
+        states = _states()
+        first = DecisionCore({'big_blind': 0.02, 'small_blind': 0.01})
+        second = DecisionCore({'big_blind': 0.02, 'small_blind': 0.01})
+        forward = [first.decision_engine.make_decision(_copy(s), i) for s, i in states]
+        backward = [second.decision_engine.make_decision(_copy(s), i) for s, i in reversed(states)]
+        self.assertEqual(forward, list(reversed(backward)))
+
+    def test_win_probability_is_seeded_memoised_and_leaves_random_alone(self):
+        calculator = SeededEquityCalculator(seed=7)
+        random.seed(99)
+        expected_next = random.Random(99).random()
+        first = calculator.calculate_win_probability(['A♠', 'K♠'], ['Q♠', '7♥', '2♦'], 1)
+        self.assertEqual(random.random(), expected_next)
+        self.assertEqual(SeededEquityCalculator(seed=7).calculate_win_probability(['A♠', 'K♠'], ['Q♠', '7♥', '2♦'], 1),
+                         first)
+        self.assertEqual(len(calculator._win_probabilities), 1)
+        calculator.calculate_win_probability(['A♠', 'K♠'], ['Q♠', '7♥', '2♦'], 1)
+        self.assertEqual(len(calculator._win_probabilities), 1)
+
+    def test_shared_core_is_built_once_and_reset(self):
+        core = get_decision_core({'big_blind': 0.04, 'small_blind': 0.02})
+        self.assertEqual(core.config['big_blind'], 0.04)
+        self.assertEqual(core.decision_engine.big_blind_amount, 0.04)
+        self.assertIn('strategy', core.config.settings)
+        core.decision_engine.table_control_manager.recent_actions.append('raise')
+        again = get_decision_core({'small_blind': 0.02, 'big_blind': 0.04})
+        self.assertIs(again, core)
+        self.assertEqual(again.decision_engine.table_control_manager.recent_actions, [])
+        self.assertIsNot(get_decision_core({'big_blind': 0.02, 'small_blind': 0.01}), core)
+
+
+class TestScenarioRunner(unittest.TestCase):
+    def test_parallel_run_matches_serial(self):
+        suite = [os.path.join(ROOT, 'test_scenarios', 'test_flop.py')]
+        ids = discover_test_ids(suite)
+        self.assertTrue(ids)
+        self.assertTrue(all(test_id.startswith('test_scenarios.test_flop.') for test_id in ids))
+        serial = run_scenarios(suite, workers=1)
+        parallel = run_scenarios(suite, workers=2)
+        self.assertEqual(serial['run'], len(ids))
+        self.assertEqual(parallel['run'], len(ids))
+        self.assertEqual([test_id for test_id, _ in serial['failures']],
+                         [test_id for test_id, _ in parallel['failures']])
+        self.assertEqual(serial['errors'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the sampling decision-cycle profiler and its folded-stack output.
+"""
+
+import unittest
+import tempfile
+import shutil
+import random
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_profiler import DecisionProfiler, create_decision_profiler
+
+
+def _busy_equity(duration):
+    end = time.perf_counter() + duration
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+def _decide(duration):
+    return _busy_equity(duration)
+
+
+class TestDecisionProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_sampled_cycle_records_stacks_below_anchor(self):
+        profiler = DecisionProfiler(sample_fraction=1.0, slow_threshold_ms=None, interval_ms=1)
+        try:
+            profiler.begin_cycle()
+            _decide(0.15)
+            self.assertEqual(profiler.end_cycle(), 'sampled')
+        finally:
+            profiler.close()
+
+        self.assertGreater(profiler.stats['samples'], 0)
+        stacks = list(profiler.folded)
+        self.assertTrue(any(stack.endswith('test_decision_profiler._decide;test_decision_profiler._busy_equity')
+                            for stack in stacks))
+        # Frames above the cycle's anchor (unittest, this test method) are not included
+        self.assertTrue(all(stack.startswith('decision_cycle;test_decision_profiler._decide') for stack in stacks))
+        self.assertEqual(profiler.top_frames(1)[0][0], 'test_decision_profiler._busy_equity')
+
+    def test_only_slow_unsampled_cycles_are_kept(self):
+        profiler = DecisionProfiler(sample_fraction=0.0, slow_threshold_ms=100, interval_ms=1,
+                                    rng=random.Random(1))
+        try:
+            profiler.begin_cycle()
+            _decide(0.01)
+            self.assertIsNone(profiler.end_cycle())
+            profiler.begin_cycle('slow_cycle')
+            _decide(0.15)
+            self.assertEqual(profiler.end_cycle(), 'slow')
+        finally:
+            profiler.close()
+
+        self.assertEqual(profiler.stats['cycles'], 2)
+        self.assertEqual(profiler.stats['kept'], 1)
+        self.assertEqual(profiler.kept_cycles[0]['label'], 'slow_cycle')
+        self.assertTrue(all(stack.startswith('slow_cycle;') for stack in profiler.folded))
+
+    def test_write_folded_file_and_factory(self):
+        self.assertIsNone(create_decision_profiler({}))
+        profiler = create_decision_profiler({'decision_profiler': {
+            'enabled': True, 'sample_fraction': 1.0, 'interval_ms': 1, 'output_dir': self.tmpdir}})
+        self.assertIsNone(profiler.write('empty'))
+        try:
+            profiler.begin_cycle()
+            _decide(0.1)
+            profiler.end_cycle()
+        finally:
+            profiler.close()
+
+        path = profiler.write('session1')
+        self.assertEqual(os.path.basename(path), 'decision_profile_session1.folded')
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('decision_cycle;'))
+            self.assertGreater(int(count), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests for replaying GameLogger decision logs through the current decision stack.
+"""
+
+import unittest
+import tempfile
+import shutil
+import csv
+import gzip
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_replay import iter_decision_files, reconstruct_spot, run_replay
+from game_logger import GameLogger
+from scenario_corpus import load_corpus
+
+
+def _log_corpus(directory, scenarios, wrong_every=0):
+    """Log corpus spots as GameLogger decisions; every wrong_every-th one with the opposite fold/continue."""
+    game_logger = GameLogger(directory, flush_interval=60.0, config={'hand_archive': {'enabled': False}})
+    try:
+        for index, scenario in enumerate(scenarios):
+            me = scenario.players[scenario.hero]
+            action = scenario.expected[0]
+            if wrong_every and index % wrong_every == 0:
+                action = 'call' if action == 'fold' else 'fold'
+            game_logger.log_decision({
+                'hand_id': f'h{index}', 'game_stage': scenario.street, 'hole_cards': me['cards'],
+                'community_cards': scenario.board, 'pot_size': scenario.pot, 'stack_size': me['stack'],
+                'bet_to_call': me['to_call'], 'win_probability': scenario.win_probability or 0.0,
+                'action': action, 'amount': me['to_call'] if action == 'call' else 0.0,
+                'opponent_count': len(scenario.players) - 1,
+            })
+        game_logger.log_decision({'hand_id': 'empty', 'action': 'fold'})  # No cards: skipped
+    finally:
+        game_logger.close()
+    return game_logger.decisions_csv_path
+
+
+class TestDecisionReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        # Heads-up spots with their golden action and a one-opponent rebuild that matches the original
+        self.scenarios = [s for s in load_corpus() if len(s.players) == 2 and s.expected[0] != 'raise'][:30]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_reconstructs_logged_context(self):
+        scenario = reconstruct_spot({
+            'game_stage': 'Flop', 'hole_cards': "['A♠', 'K♦']", 'community_cards': "['Q♠', '7♥', '2♦']",
+            'pot_size': '0.3', 'stack_size': '1.5', 'bet_to_call': '0.1', 'win_probability': '0.61',
+            'action_taken': 'BET', 'amount': '0.2', 'opponent_count': '2',
+        }, 'x:2', 0.02)
+        self.assertEqual(scenario.street, 'flop')
+        self.assertEqual(scenario.players[0]['cards'], ['A♠', 'K♦'])
+        self.assertEqual(scenario.players[0]['to_call'], 0.1)
+        self.assertEqual([p['bet'] for p in scenario.players[1:]], [0.1, 0.0])
+        self.assertEqual(scenario.win_probability, 0.61)
+        self.assertEqual(scenario.expected, ['raise'])
+        game_state, index = scenario.to_game_state()
+        self.assertEqual(len(game_state['players']), 3)
+        self.assertIsNone(reconstruct_spot({'hole_cards': '[]', 'action_taken': 'fold'}, 'x:3', 0.02))
+
+    def test_reports_changed_decisions_with_ev_impact(self):
+        _log_corpus(self.tmpdir, self.scenarios, wrong_every=5)
+        changes_dir = os.path.join(self.tmpdir, 'changes')
+        report = run_replay([self.tmpdir], workers=1, top=3, changes_dir=changes_dir)
+        self.assertEqual(report['files'], 1)
+        self.assertEqual(report['rows'], len(self.scenarios) + 1)
+        self.assertEqual(report['skipped'], 1)
+        self.assertEqual(report['replayed'], len(self.scenarios))
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['changed'], len(range(0, len(self.scenarios), 5)))
+        self.assertEqual(sum(report['transitions'].values()), report['changed'])
+        self.assertEqual(len(report['largest_changes']), 3)
+        deltas = [abs(change['ev_delta']) for change in report['largest_changes']]
+        self.assertEqual(deltas, sorted(deltas, reverse=True))
+        with open(os.path.join(changes_dir, os.listdir(changes_dir)[0]), newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), report['changed'] + report['resized'])
+        self.assertAlmostEqual(sum(float(row['ev_delta']) for row in rows), report['ev_delta'], places=4)
+
+    def test_parallel_over_files_matches_serial_and_reads_gzip(self):
+        path = _log_corpus(self.tmpdir, self.scenarios[:12], wrong_every=3)
+        with open(path, 'rb') as source, gzip.open(os.path.join(self.tmpdir, 'decisions_old.csv.gz'), 'wb') as target:
+            target.write(source.read())
+        self.assertEqual(len(list(iter_decision_files([self.tmpdir]))), 2)
+        serial = run_replay([self.tmpdir], workers=1)
+        parallel = run_replay([self.tmpdir], workers=2)
+        self.assertEqual(parallel['workers'], 2)
+        for key in ('files', 'rows', 'replayed', 'changed', 'resized', 'transitions', 'streets'):
+            self.assertEqual(serial[key], parallel[key], key)
+        self.assertAlmostEqual(serial['ev_delta'], parallel['ev_delta'], places=6)
+        self.assertEqual(serial['replayed'], 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
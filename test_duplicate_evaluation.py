@@ -0,0 +1,76 @@
+"""
+Tests for the duplicate-poker A/B evaluation harness.
+"""
+
+import unittest
+import json
+import tempfile
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from duplicate_evaluation import run_duplicate, parse_assignment, load_candidate, main
+from table_simulator import STREETS
+
+
+class TestDuplicateEvaluation(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_identical_configs_have_zero_difference(self):
+        result = run_duplicate('lag', 'lag', ['tag', 'lag', 'station'], 40, seed=3, chunk_deals=15)
+        summary = result.summary()
+        self.assertEqual(summary['deals'], 40)
+        self.assertEqual(summary['hands_per_config'], 160)
+        self.assertEqual(summary['difference']['bb_per_100'], 0.0)
+        self.assertFalse(summary['difference']['significant'])
+        self.assertEqual(summary['a']['bb_per_100'], summary['b']['bb_per_100'])
+        self.assertAlmostEqual(sum(summary['a']['by_street'].values()), summary['a']['bb_per_100'], places=6)
+        self.assertEqual(set(summary['a']['by_street']), set(STREETS))
+
+    def test_paired_difference_is_reproducible_and_tighter(self):
+        field = ['tag', 'lag', 'station', 'tag', 'lag']
+        serial = run_duplicate('tag', 'station', field, 120, seed=5, chunk_deals=40)
+        parallel = run_duplicate('tag', 'station', field, 120, workers=2, seed=5, chunk_deals=40)
+        self.assertEqual(serial.summary()['difference'], parallel.summary()['difference'])
+
+        summary = serial.summary()
+        low, high = summary['difference']['ci']
+        self.assertLess(low, summary['difference']['bb_per_100'])
+        self.assertGreater(high, summary['difference']['bb_per_100'])
+        self.assertGreater(summary['hands_reduction_factor'], 1.0)
+        self.assertIn('A - B', serial.report())
+
+    def test_engine_candidates_replay_identically(self):
+        same = ('decision_engine', {'settings': {'strategy': {'bluff_frequency': 0.5}}})
+        result = run_duplicate(same, same, ['tag', 'lag'], 4, seed=9)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.difference.total, 0.0)
+
+    def test_config_assignments_and_cli(self):
+        self.assertEqual(parse_assignment('strategy.bluff_frequency=0.3'), {'strategy': {'bluff_frequency': 0.3}})
+        self.assertEqual(parse_assignment('LOG_LEVEL=WARNING'), {'LOG_LEVEL': 'WARNING'})
+        with self.assertRaises(ValueError):
+            parse_assignment('strategy.bluff_frequency')
+
+        config_path = os.path.join(self.tmpdir, 'candidate.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({'strategy': {'bluff_frequency': 0.2, 'semi_bluff_frequency': 0.5}}, f)
+        kind, kwargs = load_candidate('decision_engine', config_path, ['strategy.bluff_frequency=0.4'])
+        self.assertEqual(kind, 'decision_engine')
+        self.assertEqual(kwargs['settings']['strategy'], {'bluff_frequency': 0.4, 'semi_bluff_frequency': 0.5})
+
+        output = os.path.join(self.tmpdir, 'summary.json')
+        self.assertEqual(main(['--engine', 'decision_engine', '--field', 'tag', '--deals', '2', '--workers', '1',
+                               '--set-b', 'strategy.bluff_frequency=0.1', '--json', output]), 0)
+        with open(output, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['deals'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the incrementally maintained EnhancedOpponentProfile statistics.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from enhanced_opponent_tracking import (
+    EnhancedOpponentProfile, ActionData, HandData, SlidingWindowCounts
+)
+
+
+def _action(action_type, street, amount=0.0, decision_time=0.0, stack_size=0.0):
+    return ActionData(action_type=action_type, amount=amount, street=street, position='BTN',
+                      pot_size_before=1.0, stack_size=stack_size, timestamp=0.0, hand_id='h',
+                      decision_time=decision_time)
+
+
+def _random_hand(rng, index):
+    actions = []
+    for street in ('preflop', 'flop', 'turn'):
+        if rng.random() < 0.2 and street != 'preflop':
+            break
+        actions.append(_action(rng.choice(['fold', 'call', 'raise', 'check', 'bet']), street))
+    return HandData(hand_id=str(index), position='BTN', starting_stack=1.0, ending_stack=1.0,
+                    actions=actions, went_to_showdown=rng.random() < 0.3, won_hand=rng.random() < 0.5)
+
+
+def _rescan(hands):
+    """The original full-history recomputation, used as the reference."""
+    preflop = [h for h in hands if any(a.street == 'preflop' for a in h.actions)]
+    vpip = sum(1 for h in preflop if any(a.action_type in ['call', 'raise'] for a in h.actions if a.street == 'preflop'))
+    pfr = sum(1 for h in preflop if any(a.action_type == 'raise' for a in h.actions if a.street == 'preflop'))
+    actions = [a for h in hands for a in h.actions]
+    aggressive = sum(1 for a in actions if a.action_type in ['bet', 'raise'])
+    passive = sum(1 for a in actions if a.action_type == 'call')
+    return vpip / len(preflop), pfr / len(preflop), (aggressive / passive if passive else aggressive)
+
+
+class TestSlidingWindowCounts(unittest.TestCase):
+    def test_window_and_lifetime_totals(self):
+        counts = SlidingWindowCounts(window=2)
+        for value in (1, 2, 3):
+            counts.add({'n': 1, 'x': value})
+        self.assertEqual(len(counts), 2)
+        self.assertEqual(counts.window_totals['x'], 5)
+        self.assertEqual(counts.lifetime_totals['x'], 6)
+        self.assertAlmostEqual(counts.ratio('x', 'n'), 2.5)
+        self.assertAlmostEqual(counts.ratio('x', 'n', lifetime=True), 2.0)
+        self.assertEqual(counts.ratio('x', 'missing'), 0.0)
+
+
+class TestIncrementalProfileStats(unittest.TestCase):
+    def test_matches_full_rescan_across_window_eviction(self):
+        rng = random.Random(7)
+        profile = EnhancedOpponentProfile('villain')
+        for index in range(EnhancedOpponentProfile.HAND_WINDOW + 75):
+            profile.add_hand_data(_random_hand(rng, index))
+            if index % 25 == 0 or index > EnhancedOpponentProfile.HAND_WINDOW:
+                vpip, pfr, af = _rescan(profile.hands_data)
+                self.assertAlmostEqual(profile.vpip, vpip)
+                self.assertAlmostEqual(profile.pfr, pfr)
+                self.assertAlmostEqual(profile.aggression_factor, af)
+
+        lifetime = profile.get_lifetime_stats()
+        self.assertEqual(lifetime['hands'], EnhancedOpponentProfile.HAND_WINDOW + 75)
+        self.assertAlmostEqual(profile.w_sd, profile.showdowns_won / profile.showdown_count)
+
+    def test_timing_stack_and_bet_size_averages(self):
+        profile = EnhancedOpponentProfile('villain')
+        for t in range(1, 41):
+            profile.add_action(_action('call', 'flop', decision_time=float(t), stack_size=float(t)))
+        # Only the last 30 decision times and 20 stack sizes count
+        self.assertAlmostEqual(profile.avg_decision_time, sum(range(11, 41)) / 30)
+        self.assertAlmostEqual(profile.slow_decisions, 30 / 30)
+        self.assertAlmostEqual(profile.avg_stack_size, sum(range(21, 41)) / 20)
+
+        for amount in (1.0, 2.0, 6.0):
+            profile.add_action(_action('bet', 'turn', amount=amount))
+        self.assertAlmostEqual(profile.avg_bet_size['turn'], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
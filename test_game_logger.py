@@ -0,0 +1,118 @@
+"""
+Tests for the queued GameLogger and its background writer.
+"""
+
+import unittest
+import tempfile
+import shutil
+import glob
+import csv
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game_logger import GameLogger, BackgroundWriter
+
+
+class TestGameLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_decisions_are_written_in_order_after_flush(self):
+        game_logger = GameLogger(self.tmpdir, flush_interval=60.0)
+        try:
+            for index in range(50):
+                decision = {'hand_id': f'h{index}', 'action': 'call', 'amount': 0.04, 'pot_size': 0.1,
+                            'ev_calculations': {'ev_call': 0.01}}
+                game_logger.log_decision(decision)
+                decision['action'] = 'mutated'  # Caller reuses its dict; the queued copy is unaffected
+            game_logger.log_performance('decision', 0.25, 'test')
+            self.assertTrue(game_logger.flush())
+
+            with open(game_logger.decisions_csv_path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([row['hand_id'] for row in rows], [f'h{index}' for index in range(50)])
+            self.assertEqual(rows[0]['ev_call'], '0.01')
+            with open(glob.glob(os.path.join(self.tmpdir, 'decisions_*.log'))[0], encoding='utf-8') as f:
+                text = f.read()
+            self.assertIn('DECISION ANALYSIS #50', text)
+            self.assertNotIn('mutated', text)
+            self.assertEqual(game_logger.writer.stats['errors'], 0)
+            # Many records share a batch instead of one file write each
+            self.assertLess(game_logger.writer.stats['batches'], game_logger.writer.stats['enqueued'])
+        finally:
+            game_logger.close()
+
+    def test_nested_payloads_are_copied_before_queueing(self):
+        game_logger = GameLogger(self.tmpdir, flush_interval=60.0)
+        release = threading.Event()
+        try:
+            # Hold the writer thread so formatting happens after the caller has mutated its data
+            game_logger.writer.submit(release.wait, 5.0)
+            decision = {'hand_id': 'h1', 'action': 'call', 'community_cards': ['As', 'Kd', '2c'],
+                        'ev_calculations': {'ev_call': 0.01}}
+            table = {'game_stage': 'Flop', 'community_cards': ['As', 'Kd', '2c']}
+            game_logger.log_decision(decision)
+            game_logger.log_game_state(table, [], {'seat': 3, 'cards': ['Qh', 'Qs']})
+            decision['community_cards'].append('9h')
+            decision['ev_calculations']['ev_call'] = 9.87
+            table['community_cards'].append('9h')
+            release.set()
+            self.assertTrue(game_logger.flush())
+
+            with open(glob.glob(os.path.join(self.tmpdir, 'decisions_*.log'))[0], encoding='utf-8') as f:
+                decisions_text = f.read()
+            with open(glob.glob(os.path.join(self.tmpdir, 'game_session_*.log'))[0], encoding='utf-8') as f:
+                main_text = f.read()
+            self.assertIn('EV Call: 0.01', decisions_text)
+            self.assertNotIn('9h', decisions_text)
+            self.assertNotIn('9h', main_text)
+        finally:
+            release.set()
+            game_logger.close()
+
+    def test_stats_count_every_record_across_threads(self):
+        writer = BackgroundWriter(flush_interval=60.0)
+        try:
+            path = os.path.join(self.tmpdir, 'rows.csv')
+            threads = [threading.Thread(target=lambda: [writer.write_row(path, [i]) for i in range(500)])
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertTrue(writer.flush())
+            self.assertEqual(writer.stats['enqueued'], 2000)
+            self.assertEqual(writer.stats['written'], 2000)
+        finally:
+            writer.close()
+
+    def test_close_drains_queue_and_stops_writer(self):
+        game_logger = GameLogger(self.tmpdir, flush_interval=60.0)
+        game_logger.log_new_hand('h1', 2.0)
+        game_logger.log_session_end()
+        game_logger.close()
+        self.assertFalse(game_logger.writer._thread.is_alive())
+        self.assertFalse(game_logger.writer.write_row(game_logger.performance_csv_path, ['late']))
+        with open(game_logger.performance_csv_path, newline='', encoding='utf-8') as f:
+            metrics = [row['metric_type'] for row in csv.DictReader(f)]
+        self.assertEqual(metrics, ['session_duration_seconds', 'total_hands', 'total_decisions'])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        writer = BackgroundWriter(flush_interval=60.0, max_queue=1)
+        try:
+            path = os.path.join(self.tmpdir, 'rows.csv')
+            results = [writer.write_row(path, [index]) for index in range(200)]
+            self.assertTrue(results[0])
+            self.assertEqual(writer.stats['dropped'], results.count(False))
+        finally:
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
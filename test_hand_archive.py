@@ -0,0 +1,134 @@
+"""
+Tests for the append-only columnar hand archive.
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hand_archive import HandArchive, HandArchiveWriter, import_csv, main
+from game_logger import GameLogger
+from performance_monitor import HandPerformance, PerformanceMonitor
+from performance_monitoring import PerformanceMetrics
+from session_performance_tracker import HandResult, SessionPerformanceTracker
+
+
+class TestHandArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.root = os.path.join(self.tmpdir, 'archive')
+        self.day_one = datetime(2026, 3, 1, 12, 0, 0)
+        writer = HandArchiveWriter(self.root, 's1', stake='0.02', row_group_size=10)
+        for index in range(40):
+            # Two days (row groups split at midnight), two stakes, hand ids in order of time
+            timestamp = self.day_one + timedelta(minutes=30 * index)
+            writer.append('decisions', {'timestamp': timestamp, 'hand_id': f'h{index:03d}',
+                                        'stake': '0.05' if index >= 34 else '', 'action': 'call',
+                                        'pot_size': index * 0.1, 'opponent_count': index % 3})
+        writer.close()
+        self.writer = writer
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_typed_columns_round_trip_across_date_partitions(self):
+        archive = HandArchive(self.root)
+        self.assertEqual(len(archive.partitions('decisions')), 2)
+        data = archive.read('decisions')
+        self.assertEqual(len(data['hand_id']), 40)
+        self.assertEqual(data['pot_size'].dtype, np.float64)
+        self.assertEqual(data['opponent_count'].dtype, np.int64)
+        self.assertAlmostEqual(data['pot_size'][7], 0.7)
+        self.assertEqual(list(data['stake'][:2]), ['0.02', '0.02'])
+        self.assertTrue(np.isnan(data['ev_call']).all())
+
+    def test_range_scans_prune_partitions_and_row_groups(self):
+        archive = HandArchive(self.root)
+        start = self.day_one + timedelta(minutes=30 * 25)
+        data = archive.read('decisions', start=start, end=start + timedelta(hours=1),
+                            columns=['hand_id', 'pot_size'])
+        self.assertEqual(list(data['hand_id']), ['h025', 'h026', 'h027'])
+        self.assertEqual(set(data), {'hand_id', 'pot_size'})
+        self.assertEqual(archive.stats['files'], 1)  # Day one's partition is never opened
+        self.assertEqual(archive.stats['row_groups_read'], 1)
+
+        archive = HandArchive(self.root)
+        self.assertEqual(len(archive.read('decisions', stake='0.05')['hand_id']), 6)
+        self.assertEqual(archive.stats['row_groups_read'], 1)
+        self.assertEqual(list(archive.read('decisions', hand_ids=['h004', 'h033'])['hand_id']), ['h004', 'h033'])
+        self.assertEqual(len(archive.read('decisions', sessions=['other'])['hand_id']), 0)
+
+    def test_appends_and_torn_tail(self):
+        writer = HandArchiveWriter(self.root, 's1', row_group_size=100)
+        writer.append('decisions', {'timestamp': self.day_one, 'hand_id': 'late'})
+        writer.close()
+        path = writer.path_for('decisions', '2026-03-01')
+        with open(path, 'ab') as f:
+            f.write(b'PKRG\x10\x00')  # Interrupted append
+        data = HandArchive(self.root).read('decisions', hand_ids=['late'])
+        self.assertEqual(list(data['hand_id']), ['late'])
+
+    def test_game_logger_and_csv_import_feed_the_archive(self):
+        logs = os.path.join(self.tmpdir, 'logs')
+        game_logger = GameLogger(logs)
+        game_logger.log_decision({'hand_id': 'g1', 'action': 'raise', 'amount': 0.06, 'stake': '0.02'})
+        game_logger.log_hand_result('g1', 2.0, 2.3, 'pair')
+        game_logger.log_performance('decision_time', 0.2)
+        game_logger.close()
+        archive = HandArchive(os.path.join(logs, 'hand_archive'))
+        self.assertEqual(list(archive.read('decisions', stake='0.02')['action']), ['raise'])
+        self.assertAlmostEqual(archive.read('hand_results')['profit_loss'][0], 0.3)
+        self.assertEqual(list(archive.read('performance')['metric_type']), ['decision_time'])
+
+        imported = os.path.join(self.tmpdir, 'imported')
+        self.assertEqual(import_csv(game_logger.decisions_csv_path, imported, stake='0.02'), 1)
+        self.assertEqual(list(HandArchive(imported).read('decisions')['action']), ['raise'])
+        self.assertEqual(main([game_logger.hands_csv_path, '--archive', imported]), 0)
+        self.assertEqual(len(HandArchive(imported).read('hand_results')['hand_id']), 1)
+
+    def test_performance_trackers_feed_the_archive(self):
+        root = os.path.join(self.tmpdir, 'trackers')
+        writer = HandArchiveWriter(root, 's2', stake='0.02')
+        tracker = SessionPerformanceTracker(os.path.join(self.tmpdir, 'session.json'), archive=writer)
+        tracker.start_new_session(2.0)
+        tracker.record_hand_result(HandResult('t1', starting_stack=2.0, ending_stack=2.4, position='BTN',
+                                              win_probability_estimates=[0.6, 0.8]))
+        tracker.record_decision('raise', {'hand_id': 't1', 'street': 'flop'}, 'won')
+        tracker.save_session_data()
+
+        metrics = PerformanceMetrics(os.path.join(self.tmpdir, 'metrics.json'), archive=writer)
+        metrics.record_hand_result('t2', {'winnings': -0.1, 'position': 'BB', 'improvements_used': ['ranges']})
+        metrics.save_session_data()
+
+        files_before = set(os.listdir('.'))
+        monitor = PerformanceMonitor(archive=writer)
+        monitor.record_hand_result(HandPerformance(
+            hand_id='t3', timestamp=self.day_one.timestamp(), starting_stack=2.0, ending_stack=1.5,
+            profit_loss=-0.5, position='SB', actions_taken=['call'], hand_strength='weak', win_probability_avg=0.3,
+            decision_quality_score=0.4, bluffs_attempted=0, bluffs_successful=0, pot_size=1.0, opponents_count=2))
+        monitor.save_performance_data()
+
+        archive = HandArchive(root)
+        hands = archive.read('session_hands')
+        self.assertEqual(list(hands['hand_id']), ['t1'])
+        self.assertAlmostEqual(hands['profit_loss'][0], 0.4)
+        self.assertAlmostEqual(hands['win_probability_avg'][0], 0.7)
+        self.assertEqual(list(archive.read('session_decisions', hand_ids=['t1'])['outcome']), ['won'])
+        improvement = archive.read('improvement_hands')
+        self.assertEqual((improvement['hand_id'][0], improvement['result'][0]), ('t2', -0.1))
+        self.assertEqual(list(archive.read('monitor_hands', start=self.day_one, end=self.day_one)['hand_id']), ['t3'])
+        summaries = archive.read('session_summaries', stake='0.02')
+        self.assertEqual(sorted(summaries['source']), ['performance_metrics', 'performance_monitor', 'session_tracker'])
+        # A monitor with an archive attached no longer drops performance_data_<time>.json files
+        self.assertEqual(set(os.listdir('.')), files_before)
+
+
+if __name__ == '__main__':
+    unittest.main()
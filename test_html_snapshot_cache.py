@@ -0,0 +1,73 @@
+"""
+Tests for the HTML snapshot diffing cache.
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from html_snapshot_cache import (
+    HtmlSnapshotCache, create_html_snapshot_cache,
+    SNAPSHOT_CHANGED, SNAPSHOT_IDENTICAL, SNAPSHOT_COSMETIC
+)
+
+SNAPSHOT = (
+    '<div class="table"><div class="hand-id">#123</div>'
+    '<span class="total-pot-amount">€0.15</span>'
+    '<div class="timeout-progress " style="animation: 15100ms linear 0s 1 normal none running x;"></div>'
+    '<div class="countdown-text">14</div></div>'
+)
+
+
+class TestHtmlSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = HtmlSnapshotCache()
+        self.parsed = {'table_data': {'hand_id': '123'}, 'error': None}
+
+    def _prime(self, html):
+        lookup = self.cache.lookup(html)
+        self.assertEqual(lookup.change, SNAPSHOT_CHANGED)
+        self.cache.store(lookup, self.parsed, {'marker': True})
+
+    def test_identical_snapshot_reuses_state(self):
+        self._prime(SNAPSHOT)
+        lookup = self.cache.lookup(SNAPSHOT)
+        self.assertEqual(lookup.change, SNAPSHOT_IDENTICAL)
+        self.assertTrue(lookup.is_reusable)
+        self.assertIs(lookup.parsed_state, self.parsed)
+        self.assertEqual(lookup.analysis, {'marker': True})
+
+    def test_timer_only_change_is_cosmetic(self):
+        self._prime(SNAPSHOT)
+        ticked = SNAPSHOT.replace('>14<', '>9<').replace('15100ms', '9100ms')
+        lookup = self.cache.lookup(ticked)
+        self.assertEqual(lookup.change, SNAPSHOT_COSMETIC)
+        self.assertTrue(lookup.is_reusable)
+        # The ticked snapshot is now an exact hit
+        self.assertEqual(self.cache.lookup(ticked).change, SNAPSHOT_IDENTICAL)
+
+    def test_game_change_is_detected(self):
+        self._prime(SNAPSHOT)
+        lookup = self.cache.lookup(SNAPSHOT.replace('€0.15', '€0.45'))
+        self.assertEqual(lookup.change, SNAPSHOT_CHANGED)
+        self.assertFalse(lookup.is_reusable)
+
+    def test_failed_parse_is_not_cached(self):
+        lookup = self.cache.lookup(SNAPSHOT)
+        self.cache.store(lookup, {'error': 'Empty or invalid HTML content received'})
+        self.assertEqual(self.cache.lookup(SNAPSHOT).change, SNAPSHOT_CHANGED)
+
+    def test_stats_and_factory(self):
+        cache = create_html_snapshot_cache({'snapshot_cache': {'volatile_attributes': []}})
+        self.assertEqual(cache.volatile_attributes, ())
+        self._prime(SNAPSHOT)
+        self.cache.lookup(SNAPSHOT)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['total'], 2)
+        self.assertAlmostEqual(stats['reuse_rate'], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the SQLite-backed opponent profile store.
+"""
+
+import unittest
+import json
+import logging
+import tempfile
+import shutil
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from opponent_profile_store import (
+    OpponentProfileStore, create_opponent_profile_store, SOURCE_BASIC, SOURCE_ENHANCED
+)
+from opponent_tracking import OpponentTracker
+from enhanced_opponent_tracking import EnhancedOpponentTracker, HandData, ActionData
+
+QUIET = logging.getLogger('test_opponent_profile_store')
+QUIET.setLevel(logging.CRITICAL)
+
+
+class TestOpponentProfileStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, 'profiles.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_round_trip_and_wal_mode(self):
+        store = OpponentProfileStore(self.db_path)
+        self.assertIsNone(store.load_profile(SOURCE_BASIC, 'villain'))
+        store.queue_profile(SOURCE_BASIC, 'villain', {
+            'counters': {'hands_seen': 12, 'vpip_hands': 4},
+            'street_stats': {'flop': {'BET_count': 3}},
+            'position_stats': {'BTN': {'vpip_hands': 2}},
+        })
+        self.assertEqual(store.flush(), 1)
+        mode = store._connection().execute('PRAGMA journal_mode').fetchone()[0]
+        self.assertEqual(mode.lower(), 'wal')
+        store.close()
+
+        reopened = OpponentProfileStore(self.db_path)
+        record = reopened.load_profile(SOURCE_BASIC, 'villain')
+        self.assertEqual(record['counters']['hands_seen'], 12)
+        self.assertEqual(record['street_stats']['flop']['BET_count'], 3)
+        self.assertEqual(record['position_stats']['BTN']['vpip_hands'], 2)
+        self.assertIsNone(reopened.load_profile(SOURCE_ENHANCED, 'villain'))
+        reopened.close()
+
+    def test_factory_is_opt_in_and_unused_store_stays_off_disk(self):
+        self.assertIsNone(create_opponent_profile_store({}))
+        store = create_opponent_profile_store({'opponent_store': {'enabled': True, 'db_path': self.db_path}})
+        store.close()
+        self.assertFalse(os.path.exists(self.db_path))
+
+    def test_basic_tracker_writes_at_hand_end_and_reloads(self):
+        store = OpponentProfileStore(self.db_path)
+        tracker = OpponentTracker(logger_instance=QUIET, profile_store=store)
+        tracker.log_action('villain', 'RAISE', 'preflop', position='CO', hand_id='h1')
+        tracker.log_action('villain', 'BET', 'flop', position='CO', hand_id='h1')
+        self.assertEqual(store.stats['flushes'], 0)  # Nothing written mid-hand
+
+        tracker.log_action('villain', 'CALL', 'preflop', position='BTN', hand_id='h2')
+        self.assertEqual(store.stats['flushes'], 1)
+        tracker.end_hand()
+        store.close()
+
+        store = OpponentProfileStore(self.db_path)
+        profile = OpponentTracker(logger_instance=QUIET, profile_store=store).get_opponent_profile('villain')
+        self.assertEqual(profile.preflop_opportunities, 2)
+        self.assertEqual(profile.preflop_pfr_actions, 1)
+        self.assertEqual(profile.hands_seen_count, 2)
+        self.assertEqual(profile.street_stats['flop']['BET_count'], 1)
+        store.close()
+
+    def test_enhanced_tracker_restores_stats(self):
+        store = OpponentProfileStore(self.db_path)
+        tracker = EnhancedOpponentTracker(logger_instance=QUIET, profile_store=store)
+        profile = tracker.get_or_create_opponent('villain')
+        for index in range(12):
+            action = ActionData('raise' if index % 3 == 0 else 'call', 1.0, 'preflop', 'BTN', 1.0, 10.0, 0.0, str(index))
+            profile.add_hand_data(HandData(str(index), 'BTN', 10.0, 10.0, [action]))
+        tracker._dirty_profiles.add('villain')
+        tracker.end_hand()
+        store.close()
+
+        store = OpponentProfileStore(self.db_path)
+        restored = EnhancedOpponentTracker(logger_instance=QUIET, profile_store=store).get_or_create_opponent('villain')
+        self.assertEqual(restored.total_hands_observed, 12)
+        self.assertAlmostEqual(restored.vpip, profile.vpip)
+        self.assertAlmostEqual(restored.pfr, profile.pfr)
+        self.assertEqual(restored.playing_style, profile.playing_style)
+        store.close()
+
+    def test_only_the_live_loop_opens_the_shipped_store(self):
+        from poker_bot import PokerBot
+        root = os.path.dirname(os.path.abspath(__file__))
+        with open(os.path.join(root, 'config.json'), encoding='utf-8') as f:
+            settings = json.load(f)
+        self.assertTrue(settings['opponent_store']['db_path'].startswith('logs/'))
+        settings['LOG_FILE_PATH'] = os.path.join(self.tmpdir, 'bot.log')
+        settings['opponent_store']['db_path'] = self.db_path
+        settings['stage_timing'] = dict(settings.get('stage_timing', {}), output_dir=self.tmpdir)
+        config_path = os.path.join(self.tmpdir, 'config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+        bot = PokerBot(config_path)
+        try:
+            self.assertIsNone(bot.opponent_store)
+            self.assertIsNone(bot.opponent_tracker.profile_store)
+            store = bot.open_opponent_store()
+            self.assertEqual(store.db_path, self.db_path)
+            self.assertIs(bot.opponent_tracker.profile_store, store)
+        finally:
+            bot.close_opponent_store()
+            bot.close_logger()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for the incrementally maintained rolling windows in PerformanceMonitor.
+"""
+
+import unittest
+import random
+import statistics
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from performance_monitor import PerformanceMonitor, HandPerformance, RollingWindow, RunningMoments
+
+
+def _hand(index, rng):
+    actions = rng.choice([['fold'], ['call'], ['raise', 'bet'], ['call', 'call'], ['check']])
+    return HandPerformance(
+        hand_id=f'h{index}', timestamp=float(index), starting_stack=10.0, ending_stack=10.0,
+        profit_loss=round(rng.uniform(-3, 3), 2), position='BTN', actions_taken=actions,
+        hand_strength='medium', win_probability_avg=0.5, decision_quality_score=rng.random(),
+        bluffs_attempted=rng.randint(0, 1), bluffs_successful=0, pot_size=rng.uniform(0, 5), opponents_count=2,
+    )
+
+
+class TestRollingWindows(unittest.TestCase):
+    def test_running_moments_add_and_remove(self):
+        moments = RunningMoments()
+        for value in (1.0, 2.0, 4.0, 8.0):
+            moments.add(value)
+        moments.remove(1.0)
+        self.assertAlmostEqual(moments.mean, statistics.mean([2.0, 4.0, 8.0]))
+        self.assertAlmostEqual(moments.variance, statistics.variance([2.0, 4.0, 8.0]))
+        for value in (2.0, 4.0, 8.0):
+            moments.remove(value)
+        self.assertEqual((moments.count, moments.mean, moments.variance), (0, 0.0, 0.0))
+
+    def test_window_matches_recomputation_after_evictions(self):
+        rng = random.Random(3)
+        window = RollingWindow(25)
+        hands = [_hand(index, rng) for index in range(300)]
+        for hand in hands:
+            window.add(hand)
+        last = hands[-25:]
+        profits = [hand.profit_loss for hand in last]
+        self.assertEqual(len(window), 25)
+        self.assertAlmostEqual(window.total_profit, sum(profits))
+        self.assertAlmostEqual(window.win_rate, sum(1 for p in profits if p > 0) / 25)
+        self.assertEqual(window.biggest_win, max(profits))
+        self.assertEqual(window.biggest_loss, min(profits))
+        self.assertAlmostEqual(window.profit.stdev, statistics.stdev(profits))
+        self.assertAlmostEqual(window.decision_quality.mean, statistics.mean(h.decision_quality_score for h in last))
+        self.assertAlmostEqual(window.rate('pfr'), sum(1 for h in last if 'raise' in h.actions_taken) / 25)
+
+    def test_monitor_metrics_and_trends(self):
+        rng = random.Random(7)
+        monitor = PerformanceMonitor()
+        hands = [_hand(index, rng) for index in range(600)]
+        for hand in hands:
+            monitor.record_hand_result(hand)
+        metrics = monitor.get_current_metrics()
+        last = hands[-500:]
+        self.assertEqual(metrics.hands_played, 500)
+        self.assertAlmostEqual(metrics.total_profit, sum(h.profit_loss for h in last))
+        self.assertAlmostEqual(metrics.avg_pot_size, statistics.mean(h.pot_size for h in last))
+        self.assertEqual(metrics.bluff_attempts, sum(h.bluffs_attempted for h in last))
+        passive = sum(h.actions_taken.count('call') for h in last)
+        aggressive = sum(h.actions_taken.count('raise') + h.actions_taken.count('bet') for h in last)
+        self.assertAlmostEqual(metrics.aggression_factor, aggressive / passive)
+
+        trends = monitor.get_performance_trends()
+        self.assertEqual(trends['short_term']['hands'], 20)
+        self.assertAlmostEqual(trends['short_term']['profit'], sum(h.profit_loss for h in hands[-20:]))
+        self.assertIn(trends['analysis']['overall_trend'], ('positive', 'negative'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the offline population prior job and the priors lookup.
+"""
+
+import unittest
+import tempfile
+import shutil
+import csv
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from population_priors import PopulationPriorJob, PopulationPriors, main
+from opponent_profile_store import OpponentProfileStore, SOURCE_BASIC, SOURCE_ENHANCED
+from decayed_stats import create_decayed_stats
+from fixed_opponent_integration import FixedOpponentIntegration
+
+
+def _record(opportunities, vpip, pfr, street_stats=None, position_stats=None):
+    return {
+        'counters': {'hands_seen': opportunities, 'preflop_opportunities': opportunities,
+                     'vpip_hands': vpip, 'pfr_hands': pfr},
+        'street_stats': street_stats or {},
+        'position_stats': position_stats or {},
+    }
+
+
+class TestPopulationPriors(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, 'profiles.db')
+        self.output = os.path.join(self.tmpdir, 'priors.json')
+        store = OpponentProfileStore(self.db_path)
+        for index in range(10):
+            vpip = 10 + 4 * index  # 10..46 of 100
+            store.queue_profile(SOURCE_BASIC, f'p{index}', _record(100, vpip, vpip // 2, street_stats={
+                'flop': {'BET_count': 3, 'CALL_count': 7, 'total_actions_on_street': 10,
+                         'faced_cbet_opportunities': 10, 'fold_to_cbet_count': 4},
+            }))
+        # Same player from the enhanced tracker is counted once (basic is preferred)
+        store.queue_profile(SOURCE_ENHANCED, 'p0', _record(100, 90, 90, position_stats={
+            'BTN': {'total_actions': 20, 'raise': 8, 'fold': 6},
+        }))
+        store.close()
+        self.csv_path = os.path.join(self.tmpdir, 'decisions_1.csv')
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['timestamp', 'hand_id', 'game_stage', 'pot_size', 'bet_to_call'])
+            writer.writerow(['t', 'h1', 'Flop', '0.30', '0.10'])
+            writer.writerow(['t', 'h2', 'Flop', '0.20', '0'])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_job_streams_sources_into_lookup(self):
+        job = PopulationPriorJob('0.02')
+        job.add_profile_store(self.db_path)
+        job.add_decisions_csv(self.csv_path)
+        job.write(self.output)
+
+        priors = PopulationPriors.load(self.output)
+        self.assertEqual(priors.stake, '0.02')
+        self.assertAlmostEqual(priors.mean('vpip'), sum(10 + 4 * i for i in range(10)) / 1000.0)
+        vpip = priors.entry('vpip')
+        self.assertEqual(vpip['players'], 10)
+        self.assertGreater(vpip['strength'], 2.0)
+        self.assertAlmostEqual(priors.mean('fold_to_cbet', street='flop'), 0.4)
+        # Position entries come from the enhanced tracker; missing ones fall back to broader entries
+        self.assertAlmostEqual(priors.mean('aggression_frequency', position='BTN'), 0.4)
+        self.assertAlmostEqual(priors.mean('aggression_frequency', position='UTG', street='flop'), 0.3)
+        self.assertAlmostEqual(priors.mean('facing_bet', street='flop'), 0.5)
+        self.assertAlmostEqual(priors.mean('bet_to_pot', street='flop'), 0.5)
+        self.assertAlmostEqual(sum(priors.type_shares().values()), 1.0, places=3)
+
+    def test_stakes_merge_and_missing_file_is_empty(self):
+        empty = PopulationPriors.load(os.path.join(self.tmpdir, 'missing.json'))
+        self.assertFalse(empty)
+        self.assertEqual(empty.mean('vpip', 0.25), 0.25)
+
+        self.assertEqual(main(['--stake', '0.02', '--store', self.db_path, '--output', self.output]), 0)
+        self.assertEqual(main(['--stake', '0.05', '--decisions', os.path.join(self.tmpdir, 'decisions_*.csv'),
+                               '--output', self.output]), 0)
+        priors = PopulationPriors.load(self.output, stake='0.05')
+        self.assertEqual(set(priors.stakes), {'0.02', '0.05'})
+        self.assertIsNone(priors.mean('vpip'))
+
+    def test_consumers_use_loaded_priors(self):
+        job = PopulationPriorJob('0.02')
+        job.add_profile_store(self.db_path)
+        job.write(self.output)
+        priors = PopulationPriors.load(self.output)
+
+        stats = create_decayed_stats({}, priors)
+        self.assertAlmostEqual(stats.estimate('vpip'), priors.mean('vpip'))
+        self.assertEqual(stats.rate('vpip').prior_strength, priors.entry('vpip')['strength'])
+
+        analysis = FixedOpponentIntegration(priors).get_enhanced_opponent_analysis(None, 2)
+        self.assertAlmostEqual(analysis['avg_vpip'], priors.mean('vpip') * 100)
+        self.assertAlmostEqual(analysis['fold_equity_estimate'], 0.4)
+        self.assertEqual(len(analysis['opponent_types']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
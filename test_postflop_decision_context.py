@@ -0,0 +1,85 @@
+"""
+Tests for the compute-once postflop decision context.
+"""
+
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from postflop.decision_context import PostflopDecisionContext
+from enhanced_hand_classification import classify_hand_strength_enhanced
+from enhanced_spr_strategy import get_spr_strategy_recommendation
+
+
+def _make_context(**overrides):
+    params = dict(numerical_hand_rank=2, win_probability=0.62, street='flop', spr=4.0,
+                  position='BTN', community_cards=['Ah', '7h', '2c'], pot_size=0.3,
+                  bet_to_call=0.1, my_stack=2.0, hand_description='One Pair, Aces')
+    params.update(overrides)
+    return PostflopDecisionContext(**params)
+
+
+class TestPostflopDecisionContext(unittest.TestCase):
+    def test_feature_computed_once(self):
+        context = _make_context()
+        calls = []
+        for _ in range(3):
+            value = context.get_feature('probe', lambda: calls.append(1) or 'value')
+        self.assertEqual(value, 'value')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(context.feature_hits['probe'], 2)
+
+    def test_distinct_keys_are_computed_separately(self):
+        context = _make_context()
+        first = context.get_feature('texture', lambda: 'dry', {'cards': ['Ah']})
+        second = context.get_feature('texture', lambda: 'wet', {'cards': ['Kd']})
+        self.assertEqual((first, second), ('dry', 'wet'))
+        self.assertEqual(context.features_used, ['texture'])
+
+    def test_failures_are_not_memoised(self):
+        context = _make_context()
+
+        def boom():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            context.get_feature('fragile', boom)
+        self.assertEqual(context.get_feature('fragile', lambda: 1), 1)
+
+    def test_standard_features_are_shared_with_helpers(self):
+        context = _make_context()
+        strength, _ = context.hand_classification
+        strategy = context.spr_strategy
+
+        # Helpers called with the same inputs reuse the context's results
+        again, _ = classify_hand_strength_enhanced(2, 0.62, 'flop', context.board_texture, decision_context=context)
+        self.assertEqual(again, strength)
+        self.assertIs(get_spr_strategy_recommendation(4.0, strength, 'flop', 'BTN', 1, context.board_texture,
+                                                      decision_context=context), strategy)
+        self.assertEqual(context.feature_hits['hand_classification'], 2)
+
+        report = context.get_usage_report()
+        self.assertIn('board_analysis', report['features_used'])
+        self.assertNotIn('opponent_analysis', report['features_used'])
+        self.assertGreaterEqual(report['total_compute_ms'], 0.0)
+
+    def test_make_postflop_decision_exposes_context(self):
+        from postflop_decision_logic import make_postflop_decision
+        engine = SimpleNamespace(config=None)
+        action, _ = make_postflop_decision(
+            decision_engine_instance=engine, numerical_hand_rank=2, hand_description='One Pair',
+            bet_to_call=0, can_check=True, pot_size=0.3, my_stack=2.0, win_probability=0.62,
+            pot_odds_to_call=0, game_stage='flop', spr=6.7, action_fold_const='fold',
+            action_check_const='check', action_call_const='call', action_raise_const='raise',
+            my_player_data={'position': 'BTN', 'name': 'hero'}, big_blind_amount=0.02,
+            base_aggression_factor=1.0, max_bet_on_table=0, community_cards=['Ah', '7h', '2c']
+        )
+        self.assertIn(action, ('check', 'raise'))
+        self.assertIn('hand_classification', engine.last_postflop_context.features_used)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for the Bayesian combo-weight range estimator.
+"""
+
+import unittest
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from range_estimation import (
+    RangeEstimator, create_range_estimator, build_likelihood_tables, board_strength, card_indices,
+    sample_combos, opponent_type_group, COMBOS, NUM_COMBOS, DECK_STRINGS, TABLE_SHAPE
+)
+from action_log import ActionLog
+from equity_calculator import EquityCalculator
+
+
+def _combo_weight(weights, first, second):
+    a, b = sorted(card_indices([first, second]))
+    index = np.flatnonzero((COMBOS[:, 0] == a) & (COMBOS[:, 1] == b))[0]
+    return weights[index]
+
+
+class TestRangeEstimator(unittest.TestCase):
+    def test_tables_and_combos(self):
+        self.assertEqual(NUM_COMBOS, 1326)
+        tables = build_likelihood_tables()
+        self.assertEqual(tables.shape, TABLE_SHAPE)
+        self.assertTrue((tables > 0).all())
+        self.assertEqual(opponent_type_group('whale'), 'loose_passive')
+        self.assertEqual(opponent_type_group('unknown_low_sample'), 'unknown')
+
+    def test_early_raise_narrows_towards_strong_hands(self):
+        estimator = RangeEstimator()
+        weights = estimator.observe('villain', 'raise', 'preflop', position='UTG', amount=0.06, pot_size_before=0.03)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertGreater(_combo_weight(weights, 'As', 'Ah'), 20 * _combo_weight(weights, '7s', '2h'))
+        self.assertLess(estimator.range_width('villain'), 0.3)
+        self.assertEqual(estimator.describe('villain'), 'tight_strong')
+        self.assertEqual(estimator.describe('nobody'), 'unknown')
+
+    def test_board_blocks_combos_and_feeds_fold_equity(self):
+        estimator = RangeEstimator()
+        estimator.observe('villain', 'call', 'preflop', position='BTN', amount=0.06, pot_size_before=0.09)
+        estimator.set_board(['Ah', 'Kd', '7c'])
+        weights = estimator.weights('villain')
+        self.assertEqual(_combo_weight(weights, 'Ah', 'As'), 0.0)
+        before = estimator.fold_equity('villain', 0.3, 0.3)
+        estimator.observe('villain', 'raise', 'flop', position='BTN', amount=0.9, pot_size_before=0.6)
+        self.assertLess(estimator.fold_equity('villain', 0.3, 0.3), before)
+        self.assertEqual(estimator.stats['board_builds'], 1)
+
+        strength = board_strength(card_indices(['Ah', 'Kd', '7c']))
+        self.assertGreater(_combo_weight(strength, '7s', '7h'), _combo_weight(strength, 'As', 'Qs'))
+        self.assertGreater(_combo_weight(strength, 'As', 'Qs'), _combo_weight(strength, '9s', '8s'))
+
+    def test_action_log_view_resets_on_new_hand(self):
+        log = ActionLog()
+        estimator = create_range_estimator({}, type_lookup=lambda name: 'tight_aggressive')
+        log.subscribe(estimator.on_logged_action)
+        log.append('villain', 'raise', 'preflop', position='CO', amount=0.06, pot_size_before=0.03, hand_id='h1')
+        self.assertIsNotNone(estimator.weights_for(['villain', 'other']))
+        log.append('other', 'call', 'preflop', position='BB', amount=0.06, pot_size_before=0.09, hand_id='h1')
+        self.assertIsNone(estimator.weights_for(['villain', 'other']))
+        log.append('other', 'fold', 'preflop', position='BB', hand_id='h2')
+        self.assertIsNone(estimator.weights('villain'))
+        self.assertIsNone(create_range_estimator({'range_estimation': {'enabled': False}}))
+
+    def test_type_confidence_blends_towards_the_unknown_range(self):
+        def width_after_open(opponent_type):
+            estimator = RangeEstimator()
+            estimator.new_hand('h1')
+            estimator.observe('villain', 'raise', 'preflop', position='UTG', amount=0.06, pot_size_before=0.03,
+                              opponent_type=opponent_type)
+            return estimator.range_width('villain')
+
+        tight, unknown = width_after_open('tight_aggressive'), width_after_open('unknown')
+        self.assertLess(tight, unknown)
+        self.assertAlmostEqual(width_after_open(('tight_aggressive', 1.0)), tight)
+        self.assertAlmostEqual(width_after_open(('tight_aggressive', 0.0)), unknown)
+        self.assertTrue(tight < width_after_open(('tight_aggressive', 0.5)) < unknown)
+
+    def test_ranges_from_another_hand_are_not_returned(self):
+        estimator = RangeEstimator()
+        estimator.new_hand('h1')
+        estimator.observe('villain', 'raise', 'preflop', position='UTG', amount=0.06, pot_size_before=0.03)
+        self.assertIsNotNone(estimator.weights_for(['villain'], hand_id='h1'))
+        self.assertIsNone(estimator.weights_for(['villain'], hand_id='h2'))
+
+    def test_first_equity_of_a_new_hand_ignores_the_previous_range(self):
+        import json
+        import tempfile
+        from poker_bot import PokerBot
+        root = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(root, 'config.json'), encoding='utf-8') as f:
+                settings = json.load(f)
+            settings['LOG_FILE_PATH'] = os.path.join(tmp, 'bot.log')
+            settings['opponent_store'] = {'enabled': False}
+            settings['stage_timing'] = dict(settings.get('stage_timing', {}), output_dir=tmp)
+            config_path = os.path.join(tmp, 'config.json')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(settings, f)
+            bot = PokerBot(config_path)
+            try:
+                # Narrow one opponent's range in the previous hand
+                bot.action_log.append('qwer37912', 'raise', 'preflop', position='UTG', amount=0.06,
+                                      pot_size_before=0.03, hand_id='previous-hand')
+                self.assertIsNotNone(bot.range_estimator.weights('qwer37912'))
+                seen = []
+                original = bot.equity_calculator.calculate_equity_monte_carlo
+
+                def spy(*args, **kwargs):
+                    seen.append(kwargs.get('opponent_weights'))
+                    return original(*args, **kwargs)
+
+                bot.equity_calculator.calculate_equity_monte_carlo = spy
+                with open(os.path.join(root, 'examples', 'flop_my_turn_raised.html'), encoding='utf-8') as f:
+                    self.assertIsNotNone(bot._process_new_snapshot(f.read()))
+            finally:
+                bot.close_logger()
+        self.assertTrue(seen)
+        self.assertIsNone(seen[0])
+        self.assertEqual(bot.range_estimator.hand_id, bot.table_data['hand_id'])
+
+    def test_equity_against_a_narrowed_range(self):
+        self.assertEqual(sample_combos(np.zeros(NUM_COMBOS), 5), [])
+        weights = np.zeros(NUM_COMBOS)
+        a, b = card_indices(['As', 'Ah'])
+        weights[(COMBOS[:, 0] == a) & (COMBOS[:, 1] == b)] = 1.0
+        drawn = sample_combos(weights, 3, rng=np.random.default_rng(1))
+        self.assertEqual(drawn, [(DECK_STRINGS[a], DECK_STRINGS[b])] * 3)
+
+        calculator = EquityCalculator()
+        _, _, equity = calculator.calculate_equity_monte_carlo(
+            [['K♠', 'K♥']], ['2♦', '7♣', '9♥'], None, 200, opponent_weights=weights)
+        self.assertLess(equity, 0.25)
+        self.assertEqual(len(calculator._equity_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
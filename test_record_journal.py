@@ -0,0 +1,105 @@
+"""
+Tests for the append-only record journal and the trackers persisted through it.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from record_journal import RecordJournal, SNAPSHOT_FORMAT
+from performance_monitoring import PerformanceMetrics
+from session_performance_tracker import SessionPerformanceTracker, HandResult
+
+
+def _fold_total(state, record):
+    state['total'] += record['value']
+    return state
+
+
+class TestRecordJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'state.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_snapshot_plus_tail_and_torn_line(self):
+        journal = RecordJournal(self.path, compact_every=3)
+        state = journal.load({'total': 0}, _fold_total)
+        for value in (1, 2, 3):
+            journal.append([{'value': value}])
+            state = _fold_total(state, {'value': value})
+        self.assertTrue(journal.should_compact)
+        journal.compact(state)
+        self.assertEqual(os.path.getsize(journal.journal_path), 0)
+        journal.append([{'value': 10}])
+        with open(journal.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 5, "rec')  # Crash mid-append
+
+        reopened = RecordJournal(self.path)
+        self.assertEqual(reopened.load({'total': 0}, _fold_total), {'total': 16})
+        self.assertEqual(reopened.stats['replayed'], 1)  # Only the tail is replayed
+        reopened.append([{'value': 100}])
+        self.assertEqual(RecordJournal(self.path).load({'total': 0}, _fold_total), {'total': 116})
+
+    def test_records_covered_by_snapshot_are_not_replayed_twice(self):
+        journal = RecordJournal(self.path)
+        journal.load({'total': 0}, _fold_total)
+        journal.append([{'value': 5}, {'value': 7}])
+        # Snapshot written but the journal was not truncated (crash in between)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'format': SNAPSHOT_FORMAT, 'sequence': 2, 'state': {'total': 12}}, f)
+        self.assertEqual(RecordJournal(self.path).load({'total': 0}, _fold_total), {'total': 12})
+
+
+class TestJournaledTrackers(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_performance_metrics_saves_only_new_hands(self):
+        path = os.path.join(self.tmpdir, 'performance_data.json')
+        with open(path, 'w') as f:
+            json.dump([{'session_id': 'old', 'start_time': '2026-01-01T00:00:00', 'hands_played': 3,
+                        'total_winnings': 1.5, 'decisions': []}], f)
+        metrics = PerformanceMetrics(path, compact_every=4)
+        self.assertEqual(metrics.historical_data[0]['session_id'], 'old')
+        metrics.record_hand_result('h1', {'winnings': 0.5})
+        metrics.save_session_data()
+        metrics.record_hand_result('h2', {'winnings': -0.2})
+        metrics.save_session_data()
+        self.assertEqual(metrics.journal.stats['appended'], 5)  # header, h1, end, h2, end
+        self.assertEqual(metrics.journal.stats['compactions'], 1)
+
+        history = PerformanceMetrics(path).historical_data
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history, metrics.historical_data)
+        self.assertEqual(history[1]['hands_played'], 2)
+        self.assertAlmostEqual(history[1]['total_winnings'], 0.3)
+
+    def test_session_tracker_restores_session_summaries(self):
+        path = os.path.join(self.tmpdir, 'session_performance.json')
+        tracker = SessionPerformanceTracker(path)
+        tracker.start_new_session(10.0)
+        tracker.record_hand_result(HandResult('h1', starting_stack=10.0, ending_stack=10.4))
+        tracker.save_session_data()
+        tracker.record_hand_result(HandResult('h2', starting_stack=10.4, ending_stack=10.1))
+        tracker.save_session_data()
+
+        restored = SessionPerformanceTracker(path)
+        self.assertEqual(len(restored.stored_sessions), 1)
+        summary = restored.stored_sessions[0]
+        self.assertEqual(summary['hands_played_count'], 2)
+        self.assertAlmostEqual(summary['session_profit'], 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for the serialised scenario corpus and DecisionEngine.decide_batch.
+"""
+
+import unittest
+import copy
+import json
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from decision_core import get_decision_core
+from scenario_corpus import DEFAULT_CORPUS_PATH, Scenario, check_corpus, load_corpus, save_corpus
+
+
+def _scenario():
+    return Scenario.from_record({
+        'id': 'example#0', 'street': 'flop', 'blinds': [0.01, 0.02], 'pot': 0.2, 'board': ['Ah', '7s', '2c'],
+        'hero': 1,
+        'players': [{'name': 'Villain', 'pos': 'BB', 'stack': 0.9, 'bet': 0.1},
+                    {'name': 'Hero', 'pos': 'BTN', 'stack': 1.0, 'bet': 0.0, 'cards': ['As', 'Kd'], 'to_call': 0.1},
+                    {'name': 'Folder', 'pos': 'SB', 'stack': 0.99, 'bet': 0.0, 'active': False}],
+        'history': [['Villain', 'BET', 0.1, 'flop']],
+        'expect': ['call', 'raise'],
+    })
+
+
+class TestScenarioRecords(unittest.TestCase):
+    def test_game_state_shape(self):
+        game_state, index = _scenario().to_game_state()
+        self.assertEqual(index, 1)
+        hero = game_state['players'][1]
+        self.assertTrue(hero['is_my_player'] and hero['has_turn'])
+        self.assertEqual(hero['hand'], ['As', 'Kd'])
+        self.assertEqual(hero['bet_to_call'], 0.1)
+        self.assertFalse(game_state['players'][2]['is_active'])
+        self.assertEqual(game_state['players'][0]['cards'], [])
+        self.assertEqual(game_state['min_raise'], 0.04)
+        self.assertEqual(game_state['action_history'][0]['action_type'], 'BET')
+        self.assertEqual(game_state['action_history'][0]['position'], 'BB')
+
+    def test_record_and_game_state_round_trip(self):
+        scenario = _scenario()
+        self.assertEqual(Scenario.from_record(json.loads(json.dumps(scenario.to_record()))), scenario)
+        game_state, index = scenario.to_game_state()
+        again = Scenario.from_game_state(game_state, index, scenario.id, scenario.expected)
+        self.assertEqual(again.to_game_state(), (game_state, index))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'corpus.jsonl')
+            save_corpus([scenario, scenario], path)
+            self.assertEqual(load_corpus(path), [scenario, scenario])
+
+
+class TestDecideBatch(unittest.TestCase):
+    def test_quiet_batch_only_raises_decision_loggers(self):
+        engine = get_decision_core().decision_engine
+        before = {name: logging.getLogger(name).level for name in ('decision_engine', 'postflop_decision_logic')}
+        seen = []
+
+        class _Spy(logging.Handler):
+            def emit(self, record):
+                seen.append((record.name, record.levelno))
+
+        spy = _Spy()
+        logging.getLogger().addHandler(spy)
+        root_level = logging.getLogger().level
+        logging.getLogger().setLevel(logging.DEBUG)
+        other = logging.getLogger('test_scenario_corpus.other')
+
+        def decide(game_state, player_index, budget=None):
+            other.info("another thread's record")
+            return original(game_state, player_index, budget)
+
+        original, engine.make_decision = engine.make_decision, decide
+        try:
+            engine.decide_batch(load_corpus()[:5])
+        finally:
+            del engine.make_decision
+            logging.getLogger().removeHandler(spy)
+            logging.getLogger().setLevel(root_level)
+        self.assertEqual(logging.root.manager.disable, logging.NOTSET)
+        self.assertEqual(seen.count(('test_scenario_corpus.other', logging.INFO)), 5)
+        self.assertFalse([record for record in seen if record[0] == 'decision_engine' and record[1] < logging.WARNING])
+        self.assertEqual({name: logging.getLogger(name).level for name in before}, before)
+
+    def test_batch_matches_single_decisions_and_leaves_inputs_alone(self):
+        scenarios = load_corpus()[:20] + [_scenario()]
+        states = [scenario.to_game_state() for scenario in scenarios]
+        untouched = copy.deepcopy(states)
+        engine = get_decision_core().decision_engine
+        batch = engine.decide_batch(states)
+        self.assertEqual(states, untouched)
+        single = [get_decision_core().decision_engine.make_decision(copy.deepcopy(state), index)
+                  for state, index in states]
+        self.assertEqual(batch, single)
+
+    def test_committed_corpus_sweep_passes(self):
+        scenarios = load_corpus(DEFAULT_CORPUS_PATH)
+        self.assertGreater(len(scenarios), 100)
+        self.assertTrue(all(scenario.expected for scenario in scenarios))
+        summary = check_corpus(scenarios)
+        self.assertEqual(summary['spots'], len(scenarios))
+        self.assertEqual(summary['mismatches'], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
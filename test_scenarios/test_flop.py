@@ -5,7 +5,7 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from poker_bot import PokerBot
+from decision_core import get_decision_core
 from decision_engine import ACTION_CALL, ACTION_RAISE, ACTION_CHECK, ACTION_FOLD
 from hand_evaluator import HandEvaluator
 
@@ -15,7 +15,7 @@ class TestFlopScenarios(unittest.TestCase):
             'big_blind': 0.02,
             'small_blind': 0.01,
         }
-        self.bot = PokerBot(config=self.config) # Pass config object
+        self.bot = get_decision_core(self.config) # Shared headless decision core with seeded equity
         self.hand_evaluator = HandEvaluator()
 
     def tearDown(self):
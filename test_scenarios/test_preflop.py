@@ -5,7 +5,7 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from poker_bot import PokerBot
+from decision_core import get_decision_core
 from decision_engine import ACTION_CALL, ACTION_RAISE, ACTION_CHECK, ACTION_FOLD # Removed ACTION_BET
 from hand_evaluator import HandEvaluator # Ensure HandEvaluator is imported
 
@@ -17,9 +17,9 @@ class TestPreFlopScenarios(unittest.TestCase):
             'small_blind': 0.01,
             # Add other necessary config items if your bot uses them
         }
-        # PokerBot now takes config and initializes DecisionEngine with HandEvaluator
-        self.bot = PokerBot(config=self.config) 
-        # HandEvaluator is now initialized within PokerBot and passed to DecisionEngine.
+        # The decision core initializes DecisionEngine with HandEvaluator and these config overrides
+        self.bot = get_decision_core(self.config) # Shared headless decision core with seeded equity
+        # HandEvaluator is initialized within the decision core and passed to DecisionEngine.
         # We still need an instance for _create_mock_my_player_data if it uses preflop strength directly.
         self.hand_evaluator = self.bot.hand_evaluator # Use the bot's hand_evaluator instance
 
@@ -2,7 +2,7 @@ import unittest
 import logging
 import os
 import sys
-from poker_bot import PokerBot
+from decision_core import get_decision_core
 from decision_engine import ACTION_CALL, ACTION_RAISE, ACTION_CHECK, ACTION_FOLD
 from hand_evaluator import HandEvaluator
 
@@ -19,7 +19,7 @@ class TestAdditionalRiverScenarios(unittest.TestCase):
             'big_blind': 0.02,
             'small_blind': 0.01,
         }
-        self.bot = PokerBot(config=self.config)
+        self.bot = get_decision_core(self.config) # Shared headless decision core with seeded equity
         self.hand_evaluator = HandEvaluator()
 
     def tearDown(self):
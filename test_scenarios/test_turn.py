@@ -5,7 +5,7 @@ import os
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from poker_bot import PokerBot
+from decision_core import get_decision_core
 from decision_engine import ACTION_CALL, ACTION_RAISE, ACTION_CHECK, ACTION_FOLD 
 from hand_evaluator import HandEvaluator
 
@@ -17,12 +17,7 @@ class TestTurnScenarios(unittest.TestCase):
             'small_blind': 0.01,
             # Add other necessary config parameters if PokerBot or DecisionEngine expects them
         }
-        # Initialize PokerBot with individual config values if it does not take a config dict
-        self.bot = PokerBot(config=self.config) # Pass config object
-        # If DecisionEngine is not created by PokerBot or needs specific setup for tests:
-        # from decision_engine import DecisionEngine # Ensure DecisionEngine is imported
-        # self.decision_engine_instance = DecisionEngine(hand_evaluator=HandEvaluator(), config=self.config)
-        # self.bot.decision_engine = self.decision_engine_instance
+        self.bot = get_decision_core(self.config) # Shared headless decision core with seeded equity
         self.hand_evaluator = HandEvaluator() # Initialize HandEvaluator
 
     def tearDown(self):
@@ -0,0 +1,149 @@
+"""
+Tests for the offline snapshot replay pipeline.
+"""
+
+import unittest
+import json
+import shutil
+import sys
+import os
+import tarfile
+import tempfile
+import zipfile
+from unittest.mock import Mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import snapshot_replay
+from snapshot_replay import ColumnarDecisionWriter, iter_snapshots, load_decisions, summarize_latencies
+from stage_timing import LatencyHistogram
+
+
+class TestSnapshotSources(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snap_dir = os.path.join(self.tmp.name, 'snaps')
+        os.makedirs(os.path.join(self.snap_dir, 'b'))
+        for rel in ('a.html', os.path.join('b', 'c.htm'), 'notes.txt'):
+            with open(os.path.join(self.snap_dir, rel), 'w', encoding='utf-8') as f:
+                f.write(f'<div>{rel}</div>')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_directory_yields_paths_only(self):
+        items = list(iter_snapshots(self.snap_dir))
+        self.assertEqual([os.path.basename(name) for name, _ in items], ['a.html', 'c.htm'])
+        self.assertTrue(all(html is None for _, html in items))
+
+    def test_archives_yield_contents(self):
+        zip_path = os.path.join(self.tmp.name, 'snaps.zip')
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr('x/one.html', '<div>1</div>')
+            archive.writestr('readme.md', 'skip')
+        tar_path = os.path.join(self.tmp.name, 'snaps.tar.gz')
+        with tarfile.open(tar_path, 'w:gz') as archive:
+            archive.add(os.path.join(self.snap_dir, 'a.html'), arcname='a.html')
+
+        self.assertEqual(list(iter_snapshots(zip_path)), [('x/one.html', '<div>1</div>')])
+        self.assertEqual(list(iter_snapshots(tar_path)), [('a.html', '<div>a.html</div>')])
+
+    def test_missing_source_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            list(iter_snapshots(os.path.join(self.tmp.name, 'missing')))
+
+
+class TestReplayRecords(unittest.TestCase):
+    def test_replay_snapshot_records_stages(self):
+        bot = Mock()
+
+        def fake_run(html, source, stage_timings):
+            stage_timings.update({'parse': 0.002, 'analyze': 0.001, 'decide': 0.003})
+            return 'raise', 0.06
+
+        bot.run_test_html.side_effect = fake_run
+        bot.get_my_player.return_value = {'has_turn': True}
+        bot.table_data = {'hand_id': '42', 'game_stage': 'Flop'}
+        bot.last_run_error = None
+        snapshot_replay._worker_bot = bot
+        try:
+            record = snapshot_replay._replay_snapshot(('snap.html', '<html></html>'))
+        finally:
+            snapshot_replay._worker_bot = None
+
+        self.assertEqual(record['action'], 'raise')
+        self.assertTrue(record['has_turn'])
+        self.assertAlmostEqual(record['decide_ms'], 3.0)
+        self.assertIsNone(record['error'])
+
+    def test_failed_snapshot_counts_as_error(self):
+        root = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(root, 'config.json'), encoding='utf-8') as f:
+                settings = json.load(f)
+            settings['LOG_FILE_PATH'] = os.path.join(tmp, 'replay.log')
+            config_path = os.path.join(tmp, 'config.json')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(settings, f)
+            snaps = os.path.join(tmp, 'snaps')
+            os.makedirs(snaps)
+            shutil.copy(os.path.join(root, 'examples', 'flop_my_turn_check.html'), snaps)
+            with open(os.path.join(snaps, 'broken.html'), 'w', encoding='utf-8') as f:
+                f.write('<html><body><p>truncated')
+            try:
+                summary = snapshot_replay.run_replay(snaps, os.path.join(tmp, 'out.npz'), workers=1,
+                                                     config_path=config_path)
+            finally:
+                snapshot_replay._worker_bot.close_logger()
+                snapshot_replay._worker_bot = None
+            self.assertEqual(summary['snapshots'], 2)
+            self.assertEqual(summary['errors'], 1)
+            data = load_decisions(os.path.join(tmp, 'out.npz'))
+            errors = dict(zip([os.path.basename(name) for name in data['source']], data['error']))
+            self.assertTrue(errors['broken.html'])
+            self.assertEqual(errors['flop_my_turn_check.html'], '')
+
+    def test_columnar_writer_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out', 'decisions.npz')
+            writer = ColumnarDecisionWriter(path)
+            writer.append({'source': 'a.html', 'action': 'call', 'amount': 0.04, 'has_turn': True, 'decide_ms': 1.5})
+            writer.append({'source': 'b.html', 'action': 'fold', 'amount': 0, 'has_turn': False})
+            writer.close()
+            data = load_decisions(path)
+            self.assertEqual(list(data['action']), ['call', 'fold'])
+            self.assertTrue(np.isnan(data['decide_ms'][1]))
+            self.assertEqual(data['has_turn'].dtype, bool)
+
+    def test_writer_flushes_fixed_size_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'decisions.npz')
+            stale = os.path.join(tmp, 'decisions-00007.npz')
+            np.savez_compressed(stale, source=np.array(['old.html']))
+            writer = ColumnarDecisionWriter(path, shard_rows=2)
+            for index in range(5):
+                writer.append({'source': f'{index}.html', 'amount': index})
+                # Only the rows of the shard being filled are buffered
+                self.assertLessEqual(len(writer.columns['source']), 1)
+            shards = writer.close()
+            self.assertEqual([os.path.basename(shard) for shard in shards],
+                             ['decisions-00000.npz', 'decisions-00001.npz', 'decisions-00002.npz'])
+            self.assertFalse(os.path.exists(stale))
+            data = load_decisions(path)
+            self.assertEqual(list(data['source']), [f'{index}.html' for index in range(5)])
+            self.assertEqual(list(data['amount']), [0.0, 1.0, 2.0, 3.0, 4.0])
+
+    def test_latency_summary(self):
+        parse, decide = LatencyHistogram(), LatencyHistogram()
+        for value in (1.0, 2.0, 3.0):
+            parse.record(value)
+        summary = summarize_latencies({'parse': parse, 'decide': decide})
+        self.assertEqual(summary['parse']['count'], 3)
+        self.assertAlmostEqual(summary['parse']['p50_ms'], 2.0, delta=0.05)
+        self.assertNotIn('decide', summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
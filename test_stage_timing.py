@@ -0,0 +1,93 @@
+"""
+Tests for stage timing and the HDR-style latency histograms.
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stage_timing import LatencyHistogram, StageTimer, timed, get_stage_timer, configure_stage_timer
+from postflop.decision_context import PostflopDecisionContext
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):  # 1..1000 ms
+            histogram.record(float(value))
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 * 0.02)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=990 * 0.02)
+        self.assertEqual(histogram.percentile(100), 1000.0)
+        self.assertAlmostEqual(histogram.mean_ms, 500.5)
+
+        small = LatencyHistogram()
+        small.record(0.05)  # Sub-millisecond values keep microsecond resolution
+        self.assertAlmostEqual(small.percentile(50), 0.05, places=3)
+        small.merge(histogram)
+        self.assertEqual(small.count, 1001)
+        self.assertEqual(small.max_ms, 1000.0)
+
+
+class TestStageTimer(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_stages_are_recorded_and_exported(self):
+        clock = FakeClock()
+        timer = StageTimer(output_dir=self.tmpdir, clock=clock)
+        for cost in (0.002, 0.004, 0.010):
+            with timer.stage('equity'):
+                clock.now += cost
+        summary = timer.export('s1')
+        self.assertEqual(summary['equity']['count'], 3)
+        self.assertAlmostEqual(summary['equity']['max_ms'], 10.0)
+        with open(os.path.join(self.tmpdir, 'stage_timings_s1.json')) as f:
+            self.assertEqual(json.load(f)['stages']['equity']['count'], 3)
+        self.assertIn('equity', timer.report())
+
+    def test_disabled_timer_records_nothing(self):
+        timer = StageTimer(enabled=False)
+        with timer.stage('parse'):
+            pass
+        timer.record('parse', 1.0)
+        self.assertEqual(timer.histograms, {})
+        self.assertEqual(timer.export(), {})
+
+    def test_decorator_and_postflop_features_feed_global_timer(self):
+        timer = configure_stage_timer({'stage_timing': {'enabled': True}})
+        timer.reset()
+
+        @timed('helper')
+        def helper(value):
+            return value * 2
+
+        self.assertEqual(helper(2), 4)
+        context = PostflopDecisionContext(numerical_hand_rank=2, win_probability=0.5, street='flop',
+                                          community_cards=['Ah', '7d', '2c'])
+        context.get_feature('board_texture', lambda: 'dry')
+        context.get_feature('board_texture', lambda: 'dry')  # Memo hit, not timed again
+        self.assertEqual(timer.histograms['helper'].count, 1)
+        self.assertEqual(timer.histograms['postflop.board_texture'].count, 1)
+        self.assertIs(get_stage_timer(), timer)
+        timer.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests that offline use of the bots starts without the UI stack or unused enhancement modules.
+"""
+
+import unittest
+import json
+import subprocess
+import tempfile
+import shutil
+import sys
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+
+UI_MODULES = ['pyautogui', 'pyperclip', 'ui_controller']
+ENHANCEMENT_MODULES = ['adaptive_timing_controller', 'enhanced_action_detection', 'advanced_decision_engine',
+                       'enhanced_opponent_tracking', 'performance_monitor', 'session_performance_tracker',
+                       'enhanced_opponent_analysis']
+DEFERRED_MODULES = ['bs4', 'html_parser', 'range_estimation', 'numpy', 'postflop_decision_logic']
+
+
+def _loaded_modules(code, cwd):
+    """Run code in a fresh interpreter and return which of the watched modules it loaded."""
+    watched = UI_MODULES + ENHANCEMENT_MODULES + DEFERRED_MODULES
+    script = (f"import sys, json; sys.path.insert(0, {ROOT!r})\n{code}\n"
+              f"print(json.dumps([m for m in {watched!r} if m in sys.modules]))")
+    completed = subprocess.run([sys.executable, '-c', script], cwd=cwd, capture_output=True, text=True, timeout=120)
+    if completed.returncode != 0:
+        raise AssertionError(completed.stderr)
+    return set(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+
+class TestStartupImports(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        with open(os.path.join(ROOT, 'config.json'), encoding='utf-8') as f:
+            settings = json.load(f)
+        settings['LOG_FILE_PATH'] = os.path.join(self.tmpdir, 'poker_bot.log')
+        settings['LOG_LEVEL'] = 'WARNING'
+        self.config_path = os.path.join(self.tmpdir, 'config.json')
+        with open(self.config_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_importing_bots_loads_nothing_deferred(self):
+        self.assertEqual(_loaded_modules("import poker_bot, enhanced_poker_bot", self.tmpdir), set())
+
+    def test_constructing_bots_skips_ui_and_enhancements(self):
+        loaded = _loaded_modules(f"from enhanced_poker_bot import EnhancedPokerBot\n"
+                                 f"bot = EnhancedPokerBot({self.config_path!r})\n"
+                                 f"assert bot.decision_engine is not None", self.tmpdir)
+        self.assertEqual(loaded, set())
+
+    def test_offline_test_file_never_touches_the_display(self):
+        example = os.path.join(ROOT, 'examples', 'flop_my_turn_check.html')
+        loaded = _loaded_modules(f"from poker_bot import PokerBot\n"
+                                 f"bot = PokerBot({self.config_path!r})\n"
+                                 f"bot.run_test_file({example!r})", self.tmpdir)
+        self.assertIn('html_parser', loaded)
+        self.assertTrue(loaded.isdisjoint(UI_MODULES + ENHANCEMENT_MODULES))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the incrementally maintained table dynamics and its version number.
+"""
+
+import unittest
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from table_dynamics import TableDynamicsCache
+from opponent_tracking import OpponentTracker
+from enhanced_opponent_tracking import EnhancedOpponentTracker, HandData, ActionData
+from fixed_opponent_integration import get_fixed_opponent_analysis
+from enhanced_opponent_analysis import get_enhanced_opponent_analysis
+
+QUIET = logging.getLogger('test_table_dynamics')
+QUIET.setLevel(logging.CRITICAL)
+
+
+def _play_hands(tracker, player_name, count, action='CALL'):
+    for index in range(count):
+        tracker.log_action(player_name, action, 'preflop', position='BTN', hand_id=f'{player_name}-{index}')
+
+
+class TestTableDynamicsCache(unittest.TestCase):
+    def test_only_dirty_profiles_are_resummarised(self):
+        profiles = {'a': 10.0, 'b': 30.0}
+        calls = []
+
+        def summarize(value):
+            calls.append(value)
+            return (value,)
+
+        cache = TableDynamicsCache(profiles, ('vpip',), summarize)
+        cache.invalidate()
+        self.assertEqual(cache.averages(), {'vpip': 20.0})
+        self.assertEqual(len(calls), 2)
+
+        profiles['b'] = 50.0
+        cache.mark_dirty('b')
+        self.assertEqual(cache.averages(), {'vpip': 30.0})
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(cache.averages(), {'vpip': 30.0})
+        self.assertEqual(len(calls), 3)
+
+        del profiles['a']
+        cache.mark_dirty('a')
+        self.assertEqual(cache.count, 1)
+
+    def test_memo_follows_version(self):
+        cache = TableDynamicsCache({}, ('vpip',), lambda p: None)
+        computed = []
+        for _ in range(3):
+            cache.memo('key', lambda: computed.append(1) or len(computed))
+        self.assertEqual(len(computed), 1)
+        cache.mark_dirty('someone')
+        self.assertEqual(cache.memo('key', lambda: 'fresh'), 'fresh')
+
+
+class TestTrackerTableDynamics(unittest.TestCase):
+    def test_basic_tracker_matches_full_recompute(self):
+        tracker = OpponentTracker(logger_instance=QUIET)
+        _play_hands(tracker, 'loose', 12, 'CALL')
+        _play_hands(tracker, 'tight', 12, 'FOLD')
+        _play_hands(tracker, 'new', 3, 'RAISE')
+
+        dynamics = tracker.get_table_dynamics()
+        relevant = [p for p in tracker.opponents.values() if p.hands_seen_count >= 10]
+        self.assertEqual(dynamics['sample_size'], len(relevant))
+        self.assertAlmostEqual(dynamics['avg_vpip'], sum(p.get_vpip() for p in relevant) / len(relevant))
+
+        version = tracker.dynamics_version
+        tracker.get_table_dynamics()
+        self.assertEqual(tracker.dynamics_version, version)
+        tracker.log_action('tight', 'RAISE', 'preflop', hand_id='tight-extra')
+        self.assertGreater(tracker.dynamics_version, version)
+
+    def test_direct_profile_updates_invalidate(self):
+        tracker = EnhancedOpponentTracker(logger_instance=QUIET)
+        profile = tracker.get_or_create_opponent('villain')
+        self.assertEqual(tracker.get_table_dynamics()['table_style'], 'unknown')
+        for index in range(6):
+            action = ActionData('call', 1.0, 'preflop', 'BTN', 1.0, 10.0, 0.0, str(index))
+            profile.add_hand_data(HandData(str(index), 'BTN', 10.0, 10.0, [action]))
+        dynamics = tracker.get_table_dynamics()
+        self.assertEqual(dynamics['active_opponents'], 1)
+        self.assertAlmostEqual(dynamics['average_vpip'], profile.vpip)
+
+    def test_analyses_are_reused_until_a_profile_changes(self):
+        tracker = OpponentTracker(logger_instance=QUIET)
+        _play_hands(tracker, 'villain', 12)
+        first = get_enhanced_opponent_analysis(opponent_tracker=tracker, active_opponents_count=2)
+        first['table_type'] = 'mutated'
+        hits = tracker.table_dynamics.stats['memo_hits']
+        second = get_enhanced_opponent_analysis(opponent_tracker=tracker, active_opponents_count=2)
+        self.assertEqual(tracker.table_dynamics.stats['memo_hits'], hits + 1)
+        self.assertNotEqual(second['table_type'], 'mutated')
+        self.assertEqual(second['tracked_count'], 1)
+
+        fixed = get_fixed_opponent_analysis(tracker, 2)
+        fixed['table_type'] = 'mutated'
+        self.assertNotEqual(get_fixed_opponent_analysis(tracker, 2)['table_type'], 'mutated')
+
+
+if __name__ == '__main__':
+    unittest.main()
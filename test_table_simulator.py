@@ -0,0 +1,135 @@
+"""
+Tests for the headless NLHE table simulator.
+"""
+
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from table_simulator import (Agent, NLHETable, CallingStationAgent, TightAggressiveAgent, evaluate_cards,
+                             hand_category, parse_cards, distribute_pots, position_names, monte_carlo_equity,
+                             run_simulation, run_parallel, FULL_HOUSE, STRAIGHT, TWO_PAIR)
+
+
+def _score(cards):
+    return evaluate_cards(parse_cards(cards))
+
+
+class _ShoveAgent(Agent):
+    name = 'shove'
+
+    def decide(self, game_state, player_index):
+        return 'all_in', 0
+
+
+class _RecordingAgent(CallingStationAgent):
+    name = 'recorder'
+
+    def __init__(self):
+        self.states = []
+
+    def decide(self, game_state, player_index):
+        self.states.append((game_state, player_index))
+        return super().decide(game_state, player_index)
+
+
+class TestHandEvaluation(unittest.TestCase):
+    def test_category_ordering_and_kickers(self):
+        royal = _score(['As', 'Ks', 'Qs', 'Js', 'Ts', '2d', '3c'])
+        quads = _score(['9s', '9h', '9d', '9c', 'Ks', '2d', '3c'])
+        boat = _score(['9s', '9h', '9d', 'Kc', 'Ks', 'Kd', '3c'])
+        flush = _score(['2s', '7s', '9s', 'Js', 'Ks', 'Ad', 'Ac'])
+        wheel = _score(['As', '2d', '3c', '4h', '5s', 'Kd', 'Qc'])
+        six_high = _score(['6s', '2d', '3c', '4h', '5s', 'Kd', 'Qc'])
+        self.assertGreater(royal, quads)
+        self.assertGreater(quads, boat)
+        self.assertGreater(boat, flush)
+        self.assertGreater(six_high, wheel)
+        self.assertEqual(hand_category(boat), FULL_HOUSE)
+        self.assertEqual(hand_category(wheel), STRAIGHT)
+
+        two_pair_ace = _score(['Ks', 'Kd', '7c', '7h', '2s', '2d', 'Ac'])
+        two_pair_queen = _score(['Ks', 'Kd', '7c', '7h', '2s', '2d', 'Qc'])
+        self.assertEqual(hand_category(two_pair_ace), TWO_PAIR)
+        self.assertGreater(two_pair_ace, two_pair_queen)
+        self.assertEqual(_score(['Ah', 'Kh', '2c', '7d', '9s']), _score(['Ac', 'Kd', '2h', '7s', '9c']))
+
+    def test_equity_is_seeded_and_ordered(self):
+        aces = parse_cards(['As', 'Ah'])
+        low = parse_cards(['7c', '2d'])
+        self.assertEqual(monte_carlo_equity(aces, [], 1, 200, random.Random(3)),
+                         monte_carlo_equity(aces, [], 1, 200, random.Random(3)))
+        self.assertGreater(monte_carlo_equity(aces, [], 1, 400, random.Random(1)),
+                           monte_carlo_equity(low, [], 1, 400, random.Random(1)) + 0.3)
+
+
+class TestTable(unittest.TestCase):
+    def test_side_pots_and_odd_chips(self):
+        # Short stack has the best hand: wins the main pot, second best takes the side pot
+        self.assertEqual(distribute_pots([10, 30, 30], [0, 1, 2], {0: 3, 1: 2, 2: 1}, button=2), [30, 40, 0])
+        # Ties split each pot among the eligible winners
+        self.assertEqual(distribute_pots([10, 30, 30], [0, 1, 2], {0: 1, 1: 2, 2: 2}, button=2), [0, 35, 35])
+        # The odd chip goes to the first winner left of the button; folded money stays in the pot
+        self.assertEqual(distribute_pots([1, 1, 1], [1, 2], {1: 5, 2: 5}, button=1), [0, 1, 2])
+
+    def test_all_in_hands_conserve_chips(self):
+        table = NLHETable([_ShoveAgent(), _ShoveAgent(), _ShoveAgent()], starting_stack_bb=[10, 30, 60],
+                          rng=random.Random(7))
+        for _ in range(200):
+            result = table.play_hand()
+            self.assertAlmostEqual(sum(result.net), 0.0, places=6)
+            self.assertTrue(result.showdown)
+            self.assertEqual(len(result.board), 5)
+            for seat, stack_bb in enumerate([10, 30, 60]):
+                # Nobody loses more than the deepest opponent can cover
+                covered = min(stack_bb, max(s for i, s in enumerate([10, 30, 60]) if i != seat))
+                self.assertGreaterEqual(result.net[seat], -covered * 0.02 - 1e-9)
+
+    def test_agents_see_parser_shaped_state(self):
+        recorder = _RecordingAgent()
+        table = NLHETable([recorder, TightAggressiveAgent(), CallingStationAgent()], rng=random.Random(2))
+        table.play_hand()
+        state, index = recorder.states[0]
+        me = state['players'][index]
+        self.assertEqual(len(me['hand']), 2)
+        self.assertTrue(me['has_turn'] and me['is_my_player'])
+        self.assertIn('bet_to_call', me)
+        for i, player in enumerate(state['players']):
+            if i != index:
+                self.assertEqual(player['hand'], [])
+        self.assertEqual(state['current_round'], 'preflop')
+        self.assertEqual(state['pot_size'], 0.03)
+        self.assertEqual(sorted(p['position'] for p in state['players']), ['BB', 'BTN', 'SB'])
+        self.assertEqual(position_names(6), ['BTN', 'SB', 'BB', 'UTG', 'MP', 'CO'])
+        # Streets progress and history uses the parser's action records
+        streets = {s['current_round'] for s, _ in recorder.states}
+        self.assertTrue(streets <= {'preflop', 'flop', 'turn', 'river'})
+        for s, _ in recorder.states:
+            self.assertEqual(len(s['community_cards']), {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}[s['street']])
+            for action in s['action_history']:
+                self.assertIn(action['action_type'], ('BET', 'RAISE', 'CALL', 'CHECK', 'FOLD'))
+
+
+class TestSimulationRuns(unittest.TestCase):
+    def test_seeded_runs_match_across_worker_counts(self):
+        seats = ['tag', 'lag', 'station', 'station']
+        serial = run_simulation(seats, 600, seed=11, chunk_hands=200)
+        parallel = run_parallel(seats, 600, workers=2, seed=11, chunk_hands=200)
+        self.assertEqual(serial.hands, 600)
+        self.assertEqual(serial.net_bb, parallel.net_bb)
+        self.assertAlmostEqual(sum(serial.net_bb), 0.0, places=6)
+        self.assertEqual(serial.errors, 0)
+        self.assertEqual(len(serial.summary()['seats']), 4)
+
+    def test_decision_engines_play_without_errors(self):
+        result = run_simulation(['decision_engine', 'advanced', 'tag', 'lag'], 30, seed=5)
+        self.assertEqual(result.errors, 0)
+        self.assertGreater(result.decisions[0], 0)
+        self.assertGreater(result.decisions[1], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()